@@ -0,0 +1,67 @@
+"""Build the latest item of every request_key already in the main table.
+
+Run once per stage before turning on dynamodb_latest_item for a provider,
+lookups then read only the latest item. Saves keep it up to date afterwards.
+--identity-items builds the vin and msisdn identity items instead, read by
+GET /data/vin/{vin} and GET /data/msisdn/{msisdn}/programcodes, from the
+newest records. Saves keep those up to date for every provider, run it once
+per stage whatever dynamodb_latest_item is.
+
+    python -m scripts.backfill_latest_items --dry-run
+    python -m scripts.backfill_latest_items --environment qa --segment 0 --total-segments 4
+    python -m scripts.backfill_latest_items --environment qa --identity-items
+"""
+
+import argparse
+import json
+import sys
+
+from agero_python_configuration import ConfigManager
+
+sys.path.append("..")
+
+from src.config.dynamo_config import DynamoConfig  # noqa
+from src.services.dynamodb_identity import backfill_identity_items  # noqa
+from src.services.dynamodb_latest import backfill_latest_items  # noqa
+from src.services.dynamodb_tables import get_main_table  # noqa
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--environment", default="local")
+    parser.add_argument("--table-name", help="defaults to dynamo.table_name")
+    parser.add_argument("--endpoint", help="defaults to dynamo.endpoint")
+    parser.add_argument("--segment", type=int, help="parallel scan segment")
+    parser.add_argument("--total-segments", type=int)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only count the request keys"
+    )
+    parser.add_argument(
+        "--identity-items",
+        action="store_true",
+        help="build the vin and msisdn identity items instead",
+    )
+    args = parser.parse_args()
+
+    config_manager = ConfigManager(config_environment=args.environment)
+    config_manager.register_config(DynamoConfig, "dynamo")
+    dynamo_config = config_manager.retrieve_config(DynamoConfig)
+    if args.table_name:
+        dynamo_config.table_name = args.table_name
+    if args.endpoint:
+        dynamo_config.endpoint = args.endpoint
+
+    scan_kwargs = {}
+    if args.total_segments:
+        scan_kwargs = {"segment": args.segment, "total_segments": args.total_segments}
+
+    table = get_main_table(dynamo_config)
+    if args.identity_items:
+        stats = backfill_identity_items(table, dry_run=args.dry_run, **scan_kwargs)
+    else:
+        stats = backfill_latest_items(table, dry_run=args.dry_run, **scan_kwargs)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
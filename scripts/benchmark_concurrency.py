@@ -0,0 +1,100 @@
+"""Show that route throughput scales with the number of in-flight requests.
+
+Drives the provider health route on one event loop with a stub client service
+whose call blocks for --latency ms, like an upstream round trip. With the
+adapter call running on the provider pool, throughput should grow with
+concurrency up to the pool size. --inline calls the adapter on the loop, as
+the routes did before, for comparison.
+
+    python -m scripts.benchmark_concurrency
+    python -m scripts.benchmark_concurrency --latency 200 --pool-size 16 --inline
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.append("..")
+
+from src.api import api  # noqa
+from src.models.domain.enums.internal_status_type import InternalStatusType  # noqa
+from src.models.enums.ctsversion_type import CtsVersion  # noqa
+from src.models.enums.programcode_type import ProgramCode  # noqa
+from src.siriusxm.models.data.vehicle_data import VehicleData  # noqa
+
+
+class SlowClientService:
+    def __init__(self, latency, pool_size):
+        self._latency = latency
+        self._config = SimpleNamespace(pool_size=pool_size)
+
+    def health(self, programcode, ctsversion):
+        time.sleep(self._latency)
+        return VehicleData(status=InternalStatusType.SUCCESS, responsemessage="ok")
+
+
+async def inline_client_call(method, *args, **kwargs):
+    return method(*args, **kwargs)
+
+
+async def run_level(concurrency, requests):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await api.health(ProgramCode.NISSAN, CtsVersion.ONE_DOT_ZERO)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(requests)])
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=int, default=100, help="ms per call")
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--levels", default="1,2,4,8,16")
+    parser.add_argument("--inline", action="store_true")
+    args = parser.parse_args()
+
+    service = SlowClientService(args.latency / 1000, args.pool_size)
+    patches = [
+        patch.object(
+            api,
+            "setup_service_manager",
+            return_value=SimpleNamespace(client_service=service),
+        ),
+        patch.object(api.logger, "info"),
+    ]
+    if args.inline:
+        patches.append(patch.object(api, "run_client_call", inline_client_call))
+    for p in patches:
+        p.start()
+
+    print(
+        "latency {} ms, pool size {}, {} requests per level{}".format(
+            args.latency,
+            args.pool_size,
+            args.requests,
+            ", adapter inline on the loop" if args.inline else "",
+        )
+    )
+    print("{:>11}  {:>10}  {:>12}".format("in-flight", "seconds", "requests/s"))
+    for level in [int(level) for level in args.levels.split(",")]:
+        elapsed = asyncio.run(run_level(level, args.requests))
+        print(
+            "{:>11}  {:>10.2f}  {:>12.1f}".format(
+                level, elapsed, args.requests / elapsed
+            )
+        )
+
+    for p in patches:
+        p.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Compare the ways Verizon replies have been handled.
+
+Handles each captured RequestVehicleLocation reply --runs times each way:
+fast, as VerizonService does with soap_fast_path on, with the soap_codec
+streaming parser and no zeep; once, as it does through zeep, with
+process_reply reading the body and the tracking headers from one parsed
+envelope; and twice, as before that, with the binding's process_reply
+followed by ElementTree.fromstring of the reply text and a positional walk
+to the headers. Reports CPU time per reply and the peak memory allocated
+while handling one.
+
+    python -m scripts.benchmark_verizon_reply
+    python -m scripts.benchmark_verizon_reply captured/*.xml --runs 2000
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET  # nosec
+
+from zeep import Client
+from zeep.helpers import serialize_object
+
+sys.path.append("..")
+
+from src.services.soaphandlers.soap_codec import (  # noqa
+    REQUEST_VEHICLE_LOCATION,
+    parse_reply,
+)
+from src.services.soaphandlers.soap_handler import (  # noqa
+    get_header_text,
+    process_reply,
+)
+from src.verizon.services.verizon_service import TRACKING_HEADERS  # noqa
+
+DEFAULT_WSDL = "src/config/wsdl/RequestVehicleLocation.wsdl"
+OPERATION = "RequestVehicleLocation"
+
+
+class CapturedReply:
+    """The parts of a requests.Response zeep reads."""
+
+    def __init__(self, content):
+        self.content = content
+        self.text = content.decode("utf-8")
+        self.status_code = 200
+        self.headers = {"Content-Type": "text/xml; charset=utf-8"}
+
+
+def parse_twice(client, reply):
+    binding = client.service._binding
+    body = binding.process_reply(client, binding._operations[OPERATION], reply)
+    root = ET.fromstring(reply.text)  # nosec
+    # Header / ReplyTo / ReferenceParameters, as the old lookup walked it
+    parameters = list(list(root[0])[2])[1]
+    return body, {
+        key: next(
+            (
+                element.text
+                for element in parameters
+                if element.tag.endswith("}" + name)
+            ),
+            "NONE",
+        )
+        for key, name in TRACKING_HEADERS.items()
+    }
+
+
+def parse_once(client, reply):
+    body, envelope = process_reply(client, OPERATION, reply)
+    return body, {
+        key: get_header_text(envelope, name) or "NONE"
+        for key, name in TRACKING_HEADERS.items()
+    }
+
+
+def parse_fast(client, reply):
+    body, headers = parse_reply(
+        reply, REQUEST_VEHICLE_LOCATION.reply, TRACKING_HEADERS.values()
+    )
+    return body, {
+        key: headers.get(name) or "NONE" for key, name in TRACKING_HEADERS.items()
+    }
+
+
+def cpu_times(handle, client, reply, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.process_time()
+        handle(client, reply)
+        timings.append((time.process_time() - started) * 1000000)
+    return timings
+
+
+def peak_allocated(handle, client, reply):
+    tracemalloc.start()
+    handle(client, reply)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def summary(name, timings, peak):
+    timings = sorted(timings)
+    return "{:<6} cpu mean {:>7.1f} us  p95 {:>7.1f} us  peak allocated {:>7} B".format(
+        name,
+        statistics.mean(timings),
+        timings[int(len(timings) * 0.95) - 1],
+        peak,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("replies", nargs="*", help="captured reply xml files")
+    parser.add_argument("--wsdl", default=DEFAULT_WSDL)
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+
+    if args.replies:
+        replies = {}
+        for path in args.replies:
+            with open(path, "rb") as reply_file:
+                replies[path] = reply_file.read()
+    else:
+        from tests.services.soaphandlers.test_soap_handler import VERIZON_REPLY
+
+        replies = {"captured success reply": VERIZON_REPLY}
+
+    client = Client(args.wsdl)
+    for name, content in replies.items():
+        reply = CapturedReply(content)
+        twice, once = parse_twice(client, reply), parse_once(client, reply)
+        fast = parse_fast(client, reply)
+        if twice != once or (serialize_object(once[0], dict), once[1]) != fast:
+            raise SystemExit(
+                "{}: results differ {} {} {}".format(name, twice, once, fast)
+            )
+        print("{} ({} bytes)".format(name, len(content)))
+        for label, handle in (
+            ("twice", parse_twice),
+            ("once", parse_once),
+            ("fast", parse_fast),
+        ):
+            # the first call loads zeep's lazily built types
+            handle(client, reply)
+            print(
+                summary(
+                    label,
+                    cpu_times(handle, client, reply, args.runs),
+                    peak_allocated(handle, client, reply),
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
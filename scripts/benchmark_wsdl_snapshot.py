@@ -0,0 +1,79 @@
+"""Compare first-call zeep client setup with and without a WSDL snapshot.
+
+Every sample runs in a fresh interpreter so zeep's process-wide InMemoryCache
+starts empty, the same as the first SOAP call in a new Lambda container.
+
+    python -m scripts.benchmark_wsdl_snapshot
+    python -m scripts.benchmark_wsdl_snapshot src/config/wsdl/siriusxm.wsdl --runs 20
+"""
+
+import argparse
+import glob
+import statistics
+import subprocess  # nosec
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_ROOT_CERT = "src/config/certs/corpvtcert.cer"
+
+PROBE = """
+import sys
+import time
+from src.services.httphandlers.http_handler import setup_http_session
+from src.services.soaphandlers import soap_handler, wsdl_snapshot
+
+wsdl, rootcert, use_snapshot = sys.argv[1], sys.argv[2], sys.argv[3] == "1"
+if not use_snapshot:
+    wsdl_snapshot.SNAPSHOT_SUFFIX = ".disabled"
+session = setup_http_session(rootcert, 1)
+started = time.perf_counter()
+soap_handler.setup_zeepclient(wsdl, "https://localhost", session)
+print(time.perf_counter() - started)
+"""
+
+
+def sample(wsdl, root_cert, use_snapshot):
+    completed = subprocess.run(  # nosec
+        [sys.executable, "-c", PROBE, wsdl, root_cert, "1" if use_snapshot else "0"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise SystemExit(completed.stderr)
+    return float(completed.stdout.strip().splitlines()[-1]) * 1000
+
+
+def describe(samples):
+    return "median {:8.1f} ms  p90 {:8.1f} ms  min {:8.1f} ms".format(
+        statistics.median(samples),
+        sorted(samples)[int(len(samples) * 0.9) - 1],
+        min(samples),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "wsdl", nargs="*", default=sorted(glob.glob("src/config/wsdl/*.wsdl"))
+    )
+    parser.add_argument("--root-cert", default=DEFAULT_ROOT_CERT)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    for wsdl in args.wsdl:
+        if not Path(ROOT, wsdl + ".snapshot.json").is_file():
+            print(
+                "{}: no snapshot, run scripts.build_wsdl_snapshots first".format(wsdl)
+            )
+            continue
+        without = [sample(wsdl, args.root_cert, False) for _ in range(args.runs)]
+        with_snapshot = [sample(wsdl, args.root_cert, True) for _ in range(args.runs)]
+        print(wsdl)
+        print("  without snapshot: {}".format(describe(without)))
+        print("  with snapshot:    {}".format(describe(with_snapshot)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Pre-load the static WSDLs into snapshot files shipped with the package.
+
+zeep's parsed Document holds thread locals and lxml trees, so it can't be
+pickled. The snapshot is the next best thing: every document the parse needs,
+remote schema imports included, resolved at build time. setup_zeepclient picks
+it up automatically when it sits next to the wsdl.
+
+    python -m scripts.build_wsdl_snapshots
+    python -m scripts.build_wsdl_snapshots src/config/wsdl/siriusxm.wsdl
+"""
+
+import argparse
+import glob
+import sys
+
+from requests import Session
+
+sys.path.append("..")
+
+from src.services.soaphandlers.wsdl_snapshot import (  # noqa
+    build_snapshot,
+    write_snapshot,
+)
+
+DEFAULT_ROOT_CERT = "src/config/certs/corpvtcert.cer"
+DEFAULT_WSDLS = sorted(glob.glob("src/config/wsdl/*.wsdl"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("wsdl", nargs="*", default=DEFAULT_WSDLS)
+    parser.add_argument("--root-cert", default=DEFAULT_ROOT_CERT)
+    args = parser.parse_args()
+
+    session = Session()
+    session.verify = args.root_cert
+
+    failed = False
+    for wsdl in args.wsdl:
+        try:
+            snapshot = build_snapshot(wsdl, session)
+        except Exception as e:
+            print("{}: unable to build snapshot: {}".format(wsdl, e))
+            failed = True
+            continue
+        path = write_snapshot(wsdl, snapshot)
+        print(
+            "{}: {} documents written to {}".format(
+                wsdl, len(snapshot["documents"]), path
+            )
+        )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Report what the Lambda init phase pays for when importing src.handler.
+
+Runs the import in a fresh interpreter with ``-X importtime`` so nothing is
+already cached in sys.modules, then prints the slowest modules, the time spent
+per top-level package and the resident memory after the import.
+
+    python -m scripts.cold_start_report
+    python -m scripts.cold_start_report --module src.fca.services.fca_service
+    python -m scripts.cold_start_report --json
+"""
+
+import argparse
+import json
+import re
+import subprocess  # nosec
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+MAXRSS_MARKER = "maxrss_kb="
+
+PROBE = """
+import resource
+import sys
+for name in sys.argv[1:]:
+    __import__(name)
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    rss = rss // 1024
+print("%s" + str(rss))
+""" % MAXRSS_MARKER
+
+
+def run_probe(modules):
+    completed = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", "-c", PROBE, *modules],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise SystemExit(completed.stderr)
+    return completed.stdout, completed.stderr
+
+
+def parse_importtime(stderr):
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append(
+                {
+                    "module": module,
+                    "self_ms": int(self_us) / 1000,
+                    "cumulative_ms": int(cumulative_us) / 1000,
+                    "depth": len(indent) // 2,
+                }
+            )
+    return entries
+
+
+def parse_maxrss(stdout):
+    for line in stdout.splitlines():
+        if line.startswith(MAXRSS_MARKER):
+            return int(line[len(MAXRSS_MARKER) :])
+    return None
+
+
+def build_report(modules, top):
+    stdout, stderr = run_probe(modules)
+    entries = parse_importtime(stderr)
+
+    packages = defaultdict(float)
+    for entry in entries:
+        packages[entry["module"].split(".")[0]] += entry["self_ms"]
+
+    requested = [entry for entry in entries if entry["module"] in modules]
+    return {
+        "modules": modules,
+        "total_ms": round(sum(entry["self_ms"] for entry in entries), 3),
+        "requested": requested,
+        "maxrss_kb": parse_maxrss(stdout),
+        "packages": dict(
+            sorted(
+                ((name, round(ms, 3)) for name, ms in packages.items()),
+                key=lambda item: item[1],
+                reverse=True,
+            )[:top]
+        ),
+        "slowest": sorted(entries, key=lambda entry: entry["self_ms"], reverse=True)[
+            :top
+        ],
+        "heavy_loaded": [
+            name
+            for name in ("zeep", "lxml", "pynamodb", "botocore")
+            if name in packages
+        ],
+    }
+
+
+def print_report(report):
+    print("Imported: {}".format(", ".join(report["modules"])))
+    print("Total import time: {:.1f} ms".format(report["total_ms"]))
+    for entry in report["requested"]:
+        print(
+            "  {}: {:.1f} ms cumulative".format(entry["module"], entry["cumulative_ms"])
+        )
+    if report["maxrss_kb"] is not None:
+        print("Max resident memory: {:.1f} MB".format(report["maxrss_kb"] / 1024))
+    print(
+        "Heavy packages loaded: {}".format(", ".join(report["heavy_loaded"]) or "none")
+    )
+
+    print("\nTime by top-level package (self, ms)")
+    for name, ms in report["packages"].items():
+        print("  {:>9.1f}  {}".format(ms, name))
+
+    print("\nSlowest modules (self, ms)")
+    for entry in report["slowest"]:
+        print("  {:>9.1f}  {}".format(entry["self_ms"], entry["module"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--module",
+        action="append",
+        default=[],
+        help="additional module to import after src.handler, e.g. a provider service",
+    )
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print the raw report")
+    args = parser.parse_args()
+
+    report = build_report(["src.handler", *args.module], args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
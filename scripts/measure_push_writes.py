@@ -0,0 +1,148 @@
+"""Compare the FCA push save with one BatchWriteItem against two PutItems.
+
+Runs FcaService.save_vehicledata --pushes times each way: batched, as the
+service saves now, and sequential, the main row then the supplement row as
+before. Both include the latest item put. The difference is a round trip
+the push, and a bcall retrial poll waiting on its rows, no longer spend.
+--demo runs against an in-memory table with --latency ms
+added to every DynamoDB call to stand in for the network round trip.
+
+    python -m scripts.measure_push_writes --demo --latency 8
+    python -m scripts.measure_push_writes --environment qa --payload push.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from contextlib import nullcontext
+from unittest.mock import patch
+
+import boto3
+from agero_python_configuration import ConfigManager
+
+sys.path.append("..")
+
+from src.config.dynamo_config import DynamoConfig  # noqa
+from src.config.fca_config import FcaConfig  # noqa
+from src.fca.services.fca_service import FcaService  # noqa
+from src.services.dynamodb_tables import (  # noqa
+    get_main_table,
+    get_supplement_table,
+)
+
+DEMO_CONFIG = DynamoConfig(
+    table_name="push-demo", supplement_table_name="push-supplement-demo"
+)
+
+
+def create_demo_tables():
+    client = boto3.client("dynamodb", region_name="us-east-1")
+    for table_name in (DEMO_CONFIG.table_name, DEMO_CONFIG.supplement_table_name):
+        client.create_table(
+            AttributeDefinitions=[
+                {"AttributeName": "request_key", "AttributeType": "S"},
+                {"AttributeName": "event_datetime", "AttributeType": "N"},
+            ],
+            KeySchema=[
+                {"AttributeName": "request_key", "KeyType": "HASH"},
+                {"AttributeName": "event_datetime", "KeyType": "RANGE"},
+            ],
+            TableName=table_name,
+            BillingMode="PAY_PER_REQUEST",
+        )
+
+
+def run_pushes(service, payload, pushes, sequential):
+    # returning every row as unwritten makes the service save them one by one
+    batch = (
+        patch(
+            "src.fca.services.fca_service.batch_save",
+            side_effect=lambda *rows: list(rows),
+        )
+        if sequential
+        else nullcontext()
+    )
+    timings = []
+    with batch:
+        for _ in range(pushes):
+            started = time.perf_counter()
+            service.save_vehicledata("13234826699", "fca", payload)
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def delay_dispatch(connection, latency):
+    dispatch = connection.dispatch
+
+    def delayed_dispatch(operation, kwargs):
+        time.sleep(latency / 1000)
+        return dispatch(operation, kwargs)
+
+    return patch.object(connection, "dispatch", side_effect=delayed_dispatch)
+
+
+def summary(name, timings):
+    timings = sorted(timings)
+    return "{:<12} mean {:>8.1f} ms  p50 {:>8.1f} ms  p95 {:>8.1f} ms".format(
+        name,
+        statistics.mean(timings),
+        timings[len(timings) // 2],
+        timings[int(len(timings) * 0.95) - 1],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--environment", default="local")
+    parser.add_argument("--payload", help="FCA push body, json file")
+    parser.add_argument("--pushes", type=int, default=50)
+    parser.add_argument("--demo", action="store_true")
+    parser.add_argument(
+        "--latency", type=float, default=0, help="ms added per call with --demo"
+    )
+    args = parser.parse_args()
+
+    if args.payload:
+        with open(args.payload) as payload_file:
+            payload = json.load(payload_file)
+    else:
+        from tests.fca.services.test_fca_service import (
+            generate_valid_fca_maserati_data,
+        )
+
+        payload = generate_valid_fca_maserati_data()
+
+    if args.demo:
+        from moto import mock_dynamodb2
+
+        mock, dynamo_config = mock_dynamodb2(), DEMO_CONFIG
+    else:
+        mock = nullcontext()
+        config_manager = ConfigManager(config_environment=args.environment)
+        config_manager.register_config(DynamoConfig, "dynamo")
+        dynamo_config = config_manager.retrieve_config(DynamoConfig)
+
+    with mock:
+        if args.demo:
+            create_demo_tables()
+        table = get_main_table(dynamo_config)
+        supplement_table = get_supplement_table(dynamo_config)
+        service = FcaService(
+            config=FcaConfig(), table=table, supplementtable=supplement_table
+        )
+        delays = [
+            delay_dispatch(model._get_connection().connection, args.latency)
+            for model in (table, supplement_table)
+        ]
+        with delays[0], delays[1]:
+            sequential = run_pushes(service, payload, args.pushes, True)
+            batched = run_pushes(service, payload, args.pushes, False)
+
+    print(summary("sequential", sequential))
+    print(summary("batched", batched))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Compare full item reads with the projections the lookups now request.
+
+For every route's lookup, reads the newest record of each request key twice,
+once as the full item and once with the route's projection, and reports the
+consumed read capacity and the size of the returned items. DynamoDB bills
+Query and GetItem by the size of the stored item, so the capacity only drops
+where a projection avoids reading the item (an index with a narrower
+projection). The payload and parse time drop everywhere.
+
+    python -m scripts.measure_read_projections --demo
+    python -m scripts.measure_read_projections --environment qa --request-key fca-13234826699
+"""
+
+import argparse
+import json
+import sys
+from contextlib import nullcontext
+
+import boto3
+from agero_python_configuration import ConfigManager
+
+sys.path.append("..")
+
+from src.aeris.services.aeris_service import VEHICLEDATA_ATTRIBUTES as AERIS  # noqa
+from src.config.dynamo_config import DynamoConfig  # noqa
+from src.fca.services.fca_service import VEHICLEDATA_ATTRIBUTES as FCA  # noqa
+from src.siriusxm.services.siriusxm_service import (  # noqa
+    VEHICLEDATA_ATTRIBUTES as SIRIUSXM,
+)
+from src.verizon.services.verizon_service import (  # noqa
+    VEHICLEDATA_ATTRIBUTES as VERIZON,
+)
+from src.vodafone.services.vodafone_service import (  # noqa
+    VEHICLEDATA_ATTRIBUTES as VODAFONE,
+)
+
+LOOKUPS = [
+    ("GET /data/{id}/programcode/{pc} (siriusxm)", SIRIUSXM),
+    ("GET /data/{msisdn}/.../ctsversion/1.0 (fca)", FCA),
+    ("GET /data/{msisdn}/.../ctsversion/2.0 (aeris)", AERIS),
+    ("GET /data/{msisdn}/.../ctsversion/2.0 (verizon)", VERIZON),
+    ("GET /data/{msisdn}/.../ctsversion/1.0 (vodafone)", VODAFONE),
+    ("GET /vehicleinfo (vodafone, full item)", None),
+]
+
+DEMO_TABLE = "projection-demo"
+DEMO_KEY = "porsche-13234826699"
+
+
+def read_newest(client, table_name, request_key, attributes):
+    kwargs = {
+        "TableName": table_name,
+        "KeyConditionExpression": "request_key = :key",
+        "ExpressionAttributeValues": {":key": {"S": request_key}},
+        "ScanIndexForward": False,
+        "Limit": 1,
+        "ReturnConsumedCapacity": "TOTAL",
+    }
+    if attributes is not None:
+        names = {"#a{}".format(i): name for i, name in enumerate(sorted(attributes))}
+        kwargs["ProjectionExpression"] = ", ".join(names)
+        kwargs["ExpressionAttributeNames"] = names
+    response = client.query(**kwargs)
+    capacity = response.get("ConsumedCapacity", {}).get("CapacityUnits")
+    return capacity, len(json.dumps(response["Items"]))
+
+
+def seed_demo_table(client):
+    client.create_table(
+        AttributeDefinitions=[
+            {"AttributeName": "request_key", "AttributeType": "S"},
+            {"AttributeName": "event_datetime", "AttributeType": "N"},
+        ],
+        KeySchema=[
+            {"AttributeName": "request_key", "KeyType": "HASH"},
+            {"AttributeName": "event_datetime", "KeyType": "RANGE"},
+        ],
+        TableName=DEMO_TABLE,
+        BillingMode="PAY_PER_REQUEST",
+    )
+    item = {
+        "request_key": {"S": DEMO_KEY},
+        "event_datetime": {"N": "1610000000000"},
+        "timestamp": {"S": "2021-01-07T06:13:20.000000+0000"},
+    }
+    for name in sorted(SIRIUSXM | FCA | AERIS | VERIZON | VODAFONE):
+        item.setdefault(name, {"S": "x" * 12})
+    # a Porsche payload is a few KB of nested JSON
+    item["JSONData"] = {
+        "S": json.dumps({"signal{}".format(i): "value" * 8 for i in range(200)})
+    }
+    client.put_item(TableName=DEMO_TABLE, Item=item)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--environment", default="local")
+    parser.add_argument("--table-name", help="defaults to dynamo.table_name")
+    parser.add_argument("--endpoint", help="defaults to dynamo.endpoint")
+    parser.add_argument("--request-key", action="append", default=[])
+    parser.add_argument(
+        "--demo", action="store_true", help="seed and read an in-memory table"
+    )
+    args = parser.parse_args()
+
+    if args.demo:
+        from moto import mock_dynamodb2
+
+        mock = mock_dynamodb2()
+        table_name, endpoint, request_keys = DEMO_TABLE, None, [DEMO_KEY]
+    else:
+        mock = nullcontext()
+        config_manager = ConfigManager(config_environment=args.environment)
+        config_manager.register_config(DynamoConfig, "dynamo")
+        dynamo_config = config_manager.retrieve_config(DynamoConfig)
+        table_name = args.table_name or dynamo_config.table_name
+        endpoint = args.endpoint or dynamo_config.endpoint
+        request_keys = args.request_key
+        if not request_keys:
+            parser.error("--request-key is required without --demo")
+
+    with mock:
+        client = boto3.client(
+            "dynamodb", region_name="us-east-1", endpoint_url=endpoint
+        )
+        if args.demo:
+            seed_demo_table(client)
+        print(
+            "{:<50} {:>12} {:>12} {:>12} {:>12}".format(
+                "lookup", "full RCU", "proj RCU", "full bytes", "proj bytes"
+            )
+        )
+        for request_key in request_keys:
+            for name, attributes in LOOKUPS:
+                full = read_newest(client, table_name, request_key, None)
+                projected = read_newest(client, table_name, request_key, attributes)
+                print(
+                    "{:<50} {:>12} {:>12} {:>12} {:>12}".format(
+                        name, str(full[0]), str(projected[0]), full[1], projected[1]
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Move the main and supplement tables to the indexes the models define.
+
+DynamoDB can't change the projection of an index, and UpdateTable, like a
+CloudFormation stack update, adds or drops one index at a time. The ALL
+projection gsi-data-index is therefore replaced by a keys-only index under a
+new name: it is created and backfilled first, so readers can move over, then
+the old one is dropped. gsi-rid-index is dropped without a replacement,
+nothing reads by referenceid.
+
+Without --apply the steps are only printed, each with the
+GlobalSecondaryIndexes the table has after it. For the tables the database
+stacks manage each step is its own change to the resources yml, deployed
+before the next one lands. --apply runs the steps with UpdateTable, waiting
+for each index to become active, and only for tables no stack manages such as
+local ones: a stack would try to undo them on its next deploy. --keep-old
+stops before dropping the old indexes.
+
+    python -m scripts.migrate_gsi_projections --environment qa
+    python -m scripts.migrate_gsi_projections --apply --keep-old
+"""
+
+import argparse
+import json
+import sys
+
+import boto3
+from agero_python_configuration import ConfigManager
+
+sys.path.append("..")
+
+from src.config.dynamo_config import DynamoConfig  # noqa
+from src.services.dynamodb_indexes import (  # noqa
+    apply_index_step,
+    index_attribute_definitions,
+    index_definitions,
+    plan_index_migration,
+    wait_for_indexes,
+)
+from src.services.dynamodb_tables import (  # noqa
+    ConnectedVehicleSupplementTable,
+    ConnectedVehicleTable,
+)
+
+# tag CloudFormation puts on the resources of a stack
+STACK_TAG = "aws:cloudformation:stack-name"
+
+
+def phases(current, steps):
+    """GlobalSecondaryIndexes of the table after each of steps."""
+    indexes = [
+        {
+            "IndexName": index["IndexName"],
+            "KeySchema": index["KeySchema"],
+            "Projection": index["Projection"],
+        }
+        for index in current
+    ]
+    for action, index in steps:
+        indexes = [
+            existing
+            for existing in indexes
+            if existing["IndexName"] != index["IndexName"]
+        ]
+        if action == "create":
+            indexes.append(index)
+        yield list(indexes)
+
+
+def managing_stack(client, table):
+    """Name of the CloudFormation stack managing table, None for none."""
+    tags = client.list_tags_of_resource(ResourceArn=table["TableArn"]).get("Tags", [])
+    for tag in tags:
+        if tag["Key"] == STACK_TAG:
+            return tag["Value"]
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--environment", default="local")
+    parser.add_argument("--endpoint", help="defaults to dynamo.endpoint")
+    parser.add_argument(
+        "--table",
+        choices=["main", "supplement"],
+        action="append",
+        help="defaults to both",
+    )
+    parser.add_argument("--apply", action="store_true", help="run the steps")
+    parser.add_argument(
+        "--keep-old", action="store_true", help="don't drop the replaced indexes"
+    )
+    parser.add_argument("--delay", type=float, default=10.0)
+    args = parser.parse_args()
+
+    config_manager = ConfigManager(config_environment=args.environment)
+    config_manager.register_config(DynamoConfig, "dynamo")
+    dynamo_config = config_manager.retrieve_config(DynamoConfig)
+    models = {
+        "main": (dynamo_config.table_name, ConnectedVehicleTable),
+        "supplement": (
+            dynamo_config.supplement_table_name,
+            ConnectedVehicleSupplementTable,
+        ),
+    }
+
+    client = boto3.client(
+        "dynamodb",
+        region_name="us-east-1",
+        endpoint_url=args.endpoint or dynamo_config.endpoint,
+    )
+    for name in args.table or ["main", "supplement"]:
+        table_name, model = models[name]
+        table = client.describe_table(TableName=table_name)["Table"]
+        stack = managing_stack(client, table)
+        if args.apply and stack is not None:
+            raise SystemExit(
+                "{} belongs to stack {}, deploy the steps as template changes".format(
+                    table_name, stack
+                )
+            )
+        current = table.get("GlobalSecondaryIndexes", [])
+        steps = plan_index_migration(
+            current, index_definitions(model), drop=not args.keep_old
+        )
+        print("{}: {} steps".format(table_name, len(steps)))
+        for number, (step, indexes) in enumerate(zip(steps, phases(current, steps)), 1):
+            print("{}. {} {}".format(number, step[0], step[1]["IndexName"]))
+            if not args.apply:
+                print(json.dumps({"GlobalSecondaryIndexes": indexes}, indent=2))
+                continue
+            apply_index_step(
+                client, table_name, step, index_attribute_definitions(model)
+            )
+            wait_for_indexes(client, table_name, delay=args.delay)
+
+
+if __name__ == "__main__":
+    main()
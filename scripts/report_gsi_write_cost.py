@@ -0,0 +1,211 @@
+"""Report the write units a save costs with the old and the new indexes.
+
+Sizes items as DynamoDB bills them, attribute names included, and adds up
+the write units of putting each into the table and into every index it is
+in: before with the ALL projection gsi-data-index and gsi-rid-index, after
+with the indexes the models define. An index that projects all attributes
+writes another copy of the item, JSONData included, so large Porsche
+payloads cost their size three times before. Items are a --sample of the
+table, or with --demo one record of each shape along with the latest and
+identity items its save writes.
+
+    python -m scripts.report_gsi_write_cost --demo
+    python -m scripts.report_gsi_write_cost --environment qa --sample 5000 --saves-per-month 3000000
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import islice
+
+from agero_python_configuration import ConfigManager
+
+sys.path.append("..")
+
+from src.config.dynamo_config import DynamoConfig  # noqa
+from src.services.dynamodb_identity import VIN_ITEM_ATTRIBUTES  # noqa
+from src.services.dynamodb_indexes import index_definitions, save_write_units  # noqa
+from src.services.dynamodb_latest import LATEST_ITEM_EXCLUDED  # noqa
+from src.services.dynamodb_tables import ConnectedVehicleTable, get_main_table  # noqa
+
+TABLE_KEYS = ("request_key", "event_datetime")
+# on-demand write request units, us-east-1
+DEFAULT_PRICE_PER_MILLION = 1.25
+
+
+def all_projection_index(name, hash_key):
+    return {
+        "IndexName": name,
+        "KeySchema": [
+            {"AttributeName": hash_key, "KeyType": "HASH"},
+            {"AttributeName": "event_datetime", "KeyType": "RANGE"},
+        ],
+        "Projection": {"ProjectionType": "ALL"},
+    }
+
+
+BEFORE = [
+    all_projection_index("gsi-data-index", "programcode"),
+    all_projection_index("gsi-rid-index", "referenceid"),
+]
+
+
+def demo_items():
+    """Serialized records of each shape, with the items their save adds."""
+    timestamp = datetime(2021, 1, 7, 13, 44, tzinfo=timezone.utc)
+    common = dict(timestamp=timestamp, latitude=42.3601, longitude=-71.0589)
+    records = [
+        ConnectedVehicleTable(
+            request_key="fca-13234826699",
+            event_datetime=1610027040000,
+            programcode="fca",
+            msisdn="13234826699",
+            vin="1C4RJKBG4M81030HT",
+            brand="JEEP",
+            odometer=12000,
+            **common,
+        ),
+        ConnectedVehicleTable(
+            request_key="siriusxm-ref-1",
+            event_datetime=1610027040000,
+            programcode="siriusxm",
+            referenceid="ref-1",
+            vin="3VWCB7BU9LM003155",
+            calldate="2021-01-07",
+            calltime="13:44",
+            **common,
+        ),
+        ConnectedVehicleTable(
+            request_key="porsche-13234826699",
+            event_datetime=1610027040000,
+            programcode="porsche",
+            msisdn="13234826699",
+            vin="WP0AA2A71JL113555",
+            # a Porsche payload is a few KB of nested JSON
+            JSONData={"signal{}".format(i): "value" * 8 for i in range(200)},
+            **common,
+        ),
+    ]
+    for record in records:
+        item = serialize(record)
+        yield record.programcode, item
+        # built from the record as save_latest_item does
+        yield "{} latest".format(record.programcode), serialize(
+            ConnectedVehicleTable(
+                **{
+                    **{
+                        name: value
+                        for name, value in record.attribute_values.items()
+                        if name not in LATEST_ITEM_EXCLUDED
+                    },
+                    "event_datetime": -1,
+                    "latest_event_datetime": record.event_datetime,
+                }
+            )
+        )
+        # the update of save_vin_item only sets these
+        yield "{} vin".format(record.programcode), {
+            **{name: item[name] for name in VIN_ITEM_ATTRIBUTES if name in item},
+            "request_key": {"S": "vin-" + record.vin},
+            "event_datetime": {"N": "-1"},
+            "latest_event_datetime": item["event_datetime"],
+            "source_request_key": item["request_key"],
+            "source_programcode": item["programcode"],
+        }
+        if record.msisdn:
+            # the update of save_msisdn_item only sets these
+            yield "{} msisdn".format(record.programcode), {
+                "request_key": {"S": "msisdn-" + record.msisdn},
+                "event_datetime": {"N": "-1"},
+                "programcodes": {"SS": [record.programcode]},
+                "msisdn": item["msisdn"],
+            }
+
+
+def serialize(record):
+    return record._serialize(attr_map=True, null_check=False)["attributes"]
+
+
+def sampled_items(table, sample):
+    for record in islice(table.scan(), sample):
+        yield record.programcode, serialize(record)
+
+
+def report(items, saves_per_month, price_per_million):
+    after = index_definitions(ConnectedVehicleTable)
+    rows = []
+    totals = Counter()
+    for kind, item in items:
+        before_units = save_write_units(item, BEFORE, TABLE_KEYS)
+        after_units = save_write_units(item, after, TABLE_KEYS)
+        before_total = sum(before_units.values())
+        after_total = sum(after_units.values())
+        totals.update(items=1, before=before_total, after=after_total)
+        rows.append(
+            {
+                "item": kind,
+                "before": before_units,
+                "after": after_units,
+                "saved": before_total - after_total,
+            }
+        )
+
+    summary = {
+        "items": totals["items"],
+        "write_units_before": totals["before"],
+        "write_units_after": totals["after"],
+        "saved_percent": round(
+            100.0 * (totals["before"] - totals["after"]) / (totals["before"] or 1), 1
+        ),
+    }
+    if saves_per_month and totals["items"]:
+        for name in ("before", "after"):
+            units = totals[name] / totals["items"] * saves_per_month
+            summary["monthly_cost_{}".format(name)] = round(
+                units / 1000000 * price_per_million, 2
+            )
+    return {"items": rows, "summary": summary}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--environment", default="local")
+    parser.add_argument("--table-name", help="defaults to dynamo.table_name")
+    parser.add_argument("--endpoint", help="defaults to dynamo.endpoint")
+    parser.add_argument("--sample", type=int, default=1000, help="items to scan")
+    parser.add_argument(
+        "--saves-per-month",
+        type=int,
+        help="item writes per month, for the cost at --sample's mix",
+    )
+    parser.add_argument(
+        "--price-per-million", type=float, default=DEFAULT_PRICE_PER_MILLION
+    )
+    parser.add_argument(
+        "--demo", action="store_true", help="size one record of each shape"
+    )
+    args = parser.parse_args()
+
+    if args.demo:
+        items = demo_items()
+    else:
+        config_manager = ConfigManager(config_environment=args.environment)
+        config_manager.register_config(DynamoConfig, "dynamo")
+        dynamo_config = config_manager.retrieve_config(DynamoConfig)
+        if args.table_name:
+            dynamo_config.table_name = args.table_name
+        if args.endpoint:
+            dynamo_config.endpoint = args.endpoint
+        items = sampled_items(get_main_table(dynamo_config), args.sample)
+
+    print(
+        json.dumps(
+            report(items, args.saves_per_month, args.price_per_million), indent=2
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -50,6 +50,10 @@ class VehicleData(BaseModel):
     mileage: Optional[int] = Field(description="Mileage in number Ex:3197")
     mileageunit: Optional[OdometerScaleType] = Field(description="Mileageunit Ex:mi")
 
+    dataage: Optional[int] = Field(
+        description="Seconds since the data was saved, set when stored data is returned instead of a live lookup"
+    )
+
     status: InternalStatusType = Field(
         InternalStatusType.UNKNOWN,
         description="Current status as returned from external service",
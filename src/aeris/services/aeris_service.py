@@ -2,24 +2,62 @@ from datetime import datetime
 import logging
 from typing import Type
 
-import requests
 from src.aeris.models.domain.vehicle_data import VehicleData
 from src.config.aeris_config import AerisConfig
 from src.models.domain.enums.internal_status_type import InternalStatusType
 from src.models.enums.ctsversion_type import CtsVersion
 from src.models.enums.programcode_type import ProgramCode
 from src.models.enums.status_type import Status
+from src.services.circuit_breaker import (
+    CircuitOpenError,
+    call_through,
+    get_circuit_breaker,
+    is_server_error,
+)
 from src.services.client_service import ClientService
-from src.services.dynamodb_tables import ConnectedVehicleTable
-from src.services.dynamodb_helper import get_vehicledata_for_config_enabled_client_only
+from src.services.dynamodb_identity import save_record_items
+from src.services.dynamodb_latest import latest_item_enabled
+from src.services.dynamodb_projections import projection
+from src.services.dynamodb_tables import ConnectedVehicleTable, handle_table_error
+from src.services.dynamodb_helper import (
+    get_circuit_open_response,
+    get_last_known_response,
+    get_vehicledata_for_config_enabled_client_only,
+)
+from src.services.httphandlers.http_handler import get_http_session, request_timeout
+from src.services.stale_fallback import (
+    get_vehicledata_or_stale,
+    stale_fallback_enabled,
+)
+from src.services.vehicledata_cache import cache_vehicledata
+from src.services.write_behind import save_vehicledata_behind
 from src.utilities.extensions.datetime_extension import get_utc_epoch
 from src.utilities.extensions.string_extension import isnotnull_whitespaceorempty
 from src.utilities.extensions.json_extension import checkjsonnode, seterrorjson
 from src.utilities.metric_scale import OdometerScale
+from src.utilities.errorhandlers.error_responsestatus import get_exception_status
 from starlette.status import HTTP_200_OK
 
 logger = logging.getLogger(__name__)
 
+# Attributes create_vehicledata_response maps into the response
+VEHICLEDATA_ATTRIBUTES = projection(
+    "activationtype",
+    "brand",
+    "headingdirection",
+    "latitude",
+    "longitude",
+    "market",
+    "modelcode",
+    "modeldesc",
+    "modelname",
+    "modelyear",
+    "odometer",
+    "odometerscale",
+    "timestamp",
+    "vin",
+)
+
 
 class AerisService(ClientService):
     def __init__(self, config: AerisConfig, table: Type[ConnectedVehicleTable]):
@@ -27,7 +65,31 @@ class AerisService(ClientService):
         self._config = config
         self._Table = table
 
+    @property
+    def circuit_breaker(self):
+        return get_circuit_breaker("aeris", self._config)
+
     def get_vehicledata(self, msisdn: str, programcode: ProgramCode):
+        if stale_fallback_enabled(self._config):
+            # stored data answers while Aeris is slow or failing
+            return get_vehicledata_or_stale(
+                self,
+                msisdn,
+                programcode,
+                self.lookup_vehicledata,
+                lambda msisdn, programcode: get_last_known_response(
+                    self,
+                    msisdn,
+                    programcode,
+                    CtsVersion.TWO_DOT_ZERO,
+                    VEHICLEDATA_ATTRIBUTES,
+                    create_vehicledata_response,
+                    "Stored vehicle data, the live lookup is slow or failed",
+                ),
+            )
+        return self.lookup_vehicledata(msisdn, programcode)
+
+    def lookup_vehicledata(self, msisdn: str, programcode: ProgramCode):
         try:
             self._logger.info(
                 "GetVehicleData: Payload received for msisdn: {} programcode: {}".format(
@@ -56,12 +118,30 @@ class AerisService(ClientService):
             if dataresponse is not None:
                 return dataresponse
             else:
-                response = requests.get(
-                    "{serviceurl}{msisdn}".format(
-                        serviceurl=self._config.base_url, msisdn=msisdn
-                    ),
-                    verify=self._config.root_cert,
-                )
+                try:
+                    response = call_through(
+                        self.circuit_breaker,
+                        get_http_session(
+                            "aeris", self._config.root_cert, self._config.pool_size
+                        ).get,
+                        "{serviceurl}{msisdn}".format(
+                            serviceurl=self._config.base_url, msisdn=msisdn
+                        ),
+                        timeout=request_timeout(self._config),
+                        failed=is_server_error,
+                    )
+                except CircuitOpenError as e:
+                    return get_circuit_open_response(
+                        self,
+                        "Aeris",
+                        msisdn,
+                        programcode,
+                        CtsVersion.TWO_DOT_ZERO,
+                        e,
+                        VEHICLEDATA_ATTRIBUTES,
+                        create_vehicledata_response,
+                        VehicleData,
+                    )
 
                 self._logger.info(
                     "GetVehicleData: Response from vordel for msisdn: {} is: "
@@ -129,7 +209,9 @@ class AerisService(ClientService):
                         market=responsejson["vehicle"]["ocuSim"]["market"],
                     )
                     # Save the data in dynamodb for audit and return the model on success
-                    self.save_vehicledata(msisdn, programcode, vehicledata)
+                    self.save_vehicledata(
+                        msisdn, programcode, vehicledata, write_behind=True
+                    )
 
                     return vehicledata
 
@@ -183,11 +265,13 @@ class AerisService(ClientService):
                 },
             )
             return VehicleData(
-                status=InternalStatusType.INTERNALSERVERERROR,
+                status=get_exception_status(e),
                 responsemessage=e.args[0] if e.args.__len__() > 0 else None,
             )
 
-    def save_vehicledata(self, msisdn, programcode, vehicledata):
+    def save_vehicledata(
+        self, msisdn, programcode, vehicledata, write_behind: bool = False
+    ):
         if vehicledata is not None:
             self._logger.info(
                 "SaveVehicleData: Payload received for msisdn: {} data: {}".format(
@@ -226,7 +310,34 @@ class AerisService(ClientService):
                     odometerscale=vehicledata.odometerscale,
                 )
 
+                # live lookups return before the audit row is written
+                if write_behind and save_vehicledata_behind(
+                    self._config, self._Table, vehicle_table
+                ):
+                    self._logger.info(
+                        "SaveVehicleData: Queued Vehicle data for msisdn: {} programcode: {}".format(
+                            vehicledata.msisdn, vehicledata.programcode
+                        ),
+                        extra={
+                            "programcode": vehicledata.programcode,
+                            "msisdn": vehicledata.msisdn,
+                            "action": "SaveVehicleData",
+                            "cts-version": CtsVersion.TWO_DOT_ZERO,
+                        },
+                    )
+                    return VehicleData(
+                        msisdn=msisdn,
+                        status=InternalStatusType.SUCCESS,
+                        responsemessage="Queued the vehicledata for msisdn: {}".format(
+                            msisdn
+                        ),
+                    )
+
                 vehicle_table.save()
+                save_record_items(
+                    self._Table, vehicle_table, latest_item_enabled(self._config)
+                )
+                cache_vehicledata(self._config, vehicle_table)
                 self._logger.info(
                     "SaveVehicleData: Successfully saved Vehicle data for msisdn: {} programcode: {} data: {} and the savequeryinfo: {}".format(
                         vehicledata.msisdn,
@@ -249,6 +360,7 @@ class AerisService(ClientService):
                     ),
                 )
             except Exception as e:
+                handle_table_error(self._Table, e)
                 self._logger.error(
                     "SaveVehicleData: Unable to save the data onto dynamodb : {}".format(
                         e
@@ -327,7 +439,7 @@ def get_data_from_database(self, msisdn, programcode, ctsversion):
             },
         )
         db_response = get_vehicledata_for_config_enabled_client_only(
-            self, msisdn, programcode, ctsversion
+            self, msisdn, programcode, ctsversion, VEHICLEDATA_ATTRIBUTES
         )
         if db_response is not None:
             dataresponse = create_vehicledata_response(
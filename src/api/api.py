@@ -1,18 +1,27 @@
 import logging
+import sys
 from os import getenv
-from fastapi import APIRouter, FastAPI
+from fastapi import APIRouter, FastAPI, Response
 from fastapi.params import Body
 from src import __version__
+from src.config.api_gateway_config import ApiGatewayConfig
+from src.config.batch_lookup_config import BatchLookupConfig
 from src.config.configuration_manager import setup_config_manager
+from src.config.dynamo_config import DynamoConfig
 from src.config.logger_config import LoggerConfig
 from src.middlewares.requestid_middleware import setup_middleware
 from src.models.commands.create_agentassignment import CreateAgentAssignmentCommand
 from src.models.commands.create_terminate import CreateTerminateCommand
+from src.models.commands.get_vehicledata_batch_command import (
+    GetVehicleDataBatchCommand,
+)
 from src.models.commands.get_vehicledata_command import GetVehicleDataCommand
 from src.models.domain.enums.internal_status_type import InternalStatusType
 from src.models.enums.ctsversion_type import CtsVersion
 from src.models.enums.programcode_type import ProgramCode
 from src.models.enums.status_type import Status
+from src.models.exceptions.badrequest_exception import BadRequestException
+from src.models.exceptions.notfound_exception import NotFoundException
 from src.models.json_api.error_response import JSONApiErrorResponse
 from src.models.json_api.success_response import JSONApiSuccessResponse
 from src.models.json_api.validation_error import InputValidationError
@@ -24,6 +33,11 @@ from src.models.responses.create_save_vehicledata_response import (
 )
 from src.models.responses.create_terminate_response import CreateTerminateResponse
 from src.models.responses.create_vehiclehex_response import CreateVehicleHexData
+from src.models.responses.get_programcodes_response import GetProgramCodesResponse
+from src.models.responses.get_vehicledata_batch_response import (
+    GetVehicleDataBatchItem,
+    GetVehicleDataBatchResponse,
+)
 from src.models.responses.get_vehicledata_response import (
     Brand,
     GetVehicleDataResponse,
@@ -32,15 +46,35 @@ from src.models.responses.get_vehicledata_response import (
     Vehicle,
 )
 from src.models.responses.health_check_response import HealthCheckResponse
+from src.services.circuit_breaker import (
+    get_circuit_breaker_stats,
+    get_service_circuit_breaker_stats,
+)
+from src.services.httphandlers.http_handler import get_http_session_stats
+from src.services.provider_executor import run_client_call
+from src.services.request_coalescer import (
+    get_coalescing_stats,
+    run_coalesced_client_call,
+)
 from src.services.service_manager import setup_service_manager
+from src.services.soaphandlers.zeep_client_pool import get_zeepclient_pool_stats
+from src.services.stale_fallback import (
+    finish_refreshes,
+    get_stale_fallback_stats,
+    record_age,
+)
 from src.siriusxm.models.domain.agentassignment import AgentAssignment
 from src.siriusxm.models.domain.terminate import Terminate
-from src.utilities.errorhandlers.error_responsestatus import handle_error_responsestatus
+from src.utilities.errorhandlers.error_responsestatus import (
+    get_exception_status,
+    handle_error_responsestatus,
+)
 from src.utilities.errorhandlers.exception_handlers import register_exception_handlers
 from src.utilities.logging import LoggerFactory, setup_root_logger
+from src.utilities.metric_scale import MileageUnit
 from src.utilities.openapi.open_api import create_custom_openapi_function
-from src.vodafone.services.vodafone_service import reformat_msisdn
-from starlette.status import HTTP_201_CREATED
+from src.utilities.request_context import get_call_timeout
+from starlette.status import HTTP_201_CREATED, HTTP_202_ACCEPTED
 
 app = FastAPI(
     title="ConnectedVehicleAPI",
@@ -56,7 +90,50 @@ logger = logging.getLogger(__name__)
 setup_root_logger()
 logger_factory = LoggerFactory(config=config_manager.retrieve_config(LoggerConfig))
 logger_factory.setup_logger()
-setup_middleware(app)
+gateway_timeout = config_manager.retrieve_config(ApiGatewayConfig).timeout
+setup_middleware(app, gateway_timeout)
+
+# Lambda gives a shutting down environment about half a second
+SHUTDOWN_FLUSH_TIMEOUT = 0.4
+
+
+@app.on_event("shutdown")
+def flush_write_behind_on_shutdown():
+    """
+    Saves the audit rows still queued for write-behind
+    """
+    # only loaded once something was queued, nothing to flush otherwise
+    write_behind = sys.modules.get("src.services.write_behind")
+    if write_behind is not None:
+        write_behind.flush_write_behind(
+            timeout=SHUTDOWN_FLUSH_TIMEOUT, reason="dropped at shutdown"
+        )
+
+
+def flush_write_behind_before_response():
+    """
+    Saves the audit rows queued for write-behind that the shutdown flush can't
+    be relied on for within the request's deadline, Lambda freezes the
+    environment as soon as the handler returns
+    """
+    write_behind = sys.modules.get("src.services.write_behind")
+    if write_behind is not None:
+        write_behind.flush_write_behind_backlog(
+            timeout=get_call_timeout(None),
+            reason="left queued when the response went out",
+        )
+
+
+def finish_refreshes_before_response():
+    """
+    Logs the live lookups still running behind a stale answer, Lambda
+    freezes them as soon as the handler returns. Waits for them first only
+    where stale_fallback_refresh_wait opts in, within the request's deadline
+    """
+    finish_refreshes(
+        timeout=get_call_timeout(None),
+        reason="left running when the response went out",
+    )
 
 
 @base_router.get("/health", response_model=JSONApiSuccessResponse[HealthCheckResponse])
@@ -64,8 +141,24 @@ async def health():
     """
     Performs a health check of the CV Gateway API
     """
+    # imported here so pynamodb stays off the cold start import path
+    from src.services.dynamodb_lease import get_lease_stats
+    from src.services.vehicledata_cache import get_vehicledata_cache_stats
+    from src.services.write_behind import get_write_behind_stats
+
     return JSONApiSuccessResponse[HealthCheckResponse](
-        data=HealthCheckResponse(success=True, responsemessage="HealthCheck passed")
+        data=HealthCheckResponse(
+            success=True,
+            responsemessage="HealthCheck passed",
+            connectionpools=get_http_session_stats(),
+            leases=get_lease_stats(),
+            coalescing=get_coalescing_stats(),
+            vehicledatacache=get_vehicledata_cache_stats(),
+            writebehind=get_write_behind_stats(),
+            circuitbreakers=get_circuit_breaker_stats(),
+            stalefallback=get_stale_fallback_stats(),
+            zeepclientpools=get_zeepclient_pool_stats(),
+        )
     )
 
 
@@ -90,7 +183,9 @@ async def health(programcode: ProgramCode, ctsversion: CtsVersion):
 
     service_manager = setup_service_manager(programcode, ctsversion)
 
-    dataresponse = service_manager.client_service.health(programcode, ctsversion)
+    dataresponse = await run_client_call(
+        service_manager.client_service.health, programcode, ctsversion
+    )
 
     if dataresponse.status == InternalStatusType.SUCCESS:
         logger.info(
@@ -107,7 +202,11 @@ async def health(programcode: ProgramCode, ctsversion: CtsVersion):
 
         return JSONApiSuccessResponse[HealthCheckResponse](
             data=HealthCheckResponse(
-                success=True, responsemessage=dataresponse.responsemessage
+                success=True,
+                responsemessage=dataresponse.responsemessage,
+                circuitbreakers=get_service_circuit_breaker_stats(
+                    service_manager.client_service
+                ),
             )
         )
     else:
@@ -171,7 +270,9 @@ async def save_vehicledata(
     # service manager should pick service e.g. SiriusXm, FCA correctly.
     service_manager = setup_service_manager(request["programcode"])
 
-    saveresponse = service_manager.client_service.save_vehicledata(request)
+    saveresponse = await run_client_call(
+        service_manager.client_service.save_vehicledata, request
+    )
     if saveresponse.status == InternalStatusType.SUCCESS:
         # For OCCAS save data, we need to return very simple HEX data response back.
         hexdata = saveresponse.hexvehicledata
@@ -240,7 +341,9 @@ async def create_agentAssignment(agentassignment_input: CreateAgentAssignmentCom
     service_manager = setup_service_manager(agentassignment.programcode)
 
     # service manager should pick service e.g. SiriusXm, FCA correctly.
-    if service_manager.client_service.assign_agent(agentassignment):
+    if await run_client_call(
+        service_manager.client_service.assign_agent, agentassignment
+    ):
         mappedresponse = CreateAgentAssignmentResponse(
             reference_id=agentassignment.response_referenceid,
             agent_assigned=agentassignment.isassigned,
@@ -304,7 +407,7 @@ async def create_terminate(terminate_input: CreateTerminateCommand):
     )
 
     service_manager = setup_service_manager(terminate.programcode)
-    if service_manager.client_service.terminate(terminate):
+    if await run_client_call(service_manager.client_service.terminate, terminate):
         mappedresponse = CreateTerminateResponse(
             reference_id=terminate.response_referenceid, status=Status.CREATED
         )
@@ -354,7 +457,9 @@ async def get_vehicledata(id: str, programcode: ProgramCode):
 
     # service manager should pick service e.g. SiriusXm, FCA correctly.
     service_manager = setup_service_manager(programcode)
-    dataresponse = service_manager.client_service.get_vehicledata(id, programcode)
+    dataresponse = await run_coalesced_client_call(
+        service_manager.client_service.get_vehicledata, id, programcode
+    )
 
     if dataresponse.status == InternalStatusType.SUCCESS:
         logger.info(
@@ -400,6 +505,97 @@ async def get_vehicledata(id: str, programcode: ProgramCode):
         raise exceptiontype(dataresponse.responsemessage)
 
 
+@base_router.get(
+    "/data/vin/{vin}",
+    response_model=JSONApiSuccessResponse[GetVehicleDataResponse],
+)
+async def getvehicledata_by_vin(vin: str):
+    """
+    Get the newest stored vehicle data of a VIN, whatever its msisdn and programcode, with one read of the VIN's identity item.
+    """
+    # imported here so pynamodb stays off the cold start import path
+    from src.services.dynamodb_identity import get_vin_item
+    from src.services.dynamodb_tables import get_main_table, handle_table_error
+
+    logger.info(
+        "GetVehicleDataByVin: Payload received for vin:{}".format(vin),
+        extra={"vin": vin, "action": "GetVehicleDataByVin"},
+    )
+    table = get_main_table(config_manager.retrieve_config(DynamoConfig))
+    try:
+        record = await run_client_call(get_vin_item, table, vin)
+    except Exception as e:
+        handle_table_error(table, e)
+        exceptiontype = handle_error_responsestatus(get_exception_status(e))
+        logger.error(
+            "GetVehicleDataByVin: Failed for vin:{} reason:{}".format(vin, e),
+            extra={
+                "vin": vin,
+                "status-code": exceptiontype().status_code,
+                "action": "GetVehicleDataByVin",
+            },
+        )
+        raise exceptiontype("Unable to read vehicle data for vin: {}".format(vin))
+
+    if record is None:
+        logger.info(
+            "GetVehicleDataByVin: No vehicle data for vin:{}".format(vin),
+            extra={"vin": vin, "action": "GetVehicleDataByVin"},
+        )
+        raise NotFoundException("No vehicle data found for vin: {}".format(vin))
+
+    logger.info(
+        "GetVehicleDataByVin: Success for vin:{} programcode:{}".format(
+            vin, record.programcode
+        ),
+        extra={
+            "vin": vin,
+            "programcode": record.programcode,
+            "action": "GetVehicleDataByVin",
+        },
+    )
+    return JSONApiSuccessResponse[GetVehicleDataResponse](
+        data=create_vin_vehicledata_response(record)
+    )
+
+
+@base_router.get(
+    "/data/msisdn/{msisdn}/programcodes",
+    response_model=JSONApiSuccessResponse[GetProgramCodesResponse],
+)
+async def getprogramcodes(msisdn: str):
+    """
+    Get the programcodes an msisdn has stored vehicle data under, with one read of the msisdn's identity item.
+    """
+    # imported here so pynamodb stays off the cold start import path
+    from src.services.dynamodb_identity import get_msisdn_programcodes
+    from src.services.dynamodb_tables import get_main_table, handle_table_error
+
+    table = get_main_table(config_manager.retrieve_config(DynamoConfig))
+    try:
+        programcodes = await run_client_call(get_msisdn_programcodes, table, msisdn)
+    except Exception as e:
+        handle_table_error(table, e)
+        exceptiontype = handle_error_responsestatus(get_exception_status(e))
+        logger.error(
+            "GetProgramCodes: Failed for msisdn:{} reason:{}".format(msisdn, e),
+            extra={
+                "msisdn": msisdn,
+                "status-code": exceptiontype().status_code,
+                "action": "GetProgramCodes",
+            },
+        )
+        raise exceptiontype(
+            "Unable to read programcodes for msisdn: {}".format(msisdn)
+        )
+
+    if not programcodes:
+        raise NotFoundException("No programcodes found for msisdn: {}".format(msisdn))
+    return JSONApiSuccessResponse[GetProgramCodesResponse](
+        data=GetProgramCodesResponse(msisdn=msisdn, programcodes=programcodes)
+    )
+
+
 @base_router.get(
     "/data/{msisdn}/programcode/{programcode}/ctsversion/{ctsversion}",
     response_model=JSONApiSuccessResponse[GetVehicleDataResponse],
@@ -426,8 +622,10 @@ async def getvehicledata(msisdn: str, programcode: ProgramCode, ctsversion: CtsV
     service_manager = setup_service_manager(
         getvehicle_input.programcode, getvehicle_input.ctsversion
     )
-    dataresponse = service_manager.client_service.get_vehicledata(
-        getvehicle_input.msisdn, getvehicle_input.programcode
+    dataresponse = await run_coalesced_client_call(
+        service_manager.client_service.get_vehicledata,
+        getvehicle_input.msisdn,
+        getvehicle_input.programcode,
     )
     if dataresponse.status == InternalStatusType.SUCCESS:
         logger.info(
@@ -442,37 +640,8 @@ async def getvehicledata(msisdn: str, programcode: ProgramCode, ctsversion: CtsV
                 "action": "GetVehicleData",
             },
         )
-        mappedresponse = GetVehicleDataResponse(
-            status=Status.SUCCESS,
-            responsemessage="Successfully retrieved",
-            header=Header(
-                msisdn=dataresponse.msisdn,
-                programcode=dataresponse.programcode,
-                version=getvehicle_input.ctsversion,
-                calldate=dataresponse.calldate,
-                calltime=dataresponse.calltime,
-                timestamp=dataresponse.timestamp,
-                odometer=dataresponse.odometer,
-                odometerscale=dataresponse.odometerscale,
-                countrycode=dataresponse.countrycode,
-            ),
-            location=Location(
-                latitude=dataresponse.latitude,
-                longitude=dataresponse.longitude,
-                headingdirection=dataresponse.headingdirection,
-            ),
-            vehicle=Vehicle(
-                vin=dataresponse.vin,
-                brand=Brand(
-                    brandname=dataresponse.brand,
-                    modelname=dataresponse.modelname,
-                    modelyear=dataresponse.modelyear,
-                    modelcode=dataresponse.modelcode,
-                    modeldesc=dataresponse.modeldesc,
-                ),
-                mileage=dataresponse.mileage,
-                mileageunit=dataresponse.mileageunit,
-            ),
+        mappedresponse = create_getvehicledata_response(
+            dataresponse, getvehicle_input.ctsversion
         )
         return JSONApiSuccessResponse[GetVehicleDataResponse](data=mappedresponse)
     else:
@@ -495,6 +664,127 @@ async def getvehicledata(msisdn: str, programcode: ProgramCode, ctsversion: CtsV
         raise exceptiontype(dataresponse.responsemessage)
 
 
+def create_getvehicledata_response(dataresponse, ctsversion) -> GetVehicleDataResponse:
+    return GetVehicleDataResponse(
+        status=Status.SUCCESS,
+        responsemessage="Successfully retrieved",
+        header=Header(
+            msisdn=dataresponse.msisdn,
+            programcode=dataresponse.programcode,
+            version=ctsversion,
+            calldate=dataresponse.calldate,
+            calltime=dataresponse.calltime,
+            timestamp=dataresponse.timestamp,
+            odometer=dataresponse.odometer,
+            odometerscale=dataresponse.odometerscale,
+            countrycode=dataresponse.countrycode,
+        ),
+        location=Location(
+            latitude=dataresponse.latitude,
+            longitude=dataresponse.longitude,
+            headingdirection=dataresponse.headingdirection,
+        ),
+        vehicle=Vehicle(
+            vin=dataresponse.vin,
+            brand=Brand(
+                brandname=dataresponse.brand,
+                modelname=dataresponse.modelname,
+                modelyear=dataresponse.modelyear,
+                modelcode=dataresponse.modelcode,
+                modeldesc=dataresponse.modeldesc,
+            ),
+            mileage=dataresponse.mileage,
+            mileageunit=dataresponse.mileageunit,
+        ),
+        dataage=getattr(dataresponse, "dataage", None),
+    )
+
+
+def create_vin_vehicledata_response(record) -> GetVehicleDataResponse:
+    # providers store their own unit names, "mi" or "Miles" say
+    for unit in ("odometerscale", "mileageunit"):
+        value = getattr(record, unit)
+        setattr(record, unit, MileageUnit(value) if value else None)
+    mappedresponse = create_getvehicledata_response(record, None)
+    mappedresponse.dataage = record_age(record)
+    return mappedresponse
+
+
+@base_router.post(
+    "/data/batch",
+    response_model=JSONApiSuccessResponse[GetVehicleDataBatchResponse],
+)
+async def getvehicledata_batch(batch_input: GetVehicleDataBatchCommand):
+    """
+    Get vehicle data for a list of msisdns with their programcode and ctsversion. Stored data is read with one BatchGetItem, live providers are called concurrently within a shared deadline, and every item gets its own status.
+    """
+    # imported here so pynamodb stays off the cold start import path
+    from src.services.batch_lookup import DEFAULT_MAX_ITEMS, lookup_vehicledata_batch
+
+    batch_config = config_manager.retrieve_config(BatchLookupConfig)
+    max_items = batch_config.max_items or DEFAULT_MAX_ITEMS
+    logger.info(
+        "GetVehicleDataBatch: Payload received for {} items".format(
+            len(batch_input.items)
+        ),
+        extra={"action": "GetVehicleDataBatch"},
+    )
+    if len(batch_input.items) > max_items:
+        raise BadRequestException(
+            "At most {} items can be looked up in one batch".format(max_items)
+        )
+
+    dataresponses = await lookup_vehicledata_batch(
+        [
+            (
+                setup_service_manager(item.programcode, item.ctsversion).client_service,
+                item.msisdn,
+                item.programcode,
+            )
+            for item in batch_input.items
+        ],
+        batch_config.deadline,
+    )
+
+    items = []
+    for item, dataresponse in zip(batch_input.items, dataresponses):
+        if dataresponse.status == InternalStatusType.SUCCESS:
+            items.append(
+                GetVehicleDataBatchItem(
+                    msisdn=item.msisdn,
+                    programcode=item.programcode,
+                    version=item.ctsversion,
+                    status=Status.SUCCESS,
+                    responsemessage="Successfully retrieved",
+                    data=create_getvehicledata_response(dataresponse, item.ctsversion),
+                )
+            )
+        else:
+            items.append(
+                GetVehicleDataBatchItem(
+                    msisdn=item.msisdn,
+                    programcode=item.programcode,
+                    version=item.ctsversion,
+                    status=batch_item_status(dataresponse.status),
+                    responsemessage=dataresponse.responsemessage,
+                )
+            )
+
+    logger.info(
+        "GetVehicleDataBatch: Completed {} items, {} succeeded".format(
+            len(items), sum(1 for item in items if item.status == Status.SUCCESS)
+        ),
+        extra={"action": "GetVehicleDataBatch"},
+    )
+    return JSONApiSuccessResponse[GetVehicleDataBatchResponse](
+        data=GetVehicleDataBatchResponse(items=items)
+    )
+
+
+def batch_item_status(responsestatus) -> Status:
+    return Status(str(handle_error_responsestatus(responsestatus)().status_code))
+
+
 @base_router.post(
     "/terminate/{msisdn}/programcode/{programcode}/ctsversion/{ctsversion}",
     response_model=JSONApiSuccessResponse[CreateTerminateResponse],
@@ -521,8 +811,8 @@ async def terminate(
     )
 
     service_manager = setup_service_manager(programcode, ctsversion)
-    dataresponse = service_manager.client_service.terminate(
-        msisdn, programcode, request
+    dataresponse = await run_client_call(
+        service_manager.client_service.terminate, msisdn, programcode, request
     )
     if dataresponse.status == InternalStatusType.SUCCESS:
         mappedresponse = CreateTerminateResponse(msisdn=msisdn, status=Status.CREATED)
@@ -565,10 +855,12 @@ async def save_vehicledata(
     msisdn: str,
     programcode: ProgramCode,
     ctsversion: CtsVersion,
+    response: Response,
     request: dict = Body(...),
 ):
     """
     Save_VehicleData msisdn with ctsversion picks a service based on client telematics version and saves the vehicle data.
+    With the provider's ingestion queue enabled the data is validated and queued, and the response is 202.
     """
     logger.info(
         "SaveVehicleData: Payload received for msisdn:{} data:{}".format(
@@ -583,14 +875,24 @@ async def save_vehicledata(
     )
 
     service_manager = setup_service_manager(programcode, ctsversion)
+    # imported here so pynamodb stays off the cold start import path
+    from src.services.ingestion import ingestion_enabled
+
+    client_service = service_manager.client_service
+    queued = ingestion_enabled(client_service)
 
-    saveresponse = service_manager.client_service.save_vehicledata(
-        msisdn, programcode, request
+    saveresponse = await run_client_call(
+        client_service.queue_vehicledata if queued else client_service.save_vehicledata,
+        msisdn,
+        programcode,
+        request,
     )
     if saveresponse.status == InternalStatusType.SUCCESS:
+        if queued:
+            response.status_code = HTTP_202_ACCEPTED
         mappedresponse = CreateSaveVehicleDataResponse(
             msisdn=msisdn,
-            status=Status.CREATED,
+            status=Status.ACCEPTED if queued else Status.CREATED,
             responsemessage=saveresponse.responsemessage,
         )
         logger.info(
@@ -620,9 +922,10 @@ async def save_vehicledata(
 @base_router.post(
     "/vehicleinfo", response_model=JSONApiSuccessResponse[CreateSaveVehicleDataResponse]
 )
-async def save_vehicleinfo(request: dict = Body(...)):
+async def save_vehicleinfo(response: Response, request: dict = Body(...)):
     """
     Save_VehicleData for PORSCHE picks vodafone service based on extracted msisdn and client telematics version from the payload, and saves the vehicle data.
+    With the ingestion queue enabled for vodafone the data is validated and queued, and the response is 202.
     """
     if (
         "userData" not in request
@@ -643,6 +946,8 @@ async def save_vehicleinfo(request: dict = Body(...)):
         ctsversion=CtsVersion.ONE_DOT_ZERO,
     )
 
+    from src.vodafone.services.vodafone_service import reformat_msisdn
+
     getvehicle_input.msisdn = reformat_msisdn(getvehicle_input.msisdn)
 
     logger.info(
@@ -661,13 +966,24 @@ async def save_vehicleinfo(request: dict = Body(...)):
         getvehicle_input.programcode, getvehicle_input.ctsversion
     )
 
-    saveresponse = service_manager.client_service.save_vehicledata(
-        getvehicle_input.msisdn, getvehicle_input.programcode, request
+    # imported here so pynamodb stays off the cold start import path
+    from src.services.ingestion import ingestion_enabled
+
+    client_service = service_manager.client_service
+    queued = ingestion_enabled(client_service)
+
+    saveresponse = await run_client_call(
+        client_service.queue_vehicledata if queued else client_service.save_vehicledata,
+        getvehicle_input.msisdn,
+        getvehicle_input.programcode,
+        request,
     )
     if saveresponse.status == InternalStatusType.SUCCESS:
+        if queued:
+            response.status_code = HTTP_202_ACCEPTED
         mappedresponse = CreateSaveVehicleDataResponse(
             msisdn=getvehicle_input.msisdn,
-            status=Status.SUCCESS,
+            status=Status.ACCEPTED if queued else Status.SUCCESS,
             responsemessage=saveresponse.responsemessage,
         )
         logger.info(
@@ -721,8 +1037,8 @@ async def getvehicleinfo(phonecontact:str):
     service_manager = setup_service_manager(
         getvehicle_input.programcode, getvehicle_input.ctsversion
     )
-    dataresponse = service_manager.client_service.get_vehicleinfo(
-        getvehicle_input.msisdn
+    dataresponse = await run_client_call(
+        service_manager.client_service.get_vehicleinfo, getvehicle_input.msisdn
     )
     if dataresponse.status == InternalStatusType.SUCCESS:
         logger.info(
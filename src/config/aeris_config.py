@@ -1,10 +1,28 @@
-from typing import Optional
+from typing import Dict, Optional
 from agero_python_configuration import BaseConfig
 
 
 class AerisConfig(BaseConfig):
     base_url: Optional[str]
     root_cert: Optional[str]
+    pool_size: Optional[int]
     dynamo_table_name: Optional[str]
     dynamodb_check_enable: Optional[bool]
-    dynamodb_check_timelimit: Optional[int]
\ No newline at end of file
+    dynamodb_check_timelimit: Optional[int]
+    dynamodb_latest_item: Optional[bool]
+    write_behind_enable: Optional[bool]
+    connect_timeout: Optional[float]
+    read_timeout: Optional[float]
+    circuit_breaker_enable: Optional[bool]
+    circuit_breaker_failure_rate: Optional[float]
+    circuit_breaker_slow_call_seconds: Optional[float]
+    circuit_breaker_slow_call_rate: Optional[float]
+    circuit_breaker_minimum_calls: Optional[int]
+    circuit_breaker_window_seconds: Optional[float]
+    circuit_breaker_open_seconds: Optional[float]
+    circuit_breaker_half_open_probes: Optional[int]
+    stale_fallback_enable: Optional[bool]
+    stale_fallback_max_age: Optional[int]
+    stale_fallback_max_age_by_programcode: Optional[Dict[str, int]]
+    stale_fallback_latency_budget: Optional[float]
+    stale_fallback_refresh_wait: Optional[float]
@@ -0,0 +1,7 @@
+from typing import Optional
+
+from agero_python_configuration import BaseConfig
+
+
+class ApiGatewayConfig(BaseConfig):
+    timeout: Optional[float]
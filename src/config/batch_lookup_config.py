@@ -0,0 +1,8 @@
+from typing import Optional
+
+from agero_python_configuration import BaseConfig
+
+
+class BatchLookupConfig(BaseConfig):
+    max_items: Optional[int]
+    deadline: Optional[float]
@@ -2,9 +2,12 @@ from os import getenv
 
 from agero_python_configuration import ConfigManager
 from src.config.aeris_config import AerisConfig
+from src.config.api_gateway_config import ApiGatewayConfig
+from src.config.batch_lookup_config import BatchLookupConfig
 from src.config.dynamo_config import DynamoConfig
 from src.config.echo_config import EchoConfig
 from src.config.fca_config import FcaConfig
+from src.config.ingestion_config import IngestionConfig
 from src.config.logger_config import LoggerConfig
 from src.config.siriusxm_config import SiriusXmConfig
 from src.config.tmna_config import TmnaConfig
@@ -18,6 +21,9 @@ def setup_config_manager() -> ConfigManager:
     config_manager.register_config(config_class=LoggerConfig, key="logging")
     config_manager.register_config(config_class=EchoConfig, key="echo")
     config_manager.register_config(config_class=DynamoConfig, key="dynamo")
+    config_manager.register_config(config_class=IngestionConfig, key="ingestion")
+    config_manager.register_config(config_class=BatchLookupConfig, key="batch_lookup")
+    config_manager.register_config(config_class=ApiGatewayConfig, key="api_gateway")
     config_manager.register_config(config_class=SiriusXmConfig, key="siriusxm")
     config_manager.register_config(config_class=VerizonConfig, key="verizon")
     config_manager.register_config(config_class=FcaConfig, key="fca")
@@ -7,3 +7,6 @@ class DynamoConfig(BaseConfig):
     table_name: Optional[str]
     supplement_table_name: Optional[str]
     endpoint: Optional[str]
+    connect_timeout: Optional[float]
+    read_timeout: Optional[float]
+    max_retry_attempts: Optional[int]
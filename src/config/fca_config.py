@@ -16,9 +16,30 @@ class FcaConfig(BaseConfig):
     terminate_bcall_url: Optional[str]
     max_retries: Optional[int]
     delay_for_each_retry: Optional[int]
+    retry_initial_delay: Optional[float]
+    retry_jitter: Optional[float]
+    retry_fast_polls: Optional[int]
+    retry_fast_poll_delay: Optional[float]
+    retry_deadline_margin: Optional[float]
+    bcall_lease_seconds: Optional[float]
+    data_arrival_probe_interval: Optional[float]
     max_ani_length: Optional[int]
     api_gateway_base_path: Optional[str]
     root_cert: Optional[str]
+    pool_size: Optional[int]
+    dynamodb_cache_ttl: Optional[int]
+    dynamodb_latest_item: Optional[bool]
+    ingestion_queue_enable: Optional[bool]
+    connect_timeout: Optional[float]
+    read_timeout: Optional[float]
+    circuit_breaker_enable: Optional[bool]
+    circuit_breaker_failure_rate: Optional[float]
+    circuit_breaker_slow_call_seconds: Optional[float]
+    circuit_breaker_slow_call_rate: Optional[float]
+    circuit_breaker_minimum_calls: Optional[int]
+    circuit_breaker_window_seconds: Optional[float]
+    circuit_breaker_open_seconds: Optional[float]
+    circuit_breaker_half_open_probes: Optional[int]
 
     @validator("api_key")
     def populate_raw_api_key_if_not_present(cls, v, values):
@@ -0,0 +1,9 @@
+from typing import Optional
+
+from agero_python_configuration import BaseConfig
+
+
+class IngestionConfig(BaseConfig):
+    queue_url: Optional[str]
+    endpoint: Optional[str]
+    batch_size: Optional[int]
@@ -10,4 +10,10 @@ class SiriusXmConfig(BaseConfig):
     api_key: Optional[str]
     raw_apikey: Optional[str]
     root_cert: Optional[str]
+    pool_size: Optional[int]
     wsdl: Optional[str]
+    dynamodb_cache_ttl: Optional[int]
+    dynamodb_latest_item: Optional[bool]
+    connect_timeout: Optional[float]
+    read_timeout: Optional[float]
+    soap_fast_path: Optional[bool]
@@ -5,4 +5,7 @@ from agero_python_configuration import BaseConfig
 class TmnaConfig(BaseConfig):
     base_url: Optional[str]
     terminate_url: Optional[str]
-    root_cert: Optional[str]
\ No newline at end of file
+    root_cert: Optional[str]
+    pool_size: Optional[int]
+    connect_timeout: Optional[float]
+    read_timeout: Optional[float]
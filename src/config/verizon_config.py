@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, Optional
 
 from agero_python_configuration import BaseConfig
 
@@ -9,11 +9,30 @@ from agero_python_configuration import BaseConfig
 class VerizonConfig(BaseConfig):
     base_url: Optional[str]
     root_cert: Optional[str]
+    pool_size: Optional[int]
     wsdl: Optional[str]
     dynamo_table_name: Optional[str]
     dynamo_supplement_table_name: Optional[str]
     dynamodb_check_enable: Optional[bool]
     dynamodb_check_timelimit: Optional[int]
+    dynamodb_latest_item: Optional[bool]
+    write_behind_enable: Optional[bool]
+    connect_timeout: Optional[float]
+    read_timeout: Optional[float]
+    circuit_breaker_enable: Optional[bool]
+    circuit_breaker_failure_rate: Optional[float]
+    circuit_breaker_slow_call_seconds: Optional[float]
+    circuit_breaker_slow_call_rate: Optional[float]
+    circuit_breaker_minimum_calls: Optional[int]
+    circuit_breaker_window_seconds: Optional[float]
+    circuit_breaker_open_seconds: Optional[float]
+    circuit_breaker_half_open_probes: Optional[int]
+    stale_fallback_enable: Optional[bool]
+    stale_fallback_max_age: Optional[int]
+    stale_fallback_max_age_by_programcode: Optional[Dict[str, int]]
+    stale_fallback_latency_budget: Optional[float]
+    stale_fallback_refresh_wait: Optional[float]
+    soap_fast_path: Optional[bool]
 
     # @validator("api_key")
     # def populate_raw_api_key_if_not_present(cls, v, values):
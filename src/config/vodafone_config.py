@@ -4,4 +4,7 @@ from agero_python_configuration import BaseConfig
 
 class VodafoneConfig(BaseConfig):
     dynamo_table_name: Optional[str]
-    dynamo_supplement_table_name: Optional[str]
\ No newline at end of file
+    dynamo_supplement_table_name: Optional[str]
+    dynamodb_cache_ttl: Optional[int]
+    dynamodb_latest_item: Optional[bool]
+    ingestion_queue_enable: Optional[bool]
@@ -1,8 +1,8 @@
 import logging
-from time import sleep
+from time import monotonic
+from functools import partial
 from typing import Type
 
-import requests
 from requests.models import Response
 from src.config.fca_config import FcaConfig
 from src.fca.models.data.vehicle_data import VehicleData
@@ -14,21 +14,63 @@ from src.models.enums.callstatus_type import CallStatus
 from src.models.enums.ctsversion_type import CtsVersion
 from src.models.enums.programcode_type import ProgramCode
 from src.models.enums.status_type import Status
+from src.services.circuit_breaker import (
+    call_through,
+    get_circuit_breaker,
+    is_server_error,
+)
 from src.services.client_service import ClientService
+from src.services.dynamodb_batch import batch_save
+from src.services.data_arrival import publish_data_arrival, subscribe_data_arrival
+from src.services.dynamodb_lease import acquire_lease, new_lease_owner, release_lease
+from src.services.httphandlers.http_handler import get_http_session, request_timeout
+from src.services.ingestion import send_vehicledata_rows
+from src.services.dynamodb_identity import save_record_items
+from src.services.dynamodb_latest import (
+    get_latest_item,
+    get_newest_event_datetime,
+    latest_item_enabled,
+)
+from src.services.dynamodb_projections import attributes_to_get, projection
 from src.services.dynamodb_tables import (
     ConnectedVehicleSupplementTable,
     ConnectedVehicleTable,
+    handle_table_error,
 )
+from src.services.retry_policy import RetryPolicy
+from src.services.vehicledata_cache import cache_vehicledata, find_latest_vehicledata
 from src.utilities.extensions.datetime_extension import (
     convert_epoch_to_utc_timestamp,
     get_utc_epoch,
 )
 from src.utilities.extensions.json_extension import checkjsonnode, seterrorjson
 from src.utilities.extensions.string_extension import isnull_whitespaceorempty
-from starlette.status import HTTP_200_OK, HTTP_202_ACCEPTED
+from src.utilities.errorhandlers.error_responsestatus import get_exception_status
+from starlette.status import (
+    HTTP_200_OK,
+    HTTP_202_ACCEPTED,
+    HTTP_503_SERVICE_UNAVAILABLE,
+)
 
 logger = logging.getLogger(__name__)
 
+# Attributes create_vehicledata_response maps into the response
+VEHICLEDATA_ATTRIBUTES = projection(
+    "timestamp",
+    "countrycode",
+    "odometer",
+    "odometerscale",
+    "latitude",
+    "longitude",
+    "headingdirection",
+    "vin",
+    "brand",
+    "modelname",
+    "modelyear",
+    "modelcode",
+    "modeldesc",
+)
+
 
 class FcaService(ClientService):
     def __init__(
@@ -42,6 +84,10 @@ class FcaService(ClientService):
         self._Table = table
         self._SupplementTable = supplementtable
 
+    @property
+    def circuit_breaker(self):
+        return get_circuit_breaker("fca", self._config)
+
     def get_vehicledata(self, msisdn: str, programcode: ProgramCode):
         try:
             msisdn = reformat_msisdn(msisdn, self._config.max_ani_length)
@@ -94,10 +140,15 @@ class FcaService(ClientService):
                 )
                 if dataresponse is not None:
                     return dataresponse
-                if (
-                    response.status_code == HTTP_200_OK
-                    or response.status_code == HTTP_202_ACCEPTED
-                ) and validjsonresponse:
+                if response is None or (
+                    (
+                        response.status_code == HTTP_200_OK
+                        or response.status_code == HTTP_202_ACCEPTED
+                    )
+                    and validjsonresponse
+                ):
+                    # response is None when another caller held the bcall
+                    # lease for the whole lookup and its push never arrived
                     self._logger.error(
                         "GetVehicleData: Request BCall Data Successful, but no record found from database for msisdn:{} status:{} programcode:{}".format(
                             msisdn, Status.NOT_FOUND, programcode
@@ -181,10 +232,30 @@ class FcaService(ClientService):
                 },
             )
             return VehicleData(
-                status=InternalStatusType.INTERNALSERVERERROR,
+                status=get_exception_status(e),
                 responsemessage=e.args[0] if e.args.__len__() > 0 else None,
             )
 
+    def latest_item_lookup(self, msisdn: str, programcode: ProgramCode):
+        """
+        Table, request_key and projection of msisdn's latest item, so batch
+        lookups can read it along with others. None when lookups don't read
+        latest items.
+        """
+        if not self._config.dynamodb_latest_item:
+            return None
+        msisdn = reformat_msisdn(msisdn, self._config.max_ani_length)
+        return self._Table, programcode + "-" + msisdn, VEHICLEDATA_ATTRIBUTES
+
+    def vehicledata_from_item(self, msisdn: str, programcode: ProgramCode, item):
+        return create_vehicledata_response(
+            item,
+            reformat_msisdn(msisdn, self._config.max_ani_length),
+            programcode,
+            InternalStatusType.SUCCESS,
+            "Successfully retrieved",
+        )
+
     def terminate(self, msisdn: str, programcode: ProgramCode, payload):
         if (
             payload is None
@@ -232,11 +303,13 @@ class FcaService(ClientService):
                 "content-type": "application/json",
                 "APIKey": self._config.raw_api_key,
             }
-            response = requests.post(
+            response = get_http_session(
+                "fca", self._config.root_cert, self._config.pool_size
+            ).post(
                 serviceurl,
                 headers=headers,
                 json=requestbody,
-                verify=self._config.root_cert,
+                timeout=request_timeout(self._config),
             )
             validjsonresponse = (
                 response.headers.get("content-type") is not None
@@ -334,12 +407,13 @@ class FcaService(ClientService):
 
             return Terminate(
                 msisdn=msisdn,
-                status=InternalStatusType.INTERNALSERVERERROR,
+                status=get_exception_status(e),
                 responsemessage=e.args[0] if e.args.__len__() > 0 else None,
                 callstatus=callstatus,
             )
 
-    def save_vehicledata(self, msisdn, programcode, savevehicledata):
+    def validate_vehicledata(self, msisdn, programcode, savevehicledata):
+        # the error response for a payload that can't be saved, None if it can
         if (
             savevehicledata is None
             or checkjsonnode("Data", savevehicledata) == False
@@ -373,6 +447,12 @@ class FcaService(ClientService):
                     msisdn
                 ),
             )
+        return None
+
+    def save_vehicledata(self, msisdn, programcode, savevehicledata):
+        invalid = self.validate_vehicledata(msisdn, programcode, savevehicledata)
+        if invalid is not None:
+            return invalid
 
         try:
             self._logger.info(
@@ -398,7 +478,19 @@ class FcaService(ClientService):
             vehicle_table = map_primarytable(
                 msisdn, programcode, vehicledata, custom_extension, self._Table
             )
-            vehicle_table.save()
+            vehicle_supplementtable = map_supplementrow(
+                self, msisdn, programcode, vehicledata, custom_extension
+            )
+            # both rows in one BatchWriteItem, a row it couldn't write is
+            # saved on its own below
+            unsaved = batch_save(vehicle_table, vehicle_supplementtable)
+            if vehicle_table in unsaved:
+                vehicle_table.save()
+            save_record_items(
+                self._Table, vehicle_table, latest_item_enabled(self._config)
+            )
+            cache_vehicledata(self._config, vehicle_table)
+            publish_data_arrival(vehicle_table.request_key)
             self._logger.info(
                 "SaveVehicleData: Successfully saved Vehicle data onto main table {} for msisdn: {}".format(
                     vehicledata, msisdn
@@ -411,7 +503,13 @@ class FcaService(ClientService):
             )
 
             save_supplementdata(
-                self, msisdn, programcode, vehicledata, custom_extension
+                self,
+                msisdn,
+                programcode,
+                vehicledata,
+                custom_extension,
+                saved=vehicle_supplementtable is not None
+                and vehicle_supplementtable not in unsaved,
             )
 
             return VehicleData(
@@ -422,6 +520,7 @@ class FcaService(ClientService):
                 ),
             )
         except Exception as e:
+            handle_table_error(self._Table, e)
             self._logger.error(
                 "SaveVehicleData: Error occured while saving vehicledata onto primary table: {} for msisdn: {}".format(
                     e, msisdn
@@ -443,6 +542,87 @@ class FcaService(ClientService):
                 ),
             )
 
+    def queue_vehicledata(self, msisdn, programcode, savevehicledata):
+        """
+        Validates and maps a push like save_vehicledata, then hands the rows to
+        the ingestion queue instead of writing them
+        """
+        invalid = self.validate_vehicledata(msisdn, programcode, savevehicledata)
+        if invalid is not None:
+            return invalid
+
+        rows = self.map_vehicledata_rows(msisdn, programcode, savevehicledata)
+        if rows is None:
+            return VehicleData(
+                msisdn=msisdn,
+                status=InternalStatusType.BADREQUEST,
+                responsemessage="SaveVehicleData: Json payload is invalid for msisdn: {}".format(
+                    msisdn
+                ),
+            )
+
+        try:
+            send_vehicledata_rows(
+                msisdn,
+                programcode,
+                CtsVersion.ONE_DOT_ZERO,
+                *rows,
+                latest_item=latest_item_enabled(self._config),
+            )
+        except Exception as e:
+            self._logger.error(
+                "SaveVehicleData: Unable to queue the vehicledata: {} for msisdn: {}".format(
+                    e, msisdn
+                ),
+                exc_info=True,
+                stack_info=True,
+                extra={
+                    "programcode": programcode,
+                    "cts-version": CtsVersion.ONE_DOT_ZERO,
+                    "payload": savevehicledata,
+                    "action": "SaveVehicleData",
+                },
+            )
+            return VehicleData(
+                msisdn=msisdn,
+                status=InternalStatusType.INTERNALSERVERERROR,
+                responsemessage="Unable to queue the vehicledata for msisdn: {}".format(
+                    msisdn
+                ),
+            )
+
+        self._logger.info(
+            "SaveVehicleData: Queued Vehicle data for msisdn: {}".format(msisdn),
+            extra={
+                "programcode": programcode,
+                "cts-version": CtsVersion.ONE_DOT_ZERO,
+                "action": "SaveVehicleData",
+            },
+        )
+        return VehicleData(
+            msisdn=msisdn,
+            status=InternalStatusType.SUCCESS,
+            responsemessage="Queued the vehicledata for msisdn: {}".format(msisdn),
+        )
+
+    def map_vehicledata_rows(self, msisdn, programcode, savevehicledata):
+        # main and supplement table rows, None when the payload doesn't parse
+        vehicledata = self.populate_vehicledata(msisdn, programcode, savevehicledata)
+        if vehicledata is None:
+            return None
+        if vehicledata.Data.customExtension.vehicleInfo is None:
+            custom_extension = vehicledata.Data.customExtension.vehicleDataUpload
+        else:
+            custom_extension = vehicledata.Data.customExtension
+        return (
+            map_primarytable(
+                msisdn, programcode, vehicledata, custom_extension, self._Table
+            ),
+            map_supplementrow(
+                self, msisdn, programcode, vehicledata, custom_extension
+            ),
+        )
+
     def populate_vehicledata(self, msisdn, programcode, data):
         try:
             vehicle_data = VehicleDataRequest(**data)
@@ -469,23 +649,52 @@ class FcaService(ClientService):
         raise NotImplementedError
 
 
-def get_vehicledata_response(self, msisdn: str, programcode: ProgramCode):
+def get_vehicledata_response(
+    self, msisdn: str, programcode: ProgramCode, consistent_read=False
+):
     try:
         if msisdn:
             # Query for Items Matching a Partition/Sort Key in descending order
-            for dataresponse in self._Table.query(
-                programcode + "-" + msisdn,
-                self._Table.msisdn == msisdn,
-                scan_index_forward=False,
-                limit=1,
-            ):
+            def query():
+                return self._Table.query(
+                    programcode + "-" + msisdn,
+                    self._Table.msisdn == msisdn,
+                    scan_index_forward=False,
+                    consistent_read=consistent_read,
+                    limit=1,
+                    attributes_to_get=attributes_to_get(VEHICLEDATA_ATTRIBUTES),
+                )
+
+            if consistent_read:
+                # polling for a push must not be answered from the cache
+                dataresponse = (
+                    get_latest_item(
+                        self._Table,
+                        programcode + "-" + msisdn,
+                        VEHICLEDATA_ATTRIBUTES,
+                    )
+                    if self._config.dynamodb_latest_item
+                    else next(iter(query()), None)
+                )
                 if dataresponse:
+                    cache_vehicledata(
+                        self._config,
+                        dataresponse,
+                        programcode + "-" + msisdn,
+                        VEHICLEDATA_ATTRIBUTES,
+                    )
                     return dataresponse
-                else:
-                    return None
-            return None
+                return None
+            return find_latest_vehicledata(
+                self._config,
+                self._Table,
+                programcode + "-" + msisdn,
+                query,
+                attributes=VEHICLEDATA_ATTRIBUTES,
+            )
         return None
     except Exception as e:
+        handle_table_error(self._Table, e)
         self._logger.info(
             "GetVehicleData: Error retrieving data from DynamoDB for msisdn:{} e:{}".format(
                 msisdn, e
@@ -539,8 +748,16 @@ def request_bcall_data(self, msisdn, programcode: ProgramCode, payload, action):
             "content-type": "application/json",
             "APIKey": self._config.raw_api_key,
         }
-        response = requests.post(
-            serviceurl, headers=headers, json=payload, verify=self._config.root_cert
+        response = call_through(
+            self.circuit_breaker,
+            get_http_session(
+                "fca", self._config.root_cert, self._config.pool_size
+            ).post,
+            serviceurl,
+            headers=headers,
+            json=payload,
+            timeout=request_timeout(self._config),
+            failed=is_server_error,
         )
         self._logger.info(
             "GetVehicleData: FCA returned {} for the msisdn: {} .".format(
@@ -566,15 +783,26 @@ def request_bcall_data(self, msisdn, programcode: ProgramCode, payload, action):
                 "action": action,
             },
         )
-        errorresponse = Response()
-        errorresponse.headers = {"content-type": "text/plain"}
-        errorresponse.status_code = 500
-        errormessage = "Exception calling fca bcall endpoint for msisdn: {}".format(
-            msisdn
+        return create_bcall_errorresponse(
+            get_exception_status(ex),
+            "Exception calling fca bcall endpoint for msisdn: {}".format(msisdn),
         )
-        errorresponse._content = errormessage.encode("ASCII")
+
+
+def create_bcall_errorresponse(errorstatus, errormessage) -> Response:
+    errorresponse = Response()
+    errorresponse.headers = {"content-type": "text/plain"}
+    errorresponse._content = errormessage.encode("ASCII")
+    if errorstatus == InternalStatusType.GATEWAYTIMEOUT:
+        errorresponse.status_code = 504
+        errorresponse.reason = "Gateway Timeout"
+    elif errorstatus == InternalStatusType.SERVICEUNAVAILABLE:
+        errorresponse.status_code = 503
+        errorresponse.reason = "Service Unavailable"
+    else:
+        errorresponse.status_code = 500
         errorresponse.reason = "Internal Server Error"
-        return errorresponse
+    return errorresponse
 
 
 def retrial_request_bcall_get_vehicledata(
@@ -583,64 +811,202 @@ def retrial_request_bcall_get_vehicledata(
     validjsonresponse = None
     dataresponse = None
     response = None
-    for i in range(self._config.max_retries):
-        self._logger.info(
-            "GetVehicleData: Requesting BCALL Data for msisdn {}. Retry attempt :: {}".format(
-                msisdn, i
-            ),
-            extra={
-                "msisdn": msisdn,
-                "programcode": programcode,
-                "cts-version": CtsVersion.ONE_DOT_ZERO,
-                "action": action,
-            },
-        )
-        # Requesting FCA External telematics BCALL to push data to us for the requested msisdn
-        response = request_bcall_data(self, msisdn, programcode, payload, action)
+    responsejson = None
+    accepted = False
+    unavailable = False
+    bcall_requests = 0
+    last_bcall_request = None
+    policy = create_retry_policy(self._config)
+    request_key = programcode + "-" + msisdn
+    lease_owner = new_lease_owner()
+    lease_held = False
+    # Subscribe before requesting the BCALL so a push saved while we are still
+    # querying wakes us up instead of being missed. Saves by this instance wake
+    # us at once, saves by another instance within data_arrival_probe_interval.
+    with subscribe_data_arrival(
+        request_key,
+        partial(
+            get_newest_event_datetime,
+            self._Table,
+            request_key,
+            latest_item_enabled(self._config),
+        ),
+        self._config.data_arrival_probe_interval,
+    ) as arrival:
+        try:
+            wait = policy.next_wait()
+            while wait is not None:
+                # Returns as soon as the pushed data is saved, here or by another
+                # instance. Without a probe the consistent re-query finds it.
+                waited = monotonic()
+                arrived = arrival.wait(wait) if wait > 0 else False
+                attempt = policy.start_attempt(monotonic() - waited)
 
-        validjsonresponse = (
-            response.headers.get("content-type") is not None
-            and "json" in response.headers.get("content-type").lower()
-        )
-        if (
-            response.status_code == HTTP_200_OK
-            or response.status_code == HTTP_202_ACCEPTED
-        ) and validjsonresponse:
-            responsejson = response.json()
-            # After successful request for FCA External telematics BCALL to push data to us and
-            # Data push call from FCA calls Save Vehicle data endpoint
-            # to save data in database so we search here again in database to look for data.
-            db_response = get_vehicledata_response(self, msisdn, programcode)
-            if db_response is not None:
-                responsemessage = (
-                    responsejson["message"]
-                    if checkjsonnode("message", responsejson)
-                    else "Successfully retrieved"
-                )
-                dataresponse = create_vehicledata_response(
-                    db_response,
-                    msisdn,
-                    programcode,
-                    InternalStatusType.SUCCESS,
-                    responsemessage,
-                )
-                self._logger.info(
-                    "GetVehicleData: Received BCALL Data from FCA from msisdn {} in Retry attempt :: {}".format(
-                        msisdn, i
-                    ),
-                    extra={
-                        "msisdn": msisdn,
-                        "programcode": programcode,
-                        "cts-version": CtsVersion.ONE_DOT_ZERO,
-                        "action": action,
-                    },
+                if not arrived and (
+                    bcall_requests < self._config.max_retries
+                    and (
+                        not accepted
+                        or monotonic() - last_bcall_request
+                        >= self._config.delay_for_each_retry
+                    )
+                ):
+                    # Only the lease holder asks FCA to push, concurrent lookups
+                    # of the same msisdn on any instance wait for that push.
+                    if acquire_lease(
+                        self._Table,
+                        request_key,
+                        lease_owner,
+                        self._config.bcall_lease_seconds
+                        or self._config.delay_for_each_retry,
+                    ):
+                        lease_held = True
+                        self._logger.info(
+                            "GetVehicleData: Requesting BCALL Data for msisdn {}. Retry attempt :: {}".format(
+                                msisdn, bcall_requests
+                            ),
+                            extra={
+                                "msisdn": msisdn,
+                                "programcode": programcode,
+                                "cts-version": CtsVersion.ONE_DOT_ZERO,
+                                "action": action,
+                            },
+                        )
+                        # Requesting FCA External telematics BCALL to push data to us for the requested msisdn
+                        response = request_bcall_data(
+                            self, msisdn, programcode, payload, action
+                        )
+                        bcall_requests += 1
+                        last_bcall_request = monotonic()
+                        attempt.requested = True
+
+                        validjsonresponse = (
+                            response.headers.get("content-type") is not None
+                            and "json" in response.headers.get("content-type").lower()
+                        )
+                        accepted = (
+                            response.status_code == HTTP_200_OK
+                            or response.status_code == HTTP_202_ACCEPTED
+                        ) and validjsonresponse
+                        responsejson = response.json() if accepted else None
+                        # the fca circuit is open or FCA itself is down, more
+                        # bcall requests would only add to the load
+                        unavailable = (
+                            response.status_code == HTTP_503_SERVICE_UNAVAILABLE
+                        )
+                    else:
+                        self._logger.info(
+                            "GetVehicleData: BCALL Data for msisdn {} already requested by another caller, waiting for it".format(
+                                msisdn
+                            ),
+                            extra={
+                                "msisdn": msisdn,
+                                "programcode": programcode,
+                                "cts-version": CtsVersion.ONE_DOT_ZERO,
+                                "action": action,
+                            },
+                        )
+                        # The holder's request counts against our retries too, so
+                        # we only take over once its lease has expired.
+                        bcall_requests += 1
+                        last_bcall_request = monotonic()
+                        accepted = True
+
+                if accepted or arrived:
+                    # After successful request for FCA External telematics BCALL to push data to us and
+                    # Data push call from FCA calls Save Vehicle data endpoint
+                    # to save data in database so we search here again in database to look for data.
+                    dataresponse = find_bcall_vehicledata(
+                        self, msisdn, programcode, responsejson, action, attempt.attempt
+                    )
+                policy.finish_attempt(attempt, dataresponse is not None)
+                if dataresponse is not None:
+                    break
+                if not accepted and (
+                    unavailable or bcall_requests >= self._config.max_retries
+                ):
+                    break
+                # The fast polls are for re-querying after an accepted bcall,
+                # a failed one is requested again at the old spacing.
+                wait = policy.next_wait(
+                    self._config.delay_for_each_retry
+                    if attempt.requested and not accepted
+                    else 0.0
                 )
-                break
+        finally:
+            if lease_held:
+                release_lease(self._Table, request_key, lease_owner)
 
-        sleep(self._config.delay_for_each_retry)
+    if not policy.attempts:
+        # not a single attempt fit in the request's remaining time
+        response = create_bcall_errorresponse(
+            InternalStatusType.GATEWAYTIMEOUT,
+            "No time left to request fca bcall data for msisdn: {}".format(msisdn),
+        )
+
+    self._logger.info(
+        "GetVehicleData: BCALL Data lookup for msisdn {} took {} ms over {} attempts, found: {}".format(
+            msisdn, policy.elapsed_ms(), len(policy.attempts), dataresponse is not None
+        ),
+        extra={
+            "msisdn": msisdn,
+            "programcode": programcode,
+            "cts-version": CtsVersion.ONE_DOT_ZERO,
+            "action": action,
+            "attempts": policy.timings(),
+        },
+    )
     return response, validjsonresponse, dataresponse
 
 
+def create_retry_policy(config: FcaConfig) -> RetryPolicy:
+    # The old fixed schedule waited delay_for_each_retry after each of the
+    # max_retries bcall requests, which stays the upper bound here.
+    overrides = {
+        "initial_delay": config.retry_initial_delay,
+        "jitter": config.retry_jitter,
+        "fast_polls": config.retry_fast_polls,
+        "fast_poll_delay": config.retry_fast_poll_delay,
+        "deadline_margin": config.retry_deadline_margin,
+    }
+    return RetryPolicy(
+        max_wait=config.max_retries * config.delay_for_each_retry,
+        max_delay=config.delay_for_each_retry,
+        **{name: value for name, value in overrides.items() if value is not None}
+    )
+
+
+def find_bcall_vehicledata(self, msisdn, programcode, responsejson, action, attempt):
+    db_response = get_vehicledata_response(
+        self, msisdn, programcode, consistent_read=True
+    )
+    if db_response is None:
+        return None
+
+    responsemessage = (
+        responsejson["message"]
+        if responsejson is not None and checkjsonnode("message", responsejson)
+        else "Successfully retrieved"
+    )
+    self._logger.info(
+        "GetVehicleData: Received BCALL Data from FCA from msisdn {} in Retry attempt :: {}".format(
+            msisdn, attempt
+        ),
+        extra={
+            "msisdn": msisdn,
+            "programcode": programcode,
+            "cts-version": CtsVersion.ONE_DOT_ZERO,
+            "action": action,
+        },
+    )
+    return create_vehicledata_response(
+        db_response,
+        msisdn,
+        programcode,
+        InternalStatusType.SUCCESS,
+        responsemessage,
+    )
+
+
 def internalstatus_conversion(responsestatus: str):
     #  responsestatus can be of any case which gets internally converted to uppercase
     responsestatus = responsestatus.upper()
@@ -654,6 +1020,8 @@ def internalstatus_conversion(responsestatus: str):
         "FORBIDDEN": InternalStatusType.FORBIDDEN,
         "UNAUTHORIZED": InternalStatusType.FORBIDDEN,
         "INTERNAL SERVER ERROR": InternalStatusType.INTERNALSERVERERROR,
+        "SERVICE UNAVAILABLE": InternalStatusType.SERVICEUNAVAILABLE,
+        "GATEWAY TIMEOUT": InternalStatusType.GATEWAYTIMEOUT,
         "CANCELLED": InternalStatusType.CANCELED,
         "ERROR": InternalStatusType.ERROR,
         "SERVICE_NOT_PROVISIONED": InternalStatusType.FORBIDDEN,
@@ -726,16 +1094,19 @@ def save_supplementdata(
     programcode: ProgramCode,
     vehicledata: VehicleDataRequest,
     custom_extension: CustomExtension,
+    saved: bool = False,
 ):
+    # saved: the row was already written along with the main table row
     try:
-        vehicle_supplementtable = map_supplementtable(
-            msisdn,
-            programcode,
-            vehicledata,
-            custom_extension,
-            self._SupplementTable,
-        )
-        vehicle_supplementtable.save()
+        if not saved:
+            vehicle_supplementtable = map_supplementtable(
+                msisdn,
+                programcode,
+                vehicledata,
+                custom_extension,
+                self._SupplementTable,
+            )
+            vehicle_supplementtable.save()
         self._logger.info(
             "SaveVehicleData: Successfully saved additional vehicle data onto supplement table {} for msisdn: {}".format(
                 vehicledata, msisdn
@@ -747,6 +1118,7 @@ def save_supplementdata(
             },
         )
     except Exception as e:
+        handle_table_error(self._SupplementTable, e)
         self._logger.error(
             "SaveVehicleData: Error occured while saving data onto supplement table: {} for msisdn: {}".format(
                 e, msisdn
@@ -761,6 +1133,22 @@ def save_supplementdata(
         )
 
 
+def map_supplementrow(
+    self,
+    msisdn: str,
+    programcode: ProgramCode,
+    vehicledata: VehicleDataRequest,
+    custom_extension: CustomExtension,
+):
+    # None leaves mapping errors to save_supplementdata, which logs them
+    try:
+        return map_supplementtable(
+            msisdn, programcode, vehicledata, custom_extension, self._SupplementTable
+        )
+    except Exception:
+        return None
+
+
 def map_supplementtable(
     msisdn: str,
     programcode: ProgramCode,
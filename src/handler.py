@@ -1,6 +1,55 @@
+import atexit
+import signal
+import sys
+
 from mangum import Mangum
 
-from .api.api import app
+from .api.api import (
+    app,
+    finish_refreshes_before_response,
+    flush_write_behind_before_response,
+    flush_write_behind_on_shutdown,
+    gateway_timeout,
+)
+from .utilities.request_context import (
+    set_request_deadline,
+    set_request_deadline_from_lambda_context,
+)
+
+
+class FlushingMangum(Mangum):
+    def __call__(self, event, context):
+        # the deadline the middleware sets lives in the request's own context
+        set_request_deadline_from_lambda_context(context, gateway_timeout)
+        try:
+            return super().__call__(event, context)
+        finally:
+            # the environment is frozen once this returns, stale fallback
+            # refreshes are logged and write-behind rows the shutdown flush
+            # can't cover are written now
+            finish_refreshes_before_response()
+            flush_write_behind_before_response()
+            # nor may it cut the calls of a shutdown flush later
+            set_request_deadline(None)
+
+
+handler = FlushingMangum(app, enable_lifespan=False)
+
+
+def shutdown(signum, frame):
+    # Lambda signals the runtime before shutting down an environment with
+    # extensions; the lifespan shutdown event never runs under Mangum here
+    flush_write_behind_on_shutdown()
+    sys.exit(0)
+
+
+signal.signal(signal.SIGTERM, shutdown)
+atexit.register(flush_write_behind_on_shutdown)
+
 
+def ingest(event, context):
+    """Consumer of the ingestion queue, see serverless.yml"""
+    # the API function shares this module, keep the consumer off its imports
+    from .services.ingestion import consume_ingestion_event
 
-handler = Mangum(app, enable_lifespan=False)
+    return consume_ingestion_event(event)
@@ -2,11 +2,17 @@ import agero_python_logger
 from fastapi import FastAPI
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
+from src.utilities.request_context import API_GATEWAY_TIMEOUT, set_request_deadline_from_lambda_context
 
 class RequestIdMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, gateway_timeout=API_GATEWAY_TIMEOUT):
+        super().__init__(app)
+        self.gateway_timeout = gateway_timeout
+
     async def dispatch(self, request: Request, call_next):
         agero_python_logger.set_request_ids_with_lambda_context(request.scope.get("aws.context"), request.headers.get("x-correlation-id"))# correlation-id if not present then set-up logger sets it
+        set_request_deadline_from_lambda_context(request.scope.get("aws.context"), self.gateway_timeout)
         return await call_next(request)
 
-def setup_middleware(app: FastAPI):
-    app.add_middleware(RequestIdMiddleware)
\ No newline at end of file
+def setup_middleware(app: FastAPI, gateway_timeout=API_GATEWAY_TIMEOUT):
+    app.add_middleware(RequestIdMiddleware, gateway_timeout=gateway_timeout)
\ No newline at end of file
@@ -0,0 +1,19 @@
+from typing import List
+
+from pydantic import BaseModel
+from pydantic import Field
+from pydantic import validator
+
+from src.models.commands.get_vehicledata_command import GetVehicleDataCommand
+
+
+class GetVehicleDataBatchCommand(BaseModel):
+    items: List[GetVehicleDataCommand] = Field(
+        description="msisdn, programcode and ctsversion of each lookup"
+    )
+
+    @validator("items")
+    def items_must_not_be_empty(cls, v):
+        if len(v) == 0:
+            raise ValueError("Items cannot be empty")
+        return v
@@ -9,4 +9,6 @@ class InternalStatusType(str, Enum):
     BADREQUEST = "BAD_REQUEST"
     FORBIDDEN = "FORBIDDEN"
     NOTFOUND = "NOT_FOUND"
+    SERVICEUNAVAILABLE = "SERVICE_UNAVAILABLE"
+    GATEWAYTIMEOUT = "GATEWAY_TIMEOUT"
     UNKNOWN= "UNKNOWN"
\ No newline at end of file
@@ -0,0 +1,7 @@
+from starlette import status
+from starlette.exceptions import HTTPException
+
+
+class GatewayTimeoutException(HTTPException):
+    def __init__(self, detail: str = None):
+        super().__init__(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=detail)
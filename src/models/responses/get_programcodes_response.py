@@ -0,0 +1,11 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+from pydantic import Field
+
+
+class GetProgramCodesResponse(BaseModel):
+    msisdn: Optional[str] = Field(description="Requested msisdn")
+    programcodes: List[str] = Field(
+        [], description="Program codes with vehicle data saved for the msisdn"
+    )
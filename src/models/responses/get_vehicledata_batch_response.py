@@ -0,0 +1,27 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+from pydantic import Field
+
+from src.models.enums.ctsversion_type import CtsVersion
+from src.models.enums.status_type import Status
+from src.models.responses.get_vehicledata_response import GetVehicleDataResponse
+
+
+class GetVehicleDataBatchItem(BaseModel):
+    msisdn: Optional[str] = Field(description="Requested msisdn")
+    programcode: Optional[str] = Field(description="Program Code Type")
+    version: Optional[CtsVersion] = Field(description="Program Version passed in input")
+    status: Status = Field(
+        Status.UNKNOWN, description="Http Status Code of this lookup"
+    )
+    responsemessage: Optional[str] = Field(description="Response message")
+    data: Optional[GetVehicleDataResponse] = Field(
+        description="Vehicle data, only when the lookup succeeded"
+    )
+
+
+class GetVehicleDataBatchResponse(BaseModel):
+    items: List[GetVehicleDataBatchItem] = Field(
+        description="One result per requested item, in request order"
+    )
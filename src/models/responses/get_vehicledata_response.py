@@ -76,6 +76,10 @@ class GetVehicleDataResponse(BaseModel):
     # vehicle
     vehicle: Optional[Vehicle] = Field(description="An object with vehicle details")
 
+    dataage: Optional[int] = Field(
+        description="Seconds since the data was saved, only set when stored data stands in for a failed or slow live lookup, or for lookups by VIN"
+    )
+
     status: Status = Field(
         Status.UNKNOWN, description="Current Http Status Code of vehicle data get."
     )
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, Optional, Union
 from pydantic import BaseModel
 from pydantic import Field
 
@@ -9,3 +9,27 @@ class HealthCheckResponse(BaseModel):
     )
     responsemessage: Optional[str] = Field(description="Response message")
 
+    connectionpools: Optional[Dict[str, Dict[str, int]]] = Field(
+        None, description="Keep-alive connection counters per upstream provider"
+    )
+    leases: Optional[Dict[str, int]] = Field(
+        None, description="Bcall lease counters, contended when another caller held it"
+    )
+    coalescing: Optional[Dict[str, int]] = Field(
+        None, description="Vehicle data lookups executed upstream or merged in flight"
+    )
+    vehicledatacache: Optional[Dict[str, int]] = Field(
+        None, description="Latest vehicle record cache hits, misses and evictions"
+    )
+    writebehind: Optional[Dict[str, int]] = Field(
+        None, description="Audit rows queued, written in batches, spooled on failure"
+    )
+    circuitbreakers: Optional[Dict[str, Dict[str, Union[int, str]]]] = Field(
+        None, description="Circuit state and call counters per upstream provider"
+    )
+    stalefallback: Optional[Dict[str, int]] = Field(
+        None, description="Vehicle data answered live or from stored data"
+    )
+    zeepclientpools: Optional[Dict[str, Dict[str, int]]] = Field(
+        None, description="Zeep clients created, in use and waited for per provider"
+    )
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from time import monotonic
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from src.models.domain.enums.internal_status_type import InternalStatusType
+from src.services.dynamodb_latest import get_latest_items
+from src.services.dynamodb_tables import handle_table_error
+from src.services.provider_executor import run_client_call
+from src.services.request_coalescer import run_coalesced_client_call
+from src.services.vehicledata_cache import cache_vehicledata, get_cached_vehicledata
+from src.utilities.request_context import get_remaining_time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ITEMS = 25
+DEFAULT_DEADLINE = 10.0
+# kept back from the Lambda's remaining time to map and send the response
+RESPONSE_MARGIN = 0.5
+
+
+class LookupFailure(BaseModel):
+    msisdn: Optional[str]
+    programcode: Optional[str]
+    status: InternalStatusType
+    responsemessage: Optional[str]
+
+
+def batch_deadline(deadline: Optional[float] = None) -> float:
+    """Seconds the lookups of a batch share, less when the request itself
+    has less time left."""
+    seconds = deadline or DEFAULT_DEADLINE
+    remaining = get_remaining_time()
+    if remaining is not None:
+        seconds = min(seconds, max(remaining - RESPONSE_MARGIN, 0.0))
+    return seconds
+
+
+async def lookup_vehicledata_batch(lookups, deadline: Optional[float] = None) -> List:
+    """
+    Vehicle data of each (client_service, msisdn, programcode) in lookups, in
+    the same order. Providers that read latest items (latest_item_lookup) are
+    answered from one BatchGetItem per table, everything else, and keys
+    without a latest item, through the service's get_vehicledata, all at the
+    same time. Lookups not answered within the deadline get a GATEWAY_TIMEOUT
+    result, their calls keep running for other callers.
+    """
+    expires = monotonic() + batch_deadline(deadline)
+    results = [None] * len(lookups)
+    stored = {}
+    calls = {}
+
+    for index, (service, msisdn, programcode) in enumerate(lookups):
+        if service is None:
+            results[index] = LookupFailure(
+                msisdn=msisdn,
+                programcode=programcode,
+                status=InternalStatusType.BADREQUEST,
+                responsemessage="No service for programcode: {}".format(programcode),
+            )
+            continue
+        lookup = getattr(service, "latest_item_lookup", None)
+        latest = lookup(msisdn, programcode) if lookup is not None else None
+        if latest is None:
+            calls[index] = start_lookup(service, msisdn, programcode)
+            continue
+        table, request_key, attributes = latest
+        record = get_cached_vehicledata(
+            service._config, request_key, attributes=attributes
+        )
+        if record is not None:
+            results[index] = service.vehicledata_from_item(msisdn, programcode, record)
+        else:
+            stored.setdefault((table, attributes), []).append((index, request_key))
+
+    reads = {
+        group: asyncio.ensure_future(
+            run_client_call(
+                get_latest_items, group[0], [key for _, key in keys], group[1]
+            )
+        )
+        for group, keys in stored.items()
+    }
+    if reads:
+        await asyncio.wait(reads.values(), timeout=time_left(expires))
+
+    for (table, attributes), read in reads.items():
+        found = {}
+        if read.done() and read.exception() is None:
+            found = read.result()
+        elif read.done():
+            handle_table_error(table, read.exception())
+            logger.warning(
+                "GetVehicleDataBatch: Batch read of latest items failed: {}".format(
+                    read.exception()
+                ),
+                extra={"action": "GetVehicleDataBatch"},
+            )
+        for index, request_key in stored[(table, attributes)]:
+            service, msisdn, programcode = lookups[index]
+            record = found.get(request_key)
+            if record is None:
+                # no latest item yet, or the read failed: look it up one by one
+                calls[index] = start_lookup(service, msisdn, programcode)
+                continue
+            cache_vehicledata(service._config, record, request_key, attributes)
+            results[index] = service.vehicledata_from_item(msisdn, programcode, record)
+
+    if calls:
+        await asyncio.wait(calls.values(), timeout=time_left(expires))
+
+    for index, call in calls.items():
+        _, msisdn, programcode = lookups[index]
+        if not call.done():
+            results[index] = LookupFailure(
+                msisdn=msisdn,
+                programcode=programcode,
+                status=InternalStatusType.GATEWAYTIMEOUT,
+                responsemessage="Timed out looking up vehicle data for msisdn: {}".format(
+                    msisdn
+                ),
+            )
+        elif call.exception() is not None:
+            logger.error(
+                "GetVehicleDataBatch: Lookup failed for msisdn: {}: {}".format(
+                    msisdn, call.exception()
+                ),
+                extra={
+                    "msisdn": msisdn,
+                    "programcode": programcode,
+                    "action": "GetVehicleDataBatch",
+                },
+            )
+            results[index] = LookupFailure(
+                msisdn=msisdn,
+                programcode=programcode,
+                status=InternalStatusType.INTERNALSERVERERROR,
+                responsemessage=str(call.exception()),
+            )
+        else:
+            results[index] = call.result()
+    return results
+
+
+def start_lookup(service, msisdn, programcode):
+    return asyncio.ensure_future(
+        run_coalesced_client_call(service.get_vehicledata, msisdn, programcode)
+    )
+
+
+def time_left(expires) -> float:
+    return max(expires - monotonic(), 0.0)
@@ -0,0 +1,211 @@
+import logging
+from collections import Counter, deque
+from threading import Lock
+from time import monotonic
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# One breaker per upstream for the life of the container, so the outcomes of
+# all requests on a warm instance count towards the same circuit.
+_breakers = {}
+_breakers_lock = Lock()
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Error rate and latency breaker for one upstream.
+
+    The outcomes of the calls finished within the last window_seconds are
+    kept. Once there are at least minimum_calls of them and failure_rate of
+    them failed, or slow_call_rate of them took longer than
+    slow_call_seconds, the circuit opens and calls fail fast for
+    open_seconds. After that up to half_open_probes calls go through as
+    probes. All of them succeeding closes the circuit, a failed or slow one
+    opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 5.0,
+        slow_call_rate: float = 0.8,
+        minimum_calls: int = 10,
+        window_seconds: float = 60.0,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 2,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.minimum_calls = minimum_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self.state = CLOSED
+        self._outcomes = deque()
+        self._opened = None
+        self._probes = 0
+        self._probe_successes = 0
+        self._stats = Counter()
+        self._lock = Lock()
+
+    def allow_request(self) -> bool:
+        """True when a call may go upstream, counting it as a probe while
+        the circuit is half open."""
+        with self._lock:
+            if self.state == OPEN:
+                if monotonic() - self._opened < self.open_seconds:
+                    self._stats["rejected"] += 1
+                    return False
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    self._stats["rejected"] += 1
+                    return False
+                self._probes += 1
+            return True
+
+    def record(self, failed: bool, elapsed: float):
+        """Outcome of a call allow_request let through, elapsed in seconds."""
+        slow = elapsed > self.slow_call_seconds
+        now = monotonic()
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["failures"] += failed
+            self._stats["slow_calls"] += slow
+            if self.state == HALF_OPEN:
+                if failed or slow:
+                    self._open(now)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_probes:
+                        self._transition(CLOSED)
+                return
+            if self.state == OPEN:
+                # started before the circuit opened, it no longer counts
+                return
+            self._outcomes.append((now, failed, slow))
+            while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+                self._outcomes.popleft()
+            calls = len(self._outcomes)
+            if calls < self.minimum_calls:
+                return
+            failures = sum(1 for _, failed, _ in self._outcomes if failed)
+            slow_calls = sum(1 for _, _, slow in self._outcomes if slow)
+            if (
+                failures >= self.failure_rate * calls
+                or slow_calls >= self.slow_call_rate * calls
+            ):
+                self._open(now)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "calls": self._stats["calls"],
+                "failures": self._stats["failures"],
+                "slow_calls": self._stats["slow_calls"],
+                "rejected": self._stats["rejected"],
+                "opened": self._stats["opened"],
+            }
+
+    def _open(self, now):
+        self._opened = now
+        self._stats["opened"] += 1
+        self._transition(OPEN)
+
+    def _transition(self, state):
+        logger.warning(
+            "CircuitBreaker: Circuit of {} {} -> {}".format(
+                self.name, self.state, state
+            ),
+            extra={"provider": self.name, "action": "CircuitBreaker"},
+        )
+        self.state = state
+        self._outcomes.clear()
+        self._probes = 0
+        self._probe_successes = 0
+
+
+def breaker_settings(config) -> dict:
+    overrides = {
+        "failure_rate": getattr(config, "circuit_breaker_failure_rate", None),
+        "slow_call_seconds": getattr(config, "circuit_breaker_slow_call_seconds", None),
+        "slow_call_rate": getattr(config, "circuit_breaker_slow_call_rate", None),
+        "minimum_calls": getattr(config, "circuit_breaker_minimum_calls", None),
+        "window_seconds": getattr(config, "circuit_breaker_window_seconds", None),
+        "open_seconds": getattr(config, "circuit_breaker_open_seconds", None),
+        "half_open_probes": getattr(config, "circuit_breaker_half_open_probes", None),
+    }
+    return {name: value for name, value in overrides.items() if value is not None}
+
+
+def get_circuit_breaker(provider, config):
+    """The provider's breaker, None unless its config sets
+    circuit_breaker_enable. Rebuilt, closed, when the thresholds change."""
+    if getattr(config, "circuit_breaker_enable", None) is not True:
+        return None
+    settings = breaker_settings(config)
+    entry = _breakers.get(provider)
+    if entry is None or entry[1] != settings:
+        with _breakers_lock:
+            entry = _breakers.get(provider)
+            if entry is None or entry[1] != settings:
+                entry = (CircuitBreaker(provider, **settings), settings)
+                _breakers[provider] = entry
+    return entry[0]
+
+
+def call_through(breaker, method, *args, failed=None, **kwargs):
+    """
+    method(*args, **kwargs) with its outcome recorded on breaker. A call that
+    raises counts as failed, as does a result failed(result) is True for.
+    Raises CircuitOpenError without calling method while the circuit is open.
+    """
+    if breaker is None:
+        return method(*args, **kwargs)
+    if not breaker.allow_request():
+        raise CircuitOpenError(
+            "{} is unavailable, its circuit breaker is open".format(breaker.name)
+        )
+    started = monotonic()
+    try:
+        result = method(*args, **kwargs)
+    except Exception:
+        breaker.record(True, monotonic() - started)
+        raise
+    breaker.record(failed is not None and failed(result), monotonic() - started)
+    return result
+
+
+def is_server_error(response) -> bool:
+    return response.status_code >= 500
+
+
+def reset_circuit_breakers():
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def get_circuit_breaker_stats(provider=None):
+    """State and call counters per upstream. rejected calls failed fast while
+    the circuit was open."""
+    providers = list(_breakers) if provider is None else [provider]
+    return {name: _breakers[name][0].stats() for name in providers if name in _breakers}
+
+
+def get_service_circuit_breaker_stats(service):
+    breaker = getattr(service, "circuit_breaker", None)
+    if not isinstance(breaker, CircuitBreaker):
+        return None
+    return {breaker.name: breaker.stats()}
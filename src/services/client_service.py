@@ -9,8 +9,6 @@ from src.siriusxm.models.domain.terminate import Terminate
 
 # abstract base class work
 class ClientService(ABC):
-    _localstore = {}
-
     # abstract method
     @abstractmethod
     def assign_agent(self, agentassignment: AgentAssignment):
@@ -0,0 +1,138 @@
+import logging
+from contextlib import contextmanager
+from threading import Condition
+from time import monotonic
+
+logger = logging.getLogger(__name__)
+
+
+class DataArrivalNotifier:
+    """Lets a pending lookup wait for the save of its request_key instead of
+    sleeping a fixed delay.
+
+    Only keys with a waiter are tracked, so saves for keys nobody is waiting on
+    cost a dict lookup. A waiter reads the key's version before asking the
+    provider to push data and waits for it to change, so a save that lands
+    between the two is never missed.
+
+    The notifier only sees saves made by this process. A push saved by another
+    instance is seen through the subscription's probe, a cheap read of the
+    newest saved record repeated while the waiter waits.
+    """
+
+    def __init__(self):
+        self._condition = Condition()
+        self._versions = {}
+        self._waiters = {}
+
+    def publish(self, request_key):
+        with self._condition:
+            if request_key in self._waiters:
+                self._versions[request_key] += 1
+                self._condition.notify_all()
+
+    def subscribe(
+        self, request_key, probe=None, probe_interval=None
+    ) -> "DataArrivalSubscription":
+        with self._condition:
+            self._waiters[request_key] = self._waiters.get(request_key, 0) + 1
+            version = self._versions.setdefault(request_key, 0)
+        # outside the lock, the probe reads the table
+        return DataArrivalSubscription(
+            self, request_key, version, probe, probe_interval
+        )
+
+    def unsubscribe(self, request_key):
+        with self._condition:
+            self._waiters[request_key] -= 1
+            if self._waiters[request_key] <= 0:
+                del self._waiters[request_key]
+                del self._versions[request_key]
+
+    def wait(self, request_key, version, timeout) -> int:
+        """Wait up to timeout seconds for a save newer than version and return
+        the version seen, which equals version when nothing arrived."""
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._versions[request_key] != version, timeout
+            )
+            return self._versions[request_key]
+
+    def waiting(self):
+        with self._condition:
+            return dict(self._waiters)
+
+
+class DataArrivalSubscription:
+    def __init__(self, notifier, request_key, version, probe=None, probe_interval=None):
+        self._notifier = notifier
+        self.request_key = request_key
+        self.version = version
+        self._probe = None
+        self._probe_interval = probe_interval
+        if probe is not None and probe_interval:
+            try:
+                self._seen = probe()
+                self._probe = probe
+            except Exception as e:
+                self._log_probe_error(e)
+
+    def wait(self, timeout) -> bool:
+        """Return True as soon as data for the key is saved, False on timeout.
+
+        With a probe, the wait is cut into probe_interval slices and the probe
+        runs after each one but the last, which the caller's own re-query
+        follows anyway. A probe result other than the last one seen counts as
+        arrived.
+        """
+        expires = monotonic() + timeout
+        if self._probe is not None:
+            while expires - monotonic() > self._probe_interval:
+                if self._wait_local(self._probe_interval) or self._probe_saved():
+                    return True
+        return self._wait_local(max(expires - monotonic(), 0))
+
+    def _wait_local(self, timeout) -> bool:
+        version = self._notifier.wait(self.request_key, self.version, timeout)
+        arrived = version != self.version
+        self.version = version
+        return arrived
+
+    def _probe_saved(self) -> bool:
+        try:
+            seen = self._probe()
+        except Exception as e:
+            # the caller's re-query still finds the data, only later
+            self._log_probe_error(e)
+            return False
+        arrived = seen != self._seen
+        self._seen = seen
+        return arrived
+
+    def _log_probe_error(self, error):
+        logger.warning(
+            "DataArrival: probe for {} failed e:{}".format(self.request_key, error),
+            extra={"action": "DataArrival"},
+        )
+
+
+data_arrival = DataArrivalNotifier()
+
+
+def publish_data_arrival(request_key):
+    data_arrival.publish(request_key)
+
+
+@contextmanager
+def subscribe_data_arrival(request_key, probe=None, probe_interval=None):
+    """
+    Subscribes to saves of request_key. probe, when given with a
+    probe_interval, returns a marker of the newest record saved under the
+    key from any instance (e.g. its event_datetime) and is read once here,
+    then every probe_interval seconds of a wait.
+    """
+    subscription = data_arrival.subscribe(request_key, probe, probe_interval)
+    try:
+        yield subscription
+    finally:
+        data_arrival.unsubscribe(request_key)
@@ -0,0 +1,86 @@
+import logging
+import random
+import time
+from typing import List
+
+from pynamodb.connection.base import BOTOCORE_EXCEPTIONS
+from pynamodb.exceptions import PutError
+
+from src.services.dynamodb_tables import handle_table_error
+
+logger = logging.getLogger(__name__)
+
+# DynamoDB's limit for one BatchWriteItem call
+MAX_BATCH_WRITE_ITEMS = 25
+
+
+def batch_save(*records) -> List:
+    """
+    Puts records, of one or more tables on the same endpoint, with one
+    BatchWriteItem call per 25 records. Unprocessed items are resent with the
+    first table's backoff settings. Returns the records that were not
+    written, so the caller can save those one by one; a failed call returns
+    all of its records instead of raising. None records are skipped.
+    """
+    records = [record for record in records if record is not None]
+    unsaved = []
+    for start in range(0, len(records), MAX_BATCH_WRITE_ITEMS):
+        chunk = records[start : start + MAX_BATCH_WRITE_ITEMS]
+        try:
+            unsaved.extend(batch_write_chunk(chunk))
+        except Exception as e:
+            for table in {type(record) for record in chunk}:
+                handle_table_error(table, e)
+            logger.warning(
+                "SaveVehicleData: Batch write of {} records failed: {}".format(
+                    len(chunk), e
+                ),
+                extra={"action": "BatchWrite"},
+            )
+            unsaved.extend(chunk)
+    return unsaved
+
+
+def batch_write_chunk(records) -> List:
+    meta = type(records[0]).Meta
+    pending = []
+    request_items = {}
+    for record in records:
+        item = record._serialize(attr_map=True)["attributes"]
+        pending.append((type(record).Meta.table_name, item, record))
+        request_items.setdefault(type(record).Meta.table_name, []).append(
+            {"PutRequest": {"Item": item}}
+        )
+
+    retries = 0
+    while request_items:
+        if retries:
+            if retries >= meta.max_retry_attempts:
+                break
+            time.sleep(
+                random.randint(0, meta.base_backoff_ms * (2 ** (retries - 1)))  # nosec
+                / 1000
+            )
+        request_items = dispatch_batch_write(records[0], request_items)
+        retries += 1
+
+    # whatever DynamoDB still reports unprocessed was not written
+    unprocessed = [
+        (table_name, request["PutRequest"]["Item"])
+        for table_name, requests in request_items.items()
+        for request in requests
+    ]
+    return [
+        record
+        for table_name, item, record in pending
+        if (table_name, item) in unprocessed
+    ]
+
+
+def dispatch_batch_write(record, request_items) -> dict:
+    connection = type(record)._get_connection().connection
+    try:
+        data = connection.dispatch("BatchWriteItem", {"RequestItems": request_items})
+    except BOTOCORE_EXCEPTIONS as e:
+        raise PutError("Failed to batch write items: {}".format(e), e)
+    return (data or {}).get("UnprocessedItems") or {}
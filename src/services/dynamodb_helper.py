@@ -1,6 +1,15 @@
 from datetime import datetime, timedelta
+from src.models.domain.enums.internal_status_type import InternalStatusType
 from src.models.enums.ctsversion_type import CtsVersion
 from src.models.enums.programcode_type import ProgramCode
+from src.services.dynamodb_projections import attributes_to_get
+from src.services.dynamodb_tables import handle_table_error
+from src.services.stale_fallback import (
+    max_stale_age,
+    record_age,
+    stale_fallback_enabled,
+)
+from src.services.vehicledata_cache import find_latest_vehicledata
 from src.utilities.extensions.datetime_extension import (
     convert_utc_timestamp_to_epoch,
     get_utc_epoch,
@@ -9,7 +18,7 @@ from src.utilities.extensions.string_extension import isnotnull_whitespaceorempt
 
 
 def get_vehicledata_for_config_enabled_client_only(
-    self, id: str, programcode: ProgramCode, ctsversion: CtsVersion
+    self, id: str, programcode: ProgramCode, ctsversion: CtsVersion, attributes=None
 ):
     try:
         self._logger.info(
@@ -33,36 +42,43 @@ def get_vehicledata_for_config_enabled_client_only(
             and dynamodb_check_timelimit > 0
             and isnotnull_whitespaceorempty(id)
         ):
+            window_start = convert_utc_timestamp_to_epoch(
+                datetime.utcnow() - timedelta(minutes=dynamodb_check_timelimit)
+            )
             # Query for Items Matching current timestamp within given time limit and Partition/Sort Key in descending order
-            for dataresponse in self._Table.query(
-                hash_key=programcode + "-" + id,
-                range_key_condition=self._Table.event_datetime.between(
-                    convert_utc_timestamp_to_epoch(
-                        datetime.utcnow() - timedelta(minutes=dynamodb_check_timelimit)
+            dataresponse = find_latest_vehicledata(
+                self._config,
+                self._Table,
+                programcode + "-" + id,
+                lambda: self._Table.query(
+                    hash_key=programcode + "-" + id,
+                    range_key_condition=self._Table.event_datetime.between(
+                        window_start, get_utc_epoch()
                     ),
-                    get_utc_epoch(),
+                    scan_index_forward=False,
+                    limit=1,
+                    attributes_to_get=attributes_to_get(attributes),
                 ),
-                scan_index_forward=False,
-                limit=1,
-            ):
-                if dataresponse:
-                    self._logger.info(
-                        "GetVehicleData: Successfully retrieved vehicle data from DynamoDB for id: {} programcode: {}".format(
-                            id, programcode
-                        ),
-                        extra={
-                            "programcode": programcode,
-                            "id": id,
-                            "action": "GetVehicleData",
-                            "cts-version": ctsversion,
-                        },
-                    )
-                    return dataresponse
-                else:
-                    return None
+                min_event_datetime=window_start,
+                attributes=attributes,
+            )
+            if dataresponse:
+                self._logger.info(
+                    "GetVehicleData: Successfully retrieved vehicle data from DynamoDB for id: {} programcode: {}".format(
+                        id, programcode
+                    ),
+                    extra={
+                        "programcode": programcode,
+                        "id": id,
+                        "action": "GetVehicleData",
+                        "cts-version": ctsversion,
+                    },
+                )
+                return dataresponse
             return None
         return None
     except Exception as e:
+        handle_table_error(self._Table, e)
         self._logger.error(
             "GetVehicleData: Error retrieving data from DynamoDB for id:{} e:{}".format(
                 id, e
@@ -77,3 +93,114 @@ def get_vehicledata_for_config_enabled_client_only(
             },
         )
         return None
+
+
+def get_last_known_vehicledata(
+    self, id: str, programcode: ProgramCode, ctsversion: CtsVersion, attributes=None
+):
+    """Latest stored record for id however old, the answer while its upstream
+    can't be called. None when there is none or it can't be read."""
+    try:
+        if not isnotnull_whitespaceorempty(id):
+            return None
+        return find_latest_vehicledata(
+            self._config,
+            self._Table,
+            programcode + "-" + id,
+            lambda: self._Table.query(
+                hash_key=programcode + "-" + id,
+                scan_index_forward=False,
+                limit=1,
+                attributes_to_get=attributes_to_get(attributes),
+            ),
+            attributes=attributes,
+        )
+    except Exception as e:
+        handle_table_error(self._Table, e)
+        self._logger.error(
+            "GetVehicleData: Error retrieving last known data from DynamoDB for id:{} e:{}".format(
+                id, e
+            ),
+            extra={
+                "id": id,
+                "programcode": programcode,
+                "cts-version": ctsversion,
+                "action": "GetVehicleData",
+            },
+        )
+        return None
+
+
+def get_last_known_response(
+    self,
+    msisdn,
+    programcode: ProgramCode,
+    ctsversion: CtsVersion,
+    attributes,
+    create_response,
+    responsemessage,
+):
+    """Newest stored vehicle data however old, built by the provider's
+    create_response and with its dataage. None when there is none."""
+    db_response = get_last_known_vehicledata(
+        self, msisdn, programcode, ctsversion, attributes
+    )
+    if db_response is None:
+        return None
+    dataresponse = create_response(
+        db_response,
+        msisdn,
+        programcode,
+        InternalStatusType.SUCCESS,
+        responsemessage,
+    )
+    dataresponse.dataage = record_age(db_response)
+    return dataresponse
+
+
+def get_circuit_open_response(
+    self,
+    provider,
+    msisdn,
+    programcode: ProgramCode,
+    ctsversion: CtsVersion,
+    exception,
+    attributes,
+    create_response,
+    vehicledata_type,
+):
+    """Last known vehicle data while provider's circuit is open, no older
+    than max_stale_age, else a 503 vehicledata_type. With stale fallback the
+    503 is the answer, get_vehicledata_or_stale then applies the age limit
+    to stored data and counts what it returns."""
+    self._logger.warning(
+        "GetVehicleData: {} circuit is open, not calling it for msisdn: {}".format(
+            provider, msisdn
+        ),
+        extra={
+            "msisdn": msisdn,
+            "programcode": programcode,
+            "cts-version": ctsversion,
+            "action": "GetVehicleData",
+        },
+    )
+    if not stale_fallback_enabled(self._config):
+        dataresponse = get_last_known_response(
+            self,
+            msisdn,
+            programcode,
+            ctsversion,
+            attributes,
+            create_response,
+            "Last known vehicle data, {}".format(exception),
+        )
+        max_age = max_stale_age(self._config, programcode)
+        if dataresponse is not None and (
+            max_age is None or dataresponse.dataage <= max_age
+        ):
+            return dataresponse
+    return vehicledata_type(
+        msisdn=msisdn,
+        status=InternalStatusType.SERVICEUNAVAILABLE,
+        responsemessage=str(exception),
+    )
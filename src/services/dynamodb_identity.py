@@ -0,0 +1,216 @@
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import List, Optional, Type
+
+from src.services.dynamodb_latest import find_newest_event_datetimes, save_latest_item
+from src.services.dynamodb_tables import ConnectedVehicleTable, handle_table_error
+from src.utilities.extensions.string_extension import isnotnull_whitespaceorempty
+
+logger = logging.getLogger(__name__)
+
+# Identity items live in the main table under request keys of their own, no
+# program code is named vin or msisdn. They take the sort key of the latest
+# items, so the scans that skip those skip them too.
+VIN_KEY_PREFIX = "vin-"
+MSISDN_KEY_PREFIX = "msisdn-"
+IDENTITY_EVENT_DATETIME = -1
+# What GET /data/vin maps into its response. A vin item holds only these of
+# its record, the raw payload and provider fields stay with the record. The
+# programcode goes in source_programcode, under its own name the item would
+# be in every index keyed on programcode.
+VIN_ITEM_ATTRIBUTES = (
+    "msisdn",
+    "timestamp",
+    "calldate",
+    "calltime",
+    "odometer",
+    "odometerscale",
+    "countrycode",
+    "latitude",
+    "longitude",
+    "headingdirection",
+    "vin",
+    "brand",
+    "modelname",
+    "modelyear",
+    "modelcode",
+    "modeldesc",
+    "mileage",
+    "mileageunit",
+)
+
+# (msisdn, programcode) pairs this instance knows are in their msisdn item,
+# least recently saved first. A repeat save then sends nothing: DynamoDB
+# bills a write for an update whose condition fails too.
+MAX_KNOWN_PROGRAMCODES = 4096
+_known_programcodes = OrderedDict()
+_known_programcodes_lock = Lock()
+
+
+def vin_key(vin: str) -> str:
+    return VIN_KEY_PREFIX + vin.strip().upper()
+
+
+def msisdn_key(msisdn: str) -> str:
+    return MSISDN_KEY_PREFIX + msisdn.strip()
+
+
+def is_identity_key(request_key: str) -> bool:
+    return request_key.startswith((VIN_KEY_PREFIX, MSISDN_KEY_PREFIX))
+
+
+def save_record_items(table: Type[ConnectedVehicleTable], record, latest_item=False):
+    """
+    Updates the items kept alongside a saved record: its latest item when
+    the provider keeps them (latest_item), and the identity items of its vin
+    and msisdn always, GET /data/vin and /data/msisdn read nothing else.
+    Errors are logged and never fail the save of record itself.
+    """
+    if latest_item:
+        save_latest_item(table, record)
+    save_identity_items(table, record)
+
+
+def save_identity_items(table: Type[ConnectedVehicleTable], record):
+    """
+    Points the identity items of record's vin and msisdn at record: the vin
+    item takes record's VIN_ITEM_ATTRIBUTES, with its request_key and
+    programcode kept in source_request_key and source_programcode, unless it
+    already holds a newer one; record's programcode is added to the program
+    codes of the msisdn item unless it already has it. Errors are logged and
+    never fail the save of record itself.
+    """
+    try:
+        if isnotnull_whitespaceorempty(record.vin):
+            save_vin_item(table, record)
+        if isnotnull_whitespaceorempty(record.msisdn):
+            save_msisdn_item(table, record)
+    except Exception as e:
+        handle_table_error(table, e)
+        logger.warning(
+            "SaveVehicleData: Unable to update identity items for {}: {}".format(
+                getattr(record, "request_key", None), e
+            ),
+            extra={"action": "SaveIdentityItems"},
+        )
+
+
+def save_vin_item(table: Type[ConnectedVehicleTable], record) -> bool:
+    # an update, so the item gets no model defaults: a referenceid would put
+    # it in gsi-rid-index
+    actions = [
+        table.latest_event_datetime.set(record.event_datetime),
+        table.source_request_key.set(record.request_key),
+        table.source_programcode.set(record.programcode),
+    ]
+    for name in VIN_ITEM_ATTRIBUTES:
+        attribute = getattr(table, name)
+        value = record.attribute_values.get(name)
+        # the vin's previous record may have had it
+        actions.append(attribute.remove() if value is None else attribute.set(value))
+    try:
+        table(vin_key(record.vin), IDENTITY_EVENT_DATETIME).update(
+            actions=actions,
+            condition=(
+                table.latest_event_datetime.does_not_exist()
+                | (table.latest_event_datetime <= record.event_datetime)
+            ),
+        )
+        return True
+    except Exception as e:
+        if getattr(e, "cause_response_code", None) == "ConditionalCheckFailedException":
+            # a newer record of the vin already is its latest
+            return False
+        raise
+
+
+def save_msisdn_item(table: Type[ConnectedVehicleTable], record) -> bool:
+    """Adds record's programcode to its msisdn item, False when the item
+    already has it."""
+    known = (table.Meta.table_name, record.msisdn, record.programcode)
+    with _known_programcodes_lock:
+        if known in _known_programcodes:
+            _known_programcodes.move_to_end(known)
+            return False
+    # ADD to the set is idempotent, concurrent saves can't lose a program code,
+    # and the condition leaves the item alone when the code is already there
+    try:
+        table(msisdn_key(record.msisdn), IDENTITY_EVENT_DATETIME).update(
+            actions=[
+                table.programcodes.add({record.programcode}),
+                table.msisdn.set(record.msisdn),
+            ],
+            condition=~table.programcodes.contains(record.programcode),
+        )
+        added = True
+    except Exception as e:
+        if getattr(e, "cause_response_code", None) != "ConditionalCheckFailedException":
+            raise
+        added = False
+    with _known_programcodes_lock:
+        _known_programcodes[known] = True
+        if len(_known_programcodes) > MAX_KNOWN_PROGRAMCODES:
+            _known_programcodes.popitem(last=False)
+    return added
+
+
+def forget_known_programcodes():
+    with _known_programcodes_lock:
+        _known_programcodes.clear()
+
+
+def get_vin_item(
+    table: Type[ConnectedVehicleTable], vin: str
+) -> Optional[ConnectedVehicleTable]:
+    """
+    Newest record saved with vin, under any program code, with one strongly
+    consistent GetItem. request_key and event_datetime are the record's own.
+    None when no record of vin was saved since the identity items were added
+    and backfilled.
+    """
+    try:
+        item = table.get(vin_key(vin), IDENTITY_EVENT_DATETIME, consistent_read=True)
+    except table.DoesNotExist:
+        return None
+    item.request_key = item.source_request_key
+    item.event_datetime = item.latest_event_datetime
+    item.programcode = item.source_programcode
+    return item
+
+
+def get_msisdn_programcodes(table: Type[ConnectedVehicleTable], msisdn: str) -> List:
+    """Program codes msisdn has records under, sorted, from one GetItem."""
+    try:
+        item = table.get(
+            msisdn_key(msisdn),
+            IDENTITY_EVENT_DATETIME,
+            consistent_read=True,
+            attributes_to_get=["programcodes"],
+        )
+    except table.DoesNotExist:
+        return []
+    return sorted(item.programcodes or [])
+
+
+def backfill_identity_items(
+    table: Type[ConnectedVehicleTable], dry_run=False, **scan_kwargs
+):
+    """
+    Builds the identity items from the newest record of every request_key,
+    whether or not its provider keeps latest items. Safe to run while the
+    API is saving, a vin item is never replaced by an older record.
+    """
+    stats = {"keys": 0, "vins": 0, "msisdns": 0}
+    # rebuilding, items known to this process may have been deleted since
+    forget_known_programcodes()
+    for request_key, event_datetime in find_newest_event_datetimes(
+        table, **scan_kwargs
+    ).items():
+        record = table.get(request_key, event_datetime)
+        stats["keys"] += 1
+        stats["vins"] += int(isnotnull_whitespaceorempty(record.vin))
+        stats["msisdns"] += int(isnotnull_whitespaceorempty(record.msisdn))
+        if not dry_run:
+            save_identity_items(table, record)
+    return stats
@@ -0,0 +1,277 @@
+"""
+Global secondary indexes of the main and supplement tables: reads through
+them, the write units they add to a save, and the steps that move a table's
+indexes to the ones the models define.
+
+The indexes project keys only, so a save writes a few hundred bytes to each
+instead of another copy of the item, JSONData included. Readers that need
+more get it by key from the table.
+"""
+
+import logging
+import math
+import time
+from decimal import Decimal
+from typing import Dict, FrozenSet, List, Optional, Tuple, Type
+
+from pynamodb.indexes import GlobalSecondaryIndex
+from pynamodb.models import Model
+
+from src.services.dynamodb_projections import attributes_to_get, covers
+
+logger = logging.getLogger(__name__)
+
+WRITE_UNIT_BYTES = 1024
+# projection types
+KEYS_ONLY = "KEYS_ONLY"
+INCLUDE = "INCLUDE"
+ALL = "ALL"
+
+
+def projected_attributes(index: GlobalSecondaryIndex) -> Optional[FrozenSet[str]]:
+    """Attributes an item read from index has, None when it has them all."""
+    projection = index.Meta.projection
+    if projection.projection_type == ALL:
+        return None
+    model = index.Meta.model
+    keys = {
+        model._hash_key_attribute().attr_name,
+        model._range_key_attribute().attr_name,
+        *index._get_attributes(),
+    }
+    return frozenset(keys.union(projection.non_key_attributes or ()))
+
+
+def query_index(
+    table: Type[Model],
+    index: GlobalSecondaryIndex,
+    hash_key,
+    range_key_condition=None,
+    scan_index_forward=False,
+    limit=None,
+    attributes=None,
+) -> List[Model]:
+    """
+    Records of hash_key in index, newest first unless scan_index_forward.
+    Items the index doesn't project attributes of (None for the full item,
+    else a dynamodb_projections.projection) are read by key with
+    BatchGetItem, in index order. Latest, lease and
+    identity items are left out, limit counts them still.
+    """
+    entries = [
+        item
+        for item in index.query(
+            hash_key,
+            range_key_condition,
+            scan_index_forward=scan_index_forward,
+            limit=limit,
+        )
+        # leases, latest and identity items have sort keys no record can have
+        if item.event_datetime > 0
+    ]
+    if covers(projected_attributes(index), attributes):
+        return entries
+
+    keys = [(item.request_key, item.event_datetime) for item in entries]
+    found = {
+        (item.request_key, item.event_datetime): item
+        for item in table.batch_get(
+            keys, attributes_to_get=attributes_to_get(attributes)
+        )
+    }
+    return [found[key] for key in keys if key in found]
+
+
+def index_definitions(table: Type[Model]) -> List[dict]:
+    """The global secondary indexes of table's model, as UpdateTable and
+    DescribeTable spell them."""
+    definitions = []
+    for index in table._get_indexes()["global_secondary_indexes"]:
+        projection = dict(index["projection"])
+        if "NonKeyAttributes" in projection:
+            projection["NonKeyAttributes"] = sorted(projection["NonKeyAttributes"])
+        definitions.append(
+            {
+                "IndexName": index["index_name"],
+                # hash key first, as DynamoDB describes it
+                "KeySchema": sorted(
+                    index["key_schema"], key=lambda key: key["KeyType"] != "HASH"
+                ),
+                "Projection": projection,
+            }
+        )
+    return definitions
+
+
+def index_attribute_definitions(table: Type[Model]) -> List[dict]:
+    definitions = {}
+    for attribute in table._get_indexes()["attribute_definitions"]:
+        definitions[attribute["attribute_name"]] = attribute["attribute_type"]
+    return [
+        {"AttributeName": name, "AttributeType": attribute_type}
+        for name, attribute_type in sorted(definitions.items())
+    ]
+
+
+def same_index(current: dict, target: dict) -> bool:
+    projection = dict(current["Projection"])
+    if "NonKeyAttributes" in projection:
+        projection["NonKeyAttributes"] = sorted(projection["NonKeyAttributes"])
+    return (
+        current["KeySchema"] == target["KeySchema"]
+        and projection == target["Projection"]
+    )
+
+
+def plan_index_migration(
+    current: List[dict], target: List[dict], drop=True
+) -> List[Tuple[str, dict]]:
+    """
+    Steps from the current indexes of a table to target, one index each as
+    UpdateTable takes them. A projection can't be changed in place, so a
+    changed index is dropped and created again; indexes under new names are
+    created first, so readers can move over before the old ones are dropped.
+    With drop False indexes missing from target are kept.
+    """
+    current_by_name = {index["IndexName"]: index for index in current}
+    target_names = {index["IndexName"] for index in target}
+    steps = []
+    for index in target:
+        if index["IndexName"] not in current_by_name:
+            steps.append(("create", index))
+    for index in target:
+        existing = current_by_name.get(index["IndexName"])
+        if existing is not None and not same_index(existing, index):
+            steps.append(("delete", existing))
+            steps.append(("create", index))
+    if drop:
+        for index in current:
+            if index["IndexName"] not in target_names:
+                steps.append(("delete", index))
+    return steps
+
+
+def apply_index_step(
+    client, table_name: str, step: Tuple[str, dict], attribute_definitions
+):
+    action, index = step
+    if action == "delete":
+        update = {"Delete": {"IndexName": index["IndexName"]}}
+        client.update_table(TableName=table_name, GlobalSecondaryIndexUpdates=[update])
+        return
+    create = {
+        "IndexName": index["IndexName"],
+        "KeySchema": index["KeySchema"],
+        "Projection": index["Projection"],
+    }
+    table = client.describe_table(TableName=table_name)["Table"]
+    if table.get("BillingModeSummary", {}).get("BillingMode") != "PAY_PER_REQUEST":
+        throughput = table["ProvisionedThroughput"]
+        create["ProvisionedThroughput"] = {
+            "ReadCapacityUnits": throughput["ReadCapacityUnits"],
+            "WriteCapacityUnits": throughput["WriteCapacityUnits"],
+        }
+    client.update_table(
+        TableName=table_name,
+        AttributeDefinitions=attribute_definitions,
+        GlobalSecondaryIndexUpdates=[{"Create": create}],
+    )
+
+
+def wait_for_indexes(client, table_name: str, delay=10.0, timeout=3600.0) -> dict:
+    """Waits until table_name and all its indexes are ACTIVE, a new index
+    has backfilled and a dropped one is gone, and returns the table."""
+    expires = time.monotonic() + timeout
+    while True:
+        table = client.describe_table(TableName=table_name)["Table"]
+        statuses = [
+            index.get("IndexStatus", "ACTIVE")
+            for index in table.get("GlobalSecondaryIndexes", [])
+        ]
+        if table["TableStatus"] == "ACTIVE" and all(
+            status == "ACTIVE" for status in statuses
+        ):
+            return table
+        if time.monotonic() > expires:
+            raise TimeoutError(
+                "Indexes of {} not active after {} seconds".format(table_name, timeout)
+            )
+        logger.info(
+            "MigrateIndexes: Waiting for {} indexes {}".format(table_name, statuses),
+            extra={"table": table_name, "action": "MigrateIndexes"},
+        )
+        time.sleep(delay)
+
+
+def attribute_size(value: dict) -> int:
+    """Bytes DynamoDB bills for a typed value such as {"S": "fca"}."""
+    ((kind, data),) = value.items()
+    if kind == "S":
+        return len(data.encode("utf-8"))
+    if kind == "N":
+        return number_size(data)
+    if kind == "B":
+        return len(data)
+    if kind in ("BOOL", "NULL"):
+        return 1
+    if kind == "SS":
+        return sum(len(item.encode("utf-8")) for item in data)
+    if kind == "NS":
+        return sum(number_size(item) for item in data)
+    if kind == "BS":
+        return sum(len(item) for item in data)
+    if kind == "L":
+        return 3 + sum(1 + attribute_size(item) for item in data)
+    if kind == "M":
+        return 3 + sum(
+            1 + len(name.encode("utf-8")) + attribute_size(item)
+            for name, item in data.items()
+        )
+    raise ValueError("Unknown DynamoDB type {}".format(kind))
+
+
+def number_size(number: str) -> int:
+    digits = Decimal(number).normalize().as_tuple().digits
+    return (len(digits) + 1) // 2 + 1
+
+
+def item_size(item: Dict[str, dict]) -> int:
+    return sum(
+        len(name.encode("utf-8")) + attribute_size(value)
+        for name, value in item.items()
+    )
+
+
+def write_units(size: int) -> int:
+    return max(1, math.ceil(size / WRITE_UNIT_BYTES))
+
+
+def projected_item(
+    item: Dict[str, dict], index: dict, table_keys
+) -> Optional[Dict[str, dict]]:
+    """
+    The part of item written to index, None when item lacks one of the
+    index's keys and so isn't in the index at all.
+    """
+    index_keys = [key["AttributeName"] for key in index["KeySchema"]]
+    if any(key not in item for key in index_keys):
+        return None
+    projection = index["Projection"]
+    if projection["ProjectionType"] == ALL:
+        return item
+    names = set(table_keys).union(index_keys)
+    if projection["ProjectionType"] == INCLUDE:
+        names.update(projection.get("NonKeyAttributes", ()))
+    return {name: value for name, value in item.items() if name in names}
+
+
+def save_write_units(item: Dict[str, dict], indexes: List[dict], table_keys) -> dict:
+    """Write units of putting a new item: one write to the table, and one to
+    each index it's in, each billed per started KB."""
+    units = {"table": write_units(item_size(item))}
+    for index in indexes:
+        projected = projected_item(item, index, table_keys)
+        units[index["IndexName"]] = (
+            write_units(item_size(projected)) if projected is not None else 0
+        )
+    return units
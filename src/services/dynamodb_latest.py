@@ -0,0 +1,171 @@
+import logging
+from typing import Dict, Iterable, Optional, Type
+
+from src.services.dynamodb_projections import attributes_to_get, projection
+from src.services.dynamodb_tables import ConnectedVehicleTable, handle_table_error
+
+logger = logging.getLogger(__name__)
+
+# Sort key of the copy of the newest record kept under each request_key.
+# Negative so the descending range queries still see the real records first.
+LATEST_EVENT_DATETIME = -1
+# Left out of the copy: the lookups that read latest items project the mapped
+# attributes, and the raw payload can be most of a record's size.
+LATEST_ITEM_EXCLUDED = frozenset(["JSONData"])
+
+
+def latest_item_enabled(config) -> bool:
+    """True when the provider keeps latest items (dynamodb_latest_item)."""
+    return getattr(config, "dynamodb_latest_item", None) is True
+
+
+def latest_item_covers(attributes) -> bool:
+    """Whether a latest item has every attribute of the projection, which
+    the full item (None) never has."""
+    return attributes is not None and not attributes & LATEST_ITEM_EXCLUDED
+
+
+def save_latest_item(table: Type[ConnectedVehicleTable], record) -> bool:
+    """
+    Upserts the latest item of record's request_key with a copy of record,
+    less LATEST_ITEM_EXCLUDED. Callers save it only for providers that have
+    latest_item_enabled. The conditional put only replaces an older copy, so
+    concurrent or late saves can't move the pointer back. Errors are logged
+    and never fail the save of record itself.
+    """
+    try:
+        latest = table(
+            **{
+                **{
+                    name: value
+                    for name, value in record.attribute_values.items()
+                    if name not in LATEST_ITEM_EXCLUDED
+                },
+                "event_datetime": LATEST_EVENT_DATETIME,
+                "latest_event_datetime": record.event_datetime,
+            }
+        )
+        latest.save(
+            condition=(
+                table.latest_event_datetime.does_not_exist()
+                | (table.latest_event_datetime <= record.event_datetime)
+            )
+        )
+    except Exception as e:
+        if getattr(e, "cause_response_code", None) == "ConditionalCheckFailedException":
+            # a newer record already is the latest
+            return False
+        handle_table_error(table, e)
+        logger.warning(
+            "SaveVehicleData: Unable to update latest item for {}: {}".format(
+                getattr(record, "request_key", None), e
+            ),
+            extra={"action": "SaveLatestItem"},
+        )
+        return False
+    return True
+
+
+def get_latest_item(
+    table: Type[ConnectedVehicleTable], request_key: str, attributes=None
+) -> Optional[ConnectedVehicleTable]:
+    """
+    Newest record of request_key with one strongly consistent GetItem, or
+    None when the key has no latest item yet (not backfilled, or no data).
+    attributes is a projection from dynamodb_projections, None for all but
+    LATEST_ITEM_EXCLUDED.
+    """
+    try:
+        latest = table.get(
+            request_key,
+            LATEST_EVENT_DATETIME,
+            consistent_read=True,
+            attributes_to_get=attributes_to_get(attributes),
+        )
+    except table.DoesNotExist:
+        return None
+    # callers expect the record's own sort key
+    latest.event_datetime = latest.latest_event_datetime
+    return latest
+
+
+def get_newest_event_datetime(
+    table: Type[ConnectedVehicleTable], request_key: str, latest_item=False
+) -> Optional[int]:
+    """
+    event_datetime of the newest record of request_key, or None when it has
+    none, from one strongly consistent read of its keys. Reads the latest
+    item when the provider keeps them, else the newest record itself.
+    """
+    if latest_item:
+        latest = get_latest_item(table, request_key, projection())
+        return latest.event_datetime if latest is not None else None
+    newest = next(
+        iter(
+            table.query(
+                request_key,
+                # leases and latest items have sort keys no real record can have
+                table.event_datetime > 0,
+                scan_index_forward=False,
+                consistent_read=True,
+                limit=1,
+                attributes_to_get=attributes_to_get(projection()),
+            )
+        ),
+        None,
+    )
+    return newest.event_datetime if newest is not None else None
+
+
+def get_latest_items(
+    table: Type[ConnectedVehicleTable], request_keys: Iterable[str], attributes=None
+) -> Dict[str, ConnectedVehicleTable]:
+    """
+    Newest records of request_keys with BatchGetItem, 100 keys per call,
+    keyed by request_key. Keys without a latest item are left out.
+    """
+    latest_items = {}
+    for latest in table.batch_get(
+        [(request_key, LATEST_EVENT_DATETIME) for request_key in set(request_keys)],
+        consistent_read=True,
+        attributes_to_get=attributes_to_get(attributes),
+    ):
+        latest.event_datetime = latest.latest_event_datetime
+        latest_items[latest.request_key] = latest
+    return latest_items
+
+
+def find_newest_event_datetimes(table: Type[ConnectedVehicleTable], **scan_kwargs):
+    """Newest event_datetime per request_key from a keys only scan."""
+    newest = {}
+    for item in table.scan(
+        attributes_to_get=["request_key", "event_datetime"], **scan_kwargs
+    ):
+        # leases and latest items have sort keys no real record can have
+        if item.event_datetime <= 0:
+            continue
+        if item.event_datetime > newest.get(item.request_key, 0):
+            newest[item.request_key] = item.event_datetime
+    return newest
+
+
+def backfill_latest_items(
+    table: Type[ConnectedVehicleTable], dry_run=False, **scan_kwargs
+):
+    """
+    Builds the latest item of every request_key in the table. Safe to run
+    while the API is saving, save_latest_item never replaces a newer copy.
+    """
+    stats = {"keys": 0, "written": 0, "skipped": 0}
+    for request_key, event_datetime in find_newest_event_datetimes(
+        table, **scan_kwargs
+    ).items():
+        stats["keys"] += 1
+        if dry_run:
+            continue
+        record = table.get(request_key, event_datetime)
+        if save_latest_item(table, record):
+            stats["written"] += 1
+        else:
+            stats["skipped"] += 1
+    return stats
@@ -0,0 +1,118 @@
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Type
+from uuid import uuid4
+
+from src.services.dynamodb_tables import ConnectedVehicleTable, handle_table_error
+from src.utilities.extensions.datetime_extension import get_utc_epoch
+
+logger = logging.getLogger(__name__)
+
+LEASE_PREFIX = "lease#"
+# Lease items share the main table with the vehicle data, at a sort key no
+# real event can have.
+LEASE_EVENT_DATETIME = 0
+# A lease nobody released is deleted by TTL this long after it expired, the
+# slack keeps TTL's clock from ever racing the lease_expires check.
+LEASE_TTL_SLACK = timedelta(hours=1)
+
+_lease_stats = Counter()
+_lease_stats_lock = Lock()
+
+
+def new_lease_owner() -> str:
+    return uuid4().hex
+
+
+def acquire_lease(
+    table: Type[ConnectedVehicleTable], name: str, owner: str, seconds: float
+) -> bool:
+    """
+    Conditional update of the lease item for name. Succeeds when nobody holds
+    the lease, the holder let it expire, or owner already holds it (renewal).
+    Fails open when DynamoDB errors, so a lease problem never blocks a lookup.
+
+    The item only gets the lease attributes, without a programcode or
+    referenceid no index of the table sees it, and expires_at lets TTL
+    delete it when it is never released.
+    """
+    now = get_utc_epoch()
+    expires = now + int(seconds * 1000)
+    lease = table(LEASE_PREFIX + name, LEASE_EVENT_DATETIME)
+    try:
+        lease.update(
+            actions=[
+                table.timestamp.set(datetime.now(timezone.utc)),
+                table.lease_owner.set(owner),
+                table.lease_expires.set(expires),
+                table.expires_at.set(
+                    datetime.fromtimestamp(expires // 1000, timezone.utc)
+                    + LEASE_TTL_SLACK
+                ),
+            ],
+            condition=(
+                table.request_key.does_not_exist()
+                | (table.lease_expires < now)
+                | (table.lease_owner == owner)
+            ),
+        )
+        record_lease_stat("acquired")
+        return True
+    except Exception as e:
+        if is_conditional_check_failed(e):
+            record_lease_stat("contended")
+            return False
+        handle_table_error(table, e)
+        record_lease_stat("errors")
+        logger.warning(
+            "Lease: Unable to acquire lease {}, proceeding without it: {}".format(
+                name, e
+            ),
+            extra={"lease": name, "action": "AcquireLease"},
+        )
+        return True
+
+
+def release_lease(table: Type[ConnectedVehicleTable], name: str, owner: str):
+    lease = table(request_key=LEASE_PREFIX + name, event_datetime=LEASE_EVENT_DATETIME)
+    try:
+        lease.delete(condition=table.lease_owner == owner)
+        record_lease_stat("released")
+    except Exception as e:
+        if is_conditional_check_failed(e):
+            # expired and taken over by another caller, nothing to release
+            return
+        handle_table_error(table, e)
+        record_lease_stat("errors")
+        logger.warning(
+            "Lease: Unable to release lease {}: {}".format(name, e),
+            extra={"lease": name, "action": "ReleaseLease"},
+        )
+
+
+def is_conditional_check_failed(exception: Exception) -> bool:
+    return (
+        getattr(exception, "cause_response_code", None)
+        == "ConditionalCheckFailedException"
+    )
+
+
+def record_lease_stat(name: str):
+    with _lease_stats_lock:
+        _lease_stats[name] += 1
+
+
+def get_lease_stats():
+    """acquired, contended (someone else held it), released and errors."""
+    with _lease_stats_lock:
+        return {
+            name: _lease_stats[name]
+            for name in ("acquired", "contended", "released", "errors")
+        }
+
+
+def reset_lease_stats():
+    with _lease_stats_lock:
+        _lease_stats.clear()
@@ -0,0 +1,20 @@
+from typing import FrozenSet, List, Optional
+
+# Read with every projection so pynamodb can build the item and latest items
+# can be turned back into their record.
+KEY_ATTRIBUTES = ("request_key", "event_datetime", "latest_event_datetime")
+
+
+def projection(*attributes: str) -> FrozenSet[str]:
+    """Attributes a lookup maps into its response. None means the full item,
+    JSONData included."""
+    return frozenset(KEY_ATTRIBUTES + attributes)
+
+
+def attributes_to_get(attributes: Optional[FrozenSet[str]]) -> Optional[List[str]]:
+    return sorted(attributes) if attributes is not None else None
+
+
+def covers(attributes: Optional[FrozenSet[str]], required) -> bool:
+    """Whether an item read with attributes has everything required has."""
+    return attributes is None or (required is not None and required <= attributes)
@@ -1,3 +1,5 @@
+import logging
+from threading import Lock
 from typing import Type
 
 from pynamodb.attributes import NumberAttribute
@@ -5,13 +7,49 @@ from pynamodb.attributes import UnicodeAttribute
 from pynamodb.attributes import BooleanAttribute
 from pynamodb.attributes import JSONAttribute
 from pynamodb.attributes import UTCDateTimeAttribute
+from pynamodb.attributes import UnicodeSetAttribute
+from pynamodb.attributes import TTLAttribute
+from pynamodb.exceptions import TableDoesNotExist
+from pynamodb.indexes import GlobalSecondaryIndex
+from pynamodb.indexes import KeysOnlyProjection
 from pynamodb.models import Model
 from src.config.dynamo_config import DynamoConfig
+from src.utilities.request_context import DeadlineExceeded, is_deadline_exceeded
+
+logger = logging.getLogger(__name__)
+
+# (table name, endpoint) pairs already confirmed to exist in this container
+_ready_tables = set()
+_ready_tables_lock = Lock()
+
+DEADLINE_HANDLER_ID = "cv-request-deadline"
+
+
+class ProgramCodeIndex(GlobalSecondaryIndex):
+    """Keys of a programcode's items by event_datetime, the items themselves
+    are read by key, see dynamodb_indexes."""
+
+    class Meta:
+        index_name = "gsi-programcode-keys-index"
+        projection = KeysOnlyProjection()
+
+    programcode = UnicodeAttribute(hash_key=True)
+    event_datetime = NumberAttribute(range_key=True)
+
+
+class SupplementProgramCodeIndex(GlobalSecondaryIndex):
+    class Meta:
+        index_name = "gsi-programcode-keys-index"
+        projection = KeysOnlyProjection()
+
+    programcode = UnicodeAttribute(hash_key=True)
+    event_datetime = NumberAttribute(range_key=True)
 
 
 class ConnectedVehicleTable(Model):
     class Meta:
         region = "us-east-1"
+        billing_mode = "PAY_PER_REQUEST"
 
     request_key = UnicodeAttribute(hash_key=True)
     event_datetime = NumberAttribute(range_key=True)
@@ -64,11 +102,26 @@ class ConnectedVehicleTable(Model):
     cruisingrange = UnicodeAttribute(null=True)
     ismoving = BooleanAttribute(null=True)
     JSONData = JSONAttribute(null=True)
+    # only set on lease items, see dynamodb_lease
+    lease_owner = UnicodeAttribute(null=True)
+    lease_expires = NumberAttribute(null=True)
+    # DynamoDB deletes the item some time after this, see
+    # TimeToLiveSpecification in the database stack. Only set on lease items.
+    expires_at = TTLAttribute(null=True)
+    # only set on latest items, see dynamodb_latest
+    latest_event_datetime = NumberAttribute(null=True)
+    # only set on identity items, see dynamodb_identity
+    source_request_key = UnicodeAttribute(null=True)
+    source_programcode = UnicodeAttribute(null=True)
+    programcodes = UnicodeSetAttribute(null=True)
+
+    programcode_index = ProgramCodeIndex()
 
 
 class ConnectedVehicleSupplementTable(Model):
     class Meta:
         region = "us-east-1"
+        billing_mode = "PAY_PER_REQUEST"
 
     request_key = UnicodeAttribute(hash_key=True)
     event_datetime = NumberAttribute(range_key=True)
@@ -135,32 +188,118 @@ class ConnectedVehicleSupplementTable(Model):
     tirepressurerearleft = NumberAttribute(null=True)
     tirepressurerearright = NumberAttribute(null=True)
 
+    programcode_index = SupplementProgramCodeIndex()
+
 
 def get_main_table(config: DynamoConfig) -> Type[ConnectedVehicleTable]:
     ConnectedVehicleTable.Meta.table_name = config.table_name
     ConnectedVehicleTable.Meta.host = config.endpoint
-
-    # Create the table
-    if not ConnectedVehicleTable.exists():
-        ConnectedVehicleTable.create_table(
-            read_capacity_units=1,
-            write_capacity_units=1,
-            billing_mode="PAY_PER_REQUEST",
-            wait=True,
-        )
+    apply_connection_settings(ConnectedVehicleTable, config)
+    ensure_table_ready(ConnectedVehicleTable)
     return ConnectedVehicleTable
 
 
 def get_supplement_table(config: DynamoConfig) -> Type[ConnectedVehicleSupplementTable]:
     ConnectedVehicleSupplementTable.Meta.table_name = config.supplement_table_name
     ConnectedVehicleSupplementTable.Meta.host = config.endpoint
-
-    # Create the table
-    if not ConnectedVehicleSupplementTable.exists():
-        ConnectedVehicleSupplementTable.create_table(
-            read_capacity_units=1,
-            write_capacity_units=1,
-            billing_mode="PAY_PER_REQUEST",
-            wait=True,
-        )
+    apply_connection_settings(ConnectedVehicleSupplementTable, config)
+    ensure_table_ready(ConnectedVehicleSupplementTable)
     return ConnectedVehicleSupplementTable
+
+
+def apply_connection_settings(table: Type[Model], config: DynamoConfig):
+    """
+    Configured timeouts and retries for the table's connection, and a check
+    that fails its calls fast once the request deadline has passed. botocore
+    fixes its timeouts when the client is created, so the deadline can't
+    shorten a single call; it keeps a late call, or a retry, from starting.
+    """
+    if config.connect_timeout is not None:
+        table.Meta.connect_timeout_seconds = config.connect_timeout
+    if config.read_timeout is not None:
+        table.Meta.read_timeout_seconds = config.read_timeout
+    if config.max_retry_attempts is not None:
+        table.Meta.max_retry_attempts = config.max_retry_attempts
+    watch_request_deadline(table)
+
+
+def watch_request_deadline(table: Type[Model]):
+    # the unique id registers the handler once per client
+    events = table._get_connection().connection.client.meta.events
+    events.register(
+        "before-send.dynamodb",
+        reject_past_deadline,
+        unique_id=DEADLINE_HANDLER_ID,
+    )
+
+
+def reject_past_deadline(**kwargs):
+    if is_deadline_exceeded():
+        raise DeadlineExceeded("Request deadline passed before the DynamoDB call")
+
+
+def ensure_table_ready(table: Type[Model]) -> bool:
+    """
+    Verifies a table with DescribeTable on first use and remembers the result per
+    table name and endpoint, so later requests skip the round trip.
+    """
+    key = readiness_key(table)
+    if key in _ready_tables:
+        return True
+
+    with _ready_tables_lock:
+        if key in _ready_tables:
+            return True
+        if table.exists():
+            _ready_tables.add(key)
+            return True
+
+    logger.error(
+        "DynamoDB: Table {} does not exist at endpoint {}, run the table bootstrap".format(
+            table.Meta.table_name, table.Meta.host
+        ),
+        extra={"table": table.Meta.table_name, "action": "EnsureTableReady"},
+    )
+    return False
+
+
+def invalidate_table_readiness(table: Type[Model] = None):
+    with _ready_tables_lock:
+        if table is None:
+            _ready_tables.clear()
+        else:
+            _ready_tables.discard(readiness_key(table))
+
+
+def handle_table_error(table: Type[Model], exception: Exception):
+    # Only a missing table forces the next get_*_table call to verify it again
+    if is_resource_not_found(exception):
+        invalidate_table_readiness(table)
+
+
+def is_resource_not_found(exception: Exception) -> bool:
+    return (
+        isinstance(exception, TableDoesNotExist)
+        or getattr(exception, "cause_response_code", None)
+        == "ResourceNotFoundException"
+    )
+
+
+def readiness_key(table: Type[Model]):
+    return (table.Meta.table_name, getattr(table.Meta, "host", None))
+
+
+def bootstrap_tables(config: DynamoConfig):
+    """
+    Explicit create-if-missing step for the main and supplement tables.
+    Deployed stages get their tables from the database stacks; this is for local setups.
+    """
+    for table in (get_main_table(config), get_supplement_table(config)):
+        if not ensure_table_ready(table):
+            table.create_table(
+                read_capacity_units=1,
+                write_capacity_units=1,
+                billing_mode="PAY_PER_REQUEST",
+                wait=True,
+            )
+            ensure_table_ready(table)
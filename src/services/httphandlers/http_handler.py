@@ -0,0 +1,91 @@
+from threading import Lock
+from typing import Tuple
+
+from requests import Session
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+
+from src.utilities.request_context import get_call_timeout
+
+# One keep-alive session per provider, kept for the life of the container so
+# warm invocations reuse the TLS connections to the gateway.
+_sessions = {}
+_sessions_lock = Lock()
+
+# Used when a provider config leaves connect_timeout/read_timeout unset
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 10.0
+
+
+def get_http_session(provider, root_cert, pool_size=None) -> Session:
+    pool_size = pool_size or DEFAULT_POOLSIZE
+    entry = _sessions.get(provider)
+    if entry is None or entry[1:] != (root_cert, pool_size):
+        with _sessions_lock:
+            entry = _sessions.get(provider)
+            if entry is None or entry[1:] != (root_cert, pool_size):
+                if entry is not None:
+                    entry[0].close()
+                entry = (setup_http_session(root_cert, pool_size), root_cert, pool_size)
+                _sessions[provider] = entry
+    return entry[0]
+
+
+def provider_timeout(config) -> Tuple[float, float]:
+    """(connect, read) timeout configured for a provider."""
+    return (
+        getattr(config, "connect_timeout", None) or DEFAULT_CONNECT_TIMEOUT,
+        getattr(config, "read_timeout", None) or DEFAULT_READ_TIMEOUT,
+    )
+
+
+def request_timeout(config) -> Tuple[float, float]:
+    """provider_timeout with both parts cut down to the time the request has
+    left, for the timeout argument of a requests call."""
+    connect, read = provider_timeout(config)
+    return get_call_timeout(connect), get_call_timeout(read)
+
+
+def setup_http_session(root_cert, pool_size) -> Session:
+    session = Session()
+    session.verify = root_cert
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def close_http_sessions(provider=None):
+    with _sessions_lock:
+        providers = list(_sessions) if provider is None else [provider]
+        for name in providers:
+            entry = _sessions.pop(name, None)
+            if entry is not None:
+                entry[0].close()
+
+
+def get_http_session_stats(provider=None):
+    """Connection counters per provider. Every request beyond the number of
+    connections opened went over an already established TLS connection."""
+    providers = list(_sessions) if provider is None else [provider]
+    stats = {}
+    for name in providers:
+        entry = _sessions.get(name)
+        if entry is None:
+            continue
+        connections, requests = 0, 0
+        for adapter in set(entry[0].adapters.values()):
+            poolmanager = getattr(adapter, "poolmanager", None)
+            if poolmanager is None:
+                continue
+            for key in poolmanager.pools.keys():
+                pool = poolmanager.pools.get(key)
+                if pool is not None:
+                    connections += pool.num_connections
+                    requests += pool.num_requests
+        stats[name] = {
+            "pool_size": entry[2],
+            "connections_opened": connections,
+            "requests": requests,
+            "connections_reused": max(requests - connections, 0),
+        }
+    return stats
@@ -0,0 +1,210 @@
+import json
+import logging
+import queue
+from threading import Lock, Thread
+from typing import List
+from uuid import uuid4
+
+from src.config.dynamo_config import DynamoConfig
+from src.config.ingestion_config import IngestionConfig
+from src.services.dynamodb_batch import batch_save
+from src.services.dynamodb_identity import save_record_items
+from src.services.dynamodb_tables import (
+    get_main_table,
+    get_supplement_table,
+    handle_table_error,
+)
+from src.services.service_manager import get_config_manager
+
+logger = logging.getLogger(__name__)
+
+# SQS hands a consumer at most 10 messages per receive
+DEFAULT_BATCH_SIZE = 10
+
+_ingestion_queue = None
+_ingestion_queue_lock = Lock()
+
+
+def ingestion_enabled(service) -> bool:
+    """True when service's pushes go through the ingestion queue
+    (ingestion_queue_enable) instead of being saved in the request."""
+    config = getattr(service, "_config", None)
+    return getattr(config, "ingestion_queue_enable", None) is True and hasattr(
+        service, "queue_vehicledata"
+    )
+
+
+class SqsIngestionQueue:
+    def __init__(self, queue_url, endpoint=None):
+        import boto3
+
+        self.queue_url = queue_url
+        self._client = boto3.client("sqs", endpoint_url=endpoint)
+
+    def send(self, body: str):
+        self._client.send_message(QueueUrl=self.queue_url, MessageBody=body)
+
+
+class LocalIngestionQueue:
+    """Stand-in for SQS when no queue_url is configured. Messages are consumed
+    in batches on a daemon thread by the same code as the Lambda consumer."""
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_lock = Lock()
+
+    def send(self, body: str):
+        self._queue.put({"messageId": str(uuid4()), "body": body})
+        self._ensure_thread()
+
+    def _ensure_thread(self):
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, name="ingestion", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            records = [self._queue.get()]
+            while len(records) < self.batch_size:
+                try:
+                    records.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                consume_records(records)
+            except Exception as e:
+                logger.error(
+                    "IngestVehicleData: Local consumer failed: {}".format(e),
+                    exc_info=True,
+                    extra={"action": "IngestVehicleData"},
+                )
+
+
+def get_ingestion_queue():
+    global _ingestion_queue
+    if _ingestion_queue is None:
+        with _ingestion_queue_lock:
+            if _ingestion_queue is None:
+                config = get_config_manager().retrieve_config(IngestionConfig)
+                if config.queue_url:
+                    _ingestion_queue = SqsIngestionQueue(
+                        config.queue_url, config.endpoint
+                    )
+                else:
+                    _ingestion_queue = LocalIngestionQueue(
+                        config.batch_size or DEFAULT_BATCH_SIZE
+                    )
+    return _ingestion_queue
+
+
+def send_vehicledata_rows(
+    msisdn, programcode, ctsversion, row, supplement_row=None, latest_item=False
+):
+    """Enqueues the mapped main and supplement table rows of a push. The
+    rows travel in DynamoDB's wire format, so the consumer needs no provider
+    code and event_datetime stays the time the push arrived. latest_item
+    has the consumer update the latest item of row too."""
+    get_ingestion_queue().send(
+        json.dumps(
+            {
+                "msisdn": msisdn,
+                "programcode": programcode,
+                "ctsversion": ctsversion,
+                "latest_item": latest_item,
+                "row": row._serialize(attr_map=True)["attributes"],
+                "supplement_row": (
+                    supplement_row._serialize(attr_map=True)["attributes"]
+                    if supplement_row is not None
+                    else None
+                ),
+            }
+        )
+    )
+
+
+def consume_records(records) -> List[str]:
+    """
+    Writes the rows of a batch of ingestion messages with BatchWriteItem.
+    Returns the messageIds whose main table row could not be written, so
+    only those are redelivered. Unreadable messages are logged and dropped,
+    a retry can't fix them.
+    """
+    dynamo_config = get_config_manager().retrieve_config(DynamoConfig)
+    table = get_main_table(dynamo_config)
+    supplement_table = get_supplement_table(dynamo_config)
+
+    messages = []
+    for record in records:
+        try:
+            message = json.loads(record["body"])
+            row = table.from_raw_data(message["row"])
+            supplement_row = (
+                supplement_table.from_raw_data(message["supplement_row"])
+                if message.get("supplement_row")
+                else None
+            )
+        except Exception as e:
+            logger.error(
+                "IngestVehicleData: Dropping unreadable message {}: {} body: {}".format(
+                    record.get("messageId"), e, record.get("body")
+                ),
+                extra={"action": "IngestVehicleData"},
+            )
+            continue
+        messages.append((record["messageId"], message, row, supplement_row))
+
+    unsaved = batch_save(
+        *[row for _, _, row, _ in messages],
+        *[supplement_row for _, _, _, supplement_row in messages],
+    )
+
+    failed = []
+    for message_id, message, row, supplement_row in messages:
+        extra = {
+            "msisdn": message["msisdn"],
+            "programcode": message["programcode"],
+            "cts-version": message["ctsversion"],
+            "action": "IngestVehicleData",
+        }
+        try:
+            if row in unsaved:
+                row.save()
+            save_record_items(table, row, message.get("latest_item", False))
+        except Exception as e:
+            handle_table_error(table, e)
+            logger.error(
+                "IngestVehicleData: Unable to save the vehicledata for msisdn: {}, message {} will be retried: {}".format(
+                    message["msisdn"], message_id, e
+                ),
+                extra=extra,
+            )
+            failed.append(message_id)
+            continue
+        if supplement_row is not None and supplement_row in unsaved:
+            try:
+                supplement_row.save()
+            except Exception as e:
+                handle_table_error(supplement_table, e)
+                logger.error(
+                    "IngestVehicleData: Error occured while saving data onto supplement table: {} for msisdn: {}".format(
+                        e, message["msisdn"]
+                    ),
+                    extra=extra,
+                )
+        logger.info(
+            "IngestVehicleData: Saved queued vehicledata for msisdn: {}".format(
+                message["msisdn"]
+            ),
+            extra=extra,
+        )
+    return failed
+
+
+def consume_ingestion_event(event) -> dict:
+    """SQS event handler result in the partial batch response format, the
+    event source mapping needs ReportBatchItemFailures."""
+    failed = consume_records(event.get("Records") or [])
+    return {"batchItemFailures": [{"itemIdentifier": id} for id in failed]}
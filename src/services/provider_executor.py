@@ -0,0 +1,61 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Lock
+
+DEFAULT_MAX_WORKERS = 10
+
+# One bounded pool per provider so a slow upstream can only tie up its own
+# threads and never the event loop or the other providers.
+_executors = {}
+_executors_lock = Lock()
+
+
+async def run_client_call(method, *args, **kwargs):
+    """Run a blocking client service method on its provider's thread pool and
+    await the result without stalling the event loop."""
+    executor = get_provider_executor(*provider_of(method))
+    # run_in_executor does not carry context vars over, so copy them to keep
+    # the request ids set by the middleware in the adapter's log records
+    context = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, partial(context.run, method, *args, **kwargs)
+    )
+
+
+def provider_of(method):
+    service = getattr(method, "__self__", None)
+    if service is None:
+        return "default", None
+    config = getattr(service, "_config", None)
+    return type(service).__name__, getattr(config, "pool_size", None)
+
+
+def get_provider_executor(provider, max_workers=None) -> ThreadPoolExecutor:
+    # Sized like the provider's http pool so every worker can hold a connection
+    max_workers = max_workers or DEFAULT_MAX_WORKERS
+    entry = _executors.get(provider)
+    if entry is None or entry[1] != max_workers:
+        with _executors_lock:
+            entry = _executors.get(provider)
+            if entry is None or entry[1] != max_workers:
+                if entry is not None:
+                    entry[0].shutdown(wait=False)
+                entry = (
+                    ThreadPoolExecutor(
+                        max_workers=max_workers,
+                        thread_name_prefix="provider-{}".format(provider),
+                    ),
+                    max_workers,
+                )
+                _executors[provider] = entry
+    return entry[0]
+
+
+def shutdown_provider_executors(wait=True):
+    with _executors_lock:
+        for executor, _ in _executors.values():
+            executor.shutdown(wait=wait)
+        _executors.clear()
@@ -0,0 +1,71 @@
+import asyncio
+from collections import Counter
+from threading import Lock
+
+from src.services.provider_executor import run_client_call
+
+
+class RequestCoalescer:
+    """Single-flight for identical client calls within this process.
+
+    The first caller for a key starts the upstream call, callers arriving
+    while it is in flight await the same result (or exception) instead of
+    starting their own. The call runs as its own task, so a caller that
+    disconnects does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self._stats = Counter()
+        self._stats_lock = Lock()
+
+    async def run(self, key, call):
+        task = self._inflight.get(key)
+        if task is None:
+            self._record("executed")
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            self._record("merged")
+        return await asyncio.shield(task)
+
+    def inflight(self):
+        return len(self._inflight)
+
+    def stats(self):
+        """executed went upstream, merged shared a call already in flight."""
+        with self._stats_lock:
+            return {
+                "executed": self._stats["executed"],
+                "merged": self._stats["merged"],
+                "inflight": self.inflight(),
+            }
+
+    def reset(self):
+        with self._stats_lock:
+            self._stats.clear()
+
+    def _forget(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def _record(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+
+request_coalescer = RequestCoalescer()
+
+
+async def run_coalesced_client_call(method, *args):
+    """run_client_call, shared with any identical call already in flight.
+    Calls are identical when they go to the same method of the same service
+    instance with the same arguments."""
+    # bound methods compare equal when bound to the same service instance
+    key = (method,) + args
+    return await request_coalescer.run(key, lambda: run_client_call(method, *args))
+
+
+def get_coalescing_stats():
+    return request_coalescer.stats()
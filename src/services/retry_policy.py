@@ -0,0 +1,109 @@
+import random
+from time import monotonic
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from src.utilities.request_context import get_remaining_time
+
+
+class RetryAttempt(BaseModel):
+    attempt: int
+    started_ms: float
+    waited_ms: float = 0
+    duration_ms: float = 0
+    requested: bool = False
+    found: bool = False
+
+
+class RetryPolicy:
+    """Polling schedule bounded by an overall deadline.
+
+    The first fast_polls waits are short because pushed data usually lands
+    within a few hundred ms. After that the wait grows exponentially from
+    initial_delay up to max_delay. Each wait is jittered down by up to jitter
+    of its length so concurrent lookups don't re-query in lockstep. No attempt
+    starts after the deadline. The deadline is max_wait from now, or the
+    remaining request time minus deadline_margin if that is sooner.
+    """
+
+    def __init__(
+        self,
+        max_wait: float,
+        max_delay: float,
+        initial_delay: float = 0.5,
+        multiplier: float = 2.0,
+        jitter: float = 0.2,
+        fast_polls: int = 2,
+        fast_poll_delay: float = 0.25,
+        deadline_margin: float = 2.0,
+        max_attempts: Optional[int] = None,
+    ):
+        self.max_delay = max_delay
+        self.initial_delay = min(initial_delay, max_delay)
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.fast_polls = fast_polls
+        self.fast_poll_delay = min(fast_poll_delay, max_delay)
+        self.max_attempts = max_attempts
+
+        self.started = monotonic()
+        self.deadline = self.started + max_wait
+        remaining = get_remaining_time()
+        if remaining is not None:
+            self.deadline = min(
+                self.deadline, self.started + remaining - deadline_margin
+            )
+
+        self.attempts: List[RetryAttempt] = []
+
+    def delay(self, attempt: int) -> float:
+        """Wait before the given attempt (0-based, attempt 0 never waits)."""
+        if attempt <= 0:
+            return 0.0
+        if attempt <= self.fast_polls:
+            delay = self.fast_poll_delay
+        else:
+            exponent = attempt - self.fast_polls - 1
+            delay = min(self.initial_delay * self.multiplier**exponent, self.max_delay)
+        return delay * (1 - random.uniform(0, self.jitter))  # nosec
+
+    def remaining(self) -> float:
+        return max(self.deadline - monotonic(), 0.0)
+
+    def next_wait(self, min_delay: float = 0.0) -> Optional[float]:
+        """Wait before the next attempt, or None when the policy is exhausted.
+        min_delay lengthens the schedule's wait, e.g. after a failed request
+        that should not be retried at the fast poll pace."""
+        attempt = len(self.attempts)
+        if self.max_attempts is not None and attempt >= self.max_attempts:
+            return None
+        if attempt == 0:
+            return 0.0 if self.remaining() > 0 else None
+        remaining = self.remaining()
+        delay = max(self.delay(attempt), min_delay)
+        # only worth waiting if there is still time to query afterwards
+        if remaining <= 0 or delay >= remaining:
+            return None
+        return delay
+
+    def start_attempt(self, waited: float) -> RetryAttempt:
+        attempt = RetryAttempt(
+            attempt=len(self.attempts),
+            started_ms=round((monotonic() - self.started) * 1000, 1),
+            waited_ms=round(waited * 1000, 1),
+        )
+        self.attempts.append(attempt)
+        return attempt
+
+    def finish_attempt(self, attempt: RetryAttempt, found: bool):
+        attempt.found = found
+        attempt.duration_ms = round(
+            (monotonic() - self.started) * 1000 - attempt.started_ms, 1
+        )
+
+    def timings(self):
+        return [attempt.dict() for attempt in self.attempts]
+
+    def elapsed_ms(self) -> float:
+        return round((monotonic() - self.started) * 1000, 1)
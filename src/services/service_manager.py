@@ -1,7 +1,7 @@
+from threading import Lock
 from typing import Optional
 
 from pydantic import BaseModel
-from src.aeris.services.aeris_service import AerisService
 from src.config.aeris_config import AerisConfig
 from src.config.configuration_manager import setup_config_manager
 from src.config.dynamo_config import DynamoConfig
@@ -11,17 +11,10 @@ from src.config.tmna_config import TmnaConfig
 from src.config.verizon_config import VerizonConfig
 from src.config.vodafone_config import VodafoneConfig
 from src.config.wirelesscar_config import WirelessCarConfig
-from src.fca.services.fca_service import FcaService
 from src.models.enums.ctsversion_type import CtsVersion
 from src.models.enums.programcode_type import ProgramCode
 from src.services.client_service import ClientService
-from src.services.dynamodb_tables import get_main_table, get_supplement_table
-from src.siriusxm.services.siriusxm_service import SiriusXmService
-from src.tmna.services.tmna_service import TmnaService
 from src.utilities.extensions.string_extension import isnull_whitespaceorempty
-from src.verizon.services.verizon_service import VerizonService
-from src.vodafone.services.vodafone_service import VodafoneService
-from src.wirelesscar.services.wirelesscar_service import WirelessCarService
 
 
 class ServiceManager(BaseModel):
@@ -31,12 +24,67 @@ class ServiceManager(BaseModel):
         arbitrary_types_allowed = True
 
 
+# Client services are built once per (programcode, ctsversion) and reused for the
+# lifetime of the container, so config parsing and adapter setup stay off the request path.
+_service_registry = {}
+_service_registry_lock = Lock()
+_config_manager = None
+
+
 # use program code to decide right service.
 def setup_service_manager(
     programcode, version: Optional[str] = CtsVersion.ONE_DOT_ZERO
 ) -> ServiceManager:
-    config_manager = setup_config_manager()
     version = CtsVersion.ONE_DOT_ZERO if isnull_whitespaceorempty(version) else version
+    key = registry_key(programcode, version)
+
+    service = _service_registry.get(key)
+    if service is None:
+        with _service_registry_lock:
+            service = _service_registry.get(key)
+            if service is None:
+                service = create_client_service(
+                    programcode, version, get_config_manager()
+                )
+                if service is not None:
+                    _service_registry[key] = service
+    return ServiceManager(client_service=service)
+
+
+def invalidate_service_registry(programcode=None, version: Optional[str] = None):
+    """
+    Drops cached client services so the next request rebuilds them from fresh config.
+    Without arguments the whole registry, including the cached config manager, is cleared.
+    """
+    global _config_manager
+    with _service_registry_lock:
+        if programcode is None:
+            _service_registry.clear()
+            _config_manager = None
+            return
+        version = (
+            CtsVersion.ONE_DOT_ZERO if isnull_whitespaceorempty(version) else version
+        )
+        _service_registry.pop(registry_key(programcode, version), None)
+
+
+def registry_key(programcode, version):
+    return (
+        programcode.lower() if programcode else programcode,
+        getattr(version, "value", version),
+    )
+
+
+def get_config_manager():
+    global _config_manager
+    if _config_manager is None:
+        _config_manager = setup_config_manager()
+    return _config_manager
+
+
+def create_client_service(
+    programcode, version, config_manager
+) -> Optional[ClientService]:
     service = None
 
     if (
@@ -50,69 +98,118 @@ def setup_service_manager(
             and version == CtsVersion.ONE_DOT_ZERO
         )
     ):
-        service = SiriusXmService(
-            config=config_manager.retrieve_config(SiriusXmConfig),
-            table=get_main_table(config_manager.retrieve_config(DynamoConfig)),
-        )
+        service = create_siriusxm_service(config_manager)
     elif (
         programcode
         and programcode.lower() == ProgramCode.FCA.name.lower()
         and version == CtsVersion.ONE_DOT_ZERO
     ):
-        service = FcaService(
-            config=config_manager.retrieve_config(FcaConfig),
-            table=get_main_table(config_manager.retrieve_config(DynamoConfig)),
-            supplementtable=get_supplement_table(
-                config_manager.retrieve_config(DynamoConfig)
-            ),
-        )
+        service = create_fca_service(config_manager)
     elif (
         programcode
         and programcode.lower() == ProgramCode.VWCARNET.name.lower()
         and version == CtsVersion.ONE_DOT_ZERO
     ):
-        service = VerizonService(
-            config=config_manager.retrieve_config(VerizonConfig),
-            table=get_main_table(config_manager.retrieve_config(DynamoConfig)),
-            supplementtable=get_supplement_table(
-                config_manager.retrieve_config(DynamoConfig)
-            ),
-        )
+        service = create_verizon_service(config_manager)
     elif (
         programcode
         and programcode.lower() == ProgramCode.VWCARNET.name.lower()
         and version == CtsVersion.TWO_DOT_ZERO
     ):
-        service = AerisService(
-            config=config_manager.retrieve_config(AerisConfig),
-            table=get_main_table(config_manager.retrieve_config(DynamoConfig)),
-        )
+        service = create_aeris_service(config_manager)
     elif (
         programcode
         and programcode.lower() == ProgramCode.PORSCHE.name.lower()
         and version == CtsVersion.ONE_DOT_ZERO
     ):
-        service = VodafoneService(
-            config=config_manager.retrieve_config(VodafoneConfig),
-            table=get_main_table(config_manager.retrieve_config(DynamoConfig)),
-            supplementtable=get_supplement_table(
-                config_manager.retrieve_config(DynamoConfig)
-            ),
-        )
+        service = create_vodafone_service(config_manager)
     elif (
         programcode
         and programcode.lower() == ProgramCode.TOYOTA.name.lower()
         and version == CtsVersion.TWO_DOT_ZERO
     ):
-        service = TmnaService(
-            config=config_manager.retrieve_config(TmnaConfig),
-        )
+        service = create_tmna_service(config_manager)
     elif (
         programcode
         and programcode.lower() == ProgramCode.SUBARU.name.lower()
         and version == CtsVersion.TWO_DOT_ZERO
     ):
-        service = WirelessCarService(
-            config=config_manager.retrieve_config(WirelessCarConfig),
-        )
-    return ServiceManager(client_service=service)
+        service = create_wirelesscar_service(config_manager)
+    return service
+
+
+# Provider modules are imported on first use, so a container only loads zeep,
+# pynamodb and the provider models for the program codes it actually serves.
+def create_siriusxm_service(config_manager) -> ClientService:
+    from src.services.dynamodb_tables import get_main_table
+    from src.siriusxm.services.siriusxm_service import SiriusXmService
+
+    return SiriusXmService(
+        config=config_manager.retrieve_config(SiriusXmConfig),
+        table=get_main_table(config_manager.retrieve_config(DynamoConfig)),
+    )
+
+
+def create_fca_service(config_manager) -> ClientService:
+    from src.fca.services.fca_service import FcaService
+    from src.services.dynamodb_tables import get_main_table, get_supplement_table
+
+    return FcaService(
+        config=config_manager.retrieve_config(FcaConfig),
+        table=get_main_table(config_manager.retrieve_config(DynamoConfig)),
+        supplementtable=get_supplement_table(
+            config_manager.retrieve_config(DynamoConfig)
+        ),
+    )
+
+
+def create_verizon_service(config_manager) -> ClientService:
+    from src.services.dynamodb_tables import get_main_table, get_supplement_table
+    from src.verizon.services.verizon_service import VerizonService
+
+    return VerizonService(
+        config=config_manager.retrieve_config(VerizonConfig),
+        table=get_main_table(config_manager.retrieve_config(DynamoConfig)),
+        supplementtable=get_supplement_table(
+            config_manager.retrieve_config(DynamoConfig)
+        ),
+    )
+
+
+def create_aeris_service(config_manager) -> ClientService:
+    from src.aeris.services.aeris_service import AerisService
+    from src.services.dynamodb_tables import get_main_table
+
+    return AerisService(
+        config=config_manager.retrieve_config(AerisConfig),
+        table=get_main_table(config_manager.retrieve_config(DynamoConfig)),
+    )
+
+
+def create_vodafone_service(config_manager) -> ClientService:
+    from src.services.dynamodb_tables import get_main_table, get_supplement_table
+    from src.vodafone.services.vodafone_service import VodafoneService
+
+    return VodafoneService(
+        config=config_manager.retrieve_config(VodafoneConfig),
+        table=get_main_table(config_manager.retrieve_config(DynamoConfig)),
+        supplementtable=get_supplement_table(
+            config_manager.retrieve_config(DynamoConfig)
+        ),
+    )
+
+
+def create_tmna_service(config_manager) -> ClientService:
+    from src.tmna.services.tmna_service import TmnaService
+
+    return TmnaService(
+        config=config_manager.retrieve_config(TmnaConfig),
+    )
+
+
+def create_wirelesscar_service(config_manager) -> ClientService:
+    from src.wirelesscar.services.wirelesscar_service import WirelessCarService
+
+    return WirelessCarService(
+        config=config_manager.retrieve_config(WirelessCarConfig),
+    )
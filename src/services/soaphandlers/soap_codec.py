@@ -0,0 +1,264 @@
+"""
+Zeep-free codec for the few fixed shape SOAP operations on the hot path:
+SiriusXM agentAssigned and terminate, Verizon RequestVehicleLocation.
+
+Requests are rendered from envelope templates built once at import, replies
+are read by a streaming parser that only picks out the elements the services
+use. Neither needs the WSDL, so a container serving only these operations
+never imports zeep. Zeep stays the fallback, soap_fast_path on the provider
+config switches between the two, and the tests hold both to the same wire
+format.
+"""
+
+from io import BytesIO
+from typing import Dict, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from lxml import etree
+
+from src.services.circuit_breaker import call_through, is_server_error
+
+SOAP_ENV = "http://schemas.xmlsoap.org/soap/envelope/"
+
+
+class SoapFault(Exception):
+    """A soap Fault reply, or a reply that is no soap envelope at all."""
+
+    def __init__(self, message, code=None, status_code=None):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+        self.status_code = status_code
+
+
+class ReplyShape:
+    """
+    What to read out of a reply: the text of each of fields, children of the
+    body element named element, None for those missing. The fields named in
+    groups are elements of their own read into a dict of their group's
+    fields, a list of such dicts for the ones in repeated.
+    """
+
+    def __init__(self, element, fields, groups=None, repeated=()):
+        self.element = element
+        self.fields = fields
+        self.groups = groups or {}
+        self.repeated = frozenset(repeated)
+
+    def new_body(self):
+        body = dict.fromkeys(self.fields)
+        for name in self.repeated:
+            body[name] = []
+        return body
+
+
+class SoapOperation:
+    """Request envelope template, SOAPAction and reply shape of one
+    document/literal SOAP 1.1 operation."""
+
+    def __init__(self, name, soapaction, body_template, reply: ReplyShape):
+        self.name = name
+        self.reply = reply
+        self.headers = {
+            "Content-Type": "text/xml; charset=utf-8",
+            "SOAPAction": '"{}"'.format(soapaction),
+        }
+        self._template = (
+            "<?xml version='1.0' encoding='utf-8'?>\n"
+            '<soap-env:Envelope xmlns:soap-env="{}">'
+            "<soap-env:Body>{}</soap-env:Body>"
+            "</soap-env:Envelope>"
+        ).format(SOAP_ENV, body_template)
+
+    def envelope(self, **values) -> bytes:
+        return self._template.format(
+            **{name: xml_text(value) for name, value in values.items()}
+        ).encode("utf-8")
+
+
+def xml_text(value) -> str:
+    """value escaped as zeep sends it: booleans as xsd booleans, anything
+    else, a datetime for an xsd string say, as its str."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return escape(str(value))
+
+
+SIRIUSXM_NS = "http://www.atxg.com/schemas/t3/ts/svcpartnersvc"
+# ResponseMessageType of the svcpartnercommon schema
+SIRIUSXM_REPLY_FIELDS = ("reference-id", "result-code", "result-msg")
+
+AGENT_ASSIGNED = SoapOperation(
+    "agentAssigned",
+    "agentAssigned",
+    '<ns0:agent-assigned-request-message xmlns:ns0="{}">'
+    "<ns0:reference-id>{{reference_id}}</ns0:reference-id>"
+    "<ns0:is-assigned>{{is_assigned}}</ns0:is-assigned>"
+    "</ns0:agent-assigned-request-message>".format(SIRIUSXM_NS),
+    ReplyShape("agent-assigned-response-message", SIRIUSXM_REPLY_FIELDS),
+)
+
+TERMINATE = SoapOperation(
+    "terminate",
+    "terminate",
+    '<ns0:terminate-request-message xmlns:ns0="{}">'
+    "<ns0:reference-id>{{reference_id}}</ns0:reference-id>"
+    "</ns0:terminate-request-message>".format(SIRIUSXM_NS),
+    ReplyShape("terminate-response-message", SIRIUSXM_REPLY_FIELDS),
+)
+
+VERIZON_NS = "http://xmlns.hughestelematics.com/VehicleLocation"
+
+REQUEST_VEHICLE_LOCATION = SoapOperation(
+    "RequestVehicleLocation",
+    "http://xmlns.hughestelematics.com/RequestVehicleLocationPortType/RequestVehicleLocation",
+    '<ns0:VehicleLocationRequest xmlns:ns0="{}">'
+    "<ns0:Header>"
+    "<ns0:SourceName>{{source_name}}</ns0:SourceName>"
+    "<ns0:TargetName>{{target_name}}</ns0:TargetName>"
+    "<ns0:TransactionId>{{transaction_id}}</ns0:TransactionId>"
+    "<ns0:Timestamp>{{timestamp}}</ns0:Timestamp>"
+    "</ns0:Header>"
+    "<ns0:CTIInteractionID>{{cti_interaction_id}}</ns0:CTIInteractionID>"
+    "<ns0:MDN>{{mdn}}</ns0:MDN>"
+    "</ns0:VehicleLocationRequest>".format(VERIZON_NS),
+    ReplyShape(
+        "VehicleLocationResponse",
+        (
+            "CallIdNumber",
+            "CallDate",
+            "CallTime",
+            "CustomerFirstName",
+            "CustomerLastName",
+            "VehicleYear",
+            "Make",
+            "Model",
+            "ExteriorColor",
+            "VIN",
+            "FromLocationAddress",
+            "FromLocationCity",
+            "FromLocationState",
+            "FromLocationZip",
+            "FromLocationCountry",
+            "FromLocationLatitude",
+            "FromLocationLongitude",
+            "FromLocationPhoneNo",
+            "Altitude",
+            "Direction_heading",
+            "Location_confidence",
+            "Location_trueness",
+            "Cruising_range",
+            "Is_moving",
+            "Hmi_language",
+            "SRNumber",
+            "ServiceKeyData",
+            "Response",
+        ),
+        groups={
+            "ServiceKeyData": (
+                "ServiceKeyDataID",
+                "ServiceKeyDataCategory",
+                "ServiceKeyDataSubCategory",
+                "ServiceKeyDataValue",
+                "ServiceKeyDataPriority",
+                "ServiceKeyDataLanguageCode",
+            ),
+            "Response": ("ResponseCode", "ResponseStatus", "ResponseDescription"),
+        },
+        repeated=("ServiceKeyData",),
+    ),
+)
+
+
+def soap_fast_path_enabled(config) -> bool:
+    return getattr(config, "soap_fast_path", None) is True
+
+
+def send(operation: SoapOperation, session, url, timeout, breaker=None, **values):
+    """Posts the envelope of operation for values to url, through breaker
+    when there is one, and returns the raw reply."""
+    return call_through(
+        breaker,
+        session.post,
+        url,
+        data=operation.envelope(**values),
+        headers=operation.headers,
+        timeout=timeout,
+        failed=is_server_error,
+    )
+
+
+def parse_reply(
+    response, shape: ReplyShape, header_names=()
+) -> Tuple[Optional[dict], Dict[str, str]]:
+    """
+    The body of a raw reply read as shape, None when the Body holds no
+    shape.element, and the text of the first element of each of
+    header_names found in the soap Header. Element names match in any
+    namespace. Raises SoapFault for a Fault, a reply that does not parse
+    and any other status than 200.
+    """
+    body, group, headers = None, None, {}
+    path = []
+    try:
+        for event, element in etree.iterparse(
+            BytesIO(response.content),
+            events=("start", "end"),
+            resolve_entities=False,
+            no_network=True,
+        ):
+            name = element.tag.rpartition("}")[2]
+            if event == "start":
+                if not path and element.tag != "{%s}Envelope" % SOAP_ENV:
+                    raise SoapFault(
+                        "Reply is no soap envelope but {}".format(element.tag),
+                        status_code=response.status_code,
+                    )
+                path.append(name)
+                if len(path) == 3 and path[1] == "Body" and name == shape.element:
+                    body = shape.new_body()
+                elif body is not None and len(path) == 4 and name in shape.groups:
+                    group = dict.fromkeys(shape.groups[name])
+                continue
+
+            depth = len(path)
+            path.pop()
+            if depth < 3:
+                continue
+            if path[1] == "Header":
+                if name in header_names and name not in headers:
+                    headers[name] = element.text
+            elif depth == 3 and name == "Fault":
+                raise SoapFault(
+                    element.findtext("faultstring") or "Unknown fault occured",
+                    code=element.findtext("faultcode"),
+                    status_code=response.status_code,
+                )
+            elif depth == 4 and body is not None:
+                if name in shape.repeated:
+                    body[name].append(group)
+                elif name in shape.groups:
+                    body[name] = group
+                elif name in body:
+                    body[name] = element.text
+            elif depth == 5 and group is not None and name in group:
+                group[name] = element.text
+            else:
+                continue
+            # read, the element is of no further use
+            element.clear()
+    except etree.XMLSyntaxError as e:
+        raise SoapFault(
+            "Server returned response ({}) with invalid XML: {}".format(
+                response.status_code, e
+            ),
+            status_code=response.status_code,
+        ) from e
+    if response.status_code != 200:
+        raise SoapFault(
+            "Server returned HTTP status {}".format(response.status_code),
+            status_code=response.status_code,
+        )
+    return body, headers
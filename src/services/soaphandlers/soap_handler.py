@@ -1,40 +1,146 @@
-from requests import Session
+import os
+from contextlib import contextmanager
+from functools import partial
+
+from lxml.etree import XMLSyntaxError
 from zeep import Client
 from zeep.cache import InMemoryCache
+from zeep.loader import parse_xml
 from zeep.transports import Transport
+from zeep.utils import get_media_type
 
 from src.models.exceptions.application_exception import ApplicationException
+from src.services.httphandlers.http_handler import setup_http_session
+from src.services.soaphandlers.wsdl_snapshot import SnapshotTransport, load_snapshot
+from src.services.soaphandlers.zeep_client_pool import (
+    DEFAULT_POOL_SIZE,
+    ZeepClientPool,
+    get_zeepclient_pool,
+)
 from src.utilities.extensions.string_extension import isnull_whitespaceorempty
+from src.utilities.request_context import get_call_timeout
 
 
-def get_zeepclient(wsdl, serviceurl, rootcert, key, localstore):
-    if not isinstance(localstore, dict):
-        raise ApplicationException(
-            "get_zeepclient: Dictionary param missing, please check"
-        )
+class DeadlineTransport(Transport):
+    """Transport whose operation timeout, seconds or (connect, read), is cut
+    down to the time the request has left each time zeep sends a message."""
+
+    @property
+    def operation_timeout(self):
+        timeout = self._operation_timeout
+        if isinstance(timeout, tuple):
+            return tuple(get_call_timeout(part) for part in timeout)
+        return get_call_timeout(timeout)
+
+    @operation_timeout.setter
+    def operation_timeout(self, timeout):
+        self._operation_timeout = timeout
+
 
+class DeadlineSnapshotTransport(SnapshotTransport, DeadlineTransport):
+    pass
+
+
+@contextmanager
+def checkout_zeepclient(
+    provider, wsdl, serviceurl, rootcert, pool_size=None, timeout=None
+):
+    """
+    A zeep client of the provider's pool for the with block, sending to
+    serviceurl with timeout, seconds or (connect, read), cut down to the time
+    the request has left. Waits up to the read timeout for a client while
+    all pool_size of them are busy.
+    """
     if (
-        isnull_whitespaceorempty(wsdl)
+        isnull_whitespaceorempty(provider)
+        or isnull_whitespaceorempty(wsdl)
         or isnull_whitespaceorempty(serviceurl)
-        or isnull_whitespaceorempty(key)
         or isnull_whitespaceorempty(rootcert)
     ):
-        raise ApplicationException("get_zeepclient: Input param can't be null or empty")
+        raise ApplicationException(
+            "checkout_zeepclient: Input param can't be null or empty"
+        )
 
-    if key not in localstore.keys():
-        setup_zeepclient(wsdl, serviceurl, rootcert, localstore, key)
-    else:
-        if not localstore[key].service._binding_options["address"] == serviceurl:
-            del localstore[key]
-            setup_zeepclient(wsdl, serviceurl, rootcert, localstore, key)
-    return localstore[key]
+    pool = get_zeepclient_pool(
+        provider,
+        (wsdl, serviceurl, rootcert, pool_size),
+        partial(
+            create_zeepclient_pool, provider, wsdl, serviceurl, rootcert, pool_size
+        ),
+    )
+    wait = timeout[1] if isinstance(timeout, tuple) else timeout
+    with pool.client(get_call_timeout(wait)) as client:
+        # the configured timeout, the transport cuts it down per call
+        client.transport.operation_timeout = timeout
+        yield client
 
 
-def setup_zeepclient(wsdl, serviceurl, rootcert, localstore, key):
-    session = Session()
-    session.verify = rootcert
-    transport = Transport(cache=InMemoryCache(), session=session)
+def create_zeepclient_pool(provider, wsdl, serviceurl, rootcert, pool_size=None):
+    # the clients of a pool share one keep-alive session sized to the pool
+    session = setup_http_session(rootcert, pool_size or DEFAULT_POOL_SIZE)
+    return ZeepClientPool(
+        provider,
+        partial(setup_zeepclient, wsdl, serviceurl, session),
+        pool_size,
+        on_close=session.close,
+    )
+
+
+def setup_zeepclient(wsdl, serviceurl, session) -> Client:
+    # A snapshot built by scripts/build_wsdl_snapshots.py saves reading the
+    # schema imports, including the remote one, on the first call
+    documents = load_snapshot(wsdl)
+    if documents is not None:
+        transport = DeadlineSnapshotTransport(
+            documents,
+            os.path.dirname(os.path.abspath(wsdl)),
+            cache=InMemoryCache(),
+            session=session,
+        )
+    else:
+        transport = DeadlineTransport(cache=InMemoryCache(), session=session)
     client = Client(wsdl=wsdl, transport=transport)
     #   Zeep takes the service url from wsdl by default, hence static wsdl demands the below override
     client.service._binding_options["address"] = serviceurl
-    localstore[key] = client
+    return client
+
+
+def process_reply(client, operation_name, response):
+    """
+    The deserialized body of a raw_response reply to operation_name and the
+    envelope it was read from, so header elements come out of the same
+    parsed tree. Replies zeep has to unpack or verify first (empty,
+    multipart, signed, or handled by plugins) go through the binding's
+    process_reply and come back without an envelope.
+    """
+    binding = client.service._binding
+    operation = binding._operations[operation_name]
+    if (
+        not response.content
+        or client.wsse is not None
+        or client.plugins
+        or get_media_type(response.headers.get("Content-Type", "text/xml"))
+        == "multipart/related"
+    ):
+        return binding.process_reply(client, operation, response), None
+    try:
+        envelope = parse_xml(
+            response.content, binding.transport, settings=client.settings
+        )
+    except XMLSyntaxError:
+        # the binding raises its TransportError with the content
+        return binding.process_reply(client, operation, response), None
+    fault = envelope.find("soap-env:Body/soap-env:Fault", namespaces=binding.nsmap)
+    if response.status_code != 200 or fault is not None:
+        return binding.process_error(envelope, operation), envelope
+    return operation.process_reply(envelope), envelope
+
+
+def get_header_text(envelope, name):
+    """Text of the first element named name, in any namespace, within the
+    soap Header of envelope. None when there is no such element."""
+    header = envelope.find("{*}Header") if envelope is not None else None
+    if header is None:
+        return None
+    element = header.find(".//{*}" + name)
+    return element.text if element is not None else None
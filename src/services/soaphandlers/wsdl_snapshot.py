@@ -0,0 +1,119 @@
+import hashlib
+import json
+import logging
+import os
+from urllib.parse import urlparse
+
+from zeep import __version__ as zeep_version
+from zeep.transports import Transport
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_SUFFIX = ".snapshot.json"
+
+
+class RecordingTransport(Transport):
+    """Transport that keeps a copy of every document zeep loads while parsing."""
+
+    def __init__(self, base_dir, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.base_dir = base_dir
+        self.documents = {}
+
+    def load(self, url):
+        content = super().load(url)
+        self.documents[document_key(url, self.base_dir)] = content.decode("utf-8")
+        return content
+
+
+class SnapshotTransport(Transport):
+    """Transport that serves WSDL/XSD documents from a snapshot before falling
+    back to the file system or the network."""
+
+    def __init__(self, documents, base_dir, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.base_dir = base_dir
+        self.documents = documents
+
+    def load(self, url):
+        content = self.documents.get(document_key(url, self.base_dir))
+        if content is not None:
+            return content.encode("utf-8")
+        logger.warning(
+            "SnapshotTransport: {} missing from snapshot, loading it".format(url),
+            extra={"url": url, "action": "SnapshotTransport"},
+        )
+        return super().load(url)
+
+
+def snapshot_path(wsdl):
+    return wsdl + SNAPSHOT_SUFFIX
+
+
+def document_key(url, base_dir):
+    # Remote documents are keyed by url, local ones relative to the wsdl folder
+    # so the snapshot stays valid wherever the package is unpacked.
+    parsed = urlparse(url)
+    if parsed.scheme in ("http", "https"):
+        return url
+    path = parsed.path if parsed.scheme == "file" else os.path.expanduser(url)
+    return os.path.relpath(os.path.abspath(path), base_dir).replace(os.sep, "/")
+
+
+def file_digest(path):
+    with open(path, "rb") as fh:
+        return hashlib.sha256(fh.read()).hexdigest()
+
+
+def build_snapshot(wsdl, session):
+    """Parse the wsdl once with zeep and return every document it needed,
+    including remote schema imports, in a json-serializable form."""
+    from zeep import Client
+
+    base_dir = os.path.dirname(os.path.abspath(wsdl))
+    transport = RecordingTransport(base_dir, session=session)
+    Client(wsdl=wsdl, transport=transport)
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "zeep_version": zeep_version,
+        "wsdl": document_key(wsdl, base_dir),
+        "wsdl_sha256": file_digest(wsdl),
+        "documents": transport.documents,
+    }
+
+
+def write_snapshot(wsdl, snapshot):
+    path = snapshot_path(wsdl)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(snapshot, fh, sort_keys=True)
+    return path
+
+
+def load_snapshot(wsdl):
+    """Return the snapshot documents for the wsdl, or None when there is no
+    usable snapshot and the wsdl has to be loaded the regular way."""
+    path = snapshot_path(wsdl)
+    if not os.path.isfile(path):
+        return None
+
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            snapshot = json.load(fh)
+    except (OSError, ValueError) as e:
+        logger.warning(
+            "load_snapshot: Unable to read {}: {}".format(path, e),
+            extra={"wsdl": wsdl, "action": "load_snapshot"},
+        )
+        return None
+
+    if (
+        snapshot.get("format") != SNAPSHOT_FORMAT
+        or snapshot.get("wsdl_sha256") != file_digest(wsdl)
+    ):
+        logger.warning(
+            "load_snapshot: {} is stale, please rebuild it".format(path),
+            extra={"wsdl": wsdl, "action": "load_snapshot"},
+        )
+        return None
+    return snapshot["documents"]
@@ -0,0 +1,189 @@
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from queue import Empty, LifoQueue
+from threading import Lock
+
+from requests.exceptions import Timeout
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+
+# One pool per provider for the life of the container. Zeep has no imports
+# here, the clients come from the factory soap_handler hands in, so /health
+# can report the pools without loading zeep.
+_pools = {}
+_pools_lock = Lock()
+
+
+class ZeepClientPoolTimeout(Timeout):
+    """Raised when no client of a pool came free in time."""
+
+
+class ZeepClientPool:
+    """
+    Up to size zeep clients of one wsdl, service url and certificate, each
+    used by one call at a time. A checkout takes an idle client, creates one
+    while fewer than size exist, and otherwise waits for a checkin. The last
+    client checked in is the next one out, keeping the fewest connections
+    busy. warm_up clients are created with the pool, so the first calls do
+    not parse the wsdl.
+
+    close() drops the idle clients, ones still checked out are dropped at
+    their checkin, and on_close is called once all are gone. A replaced pool
+    keeps serving the calls that hold its clients while the new one serves
+    the rest.
+    """
+
+    def __init__(self, name, factory, size=None, warm_up=1, on_close=None):
+        self.name = name
+        self.size = size or DEFAULT_POOL_SIZE
+        self._factory = factory
+        self._on_close = on_close
+        self._idle = LifoQueue()
+        self._lock = Lock()
+        self._created = 0
+        self._in_use = 0
+        self._closed = False
+        self._stats = Counter()
+        self.warm_up(warm_up)
+
+    def warm_up(self, count):
+        """Creates clients until there are count of them, or size."""
+        client = self._grow(count)
+        while client is not None:
+            self._keep(client)
+            client = self._grow(count)
+
+    def checkout(self, timeout=None):
+        """An idle client, a new one, or the first checked in within timeout
+        seconds. Raises ZeepClientPoolTimeout when none came free."""
+        try:
+            client = self._idle.get_nowait()
+        except Empty:
+            client = self._grow(self.size)
+            if client is None:
+                with self._lock:
+                    self._stats["waits"] += 1
+                try:
+                    client = self._idle.get(timeout=timeout)
+                except Empty:
+                    with self._lock:
+                        self._stats["timeouts"] += 1
+                    raise ZeepClientPoolTimeout(
+                        "No {} zeep client came free within {} seconds".format(
+                            self.name, timeout
+                        )
+                    )
+        with self._lock:
+            self._in_use += 1
+            self._stats["checkouts"] += 1
+        return client
+
+    def checkin(self, client):
+        with self._lock:
+            self._in_use -= 1
+        self._keep(client)
+
+    @contextmanager
+    def client(self, timeout=None):
+        client = self.checkout(timeout)
+        try:
+            yield client
+        finally:
+            self.checkin(client)
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            while True:
+                try:
+                    self._idle.get_nowait()
+                except Empty:
+                    break
+                self._created -= 1
+            released = self._created == 0
+        if released:
+            self._release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "in_use": self._in_use,
+                "idle": self._created - self._in_use,
+                "checkouts": self._stats["checkouts"],
+                "waits": self._stats["waits"],
+                "timeouts": self._stats["timeouts"],
+            }
+
+    def _keep(self, client):
+        """client back to the idle ones, or dropped once the pool is closed."""
+        with self._lock:
+            if not self._closed:
+                self._idle.put(client)
+                return
+            self._created -= 1
+            released = self._created == 0
+        if released:
+            self._release()
+
+    def _grow(self, limit):
+        """A new client, None once there are limit or size of them."""
+        with self._lock:
+            if self._closed or self._created >= min(limit, self.size):
+                return None
+            self._created += 1
+        try:
+            return self._create()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _release(self):
+        # the last client is gone, on_close may close what they shared
+        if self._on_close is not None:
+            self._on_close()
+
+    def _create(self):
+        logger.info(
+            "ZeepClientPool: Creating a zeep client for {}".format(self.name),
+            extra={"provider": self.name, "action": "ZeepClientPool"},
+        )
+        return self._factory()
+
+
+def get_zeepclient_pool(provider, key, create_pool) -> ZeepClientPool:
+    """The pool of provider, made by create_pool() on first use and again,
+    the old one closed, once key (what the clients are made of) changes."""
+    entry = _pools.get(provider)
+    if entry is None or entry[1] != key:
+        with _pools_lock:
+            entry = _pools.get(provider)
+            if entry is None or entry[1] != key:
+                if entry is not None:
+                    entry[0].close()
+                entry = (create_pool(), key)
+                _pools[provider] = entry
+    return entry[0]
+
+
+def close_zeepclient_pools(provider=None):
+    with _pools_lock:
+        providers = list(_pools) if provider is None else [provider]
+        for name in providers:
+            entry = _pools.pop(name, None)
+            if entry is not None:
+                entry[0].close()
+
+
+def get_zeepclient_pool_stats(provider=None):
+    """Clients created and checked out per provider. waits counts checkouts
+    that found every client busy, timeouts those that gave up."""
+    providers = list(_pools) if provider is None else [provider]
+    return {name: _pools[name][0].stats() for name in providers if name in _pools}
@@ -0,0 +1,192 @@
+import logging
+from collections import Counter
+from concurrent.futures import TimeoutError
+from contextvars import copy_context
+from threading import Lock
+from time import monotonic
+from typing import Optional
+
+from src.models.domain.enums.internal_status_type import InternalStatusType
+from src.services.provider_executor import get_provider_executor
+from src.utilities.extensions.datetime_extension import get_utc_epoch
+from src.utilities.request_context import get_call_timeout
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LATENCY_BUDGET = 2.0
+# The response only leaves Lambda when the handler returns, so by default
+# nothing waits for a refresh behind a stale answer.
+DEFAULT_REFRESH_WAIT = 0.0
+# Live results stored data may stand in for. Any other status, a 404 or a
+# 403 say, is the upstream's answer and goes back as is.
+FALLBACK_STATUSES = (
+    InternalStatusType.INTERNALSERVERERROR,
+    InternalStatusType.GATEWAYTIMEOUT,
+    InternalStatusType.SERVICEUNAVAILABLE,
+)
+
+_stats = Counter()
+_stats_lock = Lock()
+# refreshes left running by a stale answer: msisdn, programcode and until
+# when finish_refreshes waits for them
+_refreshes = {}
+_refreshes_lock = Lock()
+
+
+def stale_fallback_enabled(config) -> bool:
+    return getattr(config, "stale_fallback_enable", None) is True
+
+
+def max_stale_age(config, programcode) -> Optional[float]:
+    """Seconds old stored data of programcode may be to stand in for a live
+    lookup. stale_fallback_max_age_by_programcode overrides
+    stale_fallback_max_age, both in minutes. None when any age will do."""
+    by_programcode = getattr(config, "stale_fallback_max_age_by_programcode", None)
+    minutes = (by_programcode or {}).get(
+        getattr(programcode, "value", programcode),
+        getattr(config, "stale_fallback_max_age", None),
+    )
+    return None if minutes is None else minutes * 60
+
+
+def record_age(record) -> int:
+    """Whole seconds since record was saved."""
+    return max(get_utc_epoch() - record.event_datetime, 0) // 1000
+
+
+def get_vehicledata_or_stale(service, msisdn, programcode, lookup, find_stale):
+    """
+    lookup(msisdn, programcode), or stored data standing in for it.
+
+    lookup runs on the service's refresh pool. When it has not answered
+    within stale_fallback_latency_budget seconds, or answered with one of
+    FALLBACK_STATUSES, find_stale(msisdn, programcode) gets the newest stored
+    vehicle data, with its dataage set. Data no older than max_stale_age is
+    returned and a lookup still running finishes in the background, saving
+    its result for the next caller. Otherwise the live result is awaited.
+
+    Lambda freezes the pool's threads once the handler returns. The handler
+    calls finish_refreshes, which logs those lookups as abandoned unless
+    stale_fallback_refresh_wait opts in to waiting for them, at the cost of
+    holding back the stale answer that long.
+    """
+    config = service._config
+    executor = get_provider_executor(
+        "{}-refresh".format(type(service).__name__), getattr(config, "pool_size", None)
+    )
+    # carries the request deadline and log ids over to the pool's thread
+    live = executor.submit(copy_context().run, lookup, msisdn, programcode)
+    try:
+        dataresponse = live.result(
+            timeout=get_call_timeout(
+                getattr(config, "stale_fallback_latency_budget", None)
+                or DEFAULT_LATENCY_BUDGET
+            )
+        )
+    except TimeoutError:
+        dataresponse = None
+    if dataresponse is not None and dataresponse.status not in FALLBACK_STATUSES:
+        record("live")
+        return dataresponse
+
+    stale = find_stale(msisdn, programcode)
+    max_age = max_stale_age(config, programcode)
+    if stale is not None and (max_age is None or stale.dataage <= max_age):
+        record("stale")
+        logger.warning(
+            "GetVehicleData: Returning {} seconds old vehicle data for msisdn: {}, the live lookup {}".format(
+                stale.dataage,
+                msisdn,
+                "is still running" if dataresponse is None else "failed",
+            ),
+            extra={
+                "msisdn": msisdn,
+                "programcode": programcode,
+                "action": "GetVehicleData",
+            },
+        )
+        if dataresponse is None:
+            track_refresh(
+                live,
+                msisdn,
+                programcode,
+                getattr(config, "stale_fallback_refresh_wait", None)
+                or DEFAULT_REFRESH_WAIT,
+            )
+        return stale
+    if stale is not None:
+        record("too_old")
+    if dataresponse is None:
+        dataresponse = live.result()
+    record("live")
+    return dataresponse
+
+
+def track_refresh(live, msisdn, programcode, wait):
+    with _refreshes_lock:
+        _refreshes[live] = (msisdn, programcode, monotonic() + wait)
+    live.add_done_callback(forget_refresh)
+
+
+def forget_refresh(live):
+    with _refreshes_lock:
+        _refreshes.pop(live, None)
+
+
+def finish_refreshes(timeout=None, reason="abandoned") -> bool:
+    """
+    Waits for the lookups get_vehicledata_or_stale left running, each until
+    its stale_fallback_refresh_wait is up and all for at most timeout
+    seconds. Each lookup still running then is logged with reason and
+    counted as abandoned, it only saves its result if the environment runs
+    again. Returns False when any was abandoned.
+    """
+    expires = None if timeout is None else monotonic() + timeout
+    with _refreshes_lock:
+        refreshes = list(_refreshes.items())
+    finished = True
+    for live, (msisdn, programcode, refresh_expires) in refreshes:
+        until = refresh_expires if expires is None else min(refresh_expires, expires)
+        try:
+            live.result(timeout=max(until - monotonic(), 0))
+        except TimeoutError:
+            finished = False
+            forget_refresh(live)
+            record("abandoned")
+            logger.warning(
+                "GetVehicleData: Refresh of vehicle data for msisdn: {} {}".format(
+                    msisdn, reason
+                ),
+                extra={
+                    "msisdn": msisdn,
+                    "programcode": programcode,
+                    "action": "GetVehicleData",
+                },
+            )
+        except Exception:
+            # the lookup logs its own failures
+            continue
+    return finished
+
+
+def record(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def reset_stale_fallback_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def get_stale_fallback_stats():
+    """live answered from the upstream, stale from stored data, too_old found
+    stored data older than the program code allows, abandoned counts
+    refreshes still running when the handler returned."""
+    with _stats_lock:
+        return {
+            "live": _stats["live"],
+            "stale": _stats["stale"],
+            "too_old": _stats["too_old"],
+            "abandoned": _stats["abandoned"],
+        }
@@ -0,0 +1,148 @@
+from collections import Counter, OrderedDict
+from threading import Lock
+from time import monotonic
+
+from src.services.dynamodb_latest import get_latest_item, latest_item_covers
+from src.services.dynamodb_projections import covers
+
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class VehicleDataCache:
+    """Bounded LRU of the newest main table record per request_key.
+
+    Entries expire after the ttl they were stored with. Only records found in
+    or written to DynamoDB are cached, a miss is never remembered so data
+    pushed to another instance shows up on the next lookup. A record read
+    with a projection only serves lookups that need no other attributes.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._stats = Counter()
+
+    def get(self, request_key, min_event_datetime=None, attributes=None):
+        with self._lock:
+            entry = self._entries.get(request_key)
+            if entry is not None and (
+                entry[1] <= monotonic()
+                or (
+                    min_event_datetime is not None
+                    and entry[0].event_datetime < min_event_datetime
+                )
+            ):
+                del self._entries[request_key]
+                self._stats["expired"] += 1
+                entry = None
+            if entry is None or not covers(entry[2], attributes):
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(request_key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def put(self, request_key, record, ttl, attributes=None):
+        with self._lock:
+            current = self._entries.get(request_key)
+            # a slower lookup must not replace a record saved meanwhile, nor a
+            # projection the full item of the same record
+            if (
+                current is not None
+                and current[1] > monotonic()
+                and (
+                    current[0].event_datetime > record.event_datetime
+                    or (
+                        current[0].event_datetime == record.event_datetime
+                        and not covers(attributes, current[2])
+                    )
+                )
+            ):
+                return
+            self._entries[request_key] = (record, monotonic() + ttl, attributes)
+            self._entries.move_to_end(request_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, request_key=None):
+        with self._lock:
+            if request_key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(request_key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self._stats["hits"],
+                "misses": self._stats["misses"],
+                "evictions": self._stats["evictions"],
+                "expired": self._stats["expired"],
+                "size": len(self._entries),
+            }
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+
+
+vehicledata_cache = VehicleDataCache()
+
+
+def cache_ttl(config) -> float:
+    """Seconds a provider's records stay cached, 0 disables the cache.
+    dynamodb_cache_ttl if set, else the dynamodb_check_timelimit window."""
+    ttl = getattr(config, "dynamodb_cache_ttl", None)
+    if ttl is None and getattr(config, "dynamodb_check_enable", None):
+        ttl = (getattr(config, "dynamodb_check_timelimit", None) or 0) * 60
+    return ttl or 0
+
+
+def get_cached_vehicledata(
+    config, request_key, min_event_datetime=None, attributes=None
+):
+    if cache_ttl(config) <= 0:
+        return None
+    return vehicledata_cache.get(request_key, min_event_datetime, attributes)
+
+
+def cache_vehicledata(config, record, request_key=None, attributes=None):
+    """Remember a record read from or saved to the main table. attributes is
+    the projection it was read with, None for a full item."""
+    ttl = cache_ttl(config)
+    if ttl > 0 and record is not None:
+        vehicledata_cache.put(
+            request_key or record.request_key, record, ttl, attributes
+        )
+
+
+def get_vehicledata_cache_stats():
+    return vehicledata_cache.stats()
+
+
+def find_latest_vehicledata(
+    config, table, request_key, query, min_event_datetime=None, attributes=None
+):
+    """Cached record for request_key, else its latest item when the provider
+    reads those (dynamodb_latest_item) and it has the attributes, else the
+    first record of query(). query has to read the same attributes, None for
+    the full item."""
+    record = get_cached_vehicledata(config, request_key, min_event_datetime, attributes)
+    if record is None:
+        if getattr(config, "dynamodb_latest_item", None) and latest_item_covers(
+            attributes
+        ):
+            record = get_latest_item(table, request_key, attributes)
+            if record is not None and (
+                min_event_datetime is not None
+                and record.event_datetime < min_event_datetime
+            ):
+                return None
+        else:
+            record = next(iter(query()), None)
+        if record:
+            cache_vehicledata(config, record, request_key, attributes)
+    return record
@@ -0,0 +1,308 @@
+import json
+import logging
+import os
+import queue
+import tempfile
+from collections import Counter
+from functools import lru_cache
+from threading import Condition, Lock, Thread
+from time import monotonic
+from typing import Type
+
+from src.services.dynamodb_identity import save_record_items
+from src.services.dynamodb_latest import latest_item_enabled
+from src.services.dynamodb_tables import ConnectedVehicleTable, handle_table_error
+from src.services.vehicledata_cache import cache_vehicledata
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 500
+# DynamoDB's limit for one BatchWriteItem call
+DEFAULT_BATCH_SIZE = 25
+DEFAULT_SPOOL_PATH = os.path.join(tempfile.gettempdir(), "cv-write-behind-spool.jsonl")
+# Lambda only signals the runtime before a shutdown when an extension is here
+LAMBDA_EXTENSIONS_PATH = "/opt/extensions"
+# what the shutdown flush writes in one BatchWriteItem, left queued on answering
+SHUTDOWN_FLUSH_ROWS = DEFAULT_BATCH_SIZE
+
+
+class WriteBehindQueue:
+    """Saves vehicle records to DynamoDB off the request path.
+
+    submit() hands a record to a bounded queue that a daemon thread drains in
+    BatchWriteItem groups of up to batch_size records per table. A full queue
+    refuses the record so the caller saves it itself, nothing is dropped.
+    Records the batch and a single retry can't write are appended to a spool
+    file replayed on the next flush, and logged with their full attributes so
+    they can be restored if the instance goes away first.
+
+    Lambda freezes the environment once the handler returns, the daemon
+    thread picks up again when the next request thaws it. With an extension
+    Lambda sends SIGTERM before shutting the environment down and the
+    shutdown flush writes what is left, so answering only writes the records
+    beyond one batch. Without one nothing else would write them, answering
+    writes them all and the audit write is back on the latency path.
+    Records a flush can't write in time are logged the same way.
+    """
+
+    def __init__(
+        self,
+        max_size=DEFAULT_MAX_SIZE,
+        batch_size=DEFAULT_BATCH_SIZE,
+        spool_path=DEFAULT_SPOOL_PATH,
+    ):
+        self.batch_size = batch_size
+        self.spool_path = spool_path
+        self._queue = queue.Queue(maxsize=max_size)
+        self._tables = {}
+        self._thread = None
+        self._thread_lock = Lock()
+        self._write_lock = Lock()
+        self._idle = Condition()
+        self._pending = 0
+        self._in_flight = []
+        self._stats = Counter()
+
+    def submit(
+        self, table: Type[ConnectedVehicleTable], record, latest_item=False
+    ) -> bool:
+        """Queues record for saving, and with latest_item for updating its
+        latest item, False when the queue is full."""
+        with self._idle:
+            try:
+                self._queue.put_nowait((table, record, latest_item))
+            except queue.Full:
+                self._stats["overflow"] += 1
+                return False
+            self._pending += 1
+            self._stats["queued"] += 1
+        self._tables[table.Meta.table_name] = table
+        self._ensure_thread()
+        return True
+
+    def flush(self, timeout=None, keep=0) -> bool:
+        """Writes everything queued (and spooled) before returning, True when
+        no more than keep records are left pending within timeout seconds.
+        No new batch is started once they are up. The spool is replayed only
+        by full flushes."""
+        expires = None if timeout is None else monotonic() + timeout
+        if not self._write_lock.acquire(timeout=-1 if timeout is None else timeout):
+            return False
+        try:
+            if not keep:
+                self._replay_spool()
+            while expires is None or monotonic() < expires:
+                batch = self._take(min(self.batch_size, self._queue.qsize() - keep))
+                if not batch:
+                    break
+                self._write(batch)
+        finally:
+            self._write_lock.release()
+        # the flusher thread may still hold a batch it took before we locked
+        with self._idle:
+            return self._idle.wait_for(
+                lambda: self._pending <= keep,
+                None if expires is None else max(expires - monotonic(), 0),
+            )
+
+    def log_unwritten(self, reason):
+        """Logs every record queued or being written, with its attributes."""
+        with self._queue.mutex:
+            queued = list(self._queue.queue)
+        with self._idle:
+            items = list(self._in_flight) + queued
+        for table, record, _ in items:
+            logger.error(
+                "SaveVehicleData: {} not written by write-behind, {}: item: {}".format(
+                    record.request_key,
+                    reason,
+                    json.dumps(
+                        {
+                            "table": table.Meta.table_name,
+                            "item": record._serialize(attr_map=True)["attributes"],
+                        }
+                    ),
+                ),
+                extra={"action": "WriteBehind"},
+            )
+        return len(items)
+
+    def stats(self):
+        with self._idle:
+            return {
+                "queued": self._stats["queued"],
+                "written": self._stats["written"],
+                "batches": self._stats["batches"],
+                "overflow": self._stats["overflow"],
+                "spooled": self._stats["spooled"],
+                "pending": self._pending,
+            }
+
+    def reset(self):
+        with self._idle:
+            self._stats.clear()
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(
+                    target=self._run, name="write-behind", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            with self._write_lock:
+                self._write([first] + self._take(self.batch_size - 1))
+
+    def _take(self, count):
+        items = []
+        while len(items) < count:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def _write(self, items):
+        with self._idle:
+            self._in_flight = items
+        by_table = {}
+        for table, record, latest_item in items:
+            by_table.setdefault(table, []).append((record, latest_item))
+        for table, entries in by_table.items():
+            for record, latest_item in self._write_table(table, entries):
+                save_record_items(table, record, latest_item)
+        with self._idle:
+            self._in_flight = []
+            self._pending -= len(items)
+            self._idle.notify_all()
+
+    def _write_table(self, table, entries):
+        try:
+            with table.batch_write() as batch:
+                for record, _ in entries:
+                    batch.save(record)
+            self._record(written=len(entries), batches=1)
+            return entries
+        except Exception as e:
+            handle_table_error(table, e)
+            logger.warning(
+                "SaveVehicleData: Batch write of {} records failed, retrying one by one: {}".format(
+                    len(entries), e
+                ),
+                extra={"action": "WriteBehind"},
+            )
+        written = []
+        for record, latest_item in entries:
+            try:
+                record.save()
+                written.append((record, latest_item))
+            except Exception as e:
+                handle_table_error(table, e)
+                self._spool(table, record, latest_item, e)
+        self._record(written=len(written))
+        return written
+
+    def _spool(self, table, record, latest_item, error):
+        entry = {
+            "table": table.Meta.table_name,
+            "item": record._serialize(attr_map=True)["attributes"],
+            "latest_item": latest_item,
+        }
+        logger.error(
+            "SaveVehicleData: Unable to save {} with write-behind, spooled: {} item: {}".format(
+                record.request_key, error, json.dumps(entry)
+            ),
+            extra={"action": "WriteBehind"},
+        )
+        try:
+            with open(self.spool_path, "a") as spool:
+                spool.write(json.dumps(entry) + "\n")
+            self._record(spooled=1)
+        except OSError as e:
+            logger.error(
+                "SaveVehicleData: Unable to spool {}: {}".format(record.request_key, e),
+                extra={"action": "WriteBehind"},
+            )
+
+    def _replay_spool(self):
+        try:
+            spool_file = open(self.spool_path)
+        except FileNotFoundError:
+            return
+        with spool_file:
+            lines = spool_file.readlines()
+        os.remove(self.spool_path)
+        for line in lines:
+            entry = json.loads(line)
+            table = self._tables.get(entry["table"])
+            if table is None:
+                # table not used by this instance yet, keep it for later
+                with open(self.spool_path, "a") as spool:
+                    spool.write(line)
+                continue
+            record = table.from_raw_data(entry["item"])
+            latest_item = entry.get("latest_item", False)
+            try:
+                record.save()
+                save_record_items(table, record, latest_item)
+                self._record(written=1)
+            except Exception as e:
+                handle_table_error(table, e)
+                self._spool(table, record, latest_item, e)
+
+    def _record(self, **counts):
+        with self._idle:
+            self._stats.update(counts)
+
+
+write_behind_queue = WriteBehindQueue()
+
+
+def save_vehicledata_behind(config, table: Type[ConnectedVehicleTable], record) -> bool:
+    """Queues record for saving when the provider writes behind
+    (write_behind_enable). False means the caller has to save it."""
+    if not getattr(config, "write_behind_enable", None):
+        return False
+    if not write_behind_queue.submit(table, record, latest_item_enabled(config)):
+        return False
+    # served from this instance's cache until the batch lands
+    cache_vehicledata(config, record)
+    return True
+
+
+def flush_write_behind(timeout=None, reason="flush timed out") -> bool:
+    """Writes everything queued within timeout seconds. Records left
+    unwritten are logged with reason and their attributes, False then."""
+    if write_behind_queue.flush(timeout):
+        return True
+    write_behind_queue.log_unwritten(reason)
+    return False
+
+
+@lru_cache(maxsize=None)
+def shutdown_flush_available() -> bool:
+    """True when Lambda signals this environment before shutting it down."""
+    try:
+        return bool(os.listdir(LAMBDA_EXTENSIONS_PATH))
+    except OSError:
+        return False
+
+
+def flush_write_behind_backlog(timeout=None, reason="flush timed out") -> bool:
+    """Writes the records the shutdown flush couldn't be relied on for, all
+    of them when there is no shutdown flush, otherwise only those beyond
+    the one batch it writes. Logged like flush_write_behind."""
+    keep = SHUTDOWN_FLUSH_ROWS if shutdown_flush_available() else 0
+    if write_behind_queue.flush(timeout, keep=keep):
+        return True
+    write_behind_queue.log_unwritten(reason)
+    return False
+
+
+def get_write_behind_stats():
+    return write_behind_queue.stats()
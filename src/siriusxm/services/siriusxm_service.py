@@ -2,24 +2,50 @@ import logging
 from datetime import datetime
 from typing import Type
 
-import requests
 from src.config.siriusxm_config import SiriusXmConfig
 from src.models.domain.enums.internal_status_type import InternalStatusType
 from src.models.enums.ctsversion_type import CtsVersion
 from src.models.enums.programcode_type import ProgramCode
 from src.models.exceptions.application_exception import ApplicationException
 from src.services.client_service import ClientService
-from src.services.dynamodb_tables import ConnectedVehicleTable
-from src.services.soaphandlers.soap_handler import get_zeepclient
+from src.services.dynamodb_identity import save_record_items
+from src.services.dynamodb_latest import latest_item_enabled
+from src.services.dynamodb_projections import attributes_to_get, projection
+from src.services.dynamodb_tables import ConnectedVehicleTable, handle_table_error
+from src.services.httphandlers.http_handler import (
+    get_http_session,
+    provider_timeout,
+    request_timeout,
+)
+from src.services.soaphandlers.soap_codec import (
+    AGENT_ASSIGNED,
+    TERMINATE,
+    parse_reply,
+    send,
+    soap_fast_path_enabled,
+)
+from src.services.vehicledata_cache import cache_vehicledata, find_latest_vehicledata
 from src.siriusxm.models.data.vehicle_data import VehicleData, VehicleHexData
 from src.siriusxm.models.domain.agentassignment import AgentAssignment
 from src.siriusxm.models.domain.terminate import Terminate
 from src.utilities.extensions.datetime_extension import get_utc_epoch
 from src.utilities.extensions.string_extension import isnotnull_whitespaceorempty
+from src.utilities.errorhandlers.error_responsestatus import get_exception_status
 from starlette.status import HTTP_200_OK
 
 logger = logging.getLogger(__name__)
 
+# Attributes get_vehicledata maps into its response
+VEHICLEDATA_ATTRIBUTES = projection(
+    "language",
+    "programcode",
+    "referenceid",
+    "timestamp",
+    "latitude",
+    "longitude",
+    "vin",
+)
+
 
 class SiriusXmService(ClientService):
     def __init__(self, config: SiriusXmConfig, table: Type[ConnectedVehicleTable]):
@@ -57,6 +83,10 @@ class SiriusXmService(ClientService):
 
             # Save the data in dynamodb
             vehicle_table.save()
+            save_record_items(
+                self._Table, vehicle_table, latest_item_enabled(self._config)
+            )
+            cache_vehicledata(self._config, vehicle_table)
 
             hexvaluedata = self.populate_hex(
                 vehicledata.referenceid,
@@ -72,6 +102,7 @@ class SiriusXmService(ClientService):
             return vehicledata
 
         except Exception as e:
+            handle_table_error(self._Table, e)
             self._logger.error(
                 "SaveVehicleData: error occured: {}".format(e),
                 exc_info=True,
@@ -122,12 +153,20 @@ class SiriusXmService(ClientService):
                 },
             )
 
-            for dataitem in self._Table.query(
+            dataitem = find_latest_vehicledata(
+                self._config,
+                self._Table,
                 programcode + "-" + id,
-                self._Table.referenceid == id,
-                scan_index_forward=False,
-                limit=1,
-            ):
+                lambda: self._Table.query(
+                    programcode + "-" + id,
+                    self._Table.referenceid == id,
+                    scan_index_forward=False,
+                    limit=1,
+                    attributes_to_get=attributes_to_get(VEHICLEDATA_ATTRIBUTES),
+                ),
+                attributes=VEHICLEDATA_ATTRIBUTES,
+            )
+            if dataitem is not None:
                 self._logger.info(
                     "GetVechicleData: Response for referenceid: {} programcode: {}".format(
                         id, programcode
@@ -159,6 +198,7 @@ class SiriusXmService(ClientService):
             )
 
         except Exception as e:
+            handle_table_error(self._Table, e)
             self._logger.error(
                 "GetVehicleData: Gateway error: SiriusXm: Error Occured: {}".format(e),
                 exc_info=True,
@@ -171,7 +211,7 @@ class SiriusXmService(ClientService):
             )
 
             return VehicleData(
-                status=InternalStatusType.INTERNALSERVERERROR,
+                status=get_exception_status(e),
                 responsemessage=e.args[0] if e.args.__len__() > 0 else None,
             )
 
@@ -187,18 +227,26 @@ class SiriusXmService(ClientService):
                     "action": "AgentAssignment",
                 },
             )
-            client = retrieve_zeepclient(
-                self._config.base_url,
-                super()._localstore,
-                self._config.wsdl,
-                self._config.root_cert,
-            )
-            agent_assignment = {
-                "reference-id": agentassignment.referenceid,
-                "is-assigned": agentassignment.isassigned,
-            }
-
-            response = client.service.agentAssigned(**agent_assignment)
+            if soap_fast_path_enabled(self._config):
+                response = call_fast_path(
+                    self,
+                    AGENT_ASSIGNED,
+                    reference_id=agentassignment.referenceid,
+                    is_assigned=agentassignment.isassigned,
+                )
+            else:
+                agent_assignment = {
+                    "reference-id": agentassignment.referenceid,
+                    "is-assigned": agentassignment.isassigned,
+                }
+                with retrieve_zeepclient(
+                    self._config.base_url,
+                    self._config.wsdl,
+                    self._config.root_cert,
+                    self._config.pool_size,
+                    provider_timeout(self._config),
+                ) as client:
+                    response = client.service.agentAssigned(**agent_assignment)
             if (
                 isnotnull_whitespaceorempty(response)
                 and isnotnull_whitespaceorempty(response["result-code"])
@@ -257,15 +305,20 @@ class SiriusXmService(ClientService):
                 },
             )
 
-            client = retrieve_zeepclient(
-                self._config.base_url,
-                super()._localstore,
-                self._config.wsdl,
-                self._config.root_cert,
-            )
-            payload = {"reference-id": terminate.referenceid}
-
-            response = client.service.terminate(**payload)
+            if soap_fast_path_enabled(self._config):
+                response = call_fast_path(
+                    self, TERMINATE, reference_id=terminate.referenceid
+                )
+            else:
+                payload = {"reference-id": terminate.referenceid}
+                with retrieve_zeepclient(
+                    self._config.base_url,
+                    self._config.wsdl,
+                    self._config.root_cert,
+                    self._config.pool_size,
+                    provider_timeout(self._config),
+                ) as client:
+                    response = client.service.terminate(**payload)
             if (
                 isnotnull_whitespaceorempty(response)
                 and isnotnull_whitespaceorempty(response["result-code"])
@@ -320,9 +373,11 @@ class SiriusXmService(ClientService):
                 },
             )
 
-            response = requests.get(
+            response = get_http_session(
+                "siriusxm", self._config.root_cert, self._config.pool_size
+            ).get(
                 "{base_url}?wsdl".format(base_url=self._config.base_url),
-                verify=self._config.root_cert,
+                timeout=request_timeout(self._config),
             )
 
             validresponse = (
@@ -373,7 +428,7 @@ class SiriusXmService(ClientService):
                 },
             )
             return VehicleData(
-                status=InternalStatusType.INTERNALSERVERERROR,
+                status=get_exception_status(e),
                 responsemessage=str(e)
             )
 
@@ -406,7 +461,27 @@ def serviceerror_conversion(responsemessage: str):
     return InternalStatusType.INTERNALSERVERERROR
 
 
-def retrieve_zeepclient(serviceurl, localstore, wsdl, root_cert):
-    return get_zeepclient(
-        wsdl, serviceurl, root_cert, "siriusxm_zeepclient", localstore
+def retrieve_zeepclient(serviceurl, wsdl, root_cert, pool_size=None, timeout=None):
+    # imported here so zeep stays off the cold start import path while
+    # soap_fast_path is on
+    from src.services.soaphandlers.soap_handler import checkout_zeepclient
+
+    return checkout_zeepclient(
+        "siriusxm", wsdl, serviceurl, root_cert, pool_size, timeout
+    )
+
+
+def call_fast_path(self, operation, **values):
+    """Reply body of operation through the soap_codec templates and
+    streaming parser, without zeep."""
+    response, _ = parse_reply(
+        send(
+            operation,
+            get_http_session("siriusxm", self._config.root_cert, self._config.pool_size),
+            self._config.base_url,
+            request_timeout(self._config),
+            **values
+        ),
+        operation.reply,
     )
+    return response
@@ -1,14 +1,15 @@
 import logging
 
-import requests
 from src.config.tmna_config import TmnaConfig
 from src.models.domain.enums.internal_status_type import InternalStatusType
 from src.models.enums.ctsversion_type import CtsVersion
 from src.models.enums.programcode_type import ProgramCode
 from src.services.client_service import ClientService
+from src.services.httphandlers.http_handler import get_http_session, request_timeout
 from src.tmna.models.data.terminate import Terminate
 from src.utilities.extensions.json_extension import checkjsonnode, seterrorjson
 from src.utilities.extensions.string_extension import isnull_whitespaceorempty
+from src.utilities.errorhandlers.error_responsestatus import get_exception_status
 from starlette.status import HTTP_200_OK, HTTP_202_ACCEPTED
 
 logger = logging.getLogger(__name__)
@@ -67,11 +68,13 @@ class TmnaService(ClientService):
             headers = {
                 "content-type": "application/json",
             }
-            response = requests.post(
+            response = get_http_session(
+                "tmna", self._config.root_cert, self._config.pool_size
+            ).post(
                 serviceurl,
                 headers=headers,
                 json=requestbody,
-                verify=self._config.root_cert,
+                timeout=request_timeout(self._config),
             )
             validjsonresponse = (
                 response.headers.get("content-type") is not None
@@ -171,7 +174,7 @@ class TmnaService(ClientService):
 
             return Terminate(
                 eventid=eventid,
-                status=InternalStatusType.INTERNALSERVERERROR,
+                status=get_exception_status(e),
                 responsemessage=e.args[0] if e.args.__len__() > 0 else None,
             )
 
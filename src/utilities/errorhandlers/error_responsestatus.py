@@ -1,8 +1,16 @@
+from requests.exceptions import Timeout
+
 from src.models.domain.enums.internal_status_type import InternalStatusType
 from src.models.exceptions.application_exception import ApplicationException
 from src.models.exceptions.badrequest_exception import BadRequestException
 from src.models.exceptions.forbidden_exception import ForbiddenException
+from src.models.exceptions.gatewaytimeout_exception import GatewayTimeoutException
 from src.models.exceptions.notfound_exception import NotFoundException
+from src.models.exceptions.serviceunavailable_exception import (
+    ServiceUnavailableException,
+)
+from src.services.circuit_breaker import CircuitOpenError
+from src.utilities.request_context import DeadlineExceeded
 
 
 def handle_error_responsestatus(responsestatus):
@@ -13,5 +21,20 @@ def handle_error_responsestatus(responsestatus):
         InternalStatusType.FORBIDDEN.casefold(): ForbiddenException,
         InternalStatusType.NOTFOUND.casefold(): NotFoundException,
         InternalStatusType.INTERNALSERVERERROR.casefold(): ApplicationException,
+        InternalStatusType.SERVICEUNAVAILABLE.casefold(): ServiceUnavailableException,
+        InternalStatusType.GATEWAYTIMEOUT.casefold(): GatewayTimeoutException,
     }
     return switcher.get(responsestatus, ApplicationException)
+
+
+def get_exception_status(exception: Exception) -> InternalStatusType:
+    # an upstream call that timed out, or was not started for lack of time,
+    # is a gateway timeout, one not made because its circuit is open means
+    # the upstream is unavailable; wrapped causes (pynamodb, zeep) count as well
+    while exception is not None:
+        if isinstance(exception, (Timeout, DeadlineExceeded)):
+            return InternalStatusType.GATEWAYTIMEOUT
+        if isinstance(exception, CircuitOpenError):
+            return InternalStatusType.SERVICEUNAVAILABLE
+        exception = getattr(exception, "cause", None) or exception.__cause__
+    return InternalStatusType.INTERNALSERVERERROR
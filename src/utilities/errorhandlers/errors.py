@@ -46,3 +46,18 @@ def create_notallowed_server_error(detail: str) -> JSONApiError:
     return JSONApiError[str](
         status="405", code="MethodNotAllowed", title="Method Not Allowed", detail=detail
     )
+
+
+def create_service_unavailable_error(detail: str) -> JSONApiError:
+    return JSONApiError[str](
+        status="503",
+        code="ServiceUnavailable",
+        title="Service Unavailable",
+        detail=detail,
+    )
+
+
+def create_gateway_timeout_error(detail: str) -> JSONApiError:
+    return JSONApiError[str](
+        status="504", code="GatewayTimeout", title="Gateway Timeout", detail=detail
+    )
@@ -12,11 +12,17 @@ from starlette.status import HTTP_405_METHOD_NOT_ALLOWED
 from src.models.exceptions.badrequest_exception import BadRequestException
 from src.models.exceptions.custom_exception import CustomException
 from src.models.exceptions.forbidden_exception import ForbiddenException
+from src.models.exceptions.gatewaytimeout_exception import GatewayTimeoutException
+from src.models.exceptions.serviceunavailable_exception import (
+    ServiceUnavailableException,
+)
 from src.models.exceptions.notfound_exception import NotFoundException
 from src.models.json_api.error_response import JSONApiErrorResponse
 from src.utilities.errorhandlers.errors import create_bad_request_error
 from src.utilities.errorhandlers.errors import create_bad_request_error_with_detail
 from src.utilities.errorhandlers.errors import create_forbidden_server_error
+from src.utilities.errorhandlers.errors import create_gateway_timeout_error
+from src.utilities.errorhandlers.errors import create_service_unavailable_error
 from src.utilities.errorhandlers.errors import create_internal_server_error
 from src.utilities.errorhandlers.errors import create_notallowed_server_error
 from src.utilities.errorhandlers.errors import create_notfound_server_error
@@ -116,6 +122,24 @@ async def forbidden_exception_handler(request: Request, exc: HTTPException):
     )
 
 
+async def serviceunavailable_exception_handler(request: Request, exc: HTTPException):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=jsonable_encoder(
+            JSONApiErrorResponse(errors=[create_service_unavailable_error(exc.detail)])
+        ),
+    )
+
+
+async def gatewaytimeout_exception_handler(request: Request, exc: HTTPException):
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content=jsonable_encoder(
+            JSONApiErrorResponse(errors=[create_gateway_timeout_error(exc.detail)])
+        ),
+    )
+
+
 def register_exception_handlers(app: FastAPI):
     app.exception_handler(RequestValidationError)(validation_exception_handler)
     app.exception_handler(ValueError)(valueerror_exception_handler)
@@ -125,3 +149,7 @@ def register_exception_handlers(app: FastAPI):
     app.exception_handler(NotFoundException)(notfound_exception_handler)
     app.exception_handler(CustomException)(base_exception_handler)
     app.exception_handler(ForbiddenException)(forbidden_exception_handler)
+    app.exception_handler(ServiceUnavailableException)(
+        serviceunavailable_exception_handler
+    )
+    app.exception_handler(GatewayTimeoutException)(gatewaytimeout_exception_handler)
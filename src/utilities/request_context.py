@@ -0,0 +1,71 @@
+from contextvars import ContextVar
+from time import monotonic
+from typing import Optional
+
+# Monotonic time by which the current request has to be answered. Set from the
+# Lambda context by the middleware; None when running outside Lambda.
+_request_deadline: ContextVar[Optional[float]] = ContextVar(
+    "request_deadline", default=None
+)
+
+
+# API Gateway answers 504 itself once the integration has run this long, even
+# when the Lambda's own timeout is later
+API_GATEWAY_TIMEOUT = 29.0
+
+
+def set_request_deadline_from_lambda_context(
+    aws_context, gateway_timeout: Optional[float] = API_GATEWAY_TIMEOUT
+):
+    """Deadline of the request: the Lambda's remaining time, capped at
+    gateway_timeout from now, whichever runs out first."""
+    get_remaining_time = getattr(aws_context, "get_remaining_time_in_millis", None)
+    if get_remaining_time is None:
+        return _request_deadline.set(None)
+    remaining = get_remaining_time() / 1000
+    if gateway_timeout is not None:
+        remaining = min(remaining, gateway_timeout)
+    return _request_deadline.set(monotonic() + remaining)
+
+
+def set_request_deadline(deadline: Optional[float]):
+    return _request_deadline.set(deadline)
+
+
+def get_request_deadline() -> Optional[float]:
+    return _request_deadline.get()
+
+
+def get_remaining_time() -> Optional[float]:
+    """Seconds left before the request deadline, or None if there is none."""
+    deadline = _request_deadline.get()
+    if deadline is None:
+        return None
+    return max(deadline - monotonic(), 0.0)
+
+
+class DeadlineExceeded(Exception):
+    """Raised instead of starting a call the request has no time left for."""
+
+
+# Kept back from the deadline so a call that runs out of time still leaves
+# room to answer with our own error response instead of API Gateway's 504.
+DEADLINE_MARGIN = 0.5
+# requests rejects a zero timeout, a call started this late fails at once
+MIN_CALL_TIMEOUT = 0.05
+
+
+def get_call_timeout(timeout: Optional[float]) -> Optional[float]:
+    """timeout cut down to the time left before the request deadline, less
+    DEADLINE_MARGIN. None (no timeout) only without a deadline."""
+    remaining = get_remaining_time()
+    if remaining is None:
+        return timeout
+    budget = max(remaining - DEADLINE_MARGIN, MIN_CALL_TIMEOUT)
+    return budget if timeout is None else min(timeout, budget)
+
+
+def is_deadline_exceeded() -> bool:
+    """True once less than DEADLINE_MARGIN is left before the request deadline."""
+    remaining = get_remaining_time()
+    return remaining is not None and remaining <= DEADLINE_MARGIN
@@ -74,6 +74,10 @@ class VehicleData(BaseModel):
     altitude: Optional[str] = Field(description="Altitude")
     language: Optional[str] = Field(description="Hmi_language Ex: English")
 
+    dataage: Optional[int] = Field(
+        description="Seconds since the data was saved, set when stored data is returned instead of a live lookup"
+    )
+
     status: InternalStatusType = Field(
         InternalStatusType.UNKNOWN,
         description="Current status as returned from external service",
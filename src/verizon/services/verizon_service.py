@@ -1,27 +1,92 @@
 import logging
-import xml.etree.ElementTree as ET
 from datetime import datetime
 from typing import Type, Optional
-import requests
 from src.config.verizon_config import VerizonConfig
 from src.models.domain.enums.internal_status_type import InternalStatusType
 from src.models.enums.ctsversion_type import CtsVersion
 from src.models.enums.programcode_type import ProgramCode
 from src.models.enums.status_type import Status
+from src.services.circuit_breaker import (
+    CircuitOpenError,
+    call_through,
+    get_circuit_breaker,
+    is_server_error,
+)
 from src.services.client_service import ClientService
+from src.services.dynamodb_identity import save_record_items
+from src.services.dynamodb_latest import latest_item_enabled
+from src.services.dynamodb_projections import projection
 from src.services.dynamodb_tables import (
     ConnectedVehicleSupplementTable,
     ConnectedVehicleTable,
+    handle_table_error,
+)
+from src.services.dynamodb_helper import (
+    get_circuit_open_response,
+    get_last_known_response,
+    get_vehicledata_for_config_enabled_client_only,
+)
+from src.services.httphandlers.http_handler import (
+    get_http_session,
+    provider_timeout,
+    request_timeout,
+)
+from src.services.soaphandlers.soap_codec import (
+    REQUEST_VEHICLE_LOCATION,
+    parse_reply,
+    send,
+    soap_fast_path_enabled,
 )
-from src.services.dynamodb_helper import get_vehicledata_for_config_enabled_client_only
-from src.services.soaphandlers.soap_handler import get_zeepclient
+from src.services.stale_fallback import (
+    get_vehicledata_or_stale,
+    stale_fallback_enabled,
+)
+from src.services.vehicledata_cache import cache_vehicledata
+from src.services.write_behind import save_vehicledata_behind
 from src.utilities.extensions.datetime_extension import get_utc_epoch
 from src.utilities.extensions.string_extension import isnotnull_whitespaceorempty
+from src.utilities.errorhandlers.error_responsestatus import get_exception_status
 from src.verizon.models.data.vehicle_data import VehicleData
 from starlette.status import HTTP_200_OK
 
 logger = logging.getLogger(__name__)
 
+# Attributes create_vehicledata_response maps into the response
+VEHICLEDATA_ATTRIBUTES = projection(
+    "altitude",
+    "brand",
+    "countrycode",
+    "cruisingrange",
+    "customerfirstname",
+    "customerlastname",
+    "headingdirection",
+    "ismoving",
+    "language",
+    "latitude",
+    "locationaddress",
+    "locationcity",
+    "locationconfidence",
+    "locationpostalcode",
+    "locationstate",
+    "locationtrueness",
+    "longitude",
+    "modelcode",
+    "modelcolor",
+    "modelname",
+    "modelyear",
+    "phonenumber",
+    "srnumber",
+    "timestamp",
+    "vin",
+)
+
+# Oracle SOA tracking ids Verizon sends in the soap Header, saved with the data
+TRACKING_HEADERS = {
+    "floweventid": "tracking.FlowEventId",
+    "flowid": "tracking.FlowId",
+    "correlationflowid": "tracking.CorrelationFlowId",
+}
+
 
 class VerizonService(ClientService):
     def __init__(
@@ -35,7 +100,31 @@ class VerizonService(ClientService):
         self._Table = table
         self._SupplementTable = supplementtable
 
+    @property
+    def circuit_breaker(self):
+        return get_circuit_breaker("verizon", self._config)
+
     def get_vehicledata(self, msisdn: str, programcode: ProgramCode):
+        if stale_fallback_enabled(self._config):
+            # stored data answers while Verizon is slow or failing
+            return get_vehicledata_or_stale(
+                self,
+                msisdn,
+                programcode,
+                self.lookup_vehicledata,
+                lambda msisdn, programcode: get_last_known_response(
+                    self,
+                    msisdn,
+                    programcode,
+                    CtsVersion.ONE_DOT_ZERO,
+                    VEHICLEDATA_ATTRIBUTES,
+                    create_vehicledata_response,
+                    "Stored vehicle data, the live lookup is slow or failed",
+                ),
+            )
+        return self.lookup_vehicledata(msisdn, programcode)
+
+    def lookup_vehicledata(self, msisdn: str, programcode: ProgramCode):
         try:
             self._logger.info(
                 "GetVehicleData: Payload received for msisdn: {} programcode: {}".format(
@@ -59,39 +148,26 @@ class VerizonService(ClientService):
             if dataresponse is not None:
                 return dataresponse
             else:
-                client = retrieve_zeepclient(
-                    self._config.base_url,
-                    super()._localstore,
-                    self._config.wsdl,
-                    self._config.root_cert,
-                )
-
-                vehicle_locationrequest = {
-                    "Header": {
-                        "SourceName": "",
-                        # Optional
-                        "TargetName": "",
-                        "TransactionId": "",
-                        "Timestamp": datetime.now(),
-                    },
-                    # Optional
-                    "CTIInteractionID": "",
-                    "MDN": msisdn,
-                }
-                with client.settings(raw_response=True):
-                    fullresponse = client.service.RequestVehicleLocation(
-                        **vehicle_locationrequest
-                    )
-
-                    operation = client.service._binding._operations[
-                        "RequestVehicleLocation"
-                    ]
-
-                    response = client.service._binding.process_reply(
-                        client, operation, fullresponse
-                    )
-                    headerresponse = get_additionaldata_from_header(
-                        self, fullresponse, msisdn, programcode
+                try:
+                    if soap_fast_path_enabled(self._config):
+                        response, headerresponse = request_vehiclelocation_fast(
+                            self, msisdn, programcode
+                        )
+                    else:
+                        response, headerresponse = request_vehiclelocation(
+                            self, msisdn, programcode
+                        )
+                except CircuitOpenError as e:
+                    return get_circuit_open_response(
+                        self,
+                        "Verizon",
+                        msisdn,
+                        programcode,
+                        CtsVersion.ONE_DOT_ZERO,
+                        e,
+                        VEHICLEDATA_ATTRIBUTES,
+                        create_vehicledata_response,
+                        VehicleData,
                     )
 
                 response_status = InternalStatusType.INTERNALSERVERERROR
@@ -128,7 +204,11 @@ class VerizonService(ClientService):
 
                         # Save the data in dynamodb for audit and return the model on success
                         self.save_vehicledata(
-                            msisdn, programcode, vehicledata, headerresponse
+                            msisdn,
+                            programcode,
+                            vehicledata,
+                            headerresponse,
+                            write_behind=True,
                         )
 
                         return vehicledata
@@ -174,7 +254,7 @@ class VerizonService(ClientService):
             )
 
             return VehicleData(
-                status=InternalStatusType.INTERNALSERVERERROR,
+                status=get_exception_status(e),
                 responsemessage=e.args[0] if e.args.__len__() > 0 else None,
             )
 
@@ -191,9 +271,11 @@ class VerizonService(ClientService):
                 },
             )
 
-            response = requests.get(
+            response = get_http_session(
+                "verizon", self._config.root_cert, self._config.pool_size
+            ).get(
                 "{base_url}?wsdl".format(base_url=self._config.base_url),
-                verify=self._config.root_cert,
+                timeout=request_timeout(self._config),
             )
 
             validresponse = (
@@ -251,7 +333,7 @@ class VerizonService(ClientService):
                 },
             )
             return VehicleData(
-                status=InternalStatusType.INTERNALSERVERERROR, responsemessage=str(e)
+                status=get_exception_status(e), responsemessage=str(e)
             )
 
     def assign_agent(self, any):
@@ -261,7 +343,12 @@ class VerizonService(ClientService):
         raise NotImplementedError
 
     def save_vehicledata(
-        self, msisdn, programcode, vehicledata, headerresponse: Optional[dict] = None
+        self,
+        msisdn,
+        programcode,
+        vehicledata,
+        headerresponse: Optional[dict] = None,
+        write_behind: bool = False,
     ):
         if vehicledata is not None:
             try:
@@ -330,7 +417,34 @@ class VerizonService(ClientService):
                     language=vehicledata.language,
                 )
 
+                # live lookups return before the audit row is written
+                if write_behind and save_vehicledata_behind(
+                    self._config, self._Table, vehicle_table
+                ):
+                    self._logger.info(
+                        "SaveVehicleData: Queued Vehicle data for msisdn: {} programcode: {}".format(
+                            vehicledata.msisdn, vehicledata.programcode
+                        ),
+                        extra={
+                            "programcode": vehicledata.programcode,
+                            "msisdn": vehicledata.msisdn,
+                            "action": "SaveVehicleData",
+                            "cts-version": CtsVersion.ONE_DOT_ZERO,
+                        },
+                    )
+                    return VehicleData(
+                        msisdn=msisdn,
+                        status=InternalStatusType.SUCCESS,
+                        responsemessage="Queued the vehicledata for msisdn: {}".format(
+                            msisdn
+                        ),
+                    )
+
                 vehicle_table.save()
+                save_record_items(
+                    self._Table, vehicle_table, latest_item_enabled(self._config)
+                )
+                cache_vehicledata(self._config, vehicle_table)
 
                 self._logger.info(
                     "SaveVehicleData: Successfully saved Vehicle data for msisdn: {} programcode: {} data: {} and the savequeryinfo: {}".format(
@@ -354,6 +468,7 @@ class VerizonService(ClientService):
                     ),
                 )
             except Exception as e:
+                handle_table_error(self._Table, e)
                 self._logger.error(
                     "SaveVehicleData: Unable to save the data onto dynamodb : {} for msisdn: {} programcode: {}".format(
                         e, msisdn, programcode
@@ -420,8 +535,14 @@ def serviceerror_conversion(responsemessage: str):
     return InternalStatusType.INTERNALSERVERERROR
 
 
-def retrieve_zeepclient(serviceurl, localstore, wsdl, root_cert):
-    return get_zeepclient(wsdl, serviceurl, root_cert, "verizon_zeepclient", localstore)
+def retrieve_zeepclient(serviceurl, wsdl, root_cert, pool_size=None, timeout=None):
+    # imported here so zeep stays off the cold start import path while
+    # soap_fast_path is on
+    from src.services.soaphandlers.soap_handler import checkout_zeepclient
+
+    return checkout_zeepclient(
+        "verizon", wsdl, serviceurl, root_cert, pool_size, timeout
+    )
 
 
 def get_timestamp_from_calldate(calldate, calltime):
@@ -434,38 +555,85 @@ def get_timestamp_from_calldate(calldate, calltime):
         return datetime.now()
 
 
-# For saving verizon header data response in db
-def get_additionaldata_from_header(self, fullresponse, msisdn, programcode):
-    try:
-        root = ET.fromstring(fullresponse.text)
-
-        floweventid = (
-            (root[0].getchildren()[2].getchildren()[1].getchildren()[1].text)
-            if ("FlowEventId")
-            in root[0].getchildren()[2].getchildren()[1].getchildren()[1].tag
-            else "NONE"
-        )
-        flowid = (
-            (root[0].getchildren()[2].getchildren()[1].getchildren()[2].text)
-            if ("FlowId")
-            in root[0].getchildren()[2].getchildren()[1].getchildren()[2].tag
-            else "NONE"
+def request_vehiclelocation(self, msisdn, programcode):
+    """RequestVehicleLocation through zeep: the reply body and the tracking
+    headers of the reply."""
+    from src.services.soaphandlers.soap_handler import get_header_text, process_reply
+
+    vehicle_locationrequest = {
+        "Header": {
+            "SourceName": "",
+            # Optional
+            "TargetName": "",
+            "TransactionId": "",
+            "Timestamp": datetime.now(),
+        },
+        # Optional
+        "CTIInteractionID": "",
+        "MDN": msisdn,
+    }
+    with retrieve_zeepclient(
+        self._config.base_url,
+        self._config.wsdl,
+        self._config.root_cert,
+        self._config.pool_size,
+        provider_timeout(self._config),
+    ) as client, client.settings(raw_response=True):
+        fullresponse = call_through(
+            self.circuit_breaker,
+            client.service.RequestVehicleLocation,
+            failed=is_server_error,
+            **vehicle_locationrequest
         )
-        correlationflowid = (
-            (root[0].getchildren()[2].getchildren()[1].getchildren()[3].text)
-            if ("CorrelationFlowId")
-            in root[0].getchildren()[2].getchildren()[1].getchildren()[3].tag
-            else "NONE"
+
+        # one parse of the reply for both the body and the headers
+        response, envelope = process_reply(
+            client, "RequestVehicleLocation", fullresponse
         )
+    headertexts = {
+        name: get_header_text(envelope, name) for name in TRACKING_HEADERS.values()
+    }
+    return response, get_additionaldata_from_header(
+        self, headertexts, msisdn, programcode
+    )
+
+
+def request_vehiclelocation_fast(self, msisdn, programcode):
+    """request_vehiclelocation through the soap_codec templates and
+    streaming parser, without zeep."""
+    fullresponse = send(
+        REQUEST_VEHICLE_LOCATION,
+        get_http_session("verizon", self._config.root_cert, self._config.pool_size),
+        self._config.base_url,
+        request_timeout(self._config),
+        self.circuit_breaker,
+        source_name="",
+        # Optional
+        target_name="",
+        transaction_id="",
+        timestamp=datetime.now(),
+        # Optional
+        cti_interaction_id="",
+        mdn=msisdn,
+    )
+    response, headertexts = parse_reply(
+        fullresponse, REQUEST_VEHICLE_LOCATION.reply, TRACKING_HEADERS.values()
+    )
+    return response, get_additionaldata_from_header(
+        self, headertexts, msisdn, programcode
+    )
+
 
+# For saving verizon header data response in db
+def get_additionaldata_from_header(self, headertexts, msisdn, programcode):
+    try:
         headerresponse = {
-            "floweventid": floweventid,
-            "flowid": flowid,
-            "correlationflowid": correlationflowid,
+            key: headertexts.get(name) or "NONE"
+            for key, name in TRACKING_HEADERS.items()
         }
         self._logger.info(
-            "GetVehicleData: Successfully retrieved additional data headerresponse: {} from response: {} for msisdn: {} programcode: {}".format(
-                headerresponse, fullresponse.text, msisdn, programcode
+            "GetVehicleData: Successfully retrieved additional data headerresponse: {} for msisdn: {} programcode: {}".format(
+                headerresponse, msisdn, programcode
             ),
             extra={
                 "programcode": programcode,
@@ -477,8 +645,8 @@ def get_additionaldata_from_header(self, fullresponse, msisdn, programcode):
         return headerresponse
     except Exception as e:
         self._logger.error(
-            "GetVehicleData: Unable to get addtional data from response: {} Error Occured: {} for msisdn: {} programcode: {}".format(
-                fullresponse, e, msisdn, programcode
+            "GetVehicleData: Unable to get addtional data from response: Error Occured: {} for msisdn: {} programcode: {}".format(
+                e, msisdn, programcode
             ),
             exc_info=True,
             stack_info=True,
@@ -511,7 +679,7 @@ def get_data_from_database(self, msisdn, programcode, ctsversion):
             },
         )
         db_response = get_vehicledata_for_config_enabled_client_only(
-            self, msisdn, programcode, ctsversion
+            self, msisdn, programcode, ctsversion, VEHICLEDATA_ATTRIBUTES
         )
         if db_response is not None:
             dataresponse = create_vehicledata_response(
@@ -7,10 +7,17 @@ from src.models.domain.enums.internal_status_type import InternalStatusType
 from src.models.enums.ctsversion_type import CtsVersion
 from src.models.enums.programcode_type import ProgramCode
 from src.services.client_service import ClientService
+from src.services.dynamodb_batch import batch_save
+from src.services.dynamodb_identity import save_record_items
+from src.services.dynamodb_latest import latest_item_enabled
+from src.services.dynamodb_projections import attributes_to_get, projection
 from src.services.dynamodb_tables import (
     ConnectedVehicleSupplementTable,
     ConnectedVehicleTable,
+    handle_table_error,
 )
+from src.services.ingestion import send_vehicledata_rows
+from src.services.vehicledata_cache import cache_vehicledata, find_latest_vehicledata
 from src.utilities.extensions.datetime_extension import (
     convert_epoch_to_utc_timestamp,
     get_utc_epoch,
@@ -23,6 +30,19 @@ from src.vodafone.models.domain.vehicle_data import VehicleDataRequest
 
 logger = logging.getLogger(__name__)
 
+# Attributes get_vehicledata maps into its response, get_vehicleinfo returns
+# the stored payload and reads the full item.
+VEHICLEDATA_ATTRIBUTES = projection(
+    "brand",
+    "countrycode",
+    "latitude",
+    "longitude",
+    "mileage",
+    "mileageunit",
+    "timestamp",
+    "vin",
+)
+
 
 class VodafoneService(ClientService):
     def __init__(
@@ -51,12 +71,20 @@ class VodafoneService(ClientService):
                     "action": "GetVehicleData",
                 },
             )
-            for dataitem in self._Table.query(
+            dataitem = find_latest_vehicledata(
+                self._config,
+                self._Table,
                 programcode + "-" + msisdn,
-                self._Table.msisdn == msisdn,
-                scan_index_forward=False,
-                limit=1,
-            ):
+                lambda: self._Table.query(
+                    programcode + "-" + msisdn,
+                    self._Table.msisdn == msisdn,
+                    scan_index_forward=False,
+                    limit=1,
+                    attributes_to_get=attributes_to_get(VEHICLEDATA_ATTRIBUTES),
+                ),
+                attributes=VEHICLEDATA_ATTRIBUTES,
+            )
+            if dataitem is not None:
                 self._logger.info(
                     "GetVehicleData: Successfully retrieved response from database for msisdn:{} programcode:{}".format(
                         msisdn, programcode
@@ -69,29 +97,14 @@ class VodafoneService(ClientService):
                     },
                 )
 
-                return VehicleData(
-                    status=InternalStatusType.SUCCESS,
-                    responsemessage="Successfully retrieved",
-                    msisdn=msisdn,
-                    programcode=programcode,
-                    event_datetime=dataitem.event_datetime,
-                    calldate=dataitem.timestamp.strftime("%Y-%m-%d"),
-                    calltime=dataitem.timestamp.strftime("%H:%M"),
-                    timestamp=dataitem.timestamp,
-                    countrycode=dataitem.countrycode,
-                    latitude=dataitem.latitude,
-                    longitude=dataitem.longitude,
-                    vin=dataitem.vin,
-                    brand=dataitem.brand,
-                    mileage=dataitem.mileage,
-                    mileageunit=MileageUnit(dataitem.mileageunit),
-                )
+                return create_vehicledata_response(dataitem, msisdn, programcode)
 
             return VehicleData(
                 status=InternalStatusType.NOTFOUND, responsemessage="No data found"
             )
 
         except Exception as e:
+            handle_table_error(self._Table, e)
             self._logger.info(
                 "GetVehicleData: Error retrieving data from DynamoDB for msisdn:{} e:{}".format(
                     msisdn, e
@@ -109,7 +122,25 @@ class VodafoneService(ClientService):
                 responsemessage=e.args[0] if e.args.__len__() > 0 else None,
             )
 
-    def save_vehicledata(self, msisdn, programcode, savevehicledata):
+    def latest_item_lookup(self, msisdn: str, programcode: ProgramCode):
+        """
+        Table, request_key and projection of msisdn's latest item, so batch
+        lookups can read it along with others. None when lookups don't read
+        latest items.
+        """
+        if not self._config.dynamodb_latest_item:
+            return None
+        return (
+            self._Table,
+            programcode + "-" + reformat_msisdn(msisdn),
+            VEHICLEDATA_ATTRIBUTES,
+        )
+
+    def vehicledata_from_item(self, msisdn: str, programcode: ProgramCode, item):
+        return create_vehicledata_response(item, reformat_msisdn(msisdn), programcode)
+
+    def validate_vehicledata(self, msisdn, programcode, savevehicledata):
+        # the error response for a payload that can't be saved, None if it can
         if (
             savevehicledata is None
             or checkjsonnode("gpsData", savevehicledata) == False
@@ -136,6 +167,12 @@ class VodafoneService(ClientService):
                     msisdn
                 ),
             )
+        return None
+
+    def save_vehicledata(self, msisdn, programcode, savevehicledata):
+        invalid = self.validate_vehicledata(msisdn, programcode, savevehicledata)
+        if invalid is not None:
+            return invalid
 
         try:
             self._logger.info(
@@ -155,7 +192,18 @@ class VodafoneService(ClientService):
             vehicle_table = map_primarytable(
                 msisdn, programcode, vehicledata, self._Table, savevehicledata
             )
-            vehicle_table.save()
+            vehicle_supplementtable = map_supplementrow(
+                self, msisdn, programcode, vehicledata
+            )
+            # both rows in one BatchWriteItem, a row it couldn't write is
+            # saved on its own below
+            unsaved = batch_save(vehicle_table, vehicle_supplementtable)
+            if vehicle_table in unsaved:
+                vehicle_table.save()
+            save_record_items(
+                self._Table, vehicle_table, latest_item_enabled(self._config)
+            )
+            cache_vehicledata(self._config, vehicle_table)
             self._logger.info(
                 "SaveVehicleData: Successfully saved Vehicle data onto main table {} for msisdn: {}".format(
                     vehicledata, msisdn
@@ -167,7 +215,14 @@ class VodafoneService(ClientService):
                 },
             )
 
-            save_supplementdata(self, msisdn, programcode, vehicledata)
+            save_supplementdata(
+                self,
+                msisdn,
+                programcode,
+                vehicledata,
+                saved=vehicle_supplementtable is not None
+                and vehicle_supplementtable not in unsaved,
+            )
 
             return VehicleData(
                 msisdn=msisdn,
@@ -177,6 +232,7 @@ class VodafoneService(ClientService):
                 ),
             )
         except Exception as e:
+            handle_table_error(self._Table, e)
             self._logger.error(
                 "SaveVehicleData: Error occured while saving vehicledata onto primary table: {} for msisdn: {}".format(
                     e, msisdn
@@ -214,12 +270,18 @@ class VodafoneService(ClientService):
                     "action": "GetVehicleInfo",
                 },
             )
-            for dataitem in self._Table.query(
+            dataitem = find_latest_vehicledata(
+                self._config,
+                self._Table,
                 programcode + "-" + msisdn,
-                self._Table.msisdn == msisdn,
-                scan_index_forward=False,
-                limit=1,
-            ):
+                lambda: self._Table.query(
+                    programcode + "-" + msisdn,
+                    self._Table.msisdn == msisdn,
+                    scan_index_forward=False,
+                    limit=1,
+                ),
+            )
+            if dataitem is not None:
                 self._logger.info(
                     "GetVehicleInfo: Successfully retrieved response from database for msisdn:{} programcode:{}".format(
                         msisdn, programcode
@@ -257,6 +319,7 @@ class VodafoneService(ClientService):
             )
 
         except Exception as e:
+            handle_table_error(self._Table, e)
             self._logger.info(
                 "GetVehicleInfo: Error retrieving data from DynamoDB for msisdn:{} e:{}".format(
                     msisdn, e
@@ -274,6 +337,81 @@ class VodafoneService(ClientService):
                 responsemessage=e.args[0] if e.args.__len__() > 0 else None,
             )
 
+    def queue_vehicledata(self, msisdn, programcode, savevehicledata):
+        """
+        Validates and maps a push like save_vehicledata, then hands the rows to
+        the ingestion queue instead of writing them
+        """
+        invalid = self.validate_vehicledata(msisdn, programcode, savevehicledata)
+        if invalid is not None:
+            return invalid
+
+        rows = self.map_vehicledata_rows(msisdn, programcode, savevehicledata)
+        if rows is None:
+            return VehicleData(
+                msisdn=msisdn,
+                status=InternalStatusType.BADREQUEST,
+                responsemessage="SaveVehicleData: Json payload is invalid for msisdn: {}".format(
+                    msisdn
+                ),
+            )
+
+        try:
+            send_vehicledata_rows(
+                msisdn,
+                programcode,
+                CtsVersion.ONE_DOT_ZERO,
+                *rows,
+                latest_item=latest_item_enabled(self._config),
+            )
+        except Exception as e:
+            self._logger.error(
+                "SaveVehicleData: Unable to queue the vehicledata: {} for msisdn: {}".format(
+                    e, msisdn
+                ),
+                exc_info=True,
+                stack_info=True,
+                extra={
+                    "programcode": programcode,
+                    "cts-version": CtsVersion.ONE_DOT_ZERO,
+                    "payload": savevehicledata,
+                    "action": "SaveVehicleData",
+                },
+            )
+            return VehicleData(
+                msisdn=msisdn,
+                status=InternalStatusType.INTERNALSERVERERROR,
+                responsemessage="Unable to queue the vehicledata for msisdn: {}".format(
+                    msisdn
+                ),
+            )
+
+        self._logger.info(
+            "SaveVehicleData: Queued Vehicle data for msisdn: {}".format(msisdn),
+            extra={
+                "programcode": programcode,
+                "cts-version": CtsVersion.ONE_DOT_ZERO,
+                "action": "SaveVehicleData",
+            },
+        )
+        return VehicleData(
+            msisdn=msisdn,
+            status=InternalStatusType.SUCCESS,
+            responsemessage="Queued the vehicledata for msisdn: {}".format(msisdn),
+        )
+
+    def map_vehicledata_rows(self, msisdn, programcode, savevehicledata):
+        # main and supplement table rows, None when the payload doesn't parse
+        vehicledata = self.populate_vehicledata(msisdn, programcode, savevehicledata)
+        if vehicledata is None:
+            return None
+        return (
+            map_primarytable(
+                msisdn, programcode, vehicledata, self._Table, savevehicledata
+            ),
+            map_supplementrow(self, msisdn, programcode, vehicledata),
+        )
+
     def populate_vehicledata(self, msisdn, programcode, data):
         try:
             vehicle_data = VehicleDataRequest(**data)
@@ -303,6 +441,26 @@ class VodafoneService(ClientService):
         raise NotImplementedError
 
 
+def create_vehicledata_response(dataitem, msisdn, programcode: ProgramCode):
+    return VehicleData(
+        status=InternalStatusType.SUCCESS,
+        responsemessage="Successfully retrieved",
+        msisdn=msisdn,
+        programcode=programcode,
+        event_datetime=dataitem.event_datetime,
+        calldate=dataitem.timestamp.strftime("%Y-%m-%d"),
+        calltime=dataitem.timestamp.strftime("%H:%M"),
+        timestamp=dataitem.timestamp,
+        countrycode=dataitem.countrycode,
+        latitude=dataitem.latitude,
+        longitude=dataitem.longitude,
+        vin=dataitem.vin,
+        brand=dataitem.brand,
+        mileage=dataitem.mileage,
+        mileageunit=MileageUnit(dataitem.mileageunit),
+    )
+
+
 def reformat_msisdn(msisdn):
     if len(msisdn) == 10:
         msisdn = "1" + msisdn
@@ -339,15 +497,18 @@ def save_supplementdata(
     msisdn: str,
     programcode: ProgramCode,
     request: VehicleDataRequest,
+    saved: bool = False,
 ):
+    # saved: the row was already written along with the main table row
     try:
-        vehicle_supplementtable = map_supplementtable(
-            msisdn,
-            programcode,
-            request,
-            self._SupplementTable,
-        )
-        vehicle_supplementtable.save()
+        if not saved:
+            vehicle_supplementtable = map_supplementtable(
+                msisdn,
+                programcode,
+                request,
+                self._SupplementTable,
+            )
+            vehicle_supplementtable.save()
         self._logger.info(
             "SaveVehicleData: Successfully saved additional vehicle data onto supplement table {} for msisdn: {}".format(
                 request, msisdn
@@ -359,6 +520,7 @@ def save_supplementdata(
             },
         )
     except Exception as e:
+        handle_table_error(self._SupplementTable, e)
         self._logger.error(
             "SaveVehicleData: Error occured while saving data onto supplement table: {} for msisdn: {}".format(
                 e, msisdn
@@ -373,6 +535,19 @@ def save_supplementdata(
         )
 
 
+def map_supplementrow(
+    self,
+    msisdn: str,
+    programcode: ProgramCode,
+    request: VehicleDataRequest,
+):
+    # None leaves mapping errors to save_supplementdata, which logs them
+    try:
+        return map_supplementtable(msisdn, programcode, request, self._SupplementTable)
+    except Exception:
+        return None
+
+
 def map_supplementtable(
     msisdn: str,
     programcode: ProgramCode,
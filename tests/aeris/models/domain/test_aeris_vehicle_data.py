@@ -38,6 +38,7 @@ def generate_valid_aeris_data():
         "countrycode": None,
         "mileage": None,
         "mileageunit":None,
+        "dataage": None,
         "status": "SUCCESS",
         "responsemessage": "response message",
     }
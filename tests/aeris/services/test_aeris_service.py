@@ -1,11 +1,13 @@
 from datetime import datetime
 from decimal import Decimal
+from time import monotonic
 from unittest.mock import patch
 
 import boto3
 import pytest
 from boto3.dynamodb.conditions import Key
 from moto import mock_dynamodb2
+from requests.exceptions import ReadTimeout
 from src.aeris.models.domain.vehicle_data import VehicleData
 from src.aeris.services.aeris_service import (
     AerisService,
@@ -18,7 +20,13 @@ from src.models.domain.enums.internal_status_type import InternalStatusType
 from src.models.enums.ctsversion_type import CtsVersion
 from src.models.enums.odometerscale_type import OdometerScaleType
 from src.models.enums.programcode_type import ProgramCode
+from src.services.circuit_breaker import get_circuit_breaker
+from src.services.stale_fallback import (
+    get_stale_fallback_stats,
+    reset_stale_fallback_stats,
+)
 from src.services.dynamodb_tables import ConnectedVehicleTable, get_main_table
+from src.utilities.request_context import set_request_deadline
 
 BASE_URL = "fooBaseURL"
 ROOT_CERT = "fooCERT"
@@ -44,8 +52,10 @@ def setup_aeris_service(mock_logger, mock_dynamo_cv_table):
 
 @pytest.fixture
 def patched_rest_client():
-    with patch("src.aeris.services.aeris_service.requests") as patched_rest_client:
-        yield patched_rest_client
+    with patch(
+        "src.aeris.services.aeris_service.get_http_session"
+    ) as patched_get_http_session:
+        yield patched_get_http_session.return_value
 
 
 successjson = {
@@ -247,6 +257,24 @@ def test_aeris_service_get_vehicledata_on_get_success_but_save_fail_returns_getr
     assert response.status == InternalStatusType.SUCCESS
 
 
+def test_aeris_service_get_vehicledata_with_write_behind_queues_save(
+    patched_rest_client, mock_logger, mock_dynamo_cv_table
+):
+    patched_rest_client.get.side_effect = mocked_requests_get
+    aerisservice = AerisService(
+        config=AerisConfig(base_url="https://successjson", write_behind_enable=True),
+        table=mock_dynamo_cv_table,
+    )
+    with patch(
+        "src.aeris.services.aeris_service.save_vehicledata_behind", return_value=True
+    ) as patched_save_behind:
+        response = aerisservice.get_vehicledata("5243583607", "vwcarnet")
+
+    assert response.status == InternalStatusType.SUCCESS
+    patched_save_behind.assert_called_once()
+    mock_dynamo_cv_table.return_value.save.assert_not_called()
+
+
 @mock_dynamodb2
 def test_aeris_service_save_vehicledata_should_save_data_as_expected(
     patched_rest_client, mock_logger
@@ -338,6 +366,151 @@ def test_aeris_service_get_vehicledata_on_exception_should_return_500(
     assert response.responsemessage == "something wrong"
 
 
+def test_aeris_service_get_vehicledata_on_timeout_should_return_504_with_bounded_timeout(
+    setup_aeris_service, patched_rest_client
+):
+    patched_rest_client.get.side_effect = ReadTimeout("read timed out")
+    set_request_deadline(monotonic() + 3)
+
+    response = setup_aeris_service.get_vehicledata("aaaaa", "vwcarnet")
+
+    assert response.status == InternalStatusType.GATEWAYTIMEOUT
+    connect, read = patched_rest_client.get.call_args[1]["timeout"]
+    assert connect <= 2.5 and read <= 2.5
+
+
+def open_aeris_circuit(config):
+    breaker = get_circuit_breaker("aeris", config)
+    for _ in range(breaker.minimum_calls):
+        breaker.allow_request()
+        breaker.record(True, 0.1)
+    return breaker
+
+
+def test_aeris_service_get_vehicledata_on_open_circuit_returns_last_known_record(
+    patched_rest_client, mock_logger, mock_dynamo_cv_table
+):
+    mock_dynamo_cv_table.query.return_value = generate_valid_aeris_dbresponse()
+    config = AerisConfig(
+        base_url="https://successjson",
+        dynamodb_check_enable=False,
+        circuit_breaker_enable=True,
+    )
+    open_aeris_circuit(config)
+    aerisservice = AerisService(config=config, table=mock_dynamo_cv_table)
+
+    response = aerisservice.get_vehicledata("5243583607", "vwcarnet")
+
+    patched_rest_client.get.assert_not_called()
+    assert response.status == InternalStatusType.SUCCESS
+    assert response.vin == "dbresponse_VIN"
+    assert response.responsemessage.startswith("Last known vehicle data")
+
+
+def test_aeris_service_get_vehicledata_on_open_circuit_without_record_should_return_503(
+    patched_rest_client, mock_logger, mock_dynamo_cv_table
+):
+    mock_dynamo_cv_table.query.return_value = []
+    config = AerisConfig(base_url="https://successjson", circuit_breaker_enable=True)
+    breaker = open_aeris_circuit(config)
+    aerisservice = AerisService(config=config, table=mock_dynamo_cv_table)
+
+    response = aerisservice.get_vehicledata("5243583607", "vwcarnet")
+
+    patched_rest_client.get.assert_not_called()
+    assert response.status == InternalStatusType.SERVICEUNAVAILABLE
+    assert aerisservice.circuit_breaker is breaker
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_aeris_service_get_vehicledata_on_open_circuit_skips_record_older_than_max_stale_age(
+    patched_rest_client, mock_logger, mock_dynamo_cv_table
+):
+    (record,) = generate_valid_aeris_dbresponse()
+    record.event_datetime -= 3600 * 1000
+    mock_dynamo_cv_table.query.return_value = [record]
+    config = AerisConfig(
+        base_url="https://successjson",
+        dynamodb_check_enable=False,
+        circuit_breaker_enable=True,
+        stale_fallback_max_age_by_programcode={"vwcarnet": 5},
+    )
+    open_aeris_circuit(config)
+    aerisservice = AerisService(config=config, table=mock_dynamo_cv_table)
+
+    response = aerisservice.get_vehicledata("5243583607", "vwcarnet")
+
+    assert response.status == InternalStatusType.SERVICEUNAVAILABLE
+
+
+@pytest.mark.parametrize("age_minutes, stat", [(0, "stale"), (60, "too_old")])
+def test_aeris_service_get_vehicledata_on_open_circuit_with_stale_fallback_counts_stored_data(
+    patched_rest_client, mock_logger, mock_dynamo_cv_table, age_minutes, stat
+):
+    (record,) = generate_valid_aeris_dbresponse()
+    record.event_datetime -= age_minutes * 60 * 1000
+    mock_dynamo_cv_table.query.return_value = [record]
+    config = AerisConfig(
+        base_url="https://successjson",
+        dynamodb_check_enable=False,
+        circuit_breaker_enable=True,
+        stale_fallback_enable=True,
+        stale_fallback_max_age_by_programcode={"vwcarnet": 5},
+    )
+    open_aeris_circuit(config)
+    aerisservice = AerisService(config=config, table=mock_dynamo_cv_table)
+    reset_stale_fallback_stats()
+
+    response = aerisservice.get_vehicledata("5243583607", "vwcarnet")
+
+    assert get_stale_fallback_stats()[stat] == 1
+    assert get_stale_fallback_stats()["live"] == (1 if stat == "too_old" else 0)
+    assert response.status == (
+        InternalStatusType.SUCCESS
+        if stat == "stale"
+        else InternalStatusType.SERVICEUNAVAILABLE
+    )
+    reset_stale_fallback_stats()
+
+
+def test_aeris_service_get_vehicledata_records_server_errors_on_the_circuit(
+    patched_rest_client, mock_logger, mock_dynamo_cv_table
+):
+    patched_rest_client.get.side_effect = mocked_requests_get
+    aerisservice = AerisService(
+        config=AerisConfig(
+            base_url="https://server_error", circuit_breaker_enable=True
+        ),
+        table=mock_dynamo_cv_table,
+    )
+
+    aerisservice.get_vehicledata("5243583607", "vwcarnet")
+
+    assert aerisservice.circuit_breaker.stats()["failures"] == 1
+
+
+def test_aeris_service_get_vehicledata_on_live_failure_returns_stored_data_with_its_age(
+    patched_rest_client, mock_logger, mock_dynamo_cv_table
+):
+    patched_rest_client.get.side_effect = mocked_requests_get
+    mock_dynamo_cv_table.query.return_value = generate_valid_aeris_dbresponse()
+    aerisservice = AerisService(
+        config=AerisConfig(
+            base_url="https://server_error",
+            stale_fallback_enable=True,
+            stale_fallback_max_age_by_programcode={"vwcarnet": 5},
+        ),
+        table=mock_dynamo_cv_table,
+    )
+
+    response = aerisservice.get_vehicledata("5243583607", "vwcarnet")
+
+    patched_rest_client.get.assert_called_once()
+    assert response.status == InternalStatusType.SUCCESS
+    assert response.vin == "dbresponse_VIN"
+    assert response.dataage < 300
+
+
 @pytest.mark.parametrize(
     "mockedresponsekey", ["datanode_missing_on_success", "errornode_missing_on_error"]
 )
@@ -1,3 +1,4 @@
+from datetime import datetime, timezone
 from unittest.mock import patch
 
 import pytest
@@ -109,6 +110,119 @@ def test_ping(client):
     assert parsed["data"]["responsemessage"] == "HealthCheck passed"
 
 
+def test_ping_returns_connection_pool_stats(client):
+    with patch(
+        "src.api.api.get_http_session_stats",
+        return_value={
+            "fca": {
+                "pool_size": 10,
+                "connections_opened": 1,
+                "requests": 4,
+                "connections_reused": 3,
+            }
+        },
+    ):
+        response = client.get("/health")
+    parsed = response.json()
+    assert parsed["data"]["connectionpools"]["fca"]["connections_reused"] == 3
+
+
+def test_ping_returns_lease_stats(client):
+    with patch(
+        "src.services.dynamodb_lease.get_lease_stats",
+        return_value={"acquired": 2, "contended": 5, "released": 2, "errors": 0},
+    ):
+        response = client.get("/health")
+    parsed = response.json()
+    assert parsed["data"]["leases"]["contended"] == 5
+
+
+def test_ping_returns_coalescing_stats(client):
+    with patch(
+        "src.api.api.get_coalescing_stats",
+        return_value={"executed": 3, "merged": 7, "inflight": 0},
+    ):
+        response = client.get("/health")
+    parsed = response.json()
+    assert parsed["data"]["coalescing"]["merged"] == 7
+
+
+def test_ping_returns_vehicledata_cache_stats(client):
+    with patch(
+        "src.services.vehicledata_cache.get_vehicledata_cache_stats",
+        return_value={"hits": 4, "misses": 2, "evictions": 0, "expired": 1, "size": 2},
+    ):
+        response = client.get("/health")
+    parsed = response.json()
+    assert parsed["data"]["vehicledatacache"]["hits"] == 4
+
+
+def test_ping_returns_write_behind_stats(client):
+    with patch(
+        "src.services.write_behind.get_write_behind_stats",
+        return_value={
+            "queued": 5,
+            "written": 4,
+            "batches": 1,
+            "overflow": 0,
+            "spooled": 0,
+            "pending": 1,
+        },
+    ):
+        response = client.get("/health")
+    parsed = response.json()
+    assert parsed["data"]["writebehind"]["pending"] == 1
+
+
+def test_ping_returns_stale_fallback_stats(client):
+    with patch(
+        "src.api.api.get_stale_fallback_stats",
+        return_value={"live": 8, "stale": 2, "too_old": 0},
+    ):
+        response = client.get("/health")
+    parsed = response.json()
+    assert parsed["data"]["stalefallback"]["stale"] == 2
+
+
+def test_ping_returns_zeep_client_pool_stats(client):
+    with patch(
+        "src.api.api.get_zeepclient_pool_stats",
+        return_value={
+            "siriusxm": {
+                "size": 10,
+                "created": 3,
+                "in_use": 1,
+                "idle": 2,
+                "checkouts": 40,
+                "waits": 0,
+                "timeouts": 0,
+            }
+        },
+    ):
+        response = client.get("/health")
+    parsed = response.json()
+    assert parsed["data"]["zeepclientpools"]["siriusxm"]["created"] == 3
+
+
+def test_ping_returns_circuit_breaker_stats(client):
+    with patch(
+        "src.api.api.get_circuit_breaker_stats",
+        return_value={
+            "aeris": {
+                "state": "open",
+                "calls": 10,
+                "failures": 6,
+                "slow_calls": 0,
+                "rejected": 3,
+                "opened": 1,
+            }
+        },
+    ):
+        response = client.get("/health")
+    parsed = response.json()
+    assert parsed["data"]["circuitbreakers"]["aeris"]["state"] == "open"
+
+
 @pytest.mark.parametrize(
     "programcode", ["nissan", "infiniti", "toyota"], ids=["Nissan", "Infiniti", "Toyota"]
 )
@@ -725,6 +839,75 @@ def test_get_vehicledata_on_different_error_status_should_return_expected_except
     assert patched_setuplogger.error.called
 
 
+@pytest.mark.parametrize(
+    "programcode,ctsversion",
+    [("vwcarnet", "2.0"), ("fca", "1.0"), ("vwcarnet", "1.0")],
+    ids=["Aeris", "FCA", "Verizon"],
+)
+def test_get_vehicledata_on_upstream_timeout_should_return_504_gateway_timeout(
+    client, patched_setupservicemanager, programcode, ctsversion
+):
+    patched_setupservicemanager().client_service.get_vehicledata.return_value = (
+        AerisVehicleData(
+            status=InternalStatusType.GATEWAYTIMEOUT, responsemessage="read timed out"
+        )
+    )
+    response = client.get(
+        "/data/5243583607/programcode/{}/ctsversion/{}".format(programcode, ctsversion)
+    )
+    assert response.status_code == 504
+    assert response.json()["errors"][0] == {
+        "code": "GatewayTimeout",
+        "detail": "read timed out",
+        "status": "504",
+        "title": "Gateway Timeout",
+    }
+
+
+def test_get_vehicledata_with_stored_data_should_return_its_age(
+    client, patched_setupservicemanager
+):
+    patched_setupservicemanager().client_service.get_vehicledata.return_value = (
+        AerisVehicleData(
+            msisdn="5243583607",
+            vin="VIN1",
+            status=InternalStatusType.SUCCESS,
+            dataage=42,
+        )
+    )
+    response = client.get("/data/5243583607/programcode/vwcarnet/ctsversion/2.0")
+    assert response.status_code == 200
+    parsed = response.json()["data"]
+    assert parsed["dataage"] == 42
+    assert parsed["vehicle"]["vin"] == "VIN1"
+
+
+@pytest.mark.parametrize(
+    "programcode,ctsversion",
+    [("vwcarnet", "2.0"), ("fca", "1.0"), ("vwcarnet", "1.0")],
+    ids=["Aeris", "FCA", "Verizon"],
+)
+def test_get_vehicledata_on_open_circuit_should_return_503_service_unavailable(
+    client, patched_setupservicemanager, programcode, ctsversion
+):
+    patched_setupservicemanager().client_service.get_vehicledata.return_value = (
+        AerisVehicleData(
+            status=InternalStatusType.SERVICEUNAVAILABLE,
+            responsemessage="aeris is unavailable, its circuit breaker is open",
+        )
+    )
+    response = client.get(
+        "/data/5243583607/programcode/{}/ctsversion/{}".format(programcode, ctsversion)
+    )
+    assert response.status_code == 503
+    assert response.json()["errors"][0] == {
+        "code": "ServiceUnavailable",
+        "detail": "aeris is unavailable, its circuit breaker is open",
+        "status": "503",
+        "title": "Service Unavailable",
+    }
+
+
 @pytest.mark.parametrize(
     "statustype, expected",
     testerrorstatus,
@@ -893,6 +1076,173 @@ def test_save_vehicledata_fca_with_ctsversion_on_success_should_return_201(
     )
 
 
+def test_save_vehicledata_fca_with_ingestion_queue_enabled_should_return_202(
+    client, patched_setupservicemanager
+):
+    client_service = patched_setupservicemanager().client_service
+    client_service.queue_vehicledata.return_value = FcaVehicleData(
+        msisdn="12345678901",
+        status="SUCCESS",
+        responsemessage="Queued the vehicledata for msisdn: 12345678901",
+    )
+    with patch("src.services.ingestion.ingestion_enabled", return_value=True):
+        response = client.post(
+            "/data/12345678901/programcode/fca/ctsversion/1.0",
+            json=save_data_request_json(),
+        )
+
+    assert response.status_code == 202
+    parsed = response.json()
+    assert parsed["data"]["status"] == "202"
+    assert (
+        parsed["data"]["responsemessage"]
+        == "Queued the vehicledata for msisdn: 12345678901"
+    )
+    client_service.save_vehicledata.assert_not_called()
+
+
+def test_getvehicledata_batch_returns_status_per_item(
+    client, patched_setupservicemanager
+):
+    from src.services.batch_lookup import LookupFailure
+
+    async def lookup_vehicledata_batch(lookups, deadline):
+        return [
+            FcaVehicleData(
+                msisdn="13234826699",
+                programcode="fca",
+                vin="VIN1",
+                status=InternalStatusType.SUCCESS,
+            ),
+            LookupFailure(
+                msisdn="5243583607",
+                status=InternalStatusType.GATEWAYTIMEOUT,
+                responsemessage="Timed out looking up vehicle data for msisdn: 5243583607",
+            ),
+            FcaVehicleData(status=InternalStatusType.NOTFOUND, responsemessage="none"),
+        ]
+
+    with patch(
+        "src.services.batch_lookup.lookup_vehicledata_batch",
+        side_effect=lookup_vehicledata_batch,
+    ):
+        response = client.post(
+            "/data/batch",
+            json={
+                "items": [
+                    {"msisdn": "13234826699", "programcode": "fca", "ctsversion": "1.0"},
+                    {"msisdn": "5243583607", "programcode": "vwcarnet"},
+                    {"msisdn": "1234567890", "programcode": "fca", "ctsversion": "1.0"},
+                ]
+            },
+        )
+
+    assert response.status_code == 200
+    items = response.json()["data"]["items"]
+    assert [item["status"] for item in items] == ["200", "504", "404"]
+    assert items[0]["data"]["vehicle"]["vin"] == "VIN1"
+    assert items[1]["data"] is None
+    assert items[2]["responsemessage"] == "none"
+
+
+def test_getvehicledata_batch_with_too_many_items_should_return_400(client):
+    response = client.post(
+        "/data/batch",
+        json={
+            "items": [{"msisdn": "13234826699", "programcode": "fca"}] * 26,
+        },
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.fixture
+def patched_main_table():
+    from src.services.dynamodb_tables import ConnectedVehicleTable
+
+    with patch(
+        "src.services.dynamodb_tables.get_main_table",
+        return_value=ConnectedVehicleTable,
+    ):
+        yield ConnectedVehicleTable
+
+
+def test_getvehicledata_by_vin_returns_newest_stored_record(client, patched_main_table):
+    from src.utilities.extensions.datetime_extension import get_utc_epoch
+
+    record = patched_main_table(
+        request_key="vwcarnet-5243583607",
+        event_datetime=get_utc_epoch() - 90000,
+        programcode="vwcarnet",
+        msisdn="5243583607",
+        timestamp=datetime(2021, 1, 7, 13, 44, tzinfo=timezone.utc),
+        vin="3VWCB7BU9LM003155",
+        latitude=42.5,
+        odometer=12000,
+        odometerscale="km",
+        mileageunit="Miles",
+    )
+    with patch(
+        "src.services.dynamodb_identity.get_vin_item", return_value=record
+    ) as get_vin_item:
+        response = client.get("/data/vin/3VWCB7BU9LM003155")
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["header"]["programcode"] == "vwcarnet"
+    assert data["header"]["msisdn"] == "5243583607"
+    assert data["header"]["odometerscale"] == "Kilometers"
+    assert data["location"]["latitude"] == 42.5
+    assert data["vehicle"]["vin"] == "3VWCB7BU9LM003155"
+    assert data["vehicle"]["mileageunit"] == "Miles"
+    assert data["dataage"] == 90
+    get_vin_item.assert_called_once_with(patched_main_table, "3VWCB7BU9LM003155")
+
+
+def test_getvehicledata_by_vin_without_record_should_return_404(
+    client, patched_main_table
+):
+    with patch("src.services.dynamodb_identity.get_vin_item", return_value=None):
+        response = client.get("/data/vin/3VWCB7BU9LM003155")
+
+    assert response.status_code == 404
+
+
+def test_getvehicledata_by_vin_with_read_timeout_should_return_504(
+    client, patched_main_table
+):
+    from src.utilities.request_context import DeadlineExceeded
+
+    with patch(
+        "src.services.dynamodb_identity.get_vin_item",
+        side_effect=DeadlineExceeded("Request deadline passed"),
+    ):
+        response = client.get("/data/vin/3VWCB7BU9LM003155")
+
+    assert response.status_code == 504
+
+
+def test_getprogramcodes_returns_programcodes_of_msisdn(client, patched_main_table):
+    with patch(
+        "src.services.dynamodb_identity.get_msisdn_programcodes",
+        return_value=["fca", "vwcarnet"],
+    ):
+        response = client.get("/data/msisdn/5243583607/programcodes")
+
+    assert response.status_code == 200
+    assert response.json()["data"] == {
+        "msisdn": "5243583607",
+        "programcodes": ["fca", "vwcarnet"],
+    }
+
+    with patch(
+        "src.services.dynamodb_identity.get_msisdn_programcodes", return_value=[]
+    ):
+        response = client.get("/data/msisdn/5243583607/programcodes")
+
+    assert response.status_code == 404
+
+
 def test_save_vehicledata_fca_with_ctsversion_on_json_body_none_should_return_400(
     client, patched_setupservicemanager
 ):
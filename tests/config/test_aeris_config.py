@@ -13,9 +13,27 @@ def generate_valid_config_data():
     return {
         "base_url": "fooBaseURL",
         "root_cert": "fooCERT",
+        "pool_size": 10,
         "dynamo_table_name": "fooTable",
         "dynamodb_check_enable": False,
         "dynamodb_check_timelimit": 0,
+        "dynamodb_latest_item": False,
+        "write_behind_enable": False,
+        "connect_timeout": 3.05,
+        "read_timeout": 10.0,
+        "circuit_breaker_enable": True,
+        "circuit_breaker_failure_rate": 0.5,
+        "circuit_breaker_slow_call_seconds": 8.0,
+        "circuit_breaker_slow_call_rate": 0.8,
+        "circuit_breaker_minimum_calls": 10,
+        "circuit_breaker_window_seconds": 60.0,
+        "circuit_breaker_open_seconds": 30.0,
+        "circuit_breaker_half_open_probes": 2,
+        "stale_fallback_enable": True,
+        "stale_fallback_max_age": 60,
+        "stale_fallback_max_age_by_programcode": {"vwcarnet": 30},
+        "stale_fallback_latency_budget": 2.0,
+        "stale_fallback_refresh_wait": 2.0,
     }
 
 
@@ -26,9 +26,30 @@ def generate_valid_config_data(api_key):
         "terminate_bcall_url": "fooTerminateURL",
         "max_retries": 3,
         "delay_for_each_retry": 1,
+        "retry_initial_delay": 0.5,
+        "retry_jitter": 0.2,
+        "retry_fast_polls": 2,
+        "retry_fast_poll_delay": 0.25,
+        "retry_deadline_margin": 2,
+        "bcall_lease_seconds": 1,
+        "data_arrival_probe_interval": 0.5,
         "max_ani_length": 11,
         "api_gateway_base_path": "foopath",
         "root_cert": "fooCERT",
+        "pool_size": 10,
+        "dynamodb_cache_ttl": 60,
+        "dynamodb_latest_item": False,
+        "ingestion_queue_enable": False,
+        "connect_timeout": 3.05,
+        "read_timeout": 10.0,
+        "circuit_breaker_enable": True,
+        "circuit_breaker_failure_rate": 0.5,
+        "circuit_breaker_slow_call_seconds": 8.0,
+        "circuit_breaker_slow_call_rate": 0.8,
+        "circuit_breaker_minimum_calls": 10,
+        "circuit_breaker_window_seconds": 60.0,
+        "circuit_breaker_open_seconds": 30.0,
+        "circuit_breaker_half_open_probes": 2,
     }
 
 
@@ -13,7 +13,13 @@ def generate_valid_config_data():
     return {
         "base_url": "fooBaseURL",
         "root_cert": "fooCERT",
+        "pool_size": 10,
         "wsdl": "fooWSDL",
+        "dynamodb_cache_ttl": 60,
+        "dynamodb_latest_item": False,
+        "connect_timeout": 3.05,
+        "read_timeout": 10.0,
+        "soap_fast_path": False,
         "api_key":"abc",
         "raw_apikey":"cde",
     }
@@ -14,6 +14,9 @@ def generate_valid_config_data():
         "base_url": "fooBaseURL",
         "terminate_url": "terminate_url",
         "root_cert": "root_cert",
+        "pool_size": 10,
+        "connect_timeout": 3.05,
+        "read_timeout": 10.0,
     }
 
 
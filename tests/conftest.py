@@ -2,22 +2,98 @@ from logging import Logger
 from unittest.mock import MagicMock, create_autospec
 
 from agero_python_configuration import ConfigManager
+from moto import mock_dynamodb2
 from pytest import fixture
 from src.aeris.services.aeris_service import AerisService
+from src.config.dynamo_config import DynamoConfig
 from src.fca.services.fca_service import FcaService
+from src.services.circuit_breaker import reset_circuit_breakers
 from src.services.client_service import ClientService
 from src.services.dynamodb_tables import (
     ConnectedVehicleSupplementTable,
     ConnectedVehicleTable,
+    get_main_table,
+    get_supplement_table,
+    invalidate_table_readiness,
 )
 from src.services.echo_service import EchoService
+from src.services.vehicledata_cache import vehicledata_cache
 from src.siriusxm.services.siriusxm_service import SiriusXmService
 from src.tmna.services.tmna_service import TmnaService
 from src.utilities.logging import LoggerFactory
+from src.utilities.request_context import set_request_deadline
 from src.verizon.services.verizon_service import VerizonService
 from src.vodafone.services.vodafone_service import VodafoneService
 from src.wirelesscar.services.wirelesscar_service import WirelessCarService
 
+# captured replies of the SOAP services, for the handlers and the fast path
+VERIZON_REPLY = (
+    b'<?xml version="1.0" encoding="UTF-8"?>\n'
+    b'<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/">'
+    b'<env:Header xmlns:wsa="http://www.w3.org/2005/08/addressing" xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">'
+    b"<wsa:Action>http://xmlns.hughestelematics.com/VehicleLocateEBSV1/RequestVehicleLocation</wsa:Action>"
+    b"<wsa:MessageID>urn:44edc912-607b-11eb-a7c8-0050568556a3</wsa:MessageID>"
+    b"<wsa:ReplyTo><wsa:Address>http://www.w3.org/2005/08/addressing/anonymous</wsa:Address>"
+    b"<wsa:ReferenceParameters>"
+    b'<instra:tracking.ecid xmlns:instra="http://xmlns.oracle.com/sca/tracking/1.0">c55c130e-b18a-41eb-a65b-f87dce76194e-00cfe0db</instra:tracking.ecid>'
+    b'<instra:tracking.FlowEventId xmlns:instra="http://xmlns.oracle.com/sca/tracking/1.0">7918148</instra:tracking.FlowEventId>'
+    b'<instra:tracking.FlowId xmlns:instra="http://xmlns.oracle.com/sca/tracking/1.0">528070</instra:tracking.FlowId>'
+    b'<instra:tracking.CorrelationFlowId xmlns:instra="http://xmlns.oracle.com/sca/tracking/1.0">0000NT300^E4AxwpGCl3if1VfVBt0007Zu</instra:tracking.CorrelationFlowId>'
+    b'<instra:tracking.quiescing.SCAEntityId xmlns:instra="http://xmlns.oracle.com/sca/tracking/1.0">832</instra:tracking.quiescing.SCAEntityId>'
+    b"</wsa:ReferenceParameters></wsa:ReplyTo>"
+    b"<wsa:FaultTo><wsa:Address>http://www.w3.org/2005/08/addressing/anonymous</wsa:Address></wsa:FaultTo>"
+    b"</env:Header>"
+    b'<soap-env:Body xmlns:soap-env="http://schemas.xmlsoap.org/soap/envelope/">'
+    b'<ns0:VehicleLocationResponse xmlns:ns0="http://xmlns.hughestelematics.com/VehicleLocation">'
+    b"<ns0:CallDate>01/07/2021</ns0:CallDate><ns0:CallTime>13:44:32</ns0:CallTime>"
+    b"<ns0:CustomerFirstName>JUSTINE</ns0:CustomerFirstName><ns0:CustomerLastName>EHLERS</ns0:CustomerLastName>"
+    b"<ns0:Make>vw</ns0:Make><ns0:Model>Passat</ns0:Model><ns0:ExteriorColor>Pure White</ns0:ExteriorColor>"
+    b"<ns0:VIN>1VWSA7A3XLC011823</ns0:VIN>"
+    b"<ns0:FromLocationCity>Redmond</ns0:FromLocationCity><ns0:FromLocationState>WA</ns0:FromLocationState>"
+    b"<ns0:FromLocationLatitude>47.6740</ns0:FromLocationLatitude><ns0:FromLocationLongitude>-122.1215</ns0:FromLocationLongitude>"
+    b"<ns0:FromLocationPhoneNo>4258811803</ns0:FromLocationPhoneNo><ns0:SRNumber>1-13220115574</ns0:SRNumber>"
+    b"<ns0:Response><ns0:ResponseCode>00</ns0:ResponseCode>"
+    b"<ns0:ResponseStatus>Successful Execution</ns0:ResponseStatus>"
+    b"<ns0:ResponseDescription>Data Found</ns0:ResponseDescription></ns0:Response>"
+    b"</ns0:VehicleLocationResponse></soap-env:Body></soapenv:Envelope>"
+)
+SIRIUSXM_REPLY = (
+    b'<S:Envelope xmlns:S="http://schemas.xmlsoap.org/soap/envelope/"><S:Body>'
+    b'<ns2:agent-assigned-response-message xmlns:ns2="http://www.atxg.com/schemas/t3/ts/svcpartnercommon">'
+    b"<ns2:reference-id>ref-1</ns2:reference-id>"
+    b"<ns2:result-code>NO_ERROR</ns2:result-code>"
+    b"<ns2:result-msg>Agent assigned</ns2:result-msg>"
+    b"</ns2:agent-assigned-response-message></S:Body></S:Envelope>"
+)
+SOAP_FAULT_REPLY = (
+    b'<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/">'
+    b"<soapenv:Body><soapenv:Fault><faultcode>soapenv:Server</faultcode>"
+    b"<faultstring>Internal Error</faultstring></soapenv:Fault></soapenv:Body>"
+    b"</soapenv:Envelope>"
+)
+
+
+@fixture(autouse=True)
+def clear_vehicledata_cache():
+    vehicledata_cache.reset()
+    yield
+    vehicledata_cache.reset()
+
+
+@fixture(autouse=True)
+def clear_request_deadline():
+    # a deadline left behind by one test would cut the calls of the next
+    set_request_deadline(None)
+    yield
+    set_request_deadline(None)
+
+
+@fixture(autouse=True)
+def clear_circuit_breakers():
+    reset_circuit_breakers()
+    yield
+    reset_circuit_breakers()
+
 
 @fixture
 def mock_logger():
@@ -37,6 +113,45 @@ def mock_dynamo_supplement_cv_table():
     yield mocked_table
 
 
+@fixture
+def moto_dynamo_config():
+    yield DynamoConfig(table_name="moto-cv", supplement_table_name="moto-supplement-cv")
+
+
+@fixture
+def cv_tables(moto_dynamo_config):
+    """
+    The main and supplement tables in moto, created from their models with
+    the indexes and TTL those define, as get_main_table and
+    get_supplement_table return them.
+    """
+    invalidate_table_readiness()
+    tables = (ConnectedVehicleTable, ConnectedVehicleSupplementTable)
+    table_names = (
+        moto_dynamo_config.table_name,
+        moto_dynamo_config.supplement_table_name,
+    )
+    # pynamodb keeps the connection of the first table name on the class
+    connections = [table._connection for table in tables]
+    with mock_dynamodb2():
+        for table, table_name in zip(tables, table_names):
+            table.Meta.table_name = table_name
+            table.Meta.host = moto_dynamo_config.endpoint
+            table._connection = None
+            table.create_table(billing_mode="PAY_PER_REQUEST", wait=True)
+        yield (
+            get_main_table(moto_dynamo_config),
+            get_supplement_table(moto_dynamo_config),
+        )
+    for table, connection in zip(tables, connections):
+        table._connection = connection
+
+
+@fixture
+def cv_table(cv_tables):
+    yield cv_tables[0]
+
+
 @fixture
 def mock_config_manager():
     mocked_manager = create_autospec(spec=ConfigManager)
@@ -115,3 +230,32 @@ def mock_tmna_client_service():
 def mock_wirelesscar_client_service():
     mocked_wirelesscar_service = create_autospec(spec=WirelessCarService)
     yield mocked_wirelesscar_service
+
+
+class RawReply:
+    """The parts of a requests response the SOAP handlers read."""
+
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {"Content-Type": "text/xml"}
+
+
+@fixture
+def raw_reply():
+    yield RawReply
+
+
+@fixture
+def verizon_reply():
+    yield VERIZON_REPLY
+
+
+@fixture
+def siriusxm_reply():
+    yield SIRIUSXM_REPLY
+
+
+@fixture
+def soap_fault_reply():
+    yield SOAP_FAULT_REPLY
@@ -1,11 +1,14 @@
+import time
 from datetime import datetime
 from decimal import Decimal
+from threading import Timer
 from unittest.mock import patch
 
 import boto3
 import pytest
 from boto3.dynamodb.conditions import Key
 from moto import mock_dynamodb2
+from requests.exceptions import ConnectTimeout
 from src.config.dynamo_config import DynamoConfig
 from src.config.fca_config import FcaConfig
 from src.fca.models.data.vehicle_data import VehicleData
@@ -21,11 +24,14 @@ from src.models.domain.enums.internal_status_type import InternalStatusType
 from src.models.enums.callstatus_type import CallStatus
 from src.models.enums.ctsversion_type import CtsVersion
 from src.models.enums.programcode_type import ProgramCode
+from src.services.circuit_breaker import get_circuit_breaker
+from src.services.data_arrival import publish_data_arrival
 from src.services.dynamodb_tables import (
     ConnectedVehicleTable,
     get_main_table,
     get_supplement_table,
 )
+from src.utilities.request_context import set_request_deadline
 
 BASE_URL = "fooBaseURL"
 DYNAMO_TABLE_NAME = "cv-table"
@@ -67,8 +73,10 @@ def setup_fca_service(mock_dynamo_cv_table, mock_dynamo_supplement_cv_table):
 
 @pytest.fixture
 def patched_rest_client():
-    with patch("src.fca.services.fca_service.requests") as patched_rest_client:
-        yield patched_rest_client
+    with patch(
+        "src.fca.services.fca_service.get_http_session"
+    ) as patched_get_http_session:
+        yield patched_get_http_session.return_value
 
 
 successjson = {"message": "Bcall request sent successfully"}
@@ -552,6 +560,57 @@ def test_service_save_vehicledata_returns_200_if_success(mock_logger, is_brand_a
     )
 
 
+@mock_dynamodb2
+def test_service_save_vehicledata_publishes_data_arrival_for_request_key(mock_logger):
+    TABLE_NAME = dynamodb_primarytable_setup("local-cv")
+    primary_table = get_main_table(DynamoConfig(table_name=TABLE_NAME))
+
+    fcaservice = FcaService(
+        config=FcaConfig(base_url="someurl"),
+        table=primary_table,
+        supplementtable="invalid",
+    )
+
+    with patch(
+        "src.fca.services.fca_service.publish_data_arrival"
+    ) as patched_publish_data_arrival:
+        fcaservice.save_vehicledata(
+            "13234826699", "fca", generate_valid_fca_maserati_data()
+        )
+    patched_publish_data_arrival.assert_called_once_with("fca-13234826699")
+
+
+@mock_dynamodb2
+def test_service_save_vehicledata_saves_rows_the_batch_could_not_write(mock_logger):
+    TABLE_NAME = dynamodb_primarytable_setup("local-cv")
+    primary_table = get_main_table(DynamoConfig(table_name=TABLE_NAME))
+    SUPPLEMENT_TABLE_NAME = dynamodb_primarytable_setup("local-supplement-cv")
+    supplement_table = get_supplement_table(
+        DynamoConfig(supplement_table_name=SUPPLEMENT_TABLE_NAME)
+    )
+    fcaservice = FcaService(
+        config=FcaConfig(base_url="someurl"),
+        table=primary_table,
+        supplementtable=supplement_table,
+    )
+
+    with patch(
+        "src.fca.services.fca_service.batch_save", side_effect=lambda *rows: list(rows)
+    ) as patched_batch_save:
+        response = fcaservice.save_vehicledata(
+            "13234826699", "fca", generate_valid_fca_maserati_data()
+        )
+
+    assert response.status == InternalStatusType.SUCCESS
+    patched_batch_save.assert_called_once()
+    conn = boto3.resource("dynamodb", region_name="us-east-1")
+    for table_name in (TABLE_NAME, SUPPLEMENT_TABLE_NAME):
+        result = conn.Table(table_name).query(
+            KeyConditionExpression=Key("request_key").eq("fca-13234826699"),
+        )
+        assert result["Count"] >= 1
+
+
 @mock_dynamodb2
 def test_save_vehicledata_returns_success_even_if_secondary_data_save_is_unsuccessful(
     mock_logger,
@@ -655,6 +714,54 @@ def test_save_vehicledata_on_bad_request_returns_400(setup_fca_service, invalid_
     )
 
 
+def test_queue_vehicledata_sends_mapped_rows(setup_fca_service):
+    with patch(
+        "src.fca.services.fca_service.send_vehicledata_rows"
+    ) as patched_send_rows:
+        response = setup_fca_service.queue_vehicledata(
+            "13234826699", "fca", generate_valid_fca_maserati_data()
+        )
+
+    assert response.status == InternalStatusType.SUCCESS
+    assert response.responsemessage == "Queued the vehicledata for msisdn: 13234826699"
+    patched_send_rows.assert_called_once()
+    assert patched_send_rows.call_args[0][:3] == (
+        "13234826699",
+        "fca",
+        CtsVersion.ONE_DOT_ZERO,
+    )
+
+
+def test_queue_vehicledata_on_bad_request_returns_400_without_queueing(
+    setup_fca_service,
+):
+    with patch(
+        "src.fca.services.fca_service.send_vehicledata_rows"
+    ) as patched_send_rows:
+        response = setup_fca_service.queue_vehicledata(
+            "5243583607", "fca", {"Data": {"customExtension": None}}
+        )
+
+    assert response.status == InternalStatusType.BADREQUEST
+    patched_send_rows.assert_not_called()
+
+
+def test_queue_vehicledata_on_queue_error_returns_500(setup_fca_service):
+    with patch(
+        "src.fca.services.fca_service.send_vehicledata_rows",
+        side_effect=Exception("unreachable"),
+    ):
+        response = setup_fca_service.queue_vehicledata(
+            "13234826699", "fca", generate_valid_fca_maserati_data()
+        )
+
+    assert response.status == InternalStatusType.INTERNALSERVERERROR
+    assert (
+        response.responsemessage
+        == "Unable to queue the vehicledata for msisdn: 13234826699"
+    )
+
+
 def dynamodb_primarytable_setup(tblname):
     TABLE_NAME = tblname
     client = boto3.client("dynamodb", region_name="us-east-1")
@@ -1427,6 +1534,351 @@ def test_fca_service_retrial_request_bcall_get_vehicledata_on_success_should_ret
     assert dataresponse is None
 
 
+def test_fca_service_retrial_request_bcall_get_vehicledata_on_data_arrival_should_return_without_waiting_for_delay(
+    mock_logger,
+    mock_dynamo_cv_table,
+    mock_dynamo_supplement_cv_table,
+    patched_rest_client,
+):
+    mock_dynamo_cv_table.query.side_effect = [
+        [],
+        generate_valid_fca_data_singlelist(),
+    ]
+    patched_rest_client.post.side_effect = mocked_requests_post
+    fcaservice = FcaService(
+        config=FcaConfig(
+            base_url="https://successjson",
+            max_ani_length=11,
+            bcall_data_url="/a",
+            max_retries=3,
+            delay_for_each_retry=10,
+        ),
+        table=mock_dynamo_cv_table,
+        supplementtable=mock_dynamo_supplement_cv_table,
+    )
+    Timer(0.1, publish_data_arrival, ["fca-12345678901"]).start()
+    started = time.perf_counter()
+    response, validresponsejson, dataresponse = retrial_request_bcall_get_vehicledata(
+        fcaservice,
+        msisdn="12345678901",
+        programcode="fca",
+        payload={"msisdn": "12345678901"},
+        action="GetVehicleDataTEST",
+    )
+    assert time.perf_counter() - started < 5
+    assert dataresponse.status == InternalStatusType.SUCCESS
+    assert patched_rest_client.post.call_count == 1
+
+
+def test_fca_service_retrial_request_bcall_get_vehicledata_on_save_by_another_instance_should_return_without_waiting_for_delay(
+    mock_logger,
+    mock_dynamo_cv_table,
+    mock_dynamo_supplement_cv_table,
+    patched_rest_client,
+):
+    mock_dynamo_cv_table.query.side_effect = [
+        [],
+        generate_valid_fca_data_singlelist(),
+    ]
+    patched_rest_client.post.side_effect = mocked_requests_post
+    fcaservice = FcaService(
+        config=FcaConfig(
+            base_url="https://successjson",
+            max_ani_length=11,
+            bcall_data_url="/a",
+            max_retries=3,
+            delay_for_each_retry=10,
+            data_arrival_probe_interval=0.05,
+        ),
+        table=mock_dynamo_cv_table,
+        supplementtable=mock_dynamo_supplement_cv_table,
+    )
+    started = time.perf_counter()
+    with patch(
+        "src.fca.services.fca_service.get_newest_event_datetime",
+        side_effect=[None, None, 1610027040000],
+    ) as patched_probe:
+        response, validresponsejson, dataresponse = (
+            retrial_request_bcall_get_vehicledata(
+                fcaservice,
+                msisdn="12345678901",
+                programcode="fca",
+                payload={"msisdn": "12345678901"},
+                action="GetVehicleDataTEST",
+            )
+        )
+    assert time.perf_counter() - started < 5
+    assert dataresponse.status == InternalStatusType.SUCCESS
+    assert patched_rest_client.post.call_count == 1
+    patched_probe.assert_called_with(mock_dynamo_cv_table, "fca-12345678901", False)
+
+
+def test_fca_service_retrial_request_bcall_get_vehicledata_should_requery_with_consistent_read_and_log_attempts(
+    mock_logger,
+    mock_dynamo_cv_table,
+    mock_dynamo_supplement_cv_table,
+    patched_rest_client,
+):
+    mock_dynamo_cv_table.query.side_effect = [
+        [],
+        [],
+        generate_valid_fca_data_singlelist(),
+    ]
+    patched_rest_client.post.side_effect = mocked_requests_post
+    fcaservice = FcaService(
+        config=FcaConfig(
+            base_url="https://successjson",
+            max_ani_length=11,
+            bcall_data_url="/a",
+            max_retries=3,
+            delay_for_each_retry=1,
+            retry_fast_poll_delay=0.01,
+        ),
+        table=mock_dynamo_cv_table,
+        supplementtable=mock_dynamo_supplement_cv_table,
+    )
+    with patch.object(fcaservice, "_logger") as patched_logger:
+        response, validresponsejson, dataresponse = (
+            retrial_request_bcall_get_vehicledata(
+                fcaservice,
+                msisdn="12345678901",
+                programcode="fca",
+                payload={"msisdn": "12345678901"},
+                action="GetVehicleDataTEST",
+            )
+        )
+    assert dataresponse.status == InternalStatusType.SUCCESS
+    assert patched_rest_client.post.call_count == 1
+    assert all(
+        call.kwargs["consistent_read"] is True
+        for call in mock_dynamo_cv_table.query.call_args_list
+    )
+    attempts = patched_logger.info.call_args_list[-1].kwargs["extra"]["attempts"]
+    assert [attempt["found"] for attempt in attempts] == [False, False, True]
+    assert [attempt["requested"] for attempt in attempts] == [True, False, False]
+
+
+def test_fca_service_retrial_request_bcall_get_vehicledata_should_stop_at_request_deadline(
+    mock_logger,
+    mock_dynamo_cv_table,
+    mock_dynamo_supplement_cv_table,
+    patched_rest_client,
+):
+    mock_dynamo_cv_table.query.return_value = []
+    patched_rest_client.post.side_effect = mocked_requests_post
+    fcaservice = FcaService(
+        config=FcaConfig(
+            base_url="https://successjson",
+            max_ani_length=11,
+            bcall_data_url="/a",
+            max_retries=3,
+            delay_for_each_retry=10,
+            retry_deadline_margin=0,
+        ),
+        table=mock_dynamo_cv_table,
+        supplementtable=mock_dynamo_supplement_cv_table,
+    )
+    set_request_deadline(time.monotonic() + 1)
+    started = time.perf_counter()
+    try:
+        response, validresponsejson, dataresponse = (
+            retrial_request_bcall_get_vehicledata(
+                fcaservice,
+                msisdn="12345678901",
+                programcode="fca",
+                payload={"msisdn": "12345678901"},
+                action="GetVehicleDataTEST",
+            )
+        )
+    finally:
+        set_request_deadline(None)
+    assert time.perf_counter() - started < 1.5
+    assert dataresponse is None
+
+
+def test_fca_service_retrial_request_bcall_get_vehicledata_should_space_failed_bcall_requests_by_delay_for_each_retry(
+    mock_logger,
+    mock_dynamo_cv_table,
+    mock_dynamo_supplement_cv_table,
+    patched_rest_client,
+):
+    patched_rest_client.post.side_effect = mocked_requests_post
+    fcaservice = FcaService(
+        config=FcaConfig(
+            base_url="https://content_notsupported",
+            max_ani_length=11,
+            bcall_data_url="/a",
+            max_retries=2,
+            delay_for_each_retry=1,
+            retry_jitter=0,
+        ),
+        table=mock_dynamo_cv_table,
+        supplementtable=mock_dynamo_supplement_cv_table,
+    )
+    started = time.perf_counter()
+    response, validresponsejson, dataresponse = retrial_request_bcall_get_vehicledata(
+        fcaservice,
+        msisdn="12345678901",
+        programcode="fca",
+        payload={"msisdn": "12345678901"},
+        action="GetVehicleDataTEST",
+    )
+    # not the 0.25 s fast poll, that is for re-querying after an accepted bcall
+    assert time.perf_counter() - started >= 1
+    assert patched_rest_client.post.call_count == 2
+    assert response.status_code == 500
+    assert dataresponse is None
+    mock_dynamo_cv_table.query.assert_not_called()
+
+
+def test_fca_service_get_vehicledata_without_time_for_one_attempt_should_return_504(
+    mock_logger,
+    mock_dynamo_cv_table,
+    patched_rest_client,
+    setup_fca_service,
+):
+    mock_dynamo_cv_table.query.return_value = []
+    set_request_deadline(time.monotonic() + 1)
+    try:
+        dataresponse = setup_fca_service.get_vehicledata(
+            msisdn="12345678901", programcode="fca"
+        )
+    finally:
+        set_request_deadline(None)
+    assert dataresponse.status == InternalStatusType.GATEWAYTIMEOUT
+    assert (
+        dataresponse.responsemessage
+        == "No time left to request fca bcall data for msisdn: 12345678901"
+    )
+    patched_rest_client.post.assert_not_called()
+
+
+def test_fca_service_retrial_request_bcall_get_vehicledata_should_wait_without_bcall_when_lease_is_held_elsewhere(
+    mock_logger,
+    mock_dynamo_cv_table,
+    mock_dynamo_supplement_cv_table,
+    patched_rest_client,
+):
+    mock_dynamo_cv_table.query.side_effect = [
+        [],
+        generate_valid_fca_data_singlelist(),
+    ]
+    patched_rest_client.post.side_effect = mocked_requests_post
+    fcaservice = FcaService(
+        config=FcaConfig(
+            base_url="https://successjson",
+            max_ani_length=11,
+            bcall_data_url="/a",
+            max_retries=3,
+            delay_for_each_retry=1,
+            retry_fast_poll_delay=0.01,
+        ),
+        table=mock_dynamo_cv_table,
+        supplementtable=mock_dynamo_supplement_cv_table,
+    )
+    with patch(
+        "src.fca.services.fca_service.acquire_lease", return_value=False
+    ) as patched_acquire_lease, patch(
+        "src.fca.services.fca_service.release_lease"
+    ) as patched_release_lease:
+        response, validresponsejson, dataresponse = (
+            retrial_request_bcall_get_vehicledata(
+                fcaservice,
+                msisdn="12345678901",
+                programcode="fca",
+                payload={"msisdn": "12345678901"},
+                action="GetVehicleDataTEST",
+            )
+        )
+    assert dataresponse.status == InternalStatusType.SUCCESS
+    assert response is None
+    assert patched_rest_client.post.call_count == 0
+    assert patched_acquire_lease.call_args.args[1] == "fca-12345678901"
+    assert patched_release_lease.call_count == 0
+
+
+def test_fca_service_retrial_request_bcall_get_vehicledata_should_release_lease_after_bcall(
+    mock_logger,
+    mock_dynamo_cv_table,
+    mock_dynamo_supplement_cv_table,
+    patched_rest_client,
+):
+    mock_dynamo_cv_table.query.return_value = generate_valid_fca_data_singlelist()
+    patched_rest_client.post.side_effect = mocked_requests_post
+    fcaservice = FcaService(
+        config=FcaConfig(
+            base_url="https://successjson",
+            max_ani_length=11,
+            bcall_data_url="/a",
+            max_retries=3,
+            delay_for_each_retry=1,
+            bcall_lease_seconds=5,
+        ),
+        table=mock_dynamo_cv_table,
+        supplementtable=mock_dynamo_supplement_cv_table,
+    )
+    with patch(
+        "src.fca.services.fca_service.acquire_lease", return_value=True
+    ) as patched_acquire_lease, patch(
+        "src.fca.services.fca_service.release_lease"
+    ) as patched_release_lease:
+        retrial_request_bcall_get_vehicledata(
+            fcaservice,
+            msisdn="12345678901",
+            programcode="fca",
+            payload={"msisdn": "12345678901"},
+            action="GetVehicleDataTEST",
+        )
+    table, name, owner, seconds = patched_acquire_lease.call_args.args
+    assert seconds == 5
+    assert patched_rest_client.post.call_count == 1
+    patched_release_lease.assert_called_once_with(table, name, owner)
+
+
+def test_fca_service_get_vehicledata_should_return_404_when_lease_holder_push_never_arrives(
+    mock_logger,
+    mock_dynamo_cv_table,
+    mock_dynamo_supplement_cv_table,
+    patched_rest_client,
+):
+    mock_dynamo_cv_table.query.return_value = []
+    fcaservice = FcaService(
+        config=FcaConfig(
+            base_url="https://successjson",
+            max_ani_length=11,
+            bcall_data_url="/a",
+            max_retries=1,
+            delay_for_each_retry=1,
+            retry_deadline_margin=0,
+        ),
+        table=mock_dynamo_cv_table,
+        supplementtable=mock_dynamo_supplement_cv_table,
+    )
+    with patch("src.fca.services.fca_service.acquire_lease", return_value=False):
+        dataresponse = fcaservice.get_vehicledata(
+            msisdn="12345678901", programcode="fca"
+        )
+    assert dataresponse.status == InternalStatusType.NOTFOUND
+    assert patched_rest_client.post.call_count == 0
+
+
+def test_fca_service_get_vehicledata_response_should_skip_cache_for_consistent_read(
+    mock_dynamo_cv_table, mock_dynamo_supplement_cv_table, mock_logger
+):
+    mock_dynamo_cv_table.query.return_value = generate_valid_fca_data_singlelist()
+    fcaservice = FcaService(
+        config=FcaConfig(dynamodb_cache_ttl=60),
+        table=mock_dynamo_cv_table,
+        supplementtable=mock_dynamo_supplement_cv_table,
+    )
+    get_vehicledata_response(fcaservice, "12345678901", "fca")
+    get_vehicledata_response(fcaservice, "12345678901", "fca")
+    assert mock_dynamo_cv_table.query.call_count == 1
+
+    get_vehicledata_response(fcaservice, "12345678901", "fca", consistent_read=True)
+    assert mock_dynamo_cv_table.query.call_count == 2
+
+
 def test_fca_service_request_bcall_data_on_success_should_return_200_or_202(
     mock_logger,
     mock_dynamo_cv_table,
@@ -1455,6 +1907,74 @@ def test_fca_service_request_bcall_data_on_success_should_return_200_or_202(
     assert response.status_code == 202
 
 
+def test_fca_service_request_bcall_data_on_timeout_should_return_504(
+    mock_logger,
+    mock_dynamo_cv_table,
+    mock_dynamo_supplement_cv_table,
+    patched_rest_client,
+):
+    patched_rest_client.post.side_effect = ConnectTimeout("connect timed out")
+    fcaservice = FcaService(
+        config=FcaConfig(
+            base_url="https://successjson",
+            max_ani_length=11,
+            bcall_data_url="/a",
+            connect_timeout=1,
+            read_timeout=5,
+        ),
+        table=mock_dynamo_cv_table,
+        supplementtable=mock_dynamo_supplement_cv_table,
+    )
+    response = request_bcall_data(
+        fcaservice,
+        msisdn="12345678901",
+        programcode="fca",
+        payload={"msisdn": "12345678901"},
+        action="GetVehicleDataTEST",
+    )
+    assert response.status_code == 504
+    assert response.reason == "Gateway Timeout"
+    assert patched_rest_client.post.call_args[1]["timeout"] == (1, 5)
+
+
+def test_fca_service_retrial_request_bcall_get_vehicledata_on_open_circuit_should_return_503_without_retrying(
+    mock_logger,
+    mock_dynamo_cv_table,
+    mock_dynamo_supplement_cv_table,
+    patched_rest_client,
+):
+    mock_dynamo_cv_table.query.return_value = []
+    config = FcaConfig(
+        base_url="https://successjson",
+        max_ani_length=11,
+        bcall_data_url="/a",
+        max_retries=3,
+        delay_for_each_retry=1,
+        circuit_breaker_enable=True,
+        circuit_breaker_minimum_calls=1,
+    )
+    breaker = get_circuit_breaker("fca", config)
+    breaker.allow_request()
+    breaker.record(True, 0.1)
+    fcaservice = FcaService(
+        config=config,
+        table=mock_dynamo_cv_table,
+        supplementtable=mock_dynamo_supplement_cv_table,
+    )
+    response, validresponsejson, dataresponse = retrial_request_bcall_get_vehicledata(
+        fcaservice,
+        msisdn="12345678901",
+        programcode="fca",
+        payload={"msisdn": "12345678901"},
+        action="GetVehicleDataTEST",
+    )
+    patched_rest_client.post.assert_not_called()
+    assert response.status_code == 503
+    assert response.reason == "Service Unavailable"
+    assert dataresponse is None
+    assert breaker.stats()["rejected"] == 1
+
+
 def test_fca_service_get_vehicledata_response_on_success_should_return_valid_db_dataresponse(
     mock_dynamo_cv_table, setup_fca_service
 ):
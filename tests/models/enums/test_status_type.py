@@ -11,6 +11,8 @@ mockStatusTestData = [
     ("0", Status.UNKNOWN),
     ("403", Status.INVALID_STATE_ERROR),
     ("400", Status.BAD_REQUEST),
+    ("503", Status.SERVICE_UNAVAILABLE),
+    ("504", Status.GATEWAY_TIMEOUT),
 ]
 
 @pytest.mark.parametrize(
@@ -24,6 +26,8 @@ mockStatusTestData = [
         "Unknown",        
         "InvalidStateError",
         "BadRequest",
+        "ServiceUnavailable",
+        "GatewayTimeout",
     ],
 )
 def test_enum_status_has_correct_values(statuscode,expected):
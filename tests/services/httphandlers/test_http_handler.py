@@ -0,0 +1,91 @@
+from time import monotonic
+
+import pytest
+
+from src.config.tmna_config import TmnaConfig
+from src.services.httphandlers.http_handler import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    close_http_sessions,
+    get_http_session,
+    get_http_session_stats,
+    request_timeout,
+)
+from src.utilities.request_context import set_request_deadline
+
+
+@pytest.fixture(autouse=True)
+def clear_http_sessions():
+    close_http_sessions()
+    yield
+    close_http_sessions()
+
+
+def test_get_http_session_returns_same_session_for_provider():
+    session = get_http_session("fca", "somecert", 5)
+    assert get_http_session("fca", "somecert", 5) is session
+    assert session.verify == "somecert"
+
+
+def test_get_http_session_returns_separate_session_per_provider():
+    assert get_http_session("fca", "somecert") is not get_http_session(
+        "aeris", "somecert"
+    )
+
+
+@pytest.mark.parametrize(
+    "root_cert, pool_size",
+    [("othercert", 5), ("somecert", 20)],
+    ids=["rootCertChanged", "poolSizeChanged"],
+)
+def test_get_http_session_when_config_changes_returns_new_session(root_cert, pool_size):
+    session = get_http_session("fca", "somecert", 5)
+    assert get_http_session("fca", root_cert, pool_size) is not session
+
+
+def test_get_http_session_mounts_adapter_with_pool_size():
+    session = get_http_session("tmna", "somecert", 7)
+    adapter = session.get_adapter("https://gateway")
+    assert adapter._pool_maxsize == 7
+    assert session.get_adapter("http://gateway") is adapter
+
+
+def test_get_http_session_without_pool_size_uses_requests_default():
+    session = get_http_session("tmna", "somecert", None)
+    assert session.get_adapter("https://gateway")._pool_maxsize == 10
+
+
+def test_get_http_session_stats_counts_reused_connections():
+    session = get_http_session("fca", "somecert", 5)
+    pool = session.get_adapter("https://gateway").poolmanager.connection_from_url(
+        "https://gateway"
+    )
+    pool.num_connections = 2
+    pool.num_requests = 9
+    assert get_http_session_stats() == {
+        "fca": {
+            "pool_size": 5,
+            "connections_opened": 2,
+            "requests": 9,
+            "connections_reused": 7,
+        }
+    }
+
+
+def test_get_http_session_stats_for_unknown_provider_returns_empty():
+    assert get_http_session_stats("verizon") == {}
+
+
+def test_request_timeout_uses_configured_or_default_timeouts():
+    assert request_timeout(TmnaConfig(connect_timeout=1, read_timeout=4)) == (1, 4)
+    assert request_timeout(TmnaConfig()) == (
+        DEFAULT_CONNECT_TIMEOUT,
+        DEFAULT_READ_TIMEOUT,
+    )
+
+
+def test_request_timeout_is_cut_to_the_remaining_time():
+    set_request_deadline(monotonic() + 2)
+    connect, read = request_timeout(TmnaConfig(connect_timeout=1, read_timeout=4))
+    assert connect == 1
+    assert read <= 1.5
@@ -0,0 +1,10 @@
+import pytest
+
+VERIZON_WSDL = "src/config/wsdl/RequestVehicleLocation.wsdl"
+
+
+@pytest.fixture
+def verizon_client():
+    from zeep import Client
+
+    return Client(VERIZON_WSDL)
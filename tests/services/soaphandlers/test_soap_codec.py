@@ -0,0 +1,193 @@
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+from lxml import etree
+from zeep.helpers import serialize_object
+
+from src.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.services.soaphandlers.soap_codec import (
+    AGENT_ASSIGNED,
+    REQUEST_VEHICLE_LOCATION,
+    TERMINATE,
+    SoapFault,
+    parse_reply,
+    send,
+    soap_fast_path_enabled,
+)
+from src.services.soaphandlers.soap_handler import process_reply
+from src.verizon.services.verizon_service import TRACKING_HEADERS
+
+
+def canonical(envelope):
+    return etree.tostring(etree.fromstring(envelope), method="c14n")
+
+
+@pytest.mark.parametrize("mdn", ["5243583607", "52<43&58>"])
+def test_request_vehicle_location_envelope_matches_zeep(verizon_client, mdn):
+    timestamp = datetime(2021, 1, 7, 13, 44, 32, 123456)
+    expected = verizon_client.create_message(
+        verizon_client.service,
+        "RequestVehicleLocation",
+        Header={
+            "SourceName": "",
+            "TargetName": "",
+            "TransactionId": "",
+            "Timestamp": timestamp,
+        },
+        CTIInteractionID="",
+        MDN=mdn,
+    )
+    envelope = REQUEST_VEHICLE_LOCATION.envelope(
+        source_name="",
+        target_name="",
+        transaction_id="",
+        timestamp=timestamp,
+        cti_interaction_id="",
+        mdn=mdn,
+    )
+    assert canonical(envelope) == etree.tostring(expected, method="c14n")
+    operation = verizon_client.service._binding._operations["RequestVehicleLocation"]
+    assert REQUEST_VEHICLE_LOCATION.headers["SOAPAction"] == '"{}"'.format(
+        operation.soapaction
+    )
+
+
+def with_groups(reply):
+    # empty and blank fields, a repeated group, no optional groups
+    return reply.replace(
+        b"<ns0:Make>vw</ns0:Make>",
+        b"<ns0:VehicleYear> 2020 </ns0:VehicleYear><ns0:Make></ns0:Make>",
+    ).replace(
+        b"<ns0:Response>",
+        b"<ns0:ServiceKeyData><ns0:ServiceKeyDataID>1</ns0:ServiceKeyDataID>"
+        b"</ns0:ServiceKeyData><ns0:ServiceKeyData>"
+        b"<ns0:ServiceKeyDataValue>a &amp; b</ns0:ServiceKeyDataValue>"
+        b"</ns0:ServiceKeyData><ns0:Response>",
+    )
+
+
+def without_response(reply):
+    return reply.replace(
+        reply[
+            reply.index(b"<ns0:Response>") : reply.index(
+                b"</ns0:VehicleLocationResponse>"
+            )
+        ],
+        b"",
+    )
+
+
+@pytest.mark.parametrize(
+    "variant",
+    [lambda reply: reply, with_groups, without_response],
+    ids=["captured", "groups", "no_response"],
+)
+def test_parse_reply_reads_request_vehicle_location_as_zeep_does(
+    verizon_client, raw_reply, verizon_reply, variant
+):
+    reply = variant(verizon_reply)
+    expected, envelope = process_reply(
+        verizon_client, "RequestVehicleLocation", raw_reply(reply)
+    )
+    body, headers = parse_reply(
+        raw_reply(reply), REQUEST_VEHICLE_LOCATION.reply, TRACKING_HEADERS.values()
+    )
+    assert body == serialize_object(expected, dict)
+    assert headers == {
+        "tracking.FlowEventId": "7918148",
+        "tracking.FlowId": "528070",
+        "tracking.CorrelationFlowId": "0000NT300^E4AxwpGCl3if1VfVBt0007Zu",
+    }
+
+
+def test_siriusxm_envelopes():
+    assert AGENT_ASSIGNED.envelope(reference_id="ref&1", is_assigned=True) == (
+        b"<?xml version='1.0' encoding='utf-8'?>\n"
+        b'<soap-env:Envelope xmlns:soap-env="http://schemas.xmlsoap.org/soap/envelope/">'
+        b"<soap-env:Body>"
+        b'<ns0:agent-assigned-request-message xmlns:ns0="http://www.atxg.com/schemas/t3/ts/svcpartnersvc">'
+        b"<ns0:reference-id>ref&amp;1</ns0:reference-id>"
+        b"<ns0:is-assigned>true</ns0:is-assigned>"
+        b"</ns0:agent-assigned-request-message>"
+        b"</soap-env:Body></soap-env:Envelope>"
+    )
+    assert b"<ns0:is-assigned>false</ns0:is-assigned>" in AGENT_ASSIGNED.envelope(
+        reference_id="ref-1", is_assigned=False
+    )
+    assert canonical(TERMINATE.envelope(reference_id="ref-1")) == (
+        b'<soap-env:Envelope xmlns:soap-env="http://schemas.xmlsoap.org/soap/envelope/">'
+        b"<soap-env:Body>"
+        b'<ns0:terminate-request-message xmlns:ns0="http://www.atxg.com/schemas/t3/ts/svcpartnersvc">'
+        b"<ns0:reference-id>ref-1</ns0:reference-id>"
+        b"</ns0:terminate-request-message>"
+        b"</soap-env:Body></soap-env:Envelope>"
+    )
+    assert AGENT_ASSIGNED.headers["SOAPAction"] == '"agentAssigned"'
+    assert TERMINATE.headers["SOAPAction"] == '"terminate"'
+
+
+def test_parse_reply_reads_siriusxm_response_message(raw_reply, siriusxm_reply):
+    body, headers = parse_reply(raw_reply(siriusxm_reply), AGENT_ASSIGNED.reply)
+    assert body == {
+        "reference-id": "ref-1",
+        "result-code": "NO_ERROR",
+        "result-msg": "Agent assigned",
+    }
+    assert headers == {}
+
+    body, _ = parse_reply(raw_reply(siriusxm_reply), TERMINATE.reply)
+    assert body is None
+
+
+@pytest.mark.parametrize("status_code", [200, 500])
+def test_parse_reply_raises_soap_faults(raw_reply, soap_fault_reply, status_code):
+    with pytest.raises(SoapFault, match="Internal Error") as execinfo:
+        parse_reply(raw_reply(soap_fault_reply, status_code), TERMINATE.reply)
+    assert execinfo.value.code == "soapenv:Server"
+    assert execinfo.value.status_code == status_code
+
+
+@pytest.mark.parametrize(
+    "content, status_code, message",
+    [
+        (b"", 202, "invalid XML"),
+        (b"<html>Bad Gateway</html>", 502, "no soap envelope"),
+        (b"Bad Gateway", 502, "invalid XML"),
+    ],
+)
+def test_parse_reply_raises_for_other_replies(raw_reply, content, status_code, message):
+    with pytest.raises(SoapFault, match=message):
+        parse_reply(raw_reply(content, status_code), AGENT_ASSIGNED.reply)
+
+
+def test_parse_reply_raises_for_error_status_without_fault(raw_reply, siriusxm_reply):
+    with pytest.raises(SoapFault, match="HTTP status 503"):
+        parse_reply(raw_reply(siriusxm_reply, 503), AGENT_ASSIGNED.reply)
+
+
+def test_send_posts_envelope_through_breaker(raw_reply, soap_fault_reply):
+    session = Mock()
+    session.post.return_value = raw_reply(soap_fault_reply, 500)
+    breaker = CircuitBreaker("foo", minimum_calls=1)
+
+    reply = send(
+        TERMINATE, session, "https://foo", (3, 10), breaker, reference_id="ref-1"
+    )
+
+    assert reply.status_code == 500
+    session.post.assert_called_once_with(
+        "https://foo",
+        data=TERMINATE.envelope(reference_id="ref-1"),
+        headers=TERMINATE.headers,
+        timeout=(3, 10),
+    )
+    assert breaker.stats()["failures"] == 1
+    with pytest.raises(CircuitOpenError):
+        send(TERMINATE, session, "https://foo", (3, 10), breaker, reference_id="x")
+
+
+def test_soap_fast_path_enabled_only_when_configured():
+    assert soap_fast_path_enabled(Mock(soap_fast_path=True))
+    assert not soap_fast_path_enabled(Mock(soap_fast_path=None))
+    assert not soap_fast_path_enabled(object())
@@ -1,19 +1,23 @@
+from time import monotonic
+
 import pytest
 from mock import patch
-from requests import Session
+from zeep.exceptions import Fault
+from zeep.loader import parse_xml
 
 from src.models.exceptions.application_exception import ApplicationException
-from src.services.soaphandlers.soap_handler import get_zeepclient
-
-testdata = [
-    ("cab.com", True),
-    ("bcd.com", True),
-    ("abc.com", True),
-    ("abc.com", False),
-    ("bcd.com", True),
-    ("bcd.com", False),
-    ("bcd.com", False),
-]
+from src.services.soaphandlers.soap_handler import (
+    DeadlineTransport,
+    checkout_zeepclient,
+    get_header_text,
+    process_reply,
+)
+from src.services.soaphandlers.zeep_client_pool import (
+    close_zeepclient_pools,
+    get_zeepclient_pool_stats,
+)
+from src.utilities.request_context import set_request_deadline
+
 invalidinput_testdata = [
     ("", "serviceurl", "somecert", "somekey"),
     (None, "serviceurl", "somecert", "somekey"),
@@ -28,77 +32,68 @@ invalidinput_testdata = [
     ("somewsdl", "someserviceurl", "somecert", None),
     ("somewsdl", "someserviceurl", "somecert", " "),
 ]
-localstore = {}
+VERIZON_WSDL = "src/config/wsdl/RequestVehicleLocation.wsdl"
+ROOT_CERT = "src/config/certs/corpvtcert.cer"
 
 
-@pytest.mark.parametrize(
-    "expectedresult",
-    [True, False, False],
-    ids=["initialRequest", "secondRequest", "thirdRequest"],
-)
-def test_soap_handler_with_same_serviceurl_returns_zeepclient_as_expected(
-    expectedresult
+@pytest.fixture
+def zeepclient_pools():
+    close_zeepclient_pools()
+    yield
+    close_zeepclient_pools()
+
+
+def test_checkout_zeepclient_with_same_serviceurl_reuses_pooled_client(
+    zeepclient_pools,
 ):
-    with patch("src.services.soaphandlers.soap_handler.Session") as patched_session:
-        patched_session.return_value = Session()
-        serviceurl = "abc.com"
-        client = get_zeepclient(
-            "src/config/wsdl/siriusxm.wsdl",
-            serviceurl,
-            "src/config/certs/corpvtcert.cer",
-            "siriusxm_zeepclient",
-            localstore,
-        )
-        assert client.service._binding_options["address"] == serviceurl
-        assert len(localstore) == 1
-        assert patched_session.called == expectedresult
+    clients = []
+    for _ in range(3):
+        with checkout_zeepclient(
+            "verizon", VERIZON_WSDL, "abc.com", ROOT_CERT, 2, (3, 10)
+        ) as client:
+            clients.append(client)
+            assert client.service._binding_options["address"] == "abc.com"
+            assert client.transport.operation_timeout == (3, 10)
 
+    assert clients[0] is clients[1] is clients[2]
+    stats = get_zeepclient_pool_stats("verizon")["verizon"]
+    assert stats["created"] == 1
+    assert stats["checkouts"] == 3
+    assert stats["in_use"] == 0
 
-@pytest.mark.parametrize(
-    "serviceUrl, expectedresult",
-    testdata,
-    ids=[
-        "1stRequest",
-        "2ndRequest",
-        "3rdRequest",
-        "4thRequest",
-        "5thRequest",
-        "6thRequest",
-        "7thRequest",
-    ],
-)
-def test_soap_handler_with_different_serviceurl_returns_zeepclient_as_expected(
-    serviceUrl, expectedresult
+
+def test_checkout_zeepclient_gives_concurrent_calls_clients_of_their_own(
+    zeepclient_pools,
 ):
-    with patch("src.services.soaphandlers.soap_handler.Session") as patched_session:
-        patched_session.return_value = Session()
-        serviceurl = serviceUrl
-        client = get_zeepclient(
-            "src/config/wsdl/siriusxm.wsdl",
-            serviceurl,
-            "src/config/certs/corpvtcert.cer",
-            "siriusxm_zeepclient",
-            localstore,
-        )
-        assert client.service._binding_options["address"] == serviceUrl
-        assert len(localstore) == 1
-        assert patched_session.called == expectedresult
+    with checkout_zeepclient("verizon", VERIZON_WSDL, "abc.com", ROOT_CERT, 2) as one:
+        with checkout_zeepclient(
+            "verizon", VERIZON_WSDL, "abc.com", ROOT_CERT, 2
+        ) as two:
+            assert one is not two
+            assert one.transport is not two.transport
+            # one keep-alive session for the pool
+            assert one.transport.session is two.transport.session
+            assert get_zeepclient_pool_stats("verizon")["verizon"]["in_use"] == 2
 
 
-def test_soap_handler_with_input_dictionary_type_missing_should_return_500():
-    lcl = ""
-    with pytest.raises(Exception) as execinfo:
-        get_zeepclient("wsdl", "serviceurl", "rootcert", "siriusxm_zeepclient", lcl)
-    assert execinfo.type == ApplicationException
-    assert execinfo.value.status_code == 500
-    assert (
-        execinfo.value.detail
-        == "get_zeepclient: Dictionary param missing, please check"
-    )
+@pytest.mark.parametrize("serviceurl", ["bcd.com", "abc.com"])
+def test_checkout_zeepclient_with_different_serviceurl_replaces_pool(
+    zeepclient_pools, serviceurl
+):
+    with checkout_zeepclient("verizon", VERIZON_WSDL, "cab.com", ROOT_CERT) as old:
+        with checkout_zeepclient(
+            "verizon", VERIZON_WSDL, serviceurl, ROOT_CERT
+        ) as client:
+            assert client is not old
+            assert client.service._binding_options["address"] == serviceurl
+        # the replaced pool's client keeps working for the call holding it
+        assert old.service._binding_options["address"] == "cab.com"
+
+    assert get_zeepclient_pool_stats()["verizon"]["created"] == 1
 
 
 @pytest.mark.parametrize(
-    "wsdl, serviceurl, rootcert, keyinput",
+    "wsdl, serviceurl, rootcert, provider",
     invalidinput_testdata,
     ids=[
         "wsdlEmpty",
@@ -110,29 +105,83 @@ def test_soap_handler_with_input_dictionary_type_missing_should_return_500():
         "rootcertEmpty",
         "rootcertNone",
         "rootcertSpace",
-        "keyEmpty",
-        "keyNone",
-        "keySpace",
+        "providerEmpty",
+        "providerNone",
+        "providerSpace",
     ],
 )
-def test_soap_handler_with_invalid_input_should_return_500(
-    wsdl, serviceurl, keyinput, rootcert
+def test_checkout_zeepclient_with_invalid_input_should_return_500(
+    wsdl, serviceurl, provider, rootcert
 ):
     with pytest.raises(Exception) as execinfo:
-        get_zeepclient(wsdl, serviceurl, rootcert, keyinput, localstore)
+        with checkout_zeepclient(provider, wsdl, serviceurl, rootcert):
+            pass
     assert execinfo.type == ApplicationException
     assert execinfo.value.status_code == 500
-    assert execinfo.value.detail == "get_zeepclient: Input param can't be null or empty"
+    assert (
+        execinfo.value.detail
+        == "checkout_zeepclient: Input param can't be null or empty"
+    )
 
 
-def test_soap_handler_with_invalid_certificatepath_should_throw_exception():
+def test_soap_handler_with_invalid_certificatepath_should_throw_exception(
+    zeepclient_pools,
+):
     try:
-        get_zeepclient(
+        with checkout_zeepclient(
+            "siriusxm",
             "src/config/wsdl/siriusxm.wsdl",
             "dddd.com",
             "invalidpath/invalid.cer",
-            "siriusxm_zeepclient",
-            localstore,
-        )
+        ):
+            pass
     except Exception as e:
         assert "invalid path: invalidpath/invalid.cer" in e.args[0]
+
+
+def test_deadline_transport_cuts_operation_timeout_to_the_remaining_time():
+    transport = DeadlineTransport(operation_timeout=(3, 10))
+    assert transport.operation_timeout == (3, 10)
+
+    set_request_deadline(monotonic() + 2)
+    connect, read = transport.operation_timeout
+    assert connect <= 1.5 and read <= 1.5
+
+    with transport.settings(timeout=1):
+        assert transport.operation_timeout == 1
+    assert transport.operation_timeout[1] <= 1.5
+
+
+def test_process_reply_returns_body_and_envelope_from_one_parse(
+    verizon_client, raw_reply, verizon_reply
+):
+    with patch(
+        "src.services.soaphandlers.soap_handler.parse_xml", wraps=parse_xml
+    ) as patched_parse_xml:
+        response, envelope = process_reply(
+            verizon_client, "RequestVehicleLocation", raw_reply(verizon_reply)
+        )
+    patched_parse_xml.assert_called_once()
+    assert response["VIN"] == "1VWSA7A3XLC011823"
+    assert response["Response"]["ResponseStatus"] == "Successful Execution"
+    assert get_header_text(envelope, "tracking.FlowEventId") == "7918148"
+    assert get_header_text(envelope, "tracking.FlowId") == "528070"
+    assert get_header_text(envelope, "tracking.Missing") is None
+    assert get_header_text(None, "tracking.FlowId") is None
+
+
+def test_process_reply_raises_soap_faults(verizon_client, raw_reply, soap_fault_reply):
+    with pytest.raises(Fault, match="Internal Error"):
+        process_reply(
+            verizon_client,
+            "RequestVehicleLocation",
+            raw_reply(soap_fault_reply, status_code=500),
+        )
+
+
+def test_process_reply_leaves_empty_replies_to_the_binding(verizon_client, raw_reply):
+    response, envelope = process_reply(
+        verizon_client, "RequestVehicleLocation", raw_reply(b"", status_code=202)
+    )
+    assert response is None
+    assert envelope is None
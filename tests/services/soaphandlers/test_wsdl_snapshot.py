@@ -0,0 +1,76 @@
+import json
+import shutil
+
+import pytest
+from mock import patch
+from requests import Session
+
+from src.services.soaphandlers.soap_handler import setup_zeepclient
+from src.services.soaphandlers.wsdl_snapshot import (
+    SnapshotTransport,
+    build_snapshot,
+    load_snapshot,
+    snapshot_path,
+    write_snapshot,
+)
+
+
+@pytest.fixture
+def wsdl(tmp_path):
+    for name in ("RequestVehicleLocation.wsdl", "RequestVehicleLocation.xsd"):
+        shutil.copy("src/config/wsdl/{}".format(name), tmp_path / name)
+    return str(tmp_path / "RequestVehicleLocation.wsdl")
+
+
+def test_build_snapshot_records_every_document_relative_to_wsdl(wsdl):
+    snapshot = build_snapshot(wsdl, Session())
+    assert snapshot["wsdl"] == "RequestVehicleLocation.wsdl"
+    assert set(snapshot["documents"]) == {
+        "RequestVehicleLocation.wsdl",
+        "RequestVehicleLocation.xsd",
+    }
+
+
+def test_load_snapshot_returns_documents_written_by_build(wsdl):
+    snapshot = build_snapshot(wsdl, Session())
+    write_snapshot(wsdl, snapshot)
+    assert load_snapshot(wsdl) == snapshot["documents"]
+
+
+def test_load_snapshot_without_snapshot_returns_none(wsdl):
+    assert load_snapshot(wsdl) is None
+
+
+def test_load_snapshot_when_wsdl_changed_returns_none(wsdl):
+    write_snapshot(wsdl, build_snapshot(wsdl, Session()))
+    with open(wsdl, "a") as fh:
+        fh.write("\n")
+    assert load_snapshot(wsdl) is None
+
+
+def test_load_snapshot_when_unreadable_returns_none(wsdl):
+    with open(snapshot_path(wsdl), "w") as fh:
+        fh.write("not json")
+    assert load_snapshot(wsdl) is None
+
+
+def test_setup_zeepclient_with_snapshot_does_not_read_schema_files(wsdl, tmp_path):
+    write_snapshot(wsdl, build_snapshot(wsdl, Session()))
+    (tmp_path / "RequestVehicleLocation.xsd").unlink()
+    client = setup_zeepclient(wsdl, "abc.com", Session())
+    assert isinstance(client.transport, SnapshotTransport)
+    assert client.service._binding_options["address"] == "abc.com"
+
+
+def test_snapshot_transport_falls_back_for_missing_document(wsdl):
+    snapshot = build_snapshot(wsdl, Session())
+    del snapshot["documents"]["RequestVehicleLocation.xsd"]
+    with open(snapshot_path(wsdl), "w") as fh:
+        json.dump(snapshot, fh)
+    with patch(
+        "src.services.soaphandlers.wsdl_snapshot.Transport.load",
+        autospec=True,
+        side_effect=lambda self, url: open(url, "rb").read(),
+    ) as patched_load:
+        setup_zeepclient(wsdl, "abc.com", Session())
+    assert patched_load.call_count == 1
@@ -0,0 +1,142 @@
+import time
+from itertools import count
+from threading import Barrier, Thread
+
+import pytest
+
+from src.services.soaphandlers.zeep_client_pool import (
+    ZeepClientPool,
+    ZeepClientPoolTimeout,
+    close_zeepclient_pools,
+    get_zeepclient_pool,
+    get_zeepclient_pool_stats,
+)
+
+
+class FooClient:
+    def __init__(self, number):
+        self.number = number
+
+
+def new_pool(size=2, warm_up=1, on_close=None):
+    numbers = count(1)
+    return ZeepClientPool(
+        "foo", lambda: FooClient(next(numbers)), size, warm_up, on_close
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_pools():
+    close_zeepclient_pools()
+    yield
+    close_zeepclient_pools()
+
+
+def test_pool_warms_up_clients_at_init():
+    pool = new_pool(size=3, warm_up=2)
+    assert pool.stats() == {
+        "size": 3,
+        "created": 2,
+        "in_use": 0,
+        "idle": 2,
+        "checkouts": 0,
+        "waits": 0,
+        "timeouts": 0,
+    }
+    # never beyond size
+    assert new_pool(size=2, warm_up=5).stats()["created"] == 2
+
+
+def test_pool_reuses_checked_in_clients():
+    pool = new_pool()
+    with pool.client() as first:
+        pass
+    with pool.client() as second:
+        pass
+    assert first is second
+    assert pool.stats()["created"] == 1
+    assert pool.stats()["checkouts"] == 2
+
+
+def test_pool_grows_up_to_size_then_waits_for_checkin():
+    pool = new_pool(size=2)
+    one, two = pool.checkout(), pool.checkout()
+    assert one is not two
+    assert pool.stats()["in_use"] == 2
+
+    Thread(target=lambda: (time.sleep(0.1), pool.checkin(two))).start()
+    assert pool.checkout(timeout=5) is two
+    assert pool.stats()["created"] == 2
+    assert pool.stats()["waits"] == 1
+
+
+def test_pool_checkout_times_out_when_all_clients_are_busy():
+    pool = new_pool(size=1)
+    with pool.client():
+        with pytest.raises(ZeepClientPoolTimeout):
+            pool.checkout(timeout=0.05)
+    assert pool.stats()["timeouts"] == 1
+    assert pool.stats()["in_use"] == 0
+
+
+def test_pool_does_not_count_clients_it_failed_to_create():
+    def factory():
+        raise ValueError("no wsdl")
+
+    pool = ZeepClientPool("foo", factory, warm_up=0)
+    with pytest.raises(ValueError):
+        pool.checkout()
+    assert pool.stats()["created"] == 0
+
+
+def test_closed_pool_drops_clients_and_calls_on_close_after_last_checkin():
+    closed = []
+    pool = new_pool(on_close=lambda: closed.append(True))
+    client = pool.checkout()
+    pool.checkout()
+
+    pool.close()
+    assert closed == []
+    pool.checkin(client)
+    assert closed == []
+    pool.checkin(client)
+    assert closed == [True]
+    assert pool.stats()["created"] == 0
+
+
+def test_concurrent_checkouts_get_distinct_clients():
+    pool = new_pool(size=4)
+    barrier = Barrier(4)
+    held = []
+
+    def call():
+        with pool.client(timeout=5) as client:
+            held.append(client)
+            barrier.wait(5)
+
+    threads = [Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len({client.number for client in held}) == 4
+    assert pool.stats()["in_use"] == 0
+    assert pool.stats()["idle"] == 4
+
+
+def test_get_zeepclient_pool_replaces_pool_when_key_changes():
+    closed = []
+    pool = get_zeepclient_pool("foo", "abc.com", new_pool)
+    assert get_zeepclient_pool("foo", "abc.com", new_pool) is pool
+
+    other = get_zeepclient_pool(
+        "foo", "bcd.com", lambda: new_pool(on_close=lambda: closed.append(True))
+    )
+    assert other is not pool
+    assert pool.stats()["created"] == 0
+    assert get_zeepclient_pool_stats() == {"foo": other.stats()}
+
+    close_zeepclient_pools("foo")
+    assert closed == [True]
+    assert get_zeepclient_pool_stats() == {}
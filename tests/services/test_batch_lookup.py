@@ -0,0 +1,146 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from pytest import fixture
+from pytest import mark
+
+from src.config.fca_config import FcaConfig
+from src.fca.services.fca_service import FcaService
+from src.models.domain.enums.internal_status_type import InternalStatusType
+from src.services.batch_lookup import batch_deadline, lookup_vehicledata_batch
+from src.services.dynamodb_latest import save_latest_item
+from src.services.request_coalescer import request_coalescer
+from src.utilities.request_context import set_request_deadline
+
+
+class LiveService:
+    def __init__(self, delay=0.0):
+        self._delay = delay
+
+    def get_vehicledata(self, msisdn, programcode):
+        time.sleep(self._delay)
+        return LiveVehicleData(msisdn)
+
+
+class LiveVehicleData:
+    def __init__(self, msisdn):
+        self.msisdn = msisdn
+        self.status = InternalStatusType.SUCCESS
+
+
+@fixture
+def fca_service(cv_table):
+    yield FcaService(
+        config=FcaConfig(dynamodb_latest_item=True, max_ani_length=11),
+        table=cv_table,
+        supplementtable=None,
+    )
+
+
+def save_pushed_record(table, msisdn, vin):
+    record = table(
+        request_key="fca-" + msisdn,
+        event_datetime=1000,
+        programcode="fca",
+        msisdn=msisdn,
+        timestamp=datetime.now(timezone.utc),
+        vin=vin,
+    )
+    record.save()
+    save_latest_item(table, record)
+
+
+@mark.asyncio
+async def test_lookup_vehicledata_batch_reads_stored_items_in_one_call(
+    cv_table, fca_service
+):
+    save_pushed_record(cv_table, "13234826699", "VIN1")
+    save_pushed_record(cv_table, "15243583607", "VIN2")
+
+    with patch.object(
+        cv_table, "batch_get", wraps=cv_table.batch_get
+    ) as patched_batch_get:
+        with patch.object(fca_service, "get_vehicledata") as patched_get:
+            results = await lookup_vehicledata_batch(
+                [
+                    (fca_service, "13234826699", "fca"),
+                    (fca_service, "15243583607", "fca"),
+                ]
+            )
+
+    patched_batch_get.assert_called_once()
+    patched_get.assert_not_called()
+    assert [result.vin for result in results] == ["VIN1", "VIN2"]
+    assert results[0].status == InternalStatusType.SUCCESS
+    assert results[0].msisdn == "13234826699"
+
+
+@mark.asyncio
+async def test_lookup_vehicledata_batch_looks_up_missing_and_live_items(
+    cv_table, fca_service
+):
+    save_pushed_record(cv_table, "13234826699", "VIN1")
+    live_service = LiveService()
+
+    with patch.object(
+        fca_service, "get_vehicledata", return_value=LiveVehicleData("15243583607")
+    ) as patched_get:
+        results = await lookup_vehicledata_batch(
+            [
+                (live_service, "5243583607", "vwcarnet"),
+                (fca_service, "13234826699", "fca"),
+                (fca_service, "15243583607", "fca"),
+            ]
+        )
+
+    patched_get.assert_called_once_with("15243583607", "fca")
+    assert [result.msisdn for result in results] == [
+        "5243583607",
+        "13234826699",
+        "15243583607",
+    ]
+    assert all(result.status == InternalStatusType.SUCCESS for result in results)
+
+
+@mark.asyncio
+async def test_lookup_vehicledata_batch_times_out_slow_items_only():
+    started = time.monotonic()
+    results = await lookup_vehicledata_batch(
+        [
+            (LiveService(delay=0.5), "5243583607", "vwcarnet"),
+            (LiveService(), "1234567890", "vwcarnet"),
+        ],
+        deadline=0.2,
+    )
+
+    assert time.monotonic() - started < 0.4
+    assert results[0].status == InternalStatusType.GATEWAYTIMEOUT
+    assert results[1].status == InternalStatusType.SUCCESS
+    # the slow call keeps running, let it finish within this event loop
+    while request_coalescer.inflight():
+        await asyncio.sleep(0.05)
+
+
+@mark.asyncio
+async def test_lookup_vehicledata_batch_reports_unknown_service_and_errors():
+    live_service = LiveService()
+    with patch.object(live_service, "get_vehicledata", side_effect=ValueError("boom")):
+        results = await lookup_vehicledata_batch(
+            [(None, "5243583607", "fca"), (live_service, "1234567890", "vwcarnet")]
+        )
+
+    assert results[0].status == InternalStatusType.BADREQUEST
+    assert results[1].status == InternalStatusType.INTERNALSERVERERROR
+    assert results[1].responsemessage == "boom"
+
+
+def test_batch_deadline_is_capped_by_request_deadline():
+    assert batch_deadline(5) == 5
+
+    set_request_deadline(time.monotonic() + 2)
+    try:
+        assert batch_deadline(5) <= 1.5
+    finally:
+        set_request_deadline(None)
@@ -0,0 +1,185 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.config.aeris_config import AerisConfig
+from src.services.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    call_through,
+    get_circuit_breaker,
+    get_circuit_breaker_stats,
+    get_service_circuit_breaker_stats,
+    is_server_error,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    with patch("src.services.circuit_breaker.monotonic", clock):
+        yield clock
+
+
+def new_breaker(**kwargs):
+    settings = dict(
+        failure_rate=0.5,
+        slow_call_seconds=1.0,
+        slow_call_rate=0.8,
+        minimum_calls=4,
+        window_seconds=60.0,
+        open_seconds=30.0,
+        half_open_probes=2,
+    )
+    settings.update(kwargs)
+    return CircuitBreaker("fooProvider", **settings)
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.minimum_calls):
+        assert breaker.allow_request()
+        breaker.record(True, 0.1)
+    assert breaker.state == OPEN
+
+
+def test_circuit_breaker_opens_on_failure_rate(clock):
+    breaker = new_breaker()
+    for failed in (False, True, False):
+        breaker.record(failed, 0.1)
+    assert breaker.state == CLOSED
+
+    breaker.record(True, 0.1)
+
+    assert breaker.state == OPEN
+    assert breaker.allow_request() is False
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_circuit_breaker_stays_closed_below_minimum_calls(clock):
+    breaker = new_breaker()
+    for _ in range(3):
+        breaker.record(True, 0.1)
+    assert breaker.state == CLOSED
+
+
+def test_circuit_breaker_opens_on_slow_calls(clock):
+    breaker = new_breaker()
+    for elapsed in (2.0, 2.0, 2.0, 0.1, 2.0):
+        breaker.record(False, elapsed)
+    assert breaker.state == OPEN
+
+
+def test_circuit_breaker_forgets_outcomes_outside_the_window(clock):
+    breaker = new_breaker()
+    for _ in range(3):
+        breaker.record(True, 0.1)
+    clock.now += 61
+    breaker.record(True, 0.1)
+    assert breaker.state == CLOSED
+
+
+def test_circuit_breaker_half_open_lets_probes_through_and_closes(clock):
+    breaker = new_breaker()
+    open_breaker(breaker)
+    clock.now += 30
+
+    assert breaker.allow_request() is True
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+
+    breaker.record(False, 0.1)
+    assert breaker.state == HALF_OPEN
+    breaker.record(False, 0.1)
+    assert breaker.state == CLOSED
+    assert breaker.allow_request() is True
+
+
+def test_circuit_breaker_failed_probe_opens_again(clock):
+    breaker = new_breaker()
+    open_breaker(breaker)
+    clock.now += 30
+
+    assert breaker.allow_request() is True
+    breaker.record(False, 5.0)
+
+    assert breaker.state == OPEN
+    assert breaker.allow_request() is False
+    assert breaker.stats()["opened"] == 2
+
+
+def test_call_through_records_results_exceptions_and_fails_fast(clock):
+    breaker = new_breaker(minimum_calls=2)
+    ok = MagicMock(status_code=200)
+    error = MagicMock(status_code=502)
+
+    assert call_through(breaker, lambda: ok, failed=is_server_error) is ok
+    assert call_through(breaker, lambda: error, failed=is_server_error) is error
+    assert breaker.state == OPEN
+
+    method = MagicMock()
+    with pytest.raises(CircuitOpenError):
+        call_through(breaker, method)
+    method.assert_not_called()
+
+    clock.now += 30
+    with pytest.raises(ValueError):
+        call_through(breaker, MagicMock(side_effect=ValueError("boom")))
+    assert breaker.state == OPEN
+    assert breaker.stats() == {
+        "state": OPEN,
+        "calls": 3,
+        "failures": 2,
+        "slow_calls": 0,
+        "rejected": 1,
+        "opened": 2,
+    }
+
+
+def test_call_through_without_breaker_calls_method():
+    assert call_through(None, lambda value: value, 5) == 5
+
+
+def test_get_circuit_breaker_only_when_enabled():
+    assert get_circuit_breaker("aeris", AerisConfig()) is None
+    assert get_circuit_breaker("aeris", MagicMock()) is None
+
+    config = AerisConfig(circuit_breaker_enable=True, circuit_breaker_open_seconds=5)
+    breaker = get_circuit_breaker("aeris", config)
+
+    assert breaker.open_seconds == 5
+    assert get_circuit_breaker("aeris", config) is breaker
+    assert get_circuit_breaker_stats() == {"aeris": breaker.stats()}
+
+
+def test_get_circuit_breaker_is_rebuilt_when_thresholds_change():
+    breaker = get_circuit_breaker("aeris", AerisConfig(circuit_breaker_enable=True))
+    changed = get_circuit_breaker(
+        "aeris",
+        AerisConfig(circuit_breaker_enable=True, circuit_breaker_minimum_calls=3),
+    )
+    assert changed is not breaker
+    assert changed.minimum_calls == 3
+
+
+def test_get_service_circuit_breaker_stats():
+    service = MagicMock()
+    assert get_service_circuit_breaker_stats(service) is None
+
+    service.circuit_breaker = get_circuit_breaker(
+        "aeris", AerisConfig(circuit_breaker_enable=True)
+    )
+    assert get_service_circuit_breaker_stats(service) == {
+        "aeris": service.circuit_breaker.stats()
+    }
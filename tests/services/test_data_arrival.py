@@ -0,0 +1,90 @@
+from threading import Timer
+from time import perf_counter
+from unittest.mock import MagicMock
+
+from src.services.data_arrival import (
+    DataArrivalNotifier,
+    data_arrival,
+    publish_data_arrival,
+    subscribe_data_arrival,
+)
+
+
+def test_wait_returns_true_when_data_is_published():
+    notifier = DataArrivalNotifier()
+    subscription = notifier.subscribe("fca-12345678901")
+    Timer(0.05, notifier.publish, ["fca-12345678901"]).start()
+    assert subscription.wait(5) is True
+
+
+def test_wait_returns_false_on_timeout():
+    notifier = DataArrivalNotifier()
+    subscription = notifier.subscribe("fca-12345678901")
+    assert subscription.wait(0.01) is False
+
+
+def test_wait_after_publish_returns_immediately():
+    notifier = DataArrivalNotifier()
+    subscription = notifier.subscribe("fca-12345678901")
+    notifier.publish("fca-12345678901")
+    assert subscription.wait(0) is True
+    assert subscription.wait(0) is False
+
+
+def test_wait_ignores_other_request_keys():
+    notifier = DataArrivalNotifier()
+    subscription = notifier.subscribe("fca-12345678901")
+    notifier.subscribe("fca-19999999999")
+    notifier.publish("fca-19999999999")
+    assert subscription.wait(0.01) is False
+
+
+def test_publish_without_subscribers_is_not_tracked():
+    notifier = DataArrivalNotifier()
+    notifier.publish("fca-12345678901")
+    assert notifier.waiting() == {}
+
+
+def test_unsubscribe_last_waiter_forgets_request_key():
+    notifier = DataArrivalNotifier()
+    notifier.subscribe("fca-12345678901")
+    notifier.subscribe("fca-12345678901")
+    notifier.unsubscribe("fca-12345678901")
+    assert notifier.waiting() == {"fca-12345678901": 1}
+    notifier.unsubscribe("fca-12345678901")
+    assert notifier.waiting() == {}
+
+
+def test_subscribe_data_arrival_unsubscribes_on_exit():
+    with subscribe_data_arrival("fca-12345678901") as subscription:
+        publish_data_arrival("fca-12345678901")
+        assert subscription.wait(0) is True
+    assert "fca-12345678901" not in data_arrival.waiting()
+
+
+def test_wait_returns_true_when_probe_sees_a_save_by_another_instance():
+    notifier = DataArrivalNotifier()
+    probe = MagicMock(side_effect=[None, None, 1610027040000])
+    subscription = notifier.subscribe("fca-12345678901", probe, 0.01)
+    started = perf_counter()
+    assert subscription.wait(5) is True
+    assert perf_counter() - started < 1
+    assert probe.call_count == 3
+
+
+def test_wait_without_new_probe_result_times_out():
+    notifier = DataArrivalNotifier()
+    probe = MagicMock(return_value=1610027040000)
+    subscription = notifier.subscribe("fca-12345678901", probe, 0.01)
+    assert subscription.wait(0.05) is False
+    # not after the last slice, the caller re-queries then anyway
+    assert 1 < probe.call_count < 6
+
+
+def test_wait_falls_back_to_local_saves_when_probe_fails():
+    notifier = DataArrivalNotifier()
+    probe = MagicMock(side_effect=[None, Exception("throttled")])
+    subscription = notifier.subscribe("fca-12345678901", probe, 0.01)
+    assert subscription.wait(0.02) is False
+    notifier.publish("fca-12345678901")
+    assert subscription.wait(0) is True
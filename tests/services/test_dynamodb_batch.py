@@ -0,0 +1,98 @@
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from src.services.dynamodb_batch import batch_save
+
+
+def new_rows(tables, msisdn="13234826699"):
+    main_table, supplement_table = tables
+    return (
+        main_table(
+            request_key="fca-" + msisdn,
+            event_datetime=1000,
+            programcode="fca",
+            msisdn=msisdn,
+            timestamp=datetime.now(timezone.utc),
+            vin="VIN" + msisdn,
+        ),
+        supplement_table(
+            request_key="fca-" + msisdn,
+            event_datetime=1000,
+            programcode="fca",
+            msisdn=msisdn,
+            timestamp=datetime.now(timezone.utc),
+            callcenternumber="+18449232959",
+        ),
+    )
+
+
+def test_batch_save_writes_rows_of_both_tables_in_one_call(cv_tables):
+    main_row, supplement_row = new_rows(cv_tables)
+    connection = type(main_row)._get_connection().connection
+
+    with patch.object(
+        connection, "dispatch", wraps=connection.dispatch
+    ) as patched_dispatch:
+        unsaved = batch_save(main_row, supplement_row, None)
+
+    assert unsaved == []
+    patched_dispatch.assert_called_once()
+    main_table, supplement_table = cv_tables
+    assert main_table.get("fca-13234826699", 1000).vin == "VIN13234826699"
+    assert (
+        supplement_table.get("fca-13234826699", 1000).callcenternumber == "+18449232959"
+    )
+
+
+def test_batch_save_resends_unprocessed_items(cv_tables):
+    main_row, supplement_row = new_rows(cv_tables)
+    supplement_table_name = cv_tables[1].Meta.table_name
+    connection = type(main_row)._get_connection().connection
+    dispatch = connection.dispatch
+
+    def throttle_supplement_once(operation, kwargs):
+        if patched_dispatch.call_count == 1:
+            unprocessed = {
+                supplement_table_name: kwargs["RequestItems"].pop(supplement_table_name)
+            }
+            data = dispatch(operation, kwargs)
+            data["UnprocessedItems"] = unprocessed
+            return data
+        return dispatch(operation, kwargs)
+
+    with patch.object(
+        connection, "dispatch", side_effect=throttle_supplement_once
+    ) as patched_dispatch:
+        unsaved = batch_save(main_row, supplement_row)
+
+    assert unsaved == []
+    assert patched_dispatch.call_count == 2
+    assert cv_tables[1].get("fca-13234826699", 1000).msisdn == "13234826699"
+
+
+def test_batch_save_returns_rows_still_unprocessed_after_retries(cv_tables):
+    main_row, supplement_row = new_rows(cv_tables)
+    supplement_table_name = cv_tables[1].Meta.table_name
+    connection = type(main_row)._get_connection().connection
+
+    def throttle_supplement(operation, kwargs):
+        return {
+            "UnprocessedItems": {
+                supplement_table_name: kwargs["RequestItems"][supplement_table_name]
+            }
+        }
+
+    with patch.object(connection, "dispatch", side_effect=throttle_supplement):
+        unsaved = batch_save(main_row, supplement_row)
+
+    assert unsaved == [supplement_row]
+
+
+def test_batch_save_on_error_returns_all_rows(cv_tables):
+    main_row, supplement_row = new_rows(cv_tables)
+    connection = type(main_row)._get_connection().connection
+
+    with patch.object(connection, "dispatch", side_effect=Exception("boom")):
+        unsaved = batch_save(main_row, supplement_row)
+
+    assert unsaved == [main_row, supplement_row]
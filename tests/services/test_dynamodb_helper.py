@@ -6,7 +6,16 @@ from src.config.aeris_config import AerisConfig
 from src.aeris.services.aeris_service import AerisService
 from src.config.verizon_config import VerizonConfig
 from src.verizon.services.verizon_service import VerizonService
-from src.services.dynamodb_helper import get_vehicledata_for_config_enabled_client_only
+from src.services.dynamodb_helper import (
+    get_circuit_open_response,
+    get_vehicledata_for_config_enabled_client_only,
+)
+from src.models.domain.enums.internal_status_type import InternalStatusType
+from src.verizon.models.data.vehicle_data import VehicleData as VerizonVehicleData
+from src.verizon.services.verizon_service import (
+    VEHICLEDATA_ATTRIBUTES,
+    create_vehicledata_response,
+)
 from src.services.dynamodb_tables import ConnectedVehicleTable
 
 BASE_URL = "fooBaseURL"
@@ -89,6 +98,26 @@ def test_dynamodb_helper_get_vehicledata_for_config_enabled_client_only_for_aeri
     assert dataresponse is None
 
 
+def test_dynamodb_helper_get_circuit_open_response_without_record_should_return_503(
+    mock_dynamo_cv_table, setup_verizon_service
+):
+    mock_dynamo_cv_table.query.return_value = []
+    dataresponse = get_circuit_open_response(
+        setup_verizon_service,
+        "Verizon",
+        "12345678901",
+        "vwcarnet",
+        "1.0",
+        Exception("verizon circuit is open"),
+        VEHICLEDATA_ATTRIBUTES,
+        create_vehicledata_response,
+        VerizonVehicleData,
+    )
+    assert type(dataresponse) == VerizonVehicleData
+    assert dataresponse.status == InternalStatusType.SERVICEUNAVAILABLE
+    assert dataresponse.responsemessage == "verizon circuit is open"
+
+
 def test_dynamodb_helper_get_vehicledata_for_config_enabled_client_only_for_verizon_on_success_should_return_valid_db_dataresponse(
     mock_dynamo_cv_table, setup_verizon_service
 ):
@@ -0,0 +1,172 @@
+from datetime import datetime, timezone
+
+import boto3
+import pytest
+from mock import patch
+
+from src.services.dynamodb_identity import (
+    IDENTITY_EVENT_DATETIME,
+    backfill_identity_items,
+    forget_known_programcodes,
+    get_msisdn_programcodes,
+    get_vin_item,
+    save_identity_items,
+    save_msisdn_item,
+    save_record_items,
+)
+from src.services.dynamodb_latest import backfill_latest_items, get_latest_item
+
+MSISDN = "13234826699"
+
+
+@pytest.fixture(autouse=True)
+def clear_known_programcodes():
+    forget_known_programcodes()
+    yield
+    forget_known_programcodes()
+
+
+def save_record(table, event_datetime, vin, programcode="fca", msisdn=MSISDN):
+    record = table(
+        request_key="{}-{}".format(programcode, msisdn),
+        event_datetime=event_datetime,
+        programcode=programcode,
+        msisdn=msisdn,
+        timestamp=datetime.now(timezone.utc),
+        vin=vin,
+        latitude=42.5,
+    )
+    record.save()
+    return record
+
+
+def test_save_record_items_points_identity_items_at_record(cv_table):
+    save_record_items(cv_table, save_record(cv_table, 1000, "VIN1"))
+
+    record = get_vin_item(cv_table, "VIN1")
+    assert record.request_key == "fca-" + MSISDN
+    assert record.event_datetime == 1000
+    assert record.programcode == "fca"
+    assert record.latitude == 42.5
+    assert get_msisdn_programcodes(cv_table, MSISDN) == ["fca"]
+    # without latest items the identity items are still kept
+    assert get_latest_item(cv_table, "fca-" + MSISDN) is None
+
+
+def test_save_record_items_with_latest_item_saves_it_too(cv_table):
+    save_record_items(cv_table, save_record(cv_table, 1000, "VIN1"), latest_item=True)
+
+    assert get_latest_item(cv_table, "fca-" + MSISDN).event_datetime == 1000
+    assert get_vin_item(cv_table, "VIN1").event_datetime == 1000
+
+
+def test_vin_item_holds_only_the_mapped_attributes(cv_table):
+    record = save_record(cv_table, 1000, "VIN1")
+    record.JSONData = {"gpsData": {"latitude": 42.5}}
+    record.customerfirstname = "JUSTINE"
+    save_identity_items(cv_table, record)
+
+    item = cv_table.get("vin-VIN1", IDENTITY_EVENT_DATETIME)
+    assert item.source_request_key == "fca-" + MSISDN
+    assert item.source_programcode == "fca"
+    assert item.latitude == 42.5
+    assert item.JSONData is None
+    assert item.customerfirstname is None
+    # keys of no index: the programcode and referenceid indexes leave it out
+    stored = boto3.client("dynamodb", region_name="us-east-1").get_item(
+        TableName=cv_table.Meta.table_name,
+        Key={"request_key": {"S": "vin-VIN1"}, "event_datetime": {"N": "-1"}},
+    )["Item"]
+    assert "programcode" not in stored
+    assert "referenceid" not in stored
+
+
+def test_vin_item_drops_attributes_the_newer_record_lacks(cv_table):
+    save_identity_items(cv_table, save_record(cv_table, 1000, "VIN1"))
+    record = save_record(cv_table, 2000, "VIN1", "vwcarnet")
+    record.latitude = None
+    save_identity_items(cv_table, record)
+
+    item = get_vin_item(cv_table, "VIN1")
+    assert item.programcode == "vwcarnet"
+    assert item.latitude is None
+
+
+def test_msisdn_item_is_written_only_for_a_new_programcode(cv_table):
+    record = save_record(cv_table, 1000, "VIN1")
+
+    assert save_msisdn_item(cv_table, record) is True
+    with patch.object(cv_table, "update") as update:
+        assert save_msisdn_item(cv_table, record) is False
+    update.assert_not_called()
+
+    # another instance saved it already, the condition leaves the item alone
+    forget_known_programcodes()
+    assert save_msisdn_item(cv_table, record) is False
+    assert save_msisdn_item(cv_table, save_record(cv_table, 2000, "VIN1", "nissan"))
+    assert get_msisdn_programcodes(cv_table, MSISDN) == ["fca", "nissan"]
+
+
+def test_vin_item_follows_newest_record_across_programcodes(cv_table):
+    save_record_items(cv_table, save_record(cv_table, 2000, "VIN1", "vwcarnet"))
+    save_record_items(cv_table, save_record(cv_table, 1000, "VIN1"))
+
+    assert get_vin_item(cv_table, "vin1").request_key == "vwcarnet-" + MSISDN
+    assert get_msisdn_programcodes(cv_table, MSISDN) == ["fca", "vwcarnet"]
+
+    save_record_items(cv_table, save_record(cv_table, 3000, "VIN1", msisdn="1555"))
+    assert get_vin_item(cv_table, "VIN1").request_key == "fca-1555"
+
+
+def test_identity_lookups_without_items(cv_table):
+    save_record(cv_table, 1000, "VIN1")
+
+    assert get_vin_item(cv_table, "VIN1") is None
+    assert get_msisdn_programcodes(cv_table, MSISDN) == []
+
+
+def test_save_identity_items_skips_missing_vin_and_msisdn(cv_table):
+    record = save_record(cv_table, 1000, None, msisdn="")
+    save_identity_items(cv_table, record)
+
+    assert cv_table.count("msisdn-") == 0
+    assert [item.request_key for item in cv_table.scan()] == ["fca-"]
+
+
+def test_save_identity_items_never_fails_the_save(cv_table):
+    record = save_record(cv_table, 1000, "VIN1")
+    with patch(
+        "src.services.dynamodb_identity.save_vin_item",
+        side_effect=Exception("throttled"),
+    ):
+        save_identity_items(cv_table, record)
+
+    assert get_msisdn_programcodes(cv_table, MSISDN) == []
+
+
+def test_identity_items_are_not_taken_for_records(cv_table):
+    save_record_items(cv_table, save_record(cv_table, 1000, "VIN1"), latest_item=True)
+
+    # the backfills skip them, as do the scans for the newest records
+    assert backfill_latest_items(cv_table) == {"keys": 1, "written": 1, "skipped": 0}
+    assert backfill_identity_items(cv_table, dry_run=True)["keys"] == 1
+
+
+def test_backfill_identity_items_builds_items_from_newest_records(cv_table):
+    save_record(cv_table, 500, "VIN0")
+    save_record(cv_table, 1000, "VIN1")
+    save_record(cv_table, 2000, "VIN2", "vwcarnet")
+    save_record(cv_table, 1500, None, "nissan", msisdn="1555")
+
+    assert backfill_identity_items(cv_table, dry_run=True) == {
+        "keys": 3,
+        "vins": 2,
+        "msisdns": 3,
+    }
+    assert get_vin_item(cv_table, "VIN1") is None
+
+    backfill_identity_items(cv_table)
+    assert get_vin_item(cv_table, "VIN1").event_datetime == 1000
+    assert get_vin_item(cv_table, "VIN2").request_key == "vwcarnet-" + MSISDN
+    assert get_msisdn_programcodes(cv_table, MSISDN) == ["fca", "vwcarnet"]
+    assert get_msisdn_programcodes(cv_table, "1555") == ["nissan"]
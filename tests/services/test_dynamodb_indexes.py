@@ -0,0 +1,229 @@
+from datetime import datetime, timezone
+
+import boto3
+from moto import mock_dynamodb2
+
+from src.services.dynamodb_indexes import (
+    apply_index_step,
+    attribute_size,
+    index_attribute_definitions,
+    index_definitions,
+    item_size,
+    plan_index_migration,
+    projected_attributes,
+    projected_item,
+    query_index,
+    save_write_units,
+    wait_for_indexes,
+)
+from src.services.dynamodb_projections import projection
+from src.services.dynamodb_tables import (
+    ConnectedVehicleSupplementTable,
+    ConnectedVehicleTable,
+)
+
+TABLE_NAME = "indexes-cv"
+TABLE_KEYS = ("request_key", "event_datetime")
+
+
+def old_index(name, hash_key):
+    return {
+        "IndexName": name,
+        "KeySchema": [
+            {"AttributeName": hash_key, "KeyType": "HASH"},
+            {"AttributeName": "event_datetime", "KeyType": "RANGE"},
+        ],
+        "Projection": {"ProjectionType": "ALL"},
+    }
+
+
+def save_record(table, event_datetime, request_key="porsche-13234826699"):
+    record = table(
+        request_key=request_key,
+        event_datetime=event_datetime,
+        programcode="porsche",
+        msisdn="13234826699",
+        vin="WP0AA2A71JL113555",
+        timestamp=datetime.now(timezone.utc),
+        JSONData={"speed": event_datetime},
+    )
+    record.save()
+    return record
+
+
+def test_index_definitions_are_the_migration_target():
+    assert index_definitions(ConnectedVehicleTable) == [
+        {
+            "IndexName": "gsi-programcode-keys-index",
+            "KeySchema": [
+                {"AttributeName": "programcode", "KeyType": "HASH"},
+                {"AttributeName": "event_datetime", "KeyType": "RANGE"},
+            ],
+            "Projection": {"ProjectionType": "KEYS_ONLY"},
+        },
+    ]
+    assert [
+        index["IndexName"]
+        for index in index_definitions(ConnectedVehicleSupplementTable)
+    ] == ["gsi-programcode-keys-index"]
+
+
+def test_projected_attributes_are_the_table_and_index_keys():
+    assert projected_attributes(ConnectedVehicleTable.programcode_index) == {
+        "request_key",
+        "event_datetime",
+        "programcode",
+    }
+
+
+def test_plan_creates_new_indexes_before_dropping_old_ones():
+    target = index_definitions(ConnectedVehicleTable)
+    current = [
+        old_index("gsi-data-index", "programcode"),
+        old_index("gsi-rid-index", "referenceid"),
+    ]
+
+    steps = plan_index_migration(current, target)
+
+    assert [(action, index["IndexName"]) for action, index in steps] == [
+        ("create", "gsi-programcode-keys-index"),
+        ("delete", "gsi-data-index"),
+        ("delete", "gsi-rid-index"),
+    ]
+    assert plan_index_migration(target, target) == []
+    assert [
+        action for action, _ in plan_index_migration(current, target, drop=False)
+    ] == ["create"]
+
+
+def test_plan_recreates_index_whose_projection_changed():
+    target = index_definitions(ConnectedVehicleSupplementTable)
+    current = [old_index("gsi-programcode-keys-index", "programcode")]
+
+    steps = plan_index_migration(current, target)
+
+    assert steps == [("delete", current[0]), ("create", target[0])]
+
+
+def test_item_size_counts_names_and_values():
+    assert attribute_size({"S": "fca"}) == 3
+    # 12000 is one significant digit pair short of 3 bytes
+    assert attribute_size({"N": "12000"}) == 2
+    assert attribute_size({"M": {"a": {"S": "bc"}}}) == 3 + 1 + 1 + 2
+    assert item_size({"vin": {"S": "abc"}, "odometer": {"N": "1"}}) == 6 + 8 + 2
+
+
+def test_save_write_units_counts_each_index_the_item_is_in():
+    item = {
+        "request_key": {"S": "porsche-13234826699"},
+        "event_datetime": {"N": "1610027040000"},
+        "programcode": {"S": "porsche"},
+        "JSONData": {"S": "x" * 2900},
+    }
+    before = [
+        old_index("gsi-data-index", "programcode"),
+        old_index("gsi-rid-index", "referenceid"),
+    ]
+
+    assert save_write_units(item, before, TABLE_KEYS) == {
+        "table": 3,
+        "gsi-data-index": 3,
+        # no referenceid, not in the index
+        "gsi-rid-index": 0,
+    }
+    assert save_write_units(
+        item, index_definitions(ConnectedVehicleTable), TABLE_KEYS
+    ) == {
+        "table": 3,
+        "gsi-programcode-keys-index": 1,
+    }
+    assert projected_item(item, before[1], TABLE_KEYS) is None
+
+
+def test_projected_item_of_include_index_keeps_included_attributes():
+    item = {
+        "request_key": {"S": "porsche-13234826699"},
+        "event_datetime": {"N": "1610027040000"},
+        "programcode": {"S": "porsche"},
+        "vin": {"S": "WP0AA2A71JL113555"},
+        "JSONData": {"S": "x" * 2900},
+    }
+    index = dict(
+        old_index("include-index", "programcode"),
+        Projection={"ProjectionType": "INCLUDE", "NonKeyAttributes": ["vin"]},
+    )
+
+    assert projected_item(item, index, TABLE_KEYS) == {
+        name: item[name]
+        for name in ("request_key", "event_datetime", "programcode", "vin")
+    }
+
+
+def test_query_index_reads_full_items_by_key_newest_first(cv_table):
+    save_record(cv_table, 1)
+    save_record(cv_table, 3)
+    save_record(cv_table, 2, request_key="porsche-13234826700")
+    # latest items share the program code, never returned
+    save_record(cv_table, -1)
+
+    records = query_index(cv_table, cv_table.programcode_index, "porsche")
+
+    assert [(r.request_key, r.event_datetime) for r in records] == [
+        ("porsche-13234826699", 3),
+        ("porsche-13234826700", 2),
+        ("porsche-13234826699", 1),
+    ]
+    assert records[0].JSONData == {"speed": 3}
+    assert records[0].vin == "WP0AA2A71JL113555"
+
+
+def test_query_index_reads_only_the_attributes_asked_for(cv_table):
+    save_record(cv_table, 1)
+
+    (record,) = query_index(
+        cv_table,
+        cv_table.programcode_index,
+        "porsche",
+        attributes=projection("vin"),
+    )
+
+    assert record.vin == "WP0AA2A71JL113555"
+    assert record.JSONData is None
+
+
+def test_apply_index_steps_moves_table_to_new_indexes():
+    with mock_dynamodb2():
+        client = boto3.client("dynamodb", region_name="us-east-1")
+        client.create_table(
+            TableName=TABLE_NAME,
+            AttributeDefinitions=[
+                {"AttributeName": "request_key", "AttributeType": "S"},
+                {"AttributeName": "event_datetime", "AttributeType": "N"},
+                {"AttributeName": "programcode", "AttributeType": "S"},
+            ],
+            KeySchema=[
+                {"AttributeName": "request_key", "KeyType": "HASH"},
+                {"AttributeName": "event_datetime", "KeyType": "RANGE"},
+            ],
+            GlobalSecondaryIndexes=[old_index("gsi-data-index", "programcode")],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        current = client.describe_table(TableName=TABLE_NAME)["Table"][
+            "GlobalSecondaryIndexes"
+        ]
+
+        for step in plan_index_migration(
+            current, index_definitions(ConnectedVehicleSupplementTable)
+        ):
+            apply_index_step(
+                client,
+                TABLE_NAME,
+                step,
+                index_attribute_definitions(ConnectedVehicleSupplementTable),
+            )
+            table = wait_for_indexes(client, TABLE_NAME, delay=0, timeout=5)
+
+        assert [
+            (index["IndexName"], index["Projection"]["ProjectionType"])
+            for index in table["GlobalSecondaryIndexes"]
+        ] == [("gsi-programcode-keys-index", "KEYS_ONLY")]
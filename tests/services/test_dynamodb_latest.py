@@ -0,0 +1,142 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from src.config.fca_config import FcaConfig
+from src.services.dynamodb_latest import (
+    LATEST_EVENT_DATETIME,
+    backfill_latest_items,
+    get_latest_item,
+    get_latest_items,
+    get_newest_event_datetime,
+    latest_item_enabled,
+    save_latest_item,
+)
+from src.services.dynamodb_lease import acquire_lease
+
+REQUEST_KEY = "fca-13234826699"
+
+
+def save_record(table, event_datetime, vin, request_key=REQUEST_KEY):
+    record = table(
+        request_key=request_key,
+        event_datetime=event_datetime,
+        programcode="fca",
+        msisdn="13234826699",
+        timestamp=datetime.now(timezone.utc),
+        vin=vin,
+    )
+    record.save()
+    return record
+
+
+def test_save_latest_item_copies_record_under_reserved_sort_key(cv_table):
+    record = save_record(cv_table, 1000, "VIN1")
+    assert save_latest_item(cv_table, record) is True
+
+    latest = cv_table.get(REQUEST_KEY, LATEST_EVENT_DATETIME)
+    assert latest.vin == "VIN1"
+    assert latest.latest_event_datetime == 1000
+
+
+def test_save_latest_item_leaves_out_raw_payload(cv_table):
+    record = save_record(cv_table, 1000, "VIN1")
+    record.JSONData = {"gpsData": {"latitude": 42.5}}
+    save_latest_item(cv_table, record)
+
+    latest = get_latest_item(cv_table, REQUEST_KEY)
+    assert latest.vin == "VIN1"
+    assert latest.JSONData is None
+
+
+def test_latest_item_enabled_only_when_config_enables_it():
+    assert latest_item_enabled(FcaConfig(dynamodb_latest_item=True))
+    assert not latest_item_enabled(FcaConfig())
+    # a mocked config is not an enabled one
+    assert not latest_item_enabled(MagicMock())
+
+
+def test_save_latest_item_does_not_replace_newer_record(cv_table):
+    save_latest_item(cv_table, save_record(cv_table, 2000, "VIN2"))
+    assert save_latest_item(cv_table, save_record(cv_table, 1000, "VIN1")) is False
+
+    assert get_latest_item(cv_table, REQUEST_KEY).vin == "VIN2"
+
+
+def test_get_latest_item_restores_record_sort_key(cv_table):
+    save_latest_item(cv_table, save_record(cv_table, 1000, "VIN1"))
+    save_latest_item(cv_table, save_record(cv_table, 2000, "VIN2"))
+
+    latest = get_latest_item(cv_table, REQUEST_KEY)
+    assert latest.vin == "VIN2"
+    assert latest.event_datetime == 2000
+
+
+def test_get_latest_item_returns_none_without_latest_item(cv_table):
+    save_record(cv_table, 1000, "VIN1")
+    assert get_latest_item(cv_table, REQUEST_KEY) is None
+
+
+def test_get_newest_event_datetime_skips_lease_and_latest_items(cv_table):
+    assert get_newest_event_datetime(cv_table, REQUEST_KEY) is None
+    acquire_lease(cv_table, REQUEST_KEY, "owner", 5)
+    assert get_newest_event_datetime(cv_table, REQUEST_KEY) is None
+
+    save_latest_item(cv_table, save_record(cv_table, 1000, "VIN1"))
+    save_record(cv_table, 2000, "VIN2")
+
+    assert get_newest_event_datetime(cv_table, REQUEST_KEY) == 2000
+    # the latest item only moves with save_latest_item
+    assert get_newest_event_datetime(cv_table, REQUEST_KEY, latest_item=True) == 1000
+
+
+def test_get_latest_items_reads_keys_in_one_batch(cv_table):
+    save_latest_item(cv_table, save_record(cv_table, 1000, "VIN1"))
+    save_latest_item(
+        cv_table, save_record(cv_table, 2000, "VIN2", request_key="fca-5243583607")
+    )
+    save_record(cv_table, 3000, "VIN3", request_key="fca-1234567890")
+
+    latest_items = get_latest_items(
+        cv_table, [REQUEST_KEY, "fca-5243583607", "fca-1234567890", REQUEST_KEY]
+    )
+
+    assert sorted(latest_items) == [REQUEST_KEY, "fca-5243583607"]
+    assert latest_items["fca-5243583607"].vin == "VIN2"
+    assert latest_items["fca-5243583607"].event_datetime == 2000
+
+
+def test_descending_query_still_returns_newest_record_first(cv_table):
+    save_latest_item(cv_table, save_record(cv_table, 1000, "VIN1"))
+    newest = next(iter(cv_table.query(REQUEST_KEY, scan_index_forward=False, limit=1)))
+    assert newest.event_datetime == 1000
+
+
+def test_backfill_latest_items_builds_newest_item_per_key(cv_table):
+    save_record(cv_table, 1000, "VIN1")
+    save_record(cv_table, 3000, "VIN3")
+    save_record(cv_table, 2000, "VIN2")
+    save_record(cv_table, 1500, "OTHERVIN", request_key="fca-10000000000")
+    acquire_lease(cv_table, REQUEST_KEY, "owner", 5)
+
+    stats = backfill_latest_items(cv_table)
+
+    assert stats == {"keys": 2, "written": 2, "skipped": 0}
+    assert get_latest_item(cv_table, REQUEST_KEY).vin == "VIN3"
+    assert get_latest_item(cv_table, "fca-10000000000").vin == "OTHERVIN"
+
+
+def test_backfill_latest_items_dry_run_writes_nothing(cv_table):
+    save_record(cv_table, 1000, "VIN1")
+
+    stats = backfill_latest_items(cv_table, dry_run=True)
+
+    assert stats["keys"] == 1
+    assert get_latest_item(cv_table, REQUEST_KEY) is None
+
+
+def test_backfill_latest_items_is_repeatable(cv_table):
+    save_record(cv_table, 1000, "VIN1")
+    backfill_latest_items(cv_table)
+
+    assert backfill_latest_items(cv_table) == {"keys": 1, "written": 1, "skipped": 0}
+    assert get_latest_item(cv_table, REQUEST_KEY).vin == "VIN1"
@@ -0,0 +1,113 @@
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import boto3
+import pytest
+from pynamodb.exceptions import UpdateError
+
+from src.services.dynamodb_lease import (
+    LEASE_PREFIX,
+    LEASE_TTL_SLACK,
+    acquire_lease,
+    get_lease_stats,
+    release_lease,
+    reset_lease_stats,
+)
+
+LEASE_NAME = "fca-13234826699"
+
+
+@pytest.fixture(autouse=True)
+def clear_lease_stats():
+    reset_lease_stats()
+    yield
+    reset_lease_stats()
+
+
+def test_acquire_lease_should_grant_free_lease(cv_table):
+    assert acquire_lease(cv_table, LEASE_NAME, "owner-a", 5) is True
+
+    lease = cv_table.get(LEASE_PREFIX + LEASE_NAME, 0)
+    assert lease.lease_owner == "owner-a"
+    assert get_lease_stats()["acquired"] == 1
+
+
+def test_acquire_lease_should_write_only_lease_attributes_with_ttl(cv_table):
+    acquire_lease(cv_table, LEASE_NAME, "owner-a", 5)
+
+    client = boto3.client("dynamodb", region_name="us-east-1")
+    item = client.get_item(
+        TableName=cv_table.Meta.table_name,
+        Key={
+            "request_key": {"S": LEASE_PREFIX + LEASE_NAME},
+            "event_datetime": {"N": "0"},
+        },
+    )["Item"]
+    # no index key attributes, the lease stays out of every GSI
+    assert "programcode" not in item
+    assert "referenceid" not in item
+    assert int(item["expires_at"]["N"]) == int(item["lease_expires"]["N"]) // 1000 + (
+        LEASE_TTL_SLACK // timedelta(seconds=1)
+    )
+
+
+def test_main_table_expires_items_by_ttl_attribute(cv_table):
+    cv_table.update_ttl(ignore_update_ttl_errors=False)
+
+    client = boto3.client("dynamodb", region_name="us-east-1")
+    assert client.describe_time_to_live(TableName=cv_table.Meta.table_name)[
+        "TimeToLiveDescription"
+    ] == {"TimeToLiveStatus": "ENABLED", "AttributeName": "expires_at"}
+
+
+def test_acquire_lease_should_be_contended_while_held_by_another_owner(cv_table):
+    acquire_lease(cv_table, LEASE_NAME, "owner-a", 5)
+
+    assert acquire_lease(cv_table, LEASE_NAME, "owner-b", 5) is False
+    assert get_lease_stats()["contended"] == 1
+    assert cv_table.get(LEASE_PREFIX + LEASE_NAME, 0).lease_owner == "owner-a"
+
+
+def test_acquire_lease_should_let_holder_renew(cv_table):
+    acquire_lease(cv_table, LEASE_NAME, "owner-a", 5)
+
+    assert acquire_lease(cv_table, LEASE_NAME, "owner-a", 5) is True
+
+
+def test_acquire_lease_should_take_over_expired_lease(cv_table):
+    acquire_lease(cv_table, LEASE_NAME, "owner-a", -1)
+
+    assert acquire_lease(cv_table, LEASE_NAME, "owner-b", 5) is True
+    assert cv_table.get(LEASE_PREFIX + LEASE_NAME, 0).lease_owner == "owner-b"
+
+
+def test_acquire_lease_should_not_block_other_names(cv_table):
+    acquire_lease(cv_table, LEASE_NAME, "owner-a", 5)
+
+    assert acquire_lease(cv_table, "fca-10000000000", "owner-b", 5) is True
+
+
+def test_release_lease_should_free_lease_for_others(cv_table):
+    acquire_lease(cv_table, LEASE_NAME, "owner-a", 5)
+    release_lease(cv_table, LEASE_NAME, "owner-a")
+
+    assert acquire_lease(cv_table, LEASE_NAME, "owner-b", 5) is True
+    assert get_lease_stats()["released"] == 1
+
+
+def test_release_lease_should_not_release_lease_of_another_owner(cv_table):
+    acquire_lease(cv_table, LEASE_NAME, "owner-a", 5)
+    release_lease(cv_table, LEASE_NAME, "owner-b")
+
+    assert cv_table.get(LEASE_PREFIX + LEASE_NAME, 0).lease_owner == "owner-a"
+    assert get_lease_stats()["released"] == 0
+
+
+def test_acquire_lease_should_fail_open_on_table_error():
+    table = MagicMock()
+    table.return_value.update.side_effect = UpdateError("boom")
+    with patch("src.services.dynamodb_lease.handle_table_error") as handle_error:
+        assert acquire_lease(table, LEASE_NAME, "owner-a", 5) is True
+
+    handle_error.assert_called_once()
+    assert get_lease_stats()["errors"] == 1
@@ -0,0 +1,40 @@
+import pytest
+
+from src.aeris.services import aeris_service
+from src.fca.services import fca_service
+from src.services.dynamodb_projections import (
+    KEY_ATTRIBUTES,
+    attributes_to_get,
+    covers,
+    projection,
+)
+from src.services.dynamodb_tables import ConnectedVehicleTable
+from src.siriusxm.services import siriusxm_service
+from src.verizon.services import verizon_service
+from src.vodafone.services import vodafone_service
+
+
+@pytest.mark.parametrize(
+    "service_module",
+    [aeris_service, fca_service, siriusxm_service, verizon_service, vodafone_service],
+)
+def test_vehicledata_projection_names_only_table_attributes(service_module):
+    attributes = service_module.VEHICLEDATA_ATTRIBUTES
+    assert attributes <= set(ConnectedVehicleTable.get_attributes())
+    assert "JSONData" not in attributes
+
+
+def test_projection_always_reads_key_attributes():
+    assert set(KEY_ATTRIBUTES) <= projection("vin")
+
+
+def test_attributes_to_get_reads_full_item_without_projection():
+    assert attributes_to_get(None) is None
+    assert attributes_to_get(projection("vin")) == sorted(projection("vin"))
+
+
+def test_covers_compares_projections():
+    assert covers(None, projection("vin"))
+    assert covers(projection("vin", "brand"), projection("vin"))
+    assert not covers(projection("vin"), projection("vin", "brand"))
+    assert not covers(projection("vin"), None)
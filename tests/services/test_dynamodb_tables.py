@@ -1,10 +1,26 @@
+import time
 from unittest.mock import patch
 
 import pytest
+from moto import mock_dynamodb2
+
+from pynamodb.exceptions import QueryError, TableDoesNotExist
 
 from src.config.dynamo_config import DynamoConfig
+from src.services.dynamodb_tables import bootstrap_tables
+from src.services.dynamodb_tables import ConnectedVehicleTable
 from src.services.dynamodb_tables import get_main_table
 from src.services.dynamodb_tables import get_supplement_table
+from src.services.dynamodb_tables import handle_table_error
+from src.services.dynamodb_tables import invalidate_table_readiness
+from src.utilities.request_context import DeadlineExceeded, set_request_deadline
+
+
+@pytest.fixture(autouse=True)
+def clear_table_readiness():
+    invalidate_table_readiness()
+    yield
+    invalidate_table_readiness()
 
 
 @pytest.fixture
@@ -31,17 +47,89 @@ def test_get_main_table_should_set_table_name_if_present(patched_exists):
     assert table.Meta.table_name == table_name
 
 
-def test_get_main_table_should_createtable_if_table_not_exist(
+def test_get_main_table_should_not_createtable_if_table_not_exist(
     patched_exists, patched_createtable
 ):
     table_name = "fooTable"
     patched_exists.return_value = False
     config = DynamoConfig(table_name=table_name)
     table = get_main_table(config)
-    assert patched_createtable.called is True
+    assert patched_createtable.called is False
     assert table is not None
 
 
+def test_get_main_table_should_check_existence_only_once(patched_exists):
+    patched_exists.return_value = True
+    config = DynamoConfig(table_name="fooTable")
+    get_main_table(config)
+    get_main_table(config)
+    assert patched_exists.call_count == 1
+
+
+def test_get_main_table_should_check_existence_per_table_name_and_endpoint(
+    patched_exists
+):
+    patched_exists.return_value = True
+    get_main_table(DynamoConfig(table_name="fooTable"))
+    get_main_table(DynamoConfig(table_name="barTable"))
+    get_main_table(DynamoConfig(table_name="fooTable", endpoint="fooHost"))
+    assert patched_exists.call_count == 3
+
+
+def test_get_main_table_should_recheck_existence_if_table_was_missing(
+    patched_exists
+):
+    patched_exists.return_value = False
+    config = DynamoConfig(table_name="fooTable")
+    get_main_table(config)
+    patched_exists.return_value = True
+    get_main_table(config)
+    get_main_table(config)
+    assert patched_exists.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "exception",
+    [
+        TableDoesNotExist("fooTable"),
+        QueryError(
+            "Failed to query items",
+            cause=type(
+                "ClientError",
+                (Exception,),
+                {
+                    "response": {
+                        "Error": {
+                            "Code": "ResourceNotFoundException",
+                            "Message": "Requested resource not found",
+                        }
+                    }
+                },
+            )(),
+        ),
+    ],
+    ids=["TableDoesNotExist", "ResourceNotFound"],
+)
+def test_handle_table_error_on_resource_not_found_should_recheck_existence(
+    patched_exists, exception
+):
+    patched_exists.return_value = True
+    config = DynamoConfig(table_name="fooTable")
+    get_main_table(config)
+    handle_table_error(ConnectedVehicleTable, exception)
+    get_main_table(config)
+    assert patched_exists.call_count == 2
+
+
+def test_handle_table_error_on_other_errors_should_keep_existence(patched_exists):
+    patched_exists.return_value = True
+    config = DynamoConfig(table_name="fooTable")
+    get_main_table(config)
+    handle_table_error(ConnectedVehicleTable, Exception("something wrong"))
+    get_main_table(config)
+    assert patched_exists.call_count == 1
+
+
 def test_get_main_table_should_set_host_if_present(patched_exists):
     host = "fooHost"
     patched_exists.return_value = True
@@ -83,17 +171,27 @@ def test_get_supplement_table_should_set_table_name_if_present(
     assert table.Meta.table_name == table_name
 
 
-def test_get_supplement_table_should_createtable_if_table_not_exist(
+def test_get_supplement_table_should_not_createtable_if_table_not_exist(
     patched_supplement_exists, patched_supplement_createtable
 ):
     table_name = "fooTable"
     patched_supplement_exists.return_value = False
     config = DynamoConfig(supplement_table_name=table_name)
     table = get_supplement_table(config)
-    assert patched_supplement_createtable.called is True
+    assert patched_supplement_createtable.called is False
     assert table is not None
 
 
+def test_get_supplement_table_should_check_existence_only_once(
+    patched_supplement_exists
+):
+    patched_supplement_exists.return_value = True
+    config = DynamoConfig(supplement_table_name="fooTable")
+    get_supplement_table(config)
+    get_supplement_table(config)
+    assert patched_supplement_exists.call_count == 1
+
+
 def test_get_supplement_table_should_set_host_if_present(patched_supplement_exists):
     host = "fooHost"
     patched_supplement_exists.return_value = True
@@ -109,3 +207,70 @@ def test_get_supplement_table_host_should_be_none_if_not_present(
     patched_supplement_exists.return_value = True
     table = get_supplement_table(config)
     assert table.Meta.host is None
+
+
+def test_bootstrap_tables_should_create_missing_tables(
+    patched_exists,
+    patched_createtable,
+    patched_supplement_exists,
+    patched_supplement_createtable,
+):
+    patched_exists.side_effect = [False, False, True]
+    patched_supplement_exists.return_value = True
+    bootstrap_tables(
+        DynamoConfig(table_name="fooTable", supplement_table_name="fooSupplement")
+    )
+    assert patched_createtable.called is True
+    assert patched_supplement_createtable.called is False
+
+
+@pytest.fixture
+def new_connection():
+    # a connection of its own, so the settings apply and are dropped after
+    connection = ConnectedVehicleTable._connection
+    meta = (
+        ConnectedVehicleTable.Meta.connect_timeout_seconds,
+        ConnectedVehicleTable.Meta.read_timeout_seconds,
+        ConnectedVehicleTable.Meta.max_retry_attempts,
+    )
+    ConnectedVehicleTable._connection = None
+    with mock_dynamodb2():
+        yield
+    ConnectedVehicleTable._connection = connection
+    (
+        ConnectedVehicleTable.Meta.connect_timeout_seconds,
+        ConnectedVehicleTable.Meta.read_timeout_seconds,
+        ConnectedVehicleTable.Meta.max_retry_attempts,
+    ) = meta
+
+
+def test_get_main_table_should_apply_configured_timeouts(
+    patched_exists, new_connection
+):
+    patched_exists.return_value = True
+    table = get_main_table(
+        DynamoConfig(
+            table_name="fooTable",
+            connect_timeout=1,
+            read_timeout=2,
+            max_retry_attempts=0,
+        )
+    )
+    connection = table._get_connection().connection
+    assert connection.client.meta.config.connect_timeout == 1
+    assert connection.client.meta.config.read_timeout == 2
+    assert table.Meta.max_retry_attempts == 0
+
+
+def test_get_main_table_calls_fail_fast_once_the_deadline_passed(
+    patched_exists, new_connection
+):
+    patched_exists.return_value = True
+    table = get_main_table(DynamoConfig(table_name="fooTable"))
+    set_request_deadline(time.monotonic())
+    with patch.object(
+        table._get_connection().connection.client._endpoint.http_session, "send"
+    ) as patched_send:
+        with pytest.raises(DeadlineExceeded):
+            table.get("fca-13234826699", 1000)
+    patched_send.assert_not_called()
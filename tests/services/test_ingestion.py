@@ -0,0 +1,151 @@
+import json
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.config.fca_config import FcaConfig
+from src.services.dynamodb_latest import get_latest_item
+from src.services.ingestion import (
+    LocalIngestionQueue,
+    consume_ingestion_event,
+    consume_records,
+    ingestion_enabled,
+    send_vehicledata_rows,
+)
+
+
+@pytest.fixture(autouse=True)
+def dynamo_config(moto_dynamo_config):
+    with patch("src.services.ingestion.get_config_manager") as config_manager:
+        config_manager.return_value.retrieve_config.return_value = moto_dynamo_config
+        yield
+
+
+@pytest.fixture
+def sent_messages():
+    messages = []
+    with patch("src.services.ingestion.get_ingestion_queue") as ingestion_queue:
+        ingestion_queue.return_value.send.side_effect = messages.append
+        yield messages
+
+
+def new_rows(tables, msisdn="13234826699"):
+    main_table, supplement_table = tables
+    return (
+        main_table(
+            request_key="fca-" + msisdn,
+            event_datetime=1000,
+            programcode="fca",
+            msisdn=msisdn,
+            timestamp=datetime.now(timezone.utc),
+            vin="VIN" + msisdn,
+        ),
+        supplement_table(
+            request_key="fca-" + msisdn,
+            event_datetime=1000,
+            programcode="fca",
+            msisdn=msisdn,
+            timestamp=datetime.now(timezone.utc),
+            callcenternumber="+18449232959",
+        ),
+    )
+
+
+def queued_record(message_id, body):
+    return {"messageId": message_id, "body": body}
+
+
+def test_ingestion_enabled_only_when_config_enables_queue():
+    service = MagicMock()
+    service._config = FcaConfig(ingestion_queue_enable=True)
+    assert ingestion_enabled(service)
+
+    service._config = FcaConfig()
+    assert not ingestion_enabled(service)
+
+    # a mocked config is not an enabled one
+    assert not ingestion_enabled(MagicMock())
+
+
+def test_send_vehicledata_rows_serializes_both_rows(cv_tables, sent_messages):
+    send_vehicledata_rows("13234826699", "fca", "1.0", *new_rows(cv_tables))
+
+    message = json.loads(sent_messages[0])
+    assert message["msisdn"] == "13234826699"
+    assert message["ctsversion"] == "1.0"
+    assert message["row"]["vin"] == {"S": "VIN13234826699"}
+    assert message["supplement_row"]["callcenternumber"] == {"S": "+18449232959"}
+
+
+def test_consume_records_saves_rows_and_latest_item(cv_tables, sent_messages):
+    main_table, supplement_table = cv_tables
+    send_vehicledata_rows(
+        "13234826699", "fca", "1.0", *new_rows(cv_tables), latest_item=True
+    )
+    send_vehicledata_rows(
+        "5243583607", "fca", "1.0", new_rows(cv_tables, "5243583607")[0]
+    )
+
+    failed = consume_records(
+        [queued_record(str(index), body) for index, body in enumerate(sent_messages)]
+    )
+
+    assert failed == []
+    assert main_table.get("fca-5243583607", 1000).vin == "VIN5243583607"
+    assert (
+        supplement_table.get("fca-13234826699", 1000).callcenternumber == "+18449232959"
+    )
+    assert get_latest_item(main_table, "fca-13234826699").vin == "VIN13234826699"
+    # the provider of the other push doesn't keep latest items
+    assert get_latest_item(main_table, "fca-5243583607") is None
+
+
+def test_consume_records_returns_message_whose_main_row_failed(
+    cv_tables, sent_messages
+):
+    main_table, _ = cv_tables
+    send_vehicledata_rows("13234826699", "fca", "1.0", *new_rows(cv_tables))
+
+    with patch(
+        "src.services.ingestion.batch_save", side_effect=lambda *rows: list(rows)
+    ):
+        with patch.object(main_table, "save", side_effect=Exception("throttled")):
+            failed = consume_records([queued_record("1", sent_messages[0])])
+
+    assert failed == ["1"]
+
+
+def test_consume_ingestion_event_drops_unreadable_message(cv_tables, sent_messages):
+    send_vehicledata_rows("13234826699", "fca", "1.0", *new_rows(cv_tables))
+
+    result = consume_ingestion_event(
+        {
+            "Records": [
+                queued_record("1", "not json"),
+                queued_record("2", sent_messages[0]),
+            ]
+        }
+    )
+
+    assert result == {"batchItemFailures": []}
+    assert cv_tables[0].get("fca-13234826699", 1000).msisdn == "13234826699"
+
+
+def test_local_ingestion_queue_consumes_sent_messages_in_batches():
+    local_queue = LocalIngestionQueue(batch_size=10)
+    consumed = []
+    with patch(
+        "src.services.ingestion.consume_records", side_effect=consumed.append
+    ) as patched_consume:
+        with patch.object(local_queue, "_ensure_thread"):
+            for index in range(12):
+                local_queue.send(str(index))
+        local_queue._ensure_thread()
+        local_queue._thread.join(timeout=0.5)
+
+    assert patched_consume.call_count == 2
+    assert [record["body"] for record in consumed[0]] == [
+        str(index) for index in range(10)
+    ]
+    assert len(consumed[1]) == 2
@@ -0,0 +1,86 @@
+import asyncio
+import contextvars
+import threading
+import time
+from types import SimpleNamespace
+
+from pytest import fixture
+from pytest import mark
+
+from src.services.provider_executor import (
+    DEFAULT_MAX_WORKERS,
+    get_provider_executor,
+    provider_of,
+    run_client_call,
+    shutdown_provider_executors,
+)
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+class StubService:
+    def __init__(self, pool_size=None, delay=0):
+        self._config = SimpleNamespace(pool_size=pool_size)
+        self._delay = delay
+
+    def get_vehicledata(self, msisdn, programcode):
+        time.sleep(self._delay)
+        return threading.current_thread().name, request_id.get(), msisdn
+
+
+@fixture(autouse=True)
+def clear_provider_executors():
+    shutdown_provider_executors()
+    yield
+    shutdown_provider_executors()
+
+
+@mark.asyncio
+async def test_run_client_call_runs_method_off_the_event_loop_thread():
+    thread_name, _, msisdn = await run_client_call(
+        StubService().get_vehicledata, "5555555555", "fca"
+    )
+    assert msisdn == "5555555555"
+    assert thread_name.startswith("provider-StubService")
+
+
+@mark.asyncio
+async def test_run_client_call_keeps_context_vars():
+    request_id.set("somerequestid")
+    _, current_request_id, _ = await run_client_call(
+        StubService().get_vehicledata, "5555555555", "fca"
+    )
+    assert current_request_id == "somerequestid"
+
+
+@mark.asyncio
+async def test_run_client_call_runs_slow_calls_concurrently():
+    service = StubService(pool_size=4, delay=0.2)
+    started = time.perf_counter()
+    await asyncio.gather(
+        *[run_client_call(service.get_vehicledata, str(i), "fca") for i in range(4)]
+    )
+    assert time.perf_counter() - started < 0.6
+
+
+def test_provider_of_uses_service_class_and_pool_size():
+    assert provider_of(StubService(pool_size=4).get_vehicledata) == ("StubService", 4)
+
+
+def test_provider_of_plain_function_uses_default_pool():
+    assert provider_of(lambda: None) == ("default", None)
+
+
+def test_get_provider_executor_is_reused_per_provider():
+    executor = get_provider_executor("FcaService", 4)
+    assert get_provider_executor("FcaService", 4) is executor
+    assert get_provider_executor("AerisService", 4) is not executor
+
+
+def test_get_provider_executor_when_size_changes_returns_new_executor():
+    executor = get_provider_executor("FcaService", 4)
+    assert get_provider_executor("FcaService", 8) is not executor
+
+
+def test_get_provider_executor_without_size_uses_default():
+    assert get_provider_executor("FcaService")._max_workers == DEFAULT_MAX_WORKERS
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+
+from pytest import fixture
+from pytest import mark
+from pytest import raises
+
+from src.services.request_coalescer import (
+    RequestCoalescer,
+    request_coalescer,
+    run_coalesced_client_call,
+)
+
+
+class StubService:
+    def __init__(self, delay=0.1):
+        self._delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_vehicledata(self, msisdn, programcode):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self._delay)
+        return object()
+
+    def fail(self, msisdn, programcode):
+        time.sleep(self._delay)
+        raise ValueError("upstream failed")
+
+
+@fixture(autouse=True)
+def clear_coalescing_stats():
+    request_coalescer.reset()
+    yield
+    request_coalescer.reset()
+
+
+@mark.asyncio
+async def test_run_coalesced_client_call_shares_one_upstream_call():
+    service = StubService()
+    results = await asyncio.gather(
+        *[
+            run_coalesced_client_call(service.get_vehicledata, "5555555555", "fca")
+            for _ in range(5)
+        ]
+    )
+    assert service.calls == 1
+    assert all(result is results[0] for result in results)
+    assert request_coalescer.stats() == {"executed": 1, "merged": 4, "inflight": 0}
+
+
+@mark.asyncio
+async def test_run_coalesced_client_call_keeps_different_keys_apart():
+    service = StubService()
+    await asyncio.gather(
+        run_coalesced_client_call(service.get_vehicledata, "5555555555", "fca"),
+        run_coalesced_client_call(service.get_vehicledata, "6666666666", "fca"),
+        run_coalesced_client_call(service.get_vehicledata, "5555555555", "toyota"),
+        run_coalesced_client_call(StubService().get_vehicledata, "5555555555", "fca"),
+    )
+    assert service.calls == 3
+    assert request_coalescer.stats()["merged"] == 0
+
+
+@mark.asyncio
+async def test_run_coalesced_client_call_does_not_reuse_finished_calls():
+    service = StubService(delay=0)
+    await run_coalesced_client_call(service.get_vehicledata, "5555555555", "fca")
+    await run_coalesced_client_call(service.get_vehicledata, "5555555555", "fca")
+    assert service.calls == 2
+
+
+@mark.asyncio
+async def test_run_coalesced_client_call_shares_exceptions():
+    service = StubService()
+    results = await asyncio.gather(
+        run_coalesced_client_call(service.fail, "5555555555", "fca"),
+        run_coalesced_client_call(service.fail, "5555555555", "fca"),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+    assert request_coalescer.inflight() == 0
+
+
+@mark.asyncio
+async def test_coalescer_keeps_call_running_when_first_caller_is_cancelled():
+    coalescer = RequestCoalescer()
+
+    async def call():
+        await asyncio.sleep(0.1)
+        return "data"
+
+    first = asyncio.ensure_future(coalescer.run("key", call))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(coalescer.run("key", call))
+    await asyncio.sleep(0)
+    first.cancel()
+    with raises(asyncio.CancelledError):
+        await first
+    assert await second == "data"
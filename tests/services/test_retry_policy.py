@@ -0,0 +1,100 @@
+from time import monotonic
+from unittest.mock import patch
+
+import pytest
+
+from src.services.retry_policy import RetryPolicy
+from src.utilities.request_context import set_request_deadline
+
+
+@pytest.fixture(autouse=True)
+def clear_request_deadline():
+    set_request_deadline(None)
+    yield
+    set_request_deadline(None)
+
+
+@pytest.fixture
+def no_jitter():
+    with patch("src.services.retry_policy.random.uniform", return_value=0):
+        yield
+
+
+def test_delay_uses_fast_polls_then_capped_exponential_backoff(no_jitter):
+    policy = RetryPolicy(
+        max_wait=30,
+        max_delay=4,
+        initial_delay=0.5,
+        fast_polls=2,
+        fast_poll_delay=0.25,
+    )
+    assert [policy.delay(i) for i in range(8)] == [
+        0.0,
+        0.25,
+        0.25,
+        0.5,
+        1.0,
+        2.0,
+        4,
+        4,
+    ]
+
+
+def test_delay_applies_jitter_below_the_schedule():
+    policy = RetryPolicy(max_wait=30, max_delay=4, jitter=0.5, fast_polls=0)
+    delays = [policy.delay(1) for _ in range(50)]
+    assert all(0.25 <= delay <= 0.5 for delay in delays)
+
+
+def test_next_wait_stops_at_max_attempts():
+    policy = RetryPolicy(max_wait=30, max_delay=4, max_attempts=2)
+    for _ in range(2):
+        assert policy.next_wait() is not None
+        policy.finish_attempt(policy.start_attempt(0), False)
+    assert policy.next_wait() is None
+
+
+def test_next_wait_stops_when_wait_would_pass_deadline(no_jitter):
+    policy = RetryPolicy(max_wait=0.3, max_delay=4, fast_polls=1, fast_poll_delay=0.2)
+    assert policy.next_wait() == 0.0
+    policy.start_attempt(0)
+    assert policy.next_wait() == 0.2
+    policy.start_attempt(0.2)
+    assert policy.next_wait() is None
+
+
+def test_next_wait_waits_at_least_min_delay(no_jitter):
+    policy = RetryPolicy(max_wait=3, max_delay=4, fast_polls=1, fast_poll_delay=0.2)
+    policy.start_attempt(0)
+    assert policy.next_wait(min_delay=1) == 1
+    assert policy.next_wait(min_delay=5) is None
+
+
+def test_deadline_uses_remaining_request_time_minus_margin():
+    set_request_deadline(monotonic() + 5)
+    policy = RetryPolicy(max_wait=12, max_delay=4, deadline_margin=2)
+    assert 2.5 < policy.remaining() <= 3
+
+
+def test_deadline_without_request_deadline_uses_max_wait():
+    policy = RetryPolicy(max_wait=12, max_delay=4)
+    assert 11.5 < policy.remaining() <= 12
+
+
+def test_next_wait_when_request_time_is_used_up_returns_none():
+    set_request_deadline(monotonic() + 1)
+    policy = RetryPolicy(max_wait=12, max_delay=4, deadline_margin=2)
+    assert policy.next_wait() is None
+
+
+def test_timings_report_each_attempt():
+    policy = RetryPolicy(max_wait=12, max_delay=4)
+    attempt = policy.start_attempt(0.25)
+    attempt.requested = True
+    policy.finish_attempt(attempt, True)
+    timings = policy.timings()
+    assert len(timings) == 1
+    assert timings[0]["attempt"] == 0
+    assert timings[0]["waited_ms"] == 250
+    assert timings[0]["requested"] is True
+    assert timings[0]["found"] is True
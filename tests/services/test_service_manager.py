@@ -11,7 +11,17 @@ from src.config.vodafone_config import VodafoneConfig
 from src.config.wirelesscar_config import WirelessCarConfig
 from src.models.enums.ctsversion_type import CtsVersion
 from src.models.enums.programcode_type import ProgramCode
-from src.services.service_manager import setup_service_manager
+from src.services.service_manager import (
+    invalidate_service_registry,
+    setup_service_manager,
+)
+
+
+@fixture(autouse=True)
+def clear_service_registry():
+    invalidate_service_registry()
+    yield
+    invalidate_service_registry()
 
 
 @fixture
@@ -26,7 +36,7 @@ def patched_setup_config_manager(mock_config_manager):
 @fixture
 def patched_get_main_table():
     with patch(
-        "src.services.service_manager.get_main_table", autospec=True
+        "src.services.dynamodb_tables.get_main_table", autospec=True
     ) as mocked_get_main_table:
         yield mocked_get_main_table
 
@@ -34,7 +44,7 @@ def patched_get_main_table():
 @fixture
 def patched_get_supplement_table():
     with patch(
-        "src.services.service_manager.get_supplement_table", autospec=True
+        "src.services.dynamodb_tables.get_supplement_table", autospec=True
     ) as mocked_get_supplement_table:
         yield mocked_get_supplement_table
 
@@ -42,7 +52,7 @@ def patched_get_supplement_table():
 @fixture
 def patched_siriusxm_client_service_class(mock_siriusxm_client_service):
     with patch(
-        "src.services.service_manager.SiriusXmService", autospec=True
+        "src.siriusxm.services.siriusxm_service.SiriusXmService", autospec=True
     ) as mock_client_service:
         mock_client_service.return_value = mock_siriusxm_client_service
         yield mock_client_service
@@ -51,7 +61,7 @@ def patched_siriusxm_client_service_class(mock_siriusxm_client_service):
 @fixture
 def patched_fca_client_service_class(mock_fca_client_service):
     with patch(
-        "src.services.service_manager.FcaService", autospec=True
+        "src.fca.services.fca_service.FcaService", autospec=True
     ) as mock_client_service:
         mock_client_service.return_value = mock_fca_client_service
         yield mock_client_service
@@ -60,7 +70,7 @@ def patched_fca_client_service_class(mock_fca_client_service):
 @fixture
 def patched_verizon_client_service_class(mock_verizon_client_service):
     with patch(
-        "src.services.service_manager.VerizonService", autospec=True
+        "src.verizon.services.verizon_service.VerizonService", autospec=True
     ) as mock_client_service:
         mock_client_service.return_value = mock_verizon_client_service
         yield mock_client_service
@@ -69,7 +79,7 @@ def patched_verizon_client_service_class(mock_verizon_client_service):
 @fixture
 def patched_aeris_client_service_class(mock_aeris_client_service):
     with patch(
-        "src.services.service_manager.AerisService", autospec=True
+        "src.aeris.services.aeris_service.AerisService", autospec=True
     ) as mock_client_service:
         mock_client_service.return_value = mock_aeris_client_service
         yield mock_client_service
@@ -78,7 +88,7 @@ def patched_aeris_client_service_class(mock_aeris_client_service):
 @fixture
 def patched_vodafone_client_service_class(mock_vodafone_client_service):
     with patch(
-        "src.services.service_manager.VodafoneService", autospec=True
+        "src.vodafone.services.vodafone_service.VodafoneService", autospec=True
     ) as mock_client_service:
         mock_client_service.return_value = mock_vodafone_client_service
         yield mock_client_service
@@ -87,7 +97,7 @@ def patched_vodafone_client_service_class(mock_vodafone_client_service):
 @fixture
 def patched_tmna_client_service_class(mock_tmna_client_service):
     with patch(
-        "src.services.service_manager.TmnaService", autospec=True
+        "src.tmna.services.tmna_service.TmnaService", autospec=True
     ) as mock_client_service:
         mock_client_service.return_value = mock_tmna_client_service
         yield mock_client_service
@@ -96,7 +106,7 @@ def patched_tmna_client_service_class(mock_tmna_client_service):
 @fixture
 def patched_wirelesscar_client_service_class(mock_wirelesscar_client_service):
     with patch(
-        "src.services.service_manager.WirelessCarService", autospec=True
+        "src.wirelesscar.services.wirelesscar_service.WirelessCarService", autospec=True
     ) as mock_client_service:
         mock_client_service.return_value = mock_wirelesscar_client_service
         yield mock_client_service
@@ -352,6 +362,7 @@ def test_setup_service_manager_creates_wirelesscar_service_as_expected(
 
 ### Create service - Block End
 
+
 ### Create Service Manager - Block Start
 @pytest.mark.parametrize(
     "programcode", ["nissan", "infiniti"], ids=["Nissan", "Infiniti"]
@@ -432,3 +443,84 @@ def test_setup_service_manager_subaru_with_version_creates_service_manager_as_ex
 
 
 ### Create Service Manager - Block End
+
+
+### Service Registry - Block Start
+@pytest.mark.parametrize(
+    "programcode,ctsversion",
+    [
+        ("nissan", None),
+        ("fca", CtsVersion.ONE_DOT_ZERO),
+        ("vwcarnet", CtsVersion.TWO_DOT_ZERO),
+        ("porsche", CtsVersion.ONE_DOT_ZERO),
+    ],
+    ids=["Nissan", "Fca", "Aeris", "Porsche"],
+)
+def test_setup_service_manager_reuses_cached_service_for_same_key(
+    service_manager_mock_setup, patched_setup_config_manager, programcode, ctsversion
+):
+    first = setup_service_manager(programcode, ctsversion)
+    second = setup_service_manager(programcode.upper(), ctsversion)
+    assert first.client_service is second.client_service
+    patched_setup_config_manager.assert_called_once_with()
+
+
+def test_setup_service_manager_builds_service_once_per_key(
+    service_manager_mock_setup, patched_verizon_client_service_class
+):
+    setup_service_manager("vwcarnet", CtsVersion.ONE_DOT_ZERO)
+    setup_service_manager("vwcarnet", "1.0")
+    setup_service_manager("vwcarnet", "")
+    patched_verizon_client_service_class.assert_called_once()
+
+
+def test_setup_service_manager_keeps_separate_services_per_ctsversion(
+    service_manager_mock_setup,
+    mock_siriusxm_client_service,
+    mock_tmna_client_service,
+):
+    assert (
+        setup_service_manager("toyota", CtsVersion.ONE_DOT_ZERO).client_service
+        == mock_siriusxm_client_service
+    )
+    assert (
+        setup_service_manager("toyota", CtsVersion.TWO_DOT_ZERO).client_service
+        == mock_tmna_client_service
+    )
+
+
+def test_setup_service_manager_does_not_cache_unknown_programcode(
+    service_manager_mock_setup, patched_setup_config_manager
+):
+    assert setup_service_manager("unknown").client_service is None
+    assert setup_service_manager("unknown").client_service is None
+    patched_setup_config_manager.assert_called_once_with()
+
+
+def test_invalidate_service_registry_for_key_rebuilds_only_that_service(
+    service_manager_mock_setup,
+    patched_fca_client_service_class,
+    patched_aeris_client_service_class,
+):
+    setup_service_manager("fca", CtsVersion.ONE_DOT_ZERO)
+    setup_service_manager("vwcarnet", CtsVersion.TWO_DOT_ZERO)
+    invalidate_service_registry("FCA")
+    setup_service_manager("fca", CtsVersion.ONE_DOT_ZERO)
+    setup_service_manager("vwcarnet", CtsVersion.TWO_DOT_ZERO)
+    assert patched_fca_client_service_class.call_count == 2
+    assert patched_aeris_client_service_class.call_count == 1
+
+
+def test_invalidate_service_registry_without_key_reloads_config(
+    service_manager_mock_setup,
+    patched_setup_config_manager,
+    patched_siriusxm_client_service_class,
+):
+    setup_service_manager("nissan")
+    invalidate_service_registry()
+    setup_service_manager("nissan")
+    assert patched_setup_config_manager.call_count == 2
+    assert patched_siriusxm_client_service_class.call_count == 2
+
+
+### Service Registry - Block End
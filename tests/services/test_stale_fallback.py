@@ -0,0 +1,235 @@
+import time
+from threading import Event
+from types import SimpleNamespace
+
+import pytest
+
+from src.config.aeris_config import AerisConfig
+from src.models.domain.enums.internal_status_type import InternalStatusType
+from src.services.stale_fallback import (
+    finish_refreshes,
+    get_stale_fallback_stats,
+    get_vehicledata_or_stale,
+    max_stale_age,
+    record_age,
+    reset_stale_fallback_stats,
+    stale_fallback_enabled,
+)
+from src.utilities.extensions.datetime_extension import get_utc_epoch
+
+
+class FooService:
+    def __init__(self, config):
+        self._config = config
+
+
+def vehicledata(status=InternalStatusType.SUCCESS, dataage=None, message="live"):
+    return SimpleNamespace(status=status, dataage=dataage, responsemessage=message)
+
+
+def new_service(**kwargs):
+    settings = dict(
+        stale_fallback_enable=True,
+        stale_fallback_max_age=10,
+        stale_fallback_latency_budget=0.2,
+    )
+    settings.update(kwargs)
+    return FooService(AerisConfig(**settings))
+
+
+@pytest.fixture(autouse=True)
+def clear_stats():
+    reset_stale_fallback_stats()
+    yield
+    reset_stale_fallback_stats()
+
+
+def test_stale_fallback_enabled_only_when_configured():
+    assert stale_fallback_enabled(AerisConfig(stale_fallback_enable=True))
+    assert not stale_fallback_enabled(AerisConfig())
+
+
+def test_max_stale_age_prefers_programcode_limit():
+    config = AerisConfig(
+        stale_fallback_max_age=60,
+        stale_fallback_max_age_by_programcode={"vwcarnet": 5},
+    )
+    assert max_stale_age(config, "vwcarnet") == 300
+    assert max_stale_age(config, "nissan") == 3600
+    assert max_stale_age(AerisConfig(), "vwcarnet") is None
+
+
+def test_record_age_is_seconds_since_saved():
+    record = SimpleNamespace(event_datetime=get_utc_epoch() - 90500)
+    assert record_age(record) == 90
+
+
+def test_get_vehicledata_or_stale_returns_live_result_within_budget():
+    stale_lookups = []
+    response = get_vehicledata_or_stale(
+        new_service(),
+        "5243583607",
+        "vwcarnet",
+        lambda msisdn, programcode: vehicledata(),
+        lambda msisdn, programcode: stale_lookups.append(msisdn),
+    )
+    assert response.responsemessage == "live"
+    assert stale_lookups == []
+    assert get_stale_fallback_stats()["live"] == 1
+
+
+def test_get_vehicledata_or_stale_does_not_replace_upstream_answers():
+    response = get_vehicledata_or_stale(
+        new_service(),
+        "5243583607",
+        "vwcarnet",
+        lambda msisdn, programcode: vehicledata(status=InternalStatusType.NOTFOUND),
+        lambda msisdn, programcode: vehicledata(dataage=1, message="stale"),
+    )
+    assert response.status == InternalStatusType.NOTFOUND
+
+
+@pytest.mark.parametrize(
+    "status",
+    [
+        InternalStatusType.INTERNALSERVERERROR,
+        InternalStatusType.GATEWAYTIMEOUT,
+        InternalStatusType.SERVICEUNAVAILABLE,
+    ],
+)
+def test_get_vehicledata_or_stale_on_live_failure_returns_stored_data(status):
+    response = get_vehicledata_or_stale(
+        new_service(),
+        "5243583607",
+        "vwcarnet",
+        lambda msisdn, programcode: vehicledata(status=status),
+        lambda msisdn, programcode: vehicledata(dataage=120, message="stale"),
+    )
+    assert response.responsemessage == "stale"
+    assert response.dataage == 120
+    assert get_stale_fallback_stats()["stale"] == 1
+
+
+def test_get_vehicledata_or_stale_on_slow_lookup_returns_stored_data_and_refreshes():
+    release = Event()
+    refreshed = Event()
+
+    def slow_lookup(msisdn, programcode):
+        release.wait(5)
+        refreshed.set()
+        return vehicledata()
+
+    started = time.monotonic()
+    response = get_vehicledata_or_stale(
+        new_service(),
+        "5243583607",
+        "vwcarnet",
+        slow_lookup,
+        lambda msisdn, programcode: vehicledata(dataage=30, message="stale"),
+    )
+    assert time.monotonic() - started < 1
+    assert response.responsemessage == "stale"
+    assert not refreshed.is_set()
+
+    release.set()
+    assert refreshed.wait(5)
+
+
+def test_finish_refreshes_waits_for_refresh_left_running_by_stale_answer():
+    def slow_lookup(msisdn, programcode):
+        time.sleep(0.4)
+        return vehicledata()
+
+    get_vehicledata_or_stale(
+        new_service(stale_fallback_refresh_wait=5),
+        "5243583607",
+        "vwcarnet",
+        slow_lookup,
+        lambda msisdn, programcode: vehicledata(dataage=30, message="stale"),
+    )
+
+    assert finish_refreshes(timeout=5) is True
+    assert finish_refreshes(timeout=0) is True
+    assert get_stale_fallback_stats()["abandoned"] == 0
+
+
+def test_finish_refreshes_does_not_wait_unless_refresh_wait_is_set():
+    release = Event()
+
+    def slow_lookup(msisdn, programcode):
+        release.wait(5)
+        return vehicledata()
+
+    get_vehicledata_or_stale(
+        new_service(),
+        "5243583607",
+        "vwcarnet",
+        slow_lookup,
+        lambda msisdn, programcode: vehicledata(dataage=30, message="stale"),
+    )
+
+    started = time.monotonic()
+    assert finish_refreshes(timeout=5) is False
+    assert time.monotonic() - started < 0.5
+    assert get_stale_fallback_stats()["abandoned"] == 1
+    release.set()
+
+
+def test_finish_refreshes_logs_refresh_still_running_after_its_wait(caplog):
+    release = Event()
+
+    def slow_lookup(msisdn, programcode):
+        release.wait(5)
+        return vehicledata()
+
+    get_vehicledata_or_stale(
+        new_service(stale_fallback_refresh_wait=0.1),
+        "5243583607",
+        "vwcarnet",
+        slow_lookup,
+        lambda msisdn, programcode: vehicledata(dataage=30, message="stale"),
+    )
+
+    started = time.monotonic()
+    assert finish_refreshes(timeout=5, reason="left running") is False
+    assert time.monotonic() - started < 1
+    assert get_stale_fallback_stats()["abandoned"] == 1
+    assert "msisdn: 5243583607 left running" in caplog.text
+    # logged once, not again by the next request
+    assert finish_refreshes(timeout=0) is True
+    release.set()
+
+
+def test_get_vehicledata_or_stale_waits_for_live_result_when_stored_data_is_too_old():
+    def slow_lookup(msisdn, programcode):
+        time.sleep(0.4)
+        return vehicledata()
+
+    response = get_vehicledata_or_stale(
+        new_service(stale_fallback_max_age_by_programcode={"vwcarnet": 1}),
+        "5243583607",
+        "vwcarnet",
+        slow_lookup,
+        lambda msisdn, programcode: vehicledata(dataage=120, message="stale"),
+    )
+    assert response.responsemessage == "live"
+    assert get_stale_fallback_stats() == {
+        "live": 1,
+        "stale": 0,
+        "too_old": 1,
+        "abandoned": 0,
+    }
+
+
+def test_get_vehicledata_or_stale_without_stored_data_returns_live_failure():
+    response = get_vehicledata_or_stale(
+        new_service(),
+        "5243583607",
+        "vwcarnet",
+        lambda msisdn, programcode: vehicledata(
+            status=InternalStatusType.GATEWAYTIMEOUT, message="read timed out"
+        ),
+        lambda msisdn, programcode: None,
+    )
+    assert response.status == InternalStatusType.GATEWAYTIMEOUT
+    assert response.responsemessage == "read timed out"
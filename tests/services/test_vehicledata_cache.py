@@ -0,0 +1,174 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.services.vehicledata_cache import (
+    VehicleDataCache,
+    cache_ttl,
+    cache_vehicledata,
+    find_latest_vehicledata,
+    vehicledata_cache,
+)
+
+
+def record(event_datetime, request_key="fca-5555555555"):
+    return SimpleNamespace(request_key=request_key, event_datetime=event_datetime)
+
+
+def test_cache_returns_stored_record_and_counts_hits_and_misses():
+    cache = VehicleDataCache()
+    stored = record(1)
+    assert cache.get("fca-5555555555") is None
+    cache.put("fca-5555555555", stored, 60)
+    assert cache.get("fca-5555555555") is stored
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_expires_entries_after_ttl():
+    cache = VehicleDataCache()
+    with patch("src.services.vehicledata_cache.monotonic", return_value=100):
+        cache.put("fca-5555555555", record(1), 10)
+    with patch("src.services.vehicledata_cache.monotonic", return_value=110):
+        assert cache.get("fca-5555555555") is None
+    assert cache.stats()["expired"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_treats_records_older_than_min_event_datetime_as_expired():
+    cache = VehicleDataCache()
+    cache.put("fca-5555555555", record(1000), 60)
+    assert cache.get("fca-5555555555", min_event_datetime=2000) is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_cache_evicts_least_recently_used_entry():
+    cache = VehicleDataCache(max_entries=2)
+    cache.put("a", record(1, "a"), 60)
+    cache.put("b", record(1, "b"), 60)
+    cache.get("a")
+    cache.put("c", record(1, "c"), 60)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_keeps_newer_record_over_older_put():
+    cache = VehicleDataCache()
+    newer = record(2)
+    cache.put("fca-5555555555", newer, 60)
+    cache.put("fca-5555555555", record(1), 60)
+    assert cache.get("fca-5555555555") is newer
+
+
+def test_cache_ttl_prefers_dynamodb_cache_ttl_then_check_timelimit():
+    assert cache_ttl(SimpleNamespace(dynamodb_cache_ttl=30)) == 30
+    assert (
+        cache_ttl(
+            SimpleNamespace(dynamodb_check_enable=True, dynamodb_check_timelimit=2)
+        )
+        == 120
+    )
+    assert (
+        cache_ttl(
+            SimpleNamespace(dynamodb_check_enable=False, dynamodb_check_timelimit=2)
+        )
+        == 0
+    )
+    assert cache_ttl(SimpleNamespace()) == 0
+
+
+def test_find_latest_vehicledata_queries_once_while_cached():
+    config = SimpleNamespace(dynamodb_cache_ttl=60)
+    query = MagicMock(return_value=[record(1)])
+    first = find_latest_vehicledata(config, None, "fca-5555555555", query)
+    second = find_latest_vehicledata(config, None, "fca-5555555555", query)
+    assert first is second
+    assert query.call_count == 1
+
+
+def test_find_latest_vehicledata_does_not_cache_misses():
+    config = SimpleNamespace(dynamodb_cache_ttl=60)
+    query = MagicMock(return_value=[])
+    assert find_latest_vehicledata(config, None, "fca-5555555555", query) is None
+    assert find_latest_vehicledata(config, None, "fca-5555555555", query) is None
+    assert query.call_count == 2
+
+
+def test_find_latest_vehicledata_bypasses_cache_when_disabled():
+    config = SimpleNamespace(dynamodb_cache_ttl=None)
+    query = MagicMock(return_value=[record(1)])
+    find_latest_vehicledata(config, None, "fca-5555555555", query)
+    find_latest_vehicledata(config, None, "fca-5555555555", query)
+    assert query.call_count == 2
+    assert vehicledata_cache.stats()["size"] == 0
+
+
+def test_cache_vehicledata_serves_saved_record_to_next_lookup():
+    config = SimpleNamespace(dynamodb_cache_ttl=60)
+    saved = record(5)
+    cache_vehicledata(config, saved)
+    query = MagicMock()
+    assert find_latest_vehicledata(config, None, "fca-5555555555", query) is saved
+    query.assert_not_called()
+
+
+def test_find_latest_vehicledata_reads_latest_item_when_enabled():
+    config = SimpleNamespace(dynamodb_cache_ttl=None, dynamodb_latest_item=True)
+    query = MagicMock()
+    latest = record(5)
+    attributes = frozenset(["request_key", "event_datetime", "vin"])
+    with patch(
+        "src.services.vehicledata_cache.get_latest_item", return_value=latest
+    ) as patched_get_latest_item:
+        assert find_latest_vehicledata(
+            config, "table", "fca-5555555555", query, attributes=attributes
+        ) is (latest)
+    patched_get_latest_item.assert_called_once_with(
+        "table", "fca-5555555555", attributes
+    )
+    query.assert_not_called()
+
+
+def test_find_latest_vehicledata_queries_full_items_latest_item_lacks():
+    config = SimpleNamespace(dynamodb_cache_ttl=None, dynamodb_latest_item=True)
+    query = MagicMock(return_value=[record(5)])
+    with patch(
+        "src.services.vehicledata_cache.get_latest_item"
+    ) as patched_get_latest_item:
+        assert find_latest_vehicledata(config, "table", "fca-5555555555", query)
+    patched_get_latest_item.assert_not_called()
+    query.assert_called_once_with()
+
+
+def test_find_latest_vehicledata_ignores_latest_item_outside_window():
+    config = SimpleNamespace(dynamodb_cache_ttl=None, dynamodb_latest_item=True)
+    with patch(
+        "src.services.vehicledata_cache.get_latest_item", return_value=record(5)
+    ):
+        assert (
+            find_latest_vehicledata(
+                config,
+                "table",
+                "fca-5555555555",
+                MagicMock(),
+                min_event_datetime=10,
+                attributes=frozenset(["vin"]),
+            )
+            is None
+        )
+
+
+def test_cache_serves_projected_record_only_to_lookups_it_covers():
+    cache = VehicleDataCache()
+    cache.put("fca-5555555555", record(1), 60, frozenset({"vin"}))
+    assert cache.get("fca-5555555555", attributes=frozenset({"vin"})) is not None
+    assert cache.get("fca-5555555555", attributes=frozenset({"vin", "brand"})) is None
+    assert cache.get("fca-5555555555") is None
+
+
+def test_cache_keeps_full_record_over_projection_of_same_record():
+    cache = VehicleDataCache()
+    full = record(1)
+    cache.put("fca-5555555555", full, 60)
+    cache.put("fca-5555555555", record(1), 60, frozenset({"vin"}))
+    assert cache.get("fca-5555555555") is full
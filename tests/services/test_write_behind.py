@@ -0,0 +1,140 @@
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from src.config.verizon_config import VerizonConfig
+from src.services.dynamodb_latest import get_latest_item
+from src.services.vehicledata_cache import get_cached_vehicledata
+from src.services.write_behind import (
+    WriteBehindQueue,
+    flush_write_behind,
+    flush_write_behind_backlog,
+    save_vehicledata_behind,
+)
+
+
+@pytest.fixture
+def write_queue(tmp_path):
+    yield WriteBehindQueue(spool_path=str(tmp_path / "spool.jsonl"))
+
+
+def new_record(table, msisdn, event_datetime=1000):
+    return table(
+        request_key="vwcarnet-" + msisdn,
+        event_datetime=event_datetime,
+        programcode="vwcarnet",
+        msisdn=msisdn,
+        timestamp=datetime.now(timezone.utc),
+        vin="VIN" + msisdn,
+    )
+
+
+def test_write_behind_queue_flush_saves_records_and_latest_items(cv_table, write_queue):
+    for index in range(30):
+        assert write_queue.submit(
+            cv_table, new_record(cv_table, str(index)), latest_item=index != 1
+        )
+
+    assert write_queue.flush(timeout=5)
+
+    assert cv_table.get("vwcarnet-29", 1000).vin == "VIN29"
+    assert get_latest_item(cv_table, "vwcarnet-0").vin == "VIN0"
+    assert cv_table.get("vwcarnet-1", 1000).vin == "VIN1"
+    assert get_latest_item(cv_table, "vwcarnet-1") is None
+    stats = write_queue.stats()
+    assert stats["written"] == 30
+    assert stats["pending"] == 0
+    assert stats["batches"] >= 2
+
+
+def test_write_behind_queue_when_full_refuses_record(cv_table, write_queue):
+    full_queue = WriteBehindQueue(max_size=1, spool_path=write_queue.spool_path)
+    with patch.object(full_queue, "_ensure_thread"):
+        assert full_queue.submit(cv_table, new_record(cv_table, "1"))
+        assert not full_queue.submit(cv_table, new_record(cv_table, "2"))
+
+    assert full_queue.stats()["overflow"] == 1
+
+
+def test_write_behind_queue_spools_failed_records_and_replays_them(
+    cv_table, write_queue
+):
+    record = new_record(cv_table, "5243583607")
+    with patch.object(cv_table, "batch_write", side_effect=Exception("throttled")):
+        with patch.object(cv_table, "save", side_effect=Exception("throttled")):
+            write_queue.submit(cv_table, record)
+            write_queue.flush(timeout=5)
+
+    with open(write_queue.spool_path) as spool:
+        assert len(spool.readlines()) == 1
+    with pytest.raises(cv_table.DoesNotExist):
+        cv_table.get("vwcarnet-5243583607", 1000)
+
+    write_queue.flush(timeout=5)
+
+    assert cv_table.get("vwcarnet-5243583607", 1000).vin == "VIN5243583607"
+
+
+def test_save_vehicledata_behind_caches_queued_record(cv_table):
+    config = VerizonConfig(
+        write_behind_enable=True, dynamodb_check_enable=True, dynamodb_check_timelimit=2
+    )
+    record = new_record(cv_table, "5243583607")
+    with patch("src.services.write_behind.write_behind_queue") as mocked_queue:
+        mocked_queue.submit.return_value = True
+        assert save_vehicledata_behind(config, cv_table, record)
+
+    mocked_queue.submit.assert_called_once_with(cv_table, record, False)
+    assert get_cached_vehicledata(config, "vwcarnet-5243583607") is record
+
+
+def test_save_vehicledata_behind_when_disabled_returns_false(cv_table):
+    with patch("src.services.write_behind.write_behind_queue") as mocked_queue:
+        assert not save_vehicledata_behind(
+            VerizonConfig(), cv_table, new_record(cv_table, "1")
+        )
+
+    mocked_queue.submit.assert_not_called()
+
+
+def test_flush_write_behind_logs_records_it_leaves_unwritten(
+    cv_table, write_queue, caplog
+):
+    with patch.object(write_queue, "_ensure_thread"):
+        write_queue.submit(cv_table, new_record(cv_table, "5243583607"))
+    with patch("src.services.write_behind.write_behind_queue", write_queue):
+        assert not flush_write_behind(timeout=0, reason="left queued")
+
+    assert "vwcarnet-5243583607 not written by write-behind, left queued" in caplog.text
+    assert '"msisdn": {"S": "5243583607"}' in caplog.text
+    assert write_queue.stats()["pending"] == 1
+
+
+def test_write_behind_queue_flush_with_keep_leaves_records_queued(
+    cv_table, write_queue
+):
+    with patch.object(write_queue, "_ensure_thread"):
+        for msisdn in ("1", "2", "3"):
+            write_queue.submit(cv_table, new_record(cv_table, msisdn))
+
+    assert write_queue.flush(timeout=5, keep=2)
+
+    assert write_queue.stats()["written"] == 1
+    assert write_queue.stats()["pending"] == 2
+
+
+@pytest.mark.parametrize("shutdown_flush, pending", [(True, 1), (False, 0)])
+def test_flush_write_behind_backlog_leaves_rows_to_the_shutdown_flush(
+    cv_table, write_queue, shutdown_flush, pending
+):
+    with patch.object(write_queue, "_ensure_thread"):
+        write_queue.submit(cv_table, new_record(cv_table, "5243583607"))
+    with patch("src.services.write_behind.write_behind_queue", write_queue):
+        with patch(
+            "src.services.write_behind.shutdown_flush_available",
+            return_value=shutdown_flush,
+        ):
+            assert flush_write_behind_backlog(timeout=5)
+
+    assert write_queue.stats()["pending"] == pending
@@ -11,6 +11,8 @@ from src.models.domain.enums.internal_status_type import InternalStatusType
 from src.models.enums.ctsversion_type import CtsVersion
 from src.models.enums.programcode_type import ProgramCode
 from src.services.dynamodb_tables import get_main_table
+from src.services.soaphandlers.soap_codec import AGENT_ASSIGNED, SoapFault
+from src.services.vehicledata_cache import vehicledata_cache
 from src.siriusxm.models.data.vehicle_data import VehicleData
 from src.siriusxm.models.domain.agentassignment import AgentAssignment
 from src.siriusxm.models.domain.terminate import Terminate
@@ -34,6 +36,10 @@ def patched_zeep_client():
     with patch(
         "src.siriusxm.services.siriusxm_service.retrieve_zeepclient"
     ) as patched_zeep_client:
+        # the client checked out for the with block is the one returned
+        patched_zeep_client.return_value.__enter__.return_value = (
+            patched_zeep_client.return_value
+        )
         yield patched_zeep_client
 
 
@@ -46,9 +52,9 @@ def patched_setup_logger():
 @pytest.fixture
 def patched_rest_client():
     with patch(
-        "src.siriusxm.services.siriusxm_service.requests"
-    ) as patched_rest_client:
-        yield patched_rest_client
+        "src.siriusxm.services.siriusxm_service.get_http_session"
+    ) as patched_get_http_session:
+        yield patched_get_http_session.return_value
 
 
 def mocked_requests_get(*args, **kwargs):
@@ -325,6 +331,54 @@ def test_service_assign_agent_should_raise_exception_when_isassigned_is_not_pass
         assert e.raw_errors[0].exc.msg_template == "field required"
 
 
+def test_service_assign_agent_with_soap_fast_path_does_not_use_zeep(
+    patched_zeep_client,
+    patched_rest_client,
+    mock_dynamo_cv_table,
+    raw_reply,
+    siriusxm_reply,
+):
+    patched_rest_client.post.return_value = raw_reply(siriusxm_reply)
+    service = SiriusXmService(
+        config=SiriusXmConfig(base_url=URL, soap_fast_path=True),
+        table=mock_dynamo_cv_table,
+    )
+    agentassignment = AgentAssignment(
+        referenceid="ref-1", isassigned=True, programcode="nissan"
+    )
+
+    assert service.assign_agent(agentassignment)
+    patched_zeep_client.assert_not_called()
+    patched_rest_client.post.assert_called_once()
+    assert patched_rest_client.post.call_args[1]["data"] == AGENT_ASSIGNED.envelope(
+        reference_id="ref-1", is_assigned=True
+    )
+    assert agentassignment.responsestatus == InternalStatusType.SUCCESS
+    assert agentassignment.response_referenceid == "ref-1"
+    assert agentassignment.responsemessage == "Agent assigned"
+
+
+def test_service_terminate_with_soap_fast_path_on_fault_should_return_false(
+    patched_zeep_client,
+    patched_rest_client,
+    mock_dynamo_cv_table,
+    raw_reply,
+    soap_fault_reply,
+):
+    patched_rest_client.post.return_value = raw_reply(
+        soap_fault_reply, status_code=500
+    )
+    service = SiriusXmService(
+        config=SiriusXmConfig(base_url=URL, soap_fast_path=True),
+        table=mock_dynamo_cv_table,
+    )
+    terminate = Terminate(referenceid="ref-1", programcode="nissan")
+
+    assert not service.terminate(terminate)
+    patched_zeep_client.assert_not_called()
+    assert type(terminate.responsemessage) is SoapFault
+
+
 @pytest.mark.parametrize(
     "programcode", ["nissan", "infiniti", "toyota"], ids=["Nissan", "Infiniti", "Toyota"]
 )
@@ -611,6 +665,40 @@ def test_get_vehicledata_returns_200_with_latest_record_if_successful(
     assert response.vin == "TESTSECONDVIN"
 
 
+def test_get_vehicledata_returns_latest_saved_record_from_cache(
+    mock_dynamodb, mock_logger
+):
+    cv_table = get_main_table(DynamoConfig(table_name=TABLE_NAME))
+    config = SiriusXmConfig(
+        base_url=URL, api_key=APIKEY, raw_apikey=RAWAPIKEY, dynamodb_cache_ttl=60
+    )
+    uut = SiriusXmService(config=config, table=cv_table)
+    uut.save_vehicledata(generate_valid_cv_data())
+    uut.save_vehicledata(generate_secondvalid_cv_data())
+    with patch.object(cv_table, "query") as patched_query:
+        response = uut.get_vehicledata(id="TESTREFERENCE", programcode="infiniti")
+    assert response.status == InternalStatusType.SUCCESS
+    assert response.vin == "TESTSECONDVIN"
+    patched_query.assert_not_called()
+    assert vehicledata_cache.stats()["hits"] == 1
+
+
+def test_get_vehicledata_reads_latest_item_when_enabled(mock_dynamodb, mock_logger):
+    cv_table = get_main_table(DynamoConfig(table_name=TABLE_NAME))
+    config = SiriusXmConfig(
+        base_url=URL, api_key=APIKEY, raw_apikey=RAWAPIKEY, dynamodb_latest_item=True
+    )
+    uut = SiriusXmService(config=config, table=cv_table)
+    uut.save_vehicledata(generate_valid_cv_data())
+    uut.save_vehicledata(generate_secondvalid_cv_data())
+    with patch.object(cv_table, "query") as patched_query:
+        response = uut.get_vehicledata(id="TESTREFERENCE", programcode="infiniti")
+    assert response.status == InternalStatusType.SUCCESS
+    assert response.vin == "TESTSECONDVIN"
+    assert int(response.event_datetime) > 0
+    patched_query.assert_not_called()
+
+
 @pytest.mark.parametrize(
     "programcode", ["nissan", "infiniti", "toyota"], ids=["Nissan", "Infiniti", "Toyota"]
 )
@@ -1,9 +1,34 @@
+from unittest.mock import patch
+
 from mangum import Mangum
 
 from src.api.api import app
-from src.handler import handler
+from src.handler import handler, ingest
 
 
 def test_handler_is_configured_mangum():
     assert isinstance(handler, Mangum)
     assert handler.app is app
+
+
+def test_handler_flushes_write_behind_before_returning():
+    with patch.object(Mangum, "__call__", return_value={"statusCode": 200}):
+        with patch("src.handler.flush_write_behind_before_response") as patched_flush:
+            with patch(
+                "src.handler.finish_refreshes_before_response"
+            ) as patched_finish:
+                assert handler({}, None) == {"statusCode": 200}
+
+    patched_finish.assert_called_once_with()
+    patched_flush.assert_called_once_with()
+
+
+def test_ingest_consumes_sqs_event():
+    event = {"Records": [{"messageId": "1", "body": "{}"}]}
+    with patch(
+        "src.services.ingestion.consume_ingestion_event",
+        return_value={"batchItemFailures": []},
+    ) as patched_consume:
+        assert ingest(event, None) == {"batchItemFailures": []}
+
+    patched_consume.assert_called_once_with(event)
@@ -11,8 +11,10 @@ from src.tmna.services.tmna_service import TmnaService
 
 @pytest.fixture
 def patched_rest_client():
-    with patch("src.tmna.services.tmna_service.requests") as patched_rest_client:
-        yield patched_rest_client
+    with patch(
+        "src.tmna.services.tmna_service.get_http_session"
+    ) as patched_get_http_session:
+        yield patched_get_http_session.return_value
 
 
 successjson = {"resultMessage": "Request processed successfully"}
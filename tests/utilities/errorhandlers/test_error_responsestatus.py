@@ -1,11 +1,22 @@
 import pytest
+from pynamodb.exceptions import GetError
+from requests.exceptions import ConnectionError, ReadTimeout
 
 from src.models.domain.enums.internal_status_type import InternalStatusType
 from src.models.exceptions.application_exception import ApplicationException
 from src.models.exceptions.badrequest_exception import BadRequestException
 from src.models.exceptions.forbidden_exception import ForbiddenException
+from src.models.exceptions.gatewaytimeout_exception import GatewayTimeoutException
+from src.models.exceptions.serviceunavailable_exception import (
+    ServiceUnavailableException,
+)
+from src.services.circuit_breaker import CircuitOpenError
 from src.models.exceptions.notfound_exception import NotFoundException
-from src.utilities.errorhandlers.error_responsestatus import handle_error_responsestatus
+from src.utilities.errorhandlers.error_responsestatus import (
+    get_exception_status,
+    handle_error_responsestatus,
+)
+from src.utilities.request_context import DeadlineExceeded
 
 testdata = [
     ("BaD_ReQuEsT", BadRequestException),
@@ -21,6 +32,8 @@ testinternalstatus = [
     (InternalStatusType.FORBIDDEN, ForbiddenException),
     (InternalStatusType.NOTFOUND, NotFoundException),
     (InternalStatusType.INTERNALSERVERERROR, ApplicationException),
+    (InternalStatusType.SERVICEUNAVAILABLE, ServiceUnavailableException),
+    (InternalStatusType.GATEWAYTIMEOUT, GatewayTimeoutException),
     (InternalStatusType.ERROR, ApplicationException),
     (InternalStatusType.CANCELED, ApplicationException),
     (InternalStatusType.UNKNOWN, ApplicationException),
@@ -44,3 +57,26 @@ def test_error_responsestatus_on_various_internalstatustype_error_should_raise_e
 ):
     actual_exception = handle_error_responsestatus(internalstatustype_input)
     assert actual_exception == expected_exception
+
+
+@pytest.mark.parametrize(
+    "exception, expected_status",
+    [
+        (ReadTimeout("read timed out"), InternalStatusType.GATEWAYTIMEOUT),
+        (DeadlineExceeded(), InternalStatusType.GATEWAYTIMEOUT),
+        (GetError(cause=DeadlineExceeded()), InternalStatusType.GATEWAYTIMEOUT),
+        (CircuitOpenError("open"), InternalStatusType.SERVICEUNAVAILABLE),
+        (ConnectionError("refused"), InternalStatusType.INTERNALSERVERERROR),
+        (ValueError("bad"), InternalStatusType.INTERNALSERVERERROR),
+    ],
+    ids=[
+        "Timeout",
+        "Deadline",
+        "WrappedDeadline",
+        "CircuitOpen",
+        "ConnectionError",
+        "Other",
+    ],
+)
+def test_get_exception_status_maps_exceptions_as_expected(exception, expected_status):
+    assert get_exception_status(exception) == expected_status
@@ -1,5 +1,7 @@
 from src.utilities.errorhandlers.errors import create_bad_request_error
 from src.utilities.errorhandlers.errors import create_forbidden_server_error
+from src.utilities.errorhandlers.errors import create_gateway_timeout_error
+from src.utilities.errorhandlers.errors import create_service_unavailable_error
 from src.utilities.errorhandlers.errors import create_internal_server_error
 from src.utilities.errorhandlers.errors import create_notallowed_server_error
 from src.utilities.errorhandlers.errors import create_notfound_server_error
@@ -62,3 +64,21 @@ def test_create_internal_server_error_creates_as_expected():
     assert error.code == "InternalServerError"
     assert error.title == "Internal Server Error"
     assert error.detail == detail
+
+
+def test_create_service_unavailable_error_creates_as_expected():
+    detail = "fooDetail"
+    error = create_service_unavailable_error(detail)
+    assert error.status == "503"
+    assert error.code == "ServiceUnavailable"
+    assert error.title == "Service Unavailable"
+    assert error.detail == detail
+
+
+def test_create_gateway_timeout_error_creates_as_expected():
+    detail = "fooDetail"
+    error = create_gateway_timeout_error(detail)
+    assert error.status == "504"
+    assert error.code == "GatewayTimeout"
+    assert error.title == "Gateway Timeout"
+    assert error.detail == detail
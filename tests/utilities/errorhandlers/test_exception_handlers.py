@@ -15,10 +15,20 @@ from starlette.responses import JSONResponse
 from src.models.exceptions.badrequest_exception import BadRequestException
 from src.models.exceptions.custom_exception import CustomException
 from src.models.exceptions.forbidden_exception import ForbiddenException
+from src.models.exceptions.gatewaytimeout_exception import GatewayTimeoutException
+from src.models.exceptions.serviceunavailable_exception import (
+    ServiceUnavailableException,
+)
 from src.models.exceptions.notfound_exception import NotFoundException
 from src.utilities.errorhandlers.exception_handlers import badrequest_exception_handler
 from src.utilities.errorhandlers.exception_handlers import base_exception_handler
 from src.utilities.errorhandlers.exception_handlers import forbidden_exception_handler
+from src.utilities.errorhandlers.exception_handlers import (
+    gatewaytimeout_exception_handler,
+)
+from src.utilities.errorhandlers.exception_handlers import (
+    serviceunavailable_exception_handler,
+)
 from src.utilities.errorhandlers.exception_handlers import http_exception_handler
 from src.utilities.errorhandlers.exception_handlers import notfound_exception_handler
 from src.utilities.errorhandlers.exception_handlers import register_exception_handlers
@@ -199,6 +209,60 @@ async def test_notfound_exception_handler_returns_as_expected(mock_json_response
     assert isinstance(response, JSONResponse)
 
 
+@mark.asyncio
+async def test_serviceunavailable_exception_handler_returns_as_expected(
+    mock_json_response,
+):
+    detail = "Detail"
+    exception_stub = NonCallableMagicMock()
+    exception_stub.detail = detail
+    exception_stub.status_code = 503
+    response = await serviceunavailable_exception_handler(
+        NonCallableMagicMock(), exception_stub
+    )
+    mock_json_response.assert_called_once_with(
+        status_code=503,
+        content={
+            "errors": [
+                {
+                    "status": "503",
+                    "code": "ServiceUnavailable",
+                    "title": "Service Unavailable",
+                    "detail": detail,
+                }
+            ]
+        },
+    )
+    assert isinstance(response, JSONResponse)
+
+
+@mark.asyncio
+async def test_gatewaytimeout_exception_handler_returns_as_expected(
+    mock_json_response,
+):
+    detail = "Detail"
+    exception_stub = NonCallableMagicMock()
+    exception_stub.detail = detail
+    exception_stub.status_code = 504
+    response = await gatewaytimeout_exception_handler(
+        NonCallableMagicMock(), exception_stub
+    )
+    mock_json_response.assert_called_once_with(
+        status_code=504,
+        content={
+            "errors": [
+                {
+                    "status": "504",
+                    "code": "GatewayTimeout",
+                    "title": "Gateway Timeout",
+                    "detail": detail,
+                }
+            ]
+        },
+    )
+    assert isinstance(response, JSONResponse)
+
+
 def test_register_exception_handlers_registers_as_expected():
     mock_fastapi = create_autospec(FastAPI)
     register_exception_handlers(mock_fastapi)
@@ -220,5 +284,9 @@ def test_register_exception_handlers_registers_as_expected():
             call()(base_exception_handler),
             call(ForbiddenException),
             call()(forbidden_exception_handler),
+            call(ServiceUnavailableException),
+            call()(serviceunavailable_exception_handler),
+            call(GatewayTimeoutException),
+            call()(gatewaytimeout_exception_handler),
         ]
     )
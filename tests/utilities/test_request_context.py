@@ -0,0 +1,65 @@
+from time import monotonic
+from unittest.mock import MagicMock
+
+from src.utilities.request_context import (
+    API_GATEWAY_TIMEOUT,
+    MIN_CALL_TIMEOUT,
+    get_call_timeout,
+    get_remaining_time,
+    get_request_deadline,
+    is_deadline_exceeded,
+    set_request_deadline,
+    set_request_deadline_from_lambda_context,
+)
+
+
+def test_set_request_deadline_from_lambda_context_uses_remaining_time():
+    aws_context = MagicMock()
+    aws_context.get_remaining_time_in_millis.return_value = 10000
+    set_request_deadline_from_lambda_context(aws_context)
+    assert 9.5 < get_remaining_time() <= 10
+
+
+def test_set_request_deadline_from_lambda_context_caps_at_gateway_timeout():
+    aws_context = MagicMock()
+    aws_context.get_remaining_time_in_millis.return_value = 30000
+    set_request_deadline_from_lambda_context(aws_context)
+    assert 28.5 < get_remaining_time() <= API_GATEWAY_TIMEOUT
+
+    set_request_deadline_from_lambda_context(aws_context, gateway_timeout=5)
+    assert get_remaining_time() <= 5
+
+    set_request_deadline_from_lambda_context(aws_context, gateway_timeout=None)
+    assert get_remaining_time() > API_GATEWAY_TIMEOUT
+
+
+def test_set_request_deadline_without_lambda_context_clears_deadline():
+    set_request_deadline(monotonic() + 10)
+    set_request_deadline_from_lambda_context(None)
+    assert get_request_deadline() is None
+    assert get_remaining_time() is None
+
+
+def test_get_remaining_time_after_deadline_returns_zero():
+    set_request_deadline(monotonic() - 1)
+    assert get_remaining_time() == 0.0
+
+
+def test_get_call_timeout_without_deadline_keeps_timeout():
+    set_request_deadline(None)
+    assert get_call_timeout(5) == 5
+    assert get_call_timeout(None) is None
+    assert not is_deadline_exceeded()
+
+
+def test_get_call_timeout_is_capped_by_remaining_time():
+    set_request_deadline(monotonic() + 2)
+    assert 1 < get_call_timeout(5) <= 1.5
+    assert get_call_timeout(0.5) == 0.5
+    assert get_call_timeout(None) <= 1.5
+
+
+def test_get_call_timeout_after_deadline_returns_minimum():
+    set_request_deadline(monotonic() - 1)
+    assert get_call_timeout(5) == MIN_CALL_TIMEOUT
+    assert is_deadline_exceeded()
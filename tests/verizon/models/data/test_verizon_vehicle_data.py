@@ -50,6 +50,7 @@ def generate_valid_verizon_data():
         "phonenumber": "4258811803",
         "altitude": "542 ft",
         "language": "English",
+        "dataage": None,
         "status": "SUCCESS",
         "responsemessage": "response message",
     }
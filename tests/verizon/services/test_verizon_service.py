@@ -16,8 +16,13 @@ from src.services.dynamodb_tables import (
     ConnectedVehicleTable,
     get_main_table,
 )
+from src.services.soaphandlers.soap_codec import (
+    REQUEST_VEHICLE_LOCATION,
+    parse_reply,
+)
 from src.verizon.models.data.vehicle_data import VehicleData
 from src.verizon.services.verizon_service import (
+    TRACKING_HEADERS,
     VerizonService,
     get_additionaldata_from_header,
     get_timestamp_from_calldate,
@@ -67,13 +72,19 @@ def patched_zeep_client():
     with patch(
         "src.verizon.services.verizon_service.retrieve_zeepclient"
     ) as patched_zeep_client:
+        # the client checked out for the with block is the one returned
+        patched_zeep_client.return_value.__enter__.return_value = (
+            patched_zeep_client.return_value
+        )
         yield patched_zeep_client
 
 
 @pytest.fixture
 def patched_rest_client():
-    with patch("src.verizon.services.verizon_service.requests") as patched_rest_client:
-        yield patched_rest_client
+    with patch(
+        "src.verizon.services.verizon_service.get_http_session"
+    ) as patched_get_http_session:
+        yield patched_get_http_session.return_value
 
 
 def mocked_requests_get(*args, **kwargs):
@@ -568,6 +579,34 @@ def test_verizon_service_save_vehicledata_on_valid_input_without_headerresponse_
     assert result["Items"][0]["eventid"] == "NONE"
 
 
+def test_verizon_service_save_vehicledata_with_write_behind_queues_record(
+    mock_logger, mock_dynamo_cv_table
+):
+    verizonservice = VerizonService(
+        config=VerizonConfig(base_url="fooBaseURL", write_behind_enable=True),
+        table=mock_dynamo_cv_table,
+        supplementtable="fooSupplementTable",
+    )
+    with patch(
+        "src.verizon.services.verizon_service.save_vehicledata_behind",
+        return_value=True,
+    ) as patched_save_behind:
+        response = verizonservice.save_vehicledata(
+            "5243583607",
+            "vwcarnet",
+            VehicleData(**generate_valid_verizon_data()),
+            write_behind=True,
+        )
+
+    assert response.status == InternalStatusType.SUCCESS
+    patched_save_behind.assert_called_once_with(
+        verizonservice._config,
+        mock_dynamo_cv_table,
+        mock_dynamo_cv_table.return_value,
+    )
+    mock_dynamo_cv_table.return_value.save.assert_not_called()
+
+
 @mock_dynamodb2
 def test_verizon_service_save_vehicledata_on_invalid_inputdata_should_not_save_data_as_expected(
     mock_logger,
@@ -619,6 +658,51 @@ def test_verizon_service_get_vehicledata_on_exception_should_return_500(
     assert response.responsemessage == "something wrong"
 
 
+def test_verizon_service_get_vehicledata_with_soap_fast_path_does_not_use_zeep(
+    patched_zeep_client,
+    patched_rest_client,
+    mock_dynamo_cv_table,
+    raw_reply,
+    verizon_reply,
+):
+    patched_rest_client.post.return_value = raw_reply(verizon_reply)
+    verizonservice = VerizonService(
+        config=VerizonConfig(base_url="https://success", soap_fast_path=True),
+        table=mock_dynamo_cv_table,
+        supplementtable=mock_dynamo_cv_table,
+    )
+    with patch.object(verizonservice, "save_vehicledata") as patched_save:
+        response = verizonservice.get_vehicledata("5243583607", "vwcarnet")
+
+    patched_zeep_client.assert_not_called()
+    args, kwargs = patched_rest_client.post.call_args
+    assert args == ("https://success",)
+    assert b"<ns0:MDN>5243583607</ns0:MDN>" in kwargs["data"]
+    assert kwargs["headers"] == REQUEST_VEHICLE_LOCATION.headers
+    assert response.status == InternalStatusType.SUCCESS
+    assert response.vin == "1VWSA7A3XLC011823"
+    assert response.phonenumber == "4258811803"
+    assert patched_save.call_args[0][3] == {
+        "floweventid": "7918148",
+        "flowid": "528070",
+        "correlationflowid": "0000NT300^E4AxwpGCl3if1VfVBt0007Zu",
+    }
+
+
+def test_verizon_service_get_vehicledata_with_soap_fast_path_on_fault_should_return_500(
+    patched_rest_client, mock_dynamo_cv_table, raw_reply, soap_fault_reply
+):
+    patched_rest_client.post.return_value = raw_reply(soap_fault_reply, status_code=500)
+    verizonservice = VerizonService(
+        config=VerizonConfig(base_url="https://success", soap_fast_path=True),
+        table=mock_dynamo_cv_table,
+        supplementtable=mock_dynamo_cv_table,
+    )
+    response = verizonservice.get_vehicledata("5243583607", "vwcarnet")
+    assert response.status == InternalStatusType.INTERNALSERVERERROR
+    assert response.responsemessage == "Internal Error"
+
+
 def test_verizon_service_get_timestamp_from_calldate_on_valid_request_should_return_calldate_timestamp():
     response = get_timestamp_from_calldate("01/07/2021", "13:44:32")
     assert response == datetime.strptime("01/07/2021 13:44:32", "%m/%d/%Y %H:%M:%S")
@@ -660,8 +744,14 @@ def test_verizon_service_get_additionaldata_from_header_on_valid_outputresponse_
             "ResponseDescription": "Data Found",
         },
     }
+    _, headertexts = parse_reply(
+        outputresponse, REQUEST_VEHICLE_LOCATION.reply, TRACKING_HEADERS.values()
+    )
     response = get_additionaldata_from_header(
-        setup_verizon_service, outputresponse, "5243583607", "vwcarnet"
+        setup_verizon_service,
+        headertexts,
+        "5243583607",
+        "vwcarnet",
     )
     assert response is not None
     assert response["floweventid"] == "7918148"
@@ -1,3 +1,4 @@
+from unittest.mock import patch
 from datetime import datetime
 from decimal import Decimal
 from src.vodafone.models.data.vehicle_info import VehicleInfo
@@ -225,6 +226,26 @@ def test_save_vehicledata_on_bad_request_returns_400(
     )
 
 
+def test_queue_vehicledata_sends_mapped_rows(setup_vodafone_service):
+    with patch(
+        "src.vodafone.services.vodafone_service.send_vehicledata_rows"
+    ) as patched_send_rows:
+        response = setup_vodafone_service.queue_vehicledata(
+            "12345678901", "porsche", generate_valid_vodafone_data()
+        )
+
+    assert response.status == InternalStatusType.SUCCESS
+    assert (
+        response.responsemessage == "Queued the vehicledata for msisdn: 12345678901"
+    )
+    patched_send_rows.assert_called_once()
+    assert patched_send_rows.call_args[0][:3] == (
+        "12345678901",
+        "porsche",
+        CtsVersion.ONE_DOT_ZERO,
+    )
+
+
 def test_populate_vehicledata_with_valid_payload_populate_as_expected(
     setup_vodafone_service,
 ):